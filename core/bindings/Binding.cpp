@@ -1,4 +1,5 @@
 #include <pybind11/eigen.h>
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <wx/log.h>
@@ -17,6 +18,20 @@
 namespace py = pybind11;
 using namespace pybind11::literals;
 
+typedef py::array_t<double, py::array::c_style | py::array::forcecast> npArrayDouble;
+
+/**
+ * Share the buffer of a NumPy array with the core without copying it. The array is kept alive as long as the core
+ * uses the buffer.
+ */
+std::shared_ptr<const double> ShareArrayBuffer(const npArrayDouble& array) {
+    auto owner = new py::object(array);
+    return {array.data(), [owner](const double*) {
+                py::gil_scoped_acquire acquire;
+                delete owner;
+            }};
+}
+
 PYBIND11_MODULE(_hydrobricks, m) {
     m.doc() = "hydrobricks Python interface";
 
@@ -30,13 +45,22 @@ PYBIND11_MODULE(_hydrobricks, m) {
     py::class_<SettingsModel>(m, "SettingsModel")
         .def(py::init<>())
         .def("generate_socont_structure", &SettingsModel::GenerateStructureSocont, "Generate the GSM-SOCONT structure.",
-             "land_cover_types"_a, "land_cover_names"_a, "soil_storage_nb"_a = 1, "surface_runoff"_a = "socont_runoff")
+             "land_cover_types"_a, "land_cover_names"_a, "soil_storage_nb"_a = 1, "surface_runoff"_a = "socont_runoff",
+             "pet_method"_a = "forcing")
         .def("log_all", &SettingsModel::SetLogAll, "Logging all components.", "log_all"_a = true)
-        .def("set_solver", &SettingsModel::SetSolver, "Set the solver.", "name"_a)
+        .def("set_solver", &SettingsModel::SetSolver, "Set the solver.", "name"_a, "abs_tolerance"_a = 0.1,
+             "rel_tolerance"_a = 0.01)
+        .def("set_analytical_linear_storages", &SettingsModel::SetAnalyticalLinearStorages,
+             "Integrate the linear storages analytically.", "active"_a = true)
+        .def("set_vectorized_processes", &SettingsModel::SetVectorizedProcesses,
+             "Evaluate the processes for all hydro units at once.", "active"_a = true)
+        .def("set_threads", &SettingsModel::SetThreads, "Set the number of threads processing the hydro units.",
+             "threads_nb"_a)
         .def("set_timer", &SettingsModel::SetTimer, "Set the modelling time properties.", "start_date"_a, "end_date"_a,
              "time_step"_a, "time_step_unit"_a)
         .def("set_parameter", &SettingsModel::SetParameter, "Setting one of the model parameter.", "component"_a,
-             "name"_a, "value"_a);
+             "name"_a, "value"_a)
+        .def("clone", &SettingsModel::Clone, "Create a deep copy of the settings.");
 
     py::class_<SettingsBasin>(m, "SettingsBasin")
         .def(py::init<>())
@@ -75,21 +99,94 @@ PYBIND11_MODULE(_hydrobricks, m) {
         .def(py::init<>())
         .def("init_with_basin", &ModelHydro::InitializeWithBasin, "Initialize the model and create the sub basin.",
              "model_settings"_a, "basin_settings"_a)
+        .def("clone", &ModelHydro::Clone, "Create an independent copy of the initialized model.", "model_settings"_a,
+             "clone_settings"_a, py::keep_alive<0, 3>())
         .def("add_behaviour", &ModelHydro::AddBehaviour, "Adding a behaviour to the model.", "behaviour"_a)
         .def("get_behaviours_nb", &ModelHydro::GetBehavioursNb, "Get the number of behaviours.")
         .def("get_behaviour_items_nb", &ModelHydro::GetBehaviourItemsNb, "Get the number of behaviour items.")
         .def("add_time_series", &ModelHydro::AddTimeSeries, "Adding a time series to the model.", "time_series"_a)
-        .def("create_time_series", &ModelHydro::CreateTimeSeries, "Create a time series and add it to the model.",
-             "data_name"_a, "time"_a, "ids"_a, "data"_a)
+        .def(
+            "create_time_series",
+            [](ModelHydro& model, const string& varName, const axd& time, const axi& ids, const npArrayDouble& data) {
+                if (data.ndim() != 2 || data.shape(0) != time.size() || data.shape(1) != ids.size()) {
+                    throw InvalidArgument(_("Dimension mismatch in the forcing data."));
+                }
+                return model.CreateTimeSeriesFromBuffer(varName, time, ids, ShareArrayBuffer(data));
+            },
+            "Create a time series (sharing the data buffer when it is a C-contiguous float64 array) and add it to the "
+            "model.",
+            "data_name"_a, "time"_a, "ids"_a, "data"_a)
+        .def(
+            "create_uniform_time_series",
+            [](ModelHydro& model, const string& varName, const axd& time, const npArrayDouble& data) {
+                if (data.ndim() != 1 || data.shape(0) != time.size()) {
+                    throw InvalidArgument(_("Dimension mismatch in the forcing data."));
+                }
+                return model.CreateUniformTimeSeriesFromBuffer(varName, time, ShareArrayBuffer(data));
+            },
+            "Create a time series with the same values for all hydro units (sharing the data buffer when it is a "
+            "contiguous float64 array) and add it to the model.",
+            "data_name"_a, "time"_a, "data"_a)
+        .def(
+            "create_spatialized_time_series",
+            [](ModelHydro& model, const string& varName, const axd& time, const axi& ids, const npArrayDouble& data) {
+                if (data.ndim() != 1 || data.shape(0) != time.size()) {
+                    throw InvalidArgument(_("Dimension mismatch in the forcing data."));
+                }
+                return model.CreateSpatializedTimeSeriesFromBuffer(varName, time, ids, ShareArrayBuffer(data));
+            },
+            "Create a time series computing the values of the hydro units on the fly from the station data and add "
+            "it to the model.",
+            "data_name"_a, "time"_a, "ids"_a, "data"_a)
+        .def("set_time_series_elevation_gradients", &ModelHydro::SetTimeSeriesElevationGradients,
+             "Set the elevation gradients of a time series created with create_spatialized_time_series.",
+             "data_name"_a, "method"_a, "elevations"_a, "ref_elevation"_a, "gradients"_a, "gradients_2"_a = axd(),
+             "elevation_threshold"_a = NAN_D)
+        .def(
+            "update_time_series_values",
+            [](ModelHydro& model, const string& varName, const npArrayDouble& data) {
+                if (data.ndim() != 2) {
+                    throw InvalidArgument(_("The forcing data must be 2D (time x hydro units)."));
+                }
+                return model.UpdateTimeSeriesValuesFromBuffer(varName, ShareArrayBuffer(data), int(data.shape(0)),
+                                                              int(data.shape(1)));
+            },
+            "Replace the values of an existing time series without rebuilding it.", "data_name"_a, "data"_a)
+        .def(
+            "update_uniform_time_series_values",
+            [](ModelHydro& model, const string& varName, const npArrayDouble& data) {
+                if (data.ndim() != 1) {
+                    throw InvalidArgument(_("The uniform forcing data must be 1D (time)."));
+                }
+                return model.UpdateUniformTimeSeriesValuesFromBuffer(varName, ShareArrayBuffer(data),
+                                                                     int(data.shape(0)));
+            },
+            "Replace the values of an existing uniform time series (or the station values of a spatialized time "
+            "series) without rebuilding it.",
+            "data_name"_a, "data"_a)
         .def("clear_time_series", &ModelHydro::ClearTimeSeries,
              "Clear time series. Use only if the time series were created with ModelHydro::ClearTimeSeries.")
         .def("attach_time_series_to_hydro_units", &ModelHydro::AttachTimeSeriesToHydroUnits, "Attach the time series.")
         .def("update_parameters", &ModelHydro::UpdateParameters, "Update the parameters with the provided values.",
-             "model_settings"_a)
+             "model_settings"_a, py::call_guard<py::gil_scoped_release>())
+        .def("compile_parameters", &ModelHydro::CompileParameters,
+             "Resolve the parameters once to later set their values with set_parameter_values.", "model_settings"_a,
+             "parameter_names"_a)
+        .def("set_parameter_values", &ModelHydro::SetParameterValues,
+             "Set the values of the parameters defined with compile_parameters.", "values"_a)
+        .def("get_compiled_parameters_nb", &ModelHydro::GetCompiledParametersNb,
+             "Get the number of compiled parameters.")
         .def("forcing_loaded", &ModelHydro::ForcingLoaded, "Check if the forcing data were loaded.")
         .def("is_ok", &ModelHydro::IsOk, "Check if the model is correctly set up.")
-        .def("run", &ModelHydro::Run, "Run the model.")
-        .def("reset", &ModelHydro::Reset, "Reset the model before another run.")
+        .def("run", &ModelHydro::Run, "Run the model.", py::call_guard<py::gil_scoped_release>())
+        .def("run_batch", &ModelHydro::RunBatch, "Run the model for multiple parameter sets.", "model_settings"_a,
+             "parameter_values"_a, "parameter_names"_a, py::call_guard<py::gil_scoped_release>())
+        .def("run_batch_evaluation", &ModelHydro::RunBatchEvaluation,
+             "Run the model for multiple parameter sets and evaluate each run with the given metric.",
+             "model_settings"_a, "parameter_values"_a, "parameter_names"_a, "observations"_a, "metric"_a,
+             py::call_guard<py::gil_scoped_release>())
+        .def("reset", &ModelHydro::Reset, "Reset the model before another run.",
+             py::call_guard<py::gil_scoped_release>())
         .def("save_as_initial_state", &ModelHydro::SaveAsInitialState, "Save the model state as initial conditions.")
         .def("get_outlet_discharge", &ModelHydro::GetOutletDischarge, "Get the outlet discharge.")
         .def("get_total_outlet_discharge", &ModelHydro::GetTotalOutletDischarge, "Get the outlet discharge total.")
@@ -98,7 +195,8 @@ PYBIND11_MODULE(_hydrobricks, m) {
              "Get the total change in water storage.")
         .def("get_total_snow_storage_changes", &ModelHydro::GetTotalSnowStorageChanges,
              "Get the total change in snow storage.")
-        .def("dump_outputs", &ModelHydro::DumpOutputs, "Dump the model outputs to file.", "path"_a);
+        .def("dump_outputs", &ModelHydro::DumpOutputs, "Dump the model outputs to file.", "path"_a,
+             py::call_guard<py::gil_scoped_release>());
 
     py::class_<Behaviour>(m, "Behaviour").def(py::init<>());
 
@@ -0,0 +1,321 @@
+#include "BrickGroup.h"
+
+#include <typeinfo>
+
+#include "ProcessETSocont.h"
+#include "ProcessInfiltrationSocont.h"
+#include "ProcessMeltDegreeDay.h"
+#include "ProcessOutflowConstant.h"
+#include "ProcessOutflowDirect.h"
+#include "ProcessOutflowLinear.h"
+#include "ProcessOutflowOverflow.h"
+#include "ProcessOutflowRestDirect.h"
+#include "ProcessRunoffSocont.h"
+
+BrickGroup::BrickGroup(const vector<Brick*>& bricks, int firstRate)
+    : m_bricks(bricks),
+      m_firstRate(firstRate),
+      m_connectionsNb(0) {
+    wxASSERT(!m_bricks.empty());
+    int bricksNb = GetBricksNb();
+
+    for (auto brick : m_bricks) {
+        wxASSERT(AreSimilar(m_bricks[0], brick));
+        m_containers.push_back(ListContainers(brick));
+    }
+    m_contents = vecAxd(m_containers[0].size(), axd::Zero(bricksNb));
+
+    const vector<WaterContainer*>& containers = m_containers[0];
+    vector<Process*>& processes = m_bricks[0]->GetProcesses();
+    int firstConnection = 0;
+    int maxConnectionsNb = 0;
+    for (int iProcess = 0; iProcess < processes.size(); ++iProcess) {
+        Process* process = processes[iProcess];
+        ProcessArrays arrays;
+        arrays.kernel = IdentifyKernel(process);
+        for (auto brick : m_bricks) {
+            arrays.processes.push_back(brick->GetProcesses()[iProcess]);
+        }
+        arrays.container = GetContainerIndex(containers, process->GetWaterContainer());
+        if (arrays.kernel == Kernel::InfiltrationSocont) {
+            Brick* targetBrick = static_cast<ProcessInfiltration*>(process)->GetTargetBrick();
+            arrays.target = GetContainerIndex(containers, targetBrick->GetWaterContainer());
+        }
+        arrays.firstConnection = firstConnection;
+        arrays.connectionsNb = process->GetConnectionsNb();
+        arrays.parameters = vecAxd(2, axd::Zero(bricksNb));
+        arrays.forcing = axd::Zero(bricksNb);
+        m_processes.push_back(arrays);
+
+        firstConnection += arrays.connectionsNb;
+        maxConnectionsNb = wxMax(maxConnectionsNb, arrays.connectionsNb);
+    }
+
+    m_connectionsNb = firstConnection;
+    m_active = axb::Constant(bricksNb, true);
+    m_accessible = axb::Constant(bricksNb, true);
+    m_sumOtherProcesses = axd::Zero(bricksNb);
+    m_genericRates = vecDouble(maxConnectionsNb, 0.0);
+}
+
+bool BrickGroup::AreSimilar(Brick* brick1, Brick* brick2) {
+    if (typeid(*brick1) != typeid(*brick2) || brick1->GetName() != brick2->GetName()) {
+        return false;
+    }
+
+    vector<Process*>& processes1 = brick1->GetProcesses();
+    vector<Process*>& processes2 = brick2->GetProcesses();
+    if (processes1.size() != processes2.size()) {
+        return false;
+    }
+
+    vector<WaterContainer*> containers1 = ListContainers(brick1);
+    vector<WaterContainer*> containers2 = ListContainers(brick2);
+    if (containers1.size() != containers2.size()) {
+        return false;
+    }
+
+    for (int i = 0; i < processes1.size(); ++i) {
+        Process* process1 = processes1[i];
+        Process* process2 = processes2[i];
+        if (typeid(*process1) != typeid(*process2)) {
+            return false;
+        }
+        if (process1->GetConnectionsNb() != process2->GetConnectionsNb()) {
+            return false;
+        }
+        if (GetContainerIndex(containers1, process1->GetWaterContainer()) !=
+            GetContainerIndex(containers2, process2->GetWaterContainer())) {
+            return false;
+        }
+        if (IdentifyKernel(process1) == Kernel::InfiltrationSocont) {
+            WaterContainer* target1 = static_cast<ProcessInfiltration*>(process1)->GetTargetBrick()->GetWaterContainer();
+            WaterContainer* target2 = static_cast<ProcessInfiltration*>(process2)->GetTargetBrick()->GetWaterContainer();
+            if (GetContainerIndex(containers1, target1) != GetContainerIndex(containers2, target2)) {
+                return false;
+            }
+        }
+    }
+
+    return true;
+}
+
+vector<WaterContainer*> BrickGroup::ListContainers(Brick* brick) {
+    vector<WaterContainer*> containers;
+    auto addContainer = [&containers](WaterContainer* container) {
+        if (std::find(containers.begin(), containers.end(), container) == containers.end()) {
+            containers.push_back(container);
+        }
+    };
+
+    for (auto process : brick->GetProcesses()) {
+        addContainer(process->GetWaterContainer());
+        if (IdentifyKernel(process) == Kernel::InfiltrationSocont) {
+            Brick* targetBrick = static_cast<ProcessInfiltration*>(process)->GetTargetBrick();
+            wxASSERT(targetBrick);
+            addContainer(targetBrick->GetWaterContainer());
+        }
+    }
+
+    return containers;
+}
+
+int BrickGroup::GetContainerIndex(const vector<WaterContainer*>& containers, WaterContainer* container) {
+    auto it = std::find(containers.begin(), containers.end(), container);
+    wxASSERT(it != containers.end());
+    return int(it - containers.begin());
+}
+
+BrickGroup::Kernel BrickGroup::IdentifyKernel(Process* process) {
+    const std::type_info& type = typeid(*process);
+    if (type == typeid(ProcessOutflowConstant)) {
+        return Kernel::OutflowConstant;
+    } else if (type == typeid(ProcessOutflowDirect)) {
+        return Kernel::OutflowDirect;
+    } else if (type == typeid(ProcessOutflowLinear)) {
+        return Kernel::OutflowLinear;
+    } else if (type == typeid(ProcessOutflowOverflow)) {
+        return Kernel::OutflowOverflow;
+    } else if (type == typeid(ProcessOutflowRestDirect)) {
+        return Kernel::OutflowRestDirect;
+    } else if (type == typeid(ProcessETSocont) && process->GetWaterContainer()->HasMaximumCapacity()) {
+        return Kernel::ETSocont;
+    } else if (type == typeid(ProcessInfiltrationSocont)) {
+        return Kernel::InfiltrationSocont;
+    } else if (type == typeid(ProcessMeltDegreeDay)) {
+        return Kernel::MeltDegreeDay;
+    } else if (type == typeid(ProcessRunoffSocont)) {
+        return Kernel::RunoffSocont;
+    }
+
+    return Kernel::Generic;
+}
+
+void BrickGroup::UpdateActiveBricks() {
+    for (int i = 0; i < GetBricksNb(); ++i) {
+        m_active[i] = !m_bricks[i]->IsNull();
+    }
+}
+
+void BrickGroup::UpdateInputs() {
+    int bricksNb = GetBricksNb();
+    for (auto& arrays : m_processes) {
+        axd& parameter1 = arrays.parameters[0];
+        axd& parameter2 = arrays.parameters[1];
+        switch (arrays.kernel) {
+            case Kernel::OutflowConstant:
+                for (int i = 0; i < bricksNb; ++i) {
+                    parameter1[i] = static_cast<ProcessOutflowConstant*>(arrays.processes[i])->GetRate();
+                }
+                break;
+            case Kernel::OutflowLinear:
+                for (int i = 0; i < bricksNb; ++i) {
+                    parameter1[i] = static_cast<ProcessOutflowLinear*>(arrays.processes[i])->GetResponseFactor();
+                }
+                break;
+            case Kernel::ETSocont:
+                for (int i = 0; i < bricksNb; ++i) {
+                    auto process = static_cast<ProcessETSocont*>(arrays.processes[i]);
+                    arrays.forcing[i] = process->GetPet();
+                    parameter1[i] = process->GetWaterContainer()->GetMaximumCapacity();
+                    parameter2[i] = process->GetExponent();
+                }
+                break;
+            case Kernel::InfiltrationSocont:
+                for (int i = 0; i < bricksNb; ++i) {
+                    parameter1[i] = m_containers[i][arrays.target]->GetMaximumCapacity();
+                }
+                break;
+            case Kernel::MeltDegreeDay:
+                for (int i = 0; i < bricksNb; ++i) {
+                    auto process = static_cast<ProcessMeltDegreeDay*>(arrays.processes[i]);
+                    arrays.forcing[i] = process->GetTemperature();
+                    parameter1[i] = process->GetMeltingTemperature();
+                    parameter2[i] = process->GetDegreeDayFactor();
+                }
+                break;
+            case Kernel::RunoffSocont:
+                for (int i = 0; i < bricksNb; ++i) {
+                    auto process = static_cast<ProcessRunoffSocont*>(arrays.processes[i]);
+                    parameter1[i] = process->GetBeta() * pow(process->GetSlope(), 0.5);
+                    parameter2[i] = process->GetArea();
+                }
+                break;
+            default:
+                break;
+        }
+    }
+}
+
+void BrickGroup::ComputeChangeRates(Eigen::Ref<axd> changeRates) {
+    for (int iContainer = 0; iContainer < m_contents.size(); ++iContainer) {
+        GatherContents(iContainer);
+    }
+
+    for (const auto& arrays : m_processes) {
+        ComputeProcessChangeRates(arrays, changeRates);
+    }
+}
+
+void BrickGroup::ComputeChangeRates(int processIndex, Eigen::Ref<axd> changeRates) {
+    wxASSERT(processIndex < m_processes.size());
+    const ProcessArrays& arrays = m_processes[processIndex];
+    GatherContents(arrays.container);
+    if (arrays.kernel == Kernel::InfiltrationSocont) {
+        GatherContents(arrays.target);
+    }
+
+    ComputeProcessChangeRates(arrays, changeRates);
+}
+
+void BrickGroup::GatherContents(int containerIndex) {
+    axd& contents = m_contents[containerIndex];
+    for (int i = 0; i < GetBricksNb(); ++i) {
+        contents[i] = m_containers[i][containerIndex]->GetContentWithChanges();
+    }
+}
+
+void BrickGroup::ComputeProcessChangeRates(const ProcessArrays& arrays, Eigen::Ref<axd> changeRates) {
+    if (arrays.kernel == Kernel::Generic) {
+        ComputeGenericChangeRates(arrays, changeRates);
+        return;
+    }
+
+    // Evaluate the process for all the bricks (same operations as the GetRates() methods of the processes)
+    int bricksNb = GetBricksNb();
+    wxASSERT(arrays.connectionsNb == 1);
+    Eigen::Map<axd, 0, Eigen::InnerStride<>> rates(&changeRates(m_firstRate + arrays.firstConnection), bricksNb,
+                                                   Eigen::InnerStride<>(m_connectionsNb));
+    const axd& contents = m_contents[arrays.container];
+    const axd& parameter1 = arrays.parameters[0];
+    const axd& parameter2 = arrays.parameters[1];
+
+    // No outflow from the empty containers (see Process::GetChangeRates())
+    auto active = m_active && (contents > PRECISION);
+
+    switch (arrays.kernel) {
+        case Kernel::OutflowConstant:
+            rates = active.select(parameter1, 0.0);
+            break;
+        case Kernel::OutflowDirect:
+            rates = active.select(contents, 0.0);
+            break;
+        case Kernel::OutflowLinear:
+            rates = active.select(parameter1 * contents, 0.0);
+            break;
+        case Kernel::OutflowOverflow:
+            rates.setZero();
+            break;
+        case Kernel::OutflowRestDirect:
+            for (int i = 0; i < bricksNb; ++i) {
+                m_sumOtherProcesses[i] = arrays.processes[i]->GetSumChangeRatesOtherProcesses();
+            }
+            rates = active.select((contents - m_sumOtherProcesses).max(0.0), 0.0);
+            break;
+        case Kernel::ETSocont: {
+            auto fillingRatios = (contents / parameter1).min(1.0).max(0.0);
+            auto factors = fillingRatios.binaryExpr(parameter2, [](double ratio, double exponent) {
+                return pow(ratio, exponent);
+            });
+            rates = active.select(arrays.forcing * factors, 0.0);
+            break;
+        }
+        case Kernel::InfiltrationSocont: {
+            auto fillingRatios = (m_contents[arrays.target] / parameter1).min(1.0).max(0.0);
+            auto factors = fillingRatios.unaryExpr([](double ratio) { return 1 - pow(ratio, 2); });
+            rates = (active && (parameter1 > 0)).select(contents * factors, 0.0);
+            break;
+        }
+        case Kernel::MeltDegreeDay: {
+            for (int i = 0; i < bricksNb; ++i) {
+                m_accessible[i] = m_containers[i][arrays.container]->ContentAccessible();
+            }
+            auto melt = (arrays.forcing >= parameter1).select((arrays.forcing - parameter1) * parameter2, 0.0);
+            rates = (active && m_accessible).select(melt, 0.0);
+            break;
+        }
+        case Kernel::RunoffSocont: {
+            // Water depth at the bottom of the plane (storage shape of 2), see ProcessRunoffSocont::GetRates()
+            auto depths = contents * 2.0 * 1000.0;
+            auto discharges = parameter1 * depths.unaryExpr([](double h) { return pow(h, 5 / 3); });
+            auto runoffs = 1000.0 * (discharges / parameter2) * 86400.0;
+            rates = active.select(runoffs.min(contents), 0.0);
+            break;
+        }
+        default:
+            throw ShouldNotHappen();
+    }
+}
+
+void BrickGroup::ComputeGenericChangeRates(const ProcessArrays& arrays, Eigen::Ref<axd> changeRates) {
+    int bricksNb = GetBricksNb();
+    for (int i = 0; i < bricksNb; ++i) {
+        if (!m_active[i]) {
+            continue;
+        }
+        arrays.processes[i]->GetChangeRates(m_genericRates.data());
+        for (int iConnect = 0; iConnect < arrays.connectionsNb; ++iConnect) {
+            changeRates(m_firstRate + i * m_connectionsNb + arrays.firstConnection + iConnect) = m_genericRates[iConnect];
+        }
+    }
+}
@@ -0,0 +1,182 @@
+#ifndef HYDROBRICKS_BRICK_GROUP_H
+#define HYDROBRICKS_BRICK_GROUP_H
+
+#include "Brick.h"
+#include "Includes.h"
+
+/**
+ * Group of similar bricks (the same brick of several hydro units) whose processes are evaluated for all the bricks
+ * at once. The contents of the containers, the parameters and the forcing of the processes are stored as contiguous
+ * arrays (one value per brick). The change rates keep the layout of the rates storage (the rates of each brick in a
+ * row, the bricks one after the other) and are written through strided maps. The processes without a vectorized
+ * form are evaluated brick by brick.
+ */
+class BrickGroup : public wxObject {
+  public:
+    /**
+     * Create a group of bricks.
+     *
+     * @param bricks The similar bricks of the group (see AreSimilar()).
+     * @param firstRate The index of the first change rate of the group in the solver storage.
+     */
+    BrickGroup(const vector<Brick*>& bricks, int firstRate);
+
+    ~BrickGroup() override = default;
+
+    /**
+     * Check if two bricks can be evaluated together: bricks of the same type and name, with the same process types
+     * attached to the same containers.
+     *
+     * @param brick1 The first brick.
+     * @param brick2 The second brick.
+     * @return True if the bricks are similar.
+     */
+    static bool AreSimilar(Brick* brick1, Brick* brick2);
+
+    int GetBricksNb() const {
+        return int(m_bricks.size());
+    }
+
+    Brick* GetBrick(int index) {
+        wxASSERT(index < m_bricks.size());
+        return m_bricks[index];
+    }
+
+    int GetFirstRate() const {
+        return m_firstRate;
+    }
+
+    int GetProcessesNb() const {
+        return int(m_processes.size());
+    }
+
+    /**
+     * Get the number of connections (i.e. change rates) of each brick.
+     *
+     * @return The number of connections per brick.
+     */
+    int GetConnectionsNb() const {
+        return m_connectionsNb;
+    }
+
+    /**
+     * Update the mask of the active bricks (i.e. the bricks that are not null). The change rates of the inactive
+     * bricks are left to zero.
+     */
+    void UpdateActiveBricks();
+
+    /**
+     * Gather the parameters and the forcing of the processes for the current time step.
+     */
+    void UpdateInputs();
+
+    /**
+     * Compute the change rates (per day) of the processes of all the bricks, independently of the time step and
+     * constraints, from the current contents of the containers.
+     *
+     * @param changeRates The column of the solver storage where the rates must be written.
+     */
+    void ComputeChangeRates(Eigen::Ref<axd> changeRates);
+
+    /**
+     * Compute the change rates (per day) of a single process of all the bricks, from the current contents of its
+     * containers. Used for the bricks processed without solver, whose processes are applied one after the other.
+     *
+     * @param processIndex The index of the process in the bricks.
+     * @param changeRates The storage where the rates must be written.
+     */
+    void ComputeChangeRates(int processIndex, Eigen::Ref<axd> changeRates);
+
+  protected:
+    /**
+     * Vectorized forms of the processes.
+     */
+    enum class Kernel {
+        Generic,
+        OutflowConstant,
+        OutflowDirect,
+        OutflowLinear,
+        OutflowOverflow,
+        OutflowRestDirect,
+        ETSocont,
+        InfiltrationSocont,
+        MeltDegreeDay,
+        RunoffSocont
+    };
+
+    /**
+     * Process of the bricks of the group, along with its inputs (one value per brick).
+     */
+    struct ProcessArrays {
+        Kernel kernel = Kernel::Generic;
+        vector<Process*> processes;  // The process of each brick.
+        int container = 0;           // Index of the container of the process.
+        int target = 0;              // Index of the container of the target brick (infiltration).
+        int firstConnection = 0;     // Index of the first connection of the process in the brick.
+        int connectionsNb = 0;       // Number of connections of the process.
+        vecAxd parameters;           // Parameters of the process (e.g. response factor, rate or capacity).
+        axd forcing;                 // Forcing of the process (e.g. PET or temperature).
+    };
+
+    vector<Brick*> m_bricks;
+    int m_firstRate;
+    int m_connectionsNb;
+    vector<vector<WaterContainer*>> m_containers;  // Containers of each brick read by the processes.
+    vecAxd m_contents;                             // Contents (with changes) of the containers.
+    vector<ProcessArrays> m_processes;
+    axb m_active;                // Bricks that are not null.
+    axb m_accessible;            // Containers whose content is accessible (melt).
+    axd m_sumOtherProcesses;     // Sum of the outflows of the other processes (rest direct).
+    vecDouble m_genericRates;    // Rates of a process without vectorized form.
+
+    /**
+     * List the containers read by the processes of a brick (containers of the processes and of the infiltration
+     * targets), in the order of the processes.
+     *
+     * @param brick The brick.
+     * @return The containers read by the processes.
+     */
+    static vector<WaterContainer*> ListContainers(Brick* brick);
+
+    /**
+     * Get the index of a container in the list of the containers of a brick.
+     *
+     * @param containers The containers of the brick (see ListContainers()).
+     * @param container The container to look for.
+     * @return The index of the container.
+     */
+    static int GetContainerIndex(const vector<WaterContainer*>& containers, WaterContainer* container);
+
+    /**
+     * Identify the vectorized form of the process.
+     *
+     * @param process The process.
+     * @return The kernel of the process (Kernel::Generic if it has no vectorized form).
+     */
+    static Kernel IdentifyKernel(Process* process);
+
+    /**
+     * Gather the current contents (with changes) of a container of all the bricks.
+     *
+     * @param containerIndex The index of the container in the bricks.
+     */
+    void GatherContents(int containerIndex);
+
+    /**
+     * Compute the change rates of a process of all the bricks from the gathered contents.
+     *
+     * @param arrays The process of the group.
+     * @param changeRates The storage where the rates must be written.
+     */
+    void ComputeProcessChangeRates(const ProcessArrays& arrays, Eigen::Ref<axd> changeRates);
+
+    /**
+     * Compute the change rates of a process without vectorized form, brick by brick.
+     *
+     * @param arrays The process of the group.
+     * @param changeRates The storage where the rates must be written.
+     */
+    void ComputeGenericChangeRates(const ProcessArrays& arrays, Eigen::Ref<axd> changeRates);
+};
+
+#endif  // HYDROBRICKS_BRICK_GROUP_H
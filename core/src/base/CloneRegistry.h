@@ -0,0 +1,73 @@
+#ifndef HYDROBRICKS_CLONE_REGISTRY_H
+#define HYDROBRICKS_CLONE_REGISTRY_H
+
+#include "Includes.h"
+
+/**
+ * Table of the elements of a model and of their copies, used to copy the model structure without building it again.
+ * The elements are first copied member by member and registered here, along with the values other elements point to
+ * (e.g. the water content of the containers). The owned elements (e.g. the containers of a brick) are replaced by their
+ * copies right away, but the other pointers of the copies still target the original model. They are then replaced by
+ * the corresponding copies (RemapPointers()).
+ */
+class CloneRegistry : public wxObject {
+  public:
+    CloneRegistry() = default;
+
+    ~CloneRegistry() override = default;
+
+    /**
+     * Register an element (or value) and its copy.
+     *
+     * @param original the element of the original model.
+     * @param copy the corresponding element of the copy.
+     */
+    void Add(const void* original, void* copy) {
+        wxASSERT(original);
+        wxASSERT(copy);
+        m_copies[original] = copy;
+    }
+
+    /**
+     * Get the copy of an element (or value).
+     *
+     * @param original the element of the original model.
+     * @return the corresponding element of the copy (nullptr if the original is nullptr).
+     */
+    template <typename T>
+    T* Get(T* original) const {
+        if (original == nullptr) {
+            return nullptr;
+        }
+        auto it = m_copies.find(original);
+        if (it == m_copies.end()) {
+            throw ConceptionIssue(_("An element of the model has no copy."));
+        }
+
+        return static_cast<T*>(it->second);
+    }
+
+    /**
+     * Get the copies of a list of elements.
+     *
+     * @param originals the elements of the original model.
+     * @return the corresponding elements of the copy.
+     */
+    template <typename T>
+    vector<T*> Get(const vector<T*>& originals) const {
+        vector<T*> copies;
+        copies.reserve(originals.size());
+        for (auto original : originals) {
+            copies.push_back(Get(original));
+        }
+
+        return copies;
+    }
+
+  protected:
+    std::unordered_map<const void*, void*> m_copies;
+
+  private:
+};
+
+#endif  // HYDROBRICKS_CLONE_REGISTRY_H
@@ -31,6 +31,8 @@ enum TimeUnit {
 enum VariableType {
     Precipitation,
     Temperature,
+    TemperatureMin,
+    TemperatureMax,
     PET,
     Custom1,
     Custom2,
@@ -4,6 +4,17 @@ Forcing::Forcing(VariableType type)
     : m_type(type),
       m_timeSeriesData(nullptr) {}
 
+Forcing* Forcing::InitializeClone(Forcing* clone, CloneRegistry& registry) const {
+    registry.Add(this, clone);
+
+    return clone;
+}
+
+void Forcing::RemapPointers(const CloneRegistry&) {
+    // Attached again to the time series of the copy.
+    m_timeSeriesData = nullptr;
+}
+
 void Forcing::AttachTimeSeriesData(TimeSeriesData* timeSeriesData) {
     wxASSERT(timeSeriesData);
     m_timeSeriesData = timeSeriesData;
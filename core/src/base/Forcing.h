@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_FORCING_H
 #define HYDROBRICKS_FORCING_H
 
+#include "CloneRegistry.h"
 #include "Includes.h"
 #include "TimeSeriesData.h"
 
@@ -10,18 +11,45 @@ class Forcing : public wxObject {
 
     ~Forcing() override = default;
 
+    /**
+     * Create a copy of the forcing for a copy of the model (see CloneRegistry). The time series data are not
+     * attached to the copy.
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the forcing.
+     */
+    virtual Forcing* Clone(CloneRegistry& registry) const {
+        return InitializeClone(new Forcing(*this), registry);
+    }
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    virtual void RemapPointers(const CloneRegistry& registry);
+
     void AttachTimeSeriesData(TimeSeriesData* timeSeriesData);
 
     VariableType GetType() {
         return m_type;
     }
 
-    double GetValue();
+    virtual double GetValue();
 
   protected:
     VariableType m_type;
     TimeSeriesData* m_timeSeriesData;
 
+    /**
+     * Register the copy of the forcing.
+     *
+     * @param clone the member-wise copy of the forcing.
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the forcing.
+     */
+    Forcing* InitializeClone(Forcing* clone, CloneRegistry& registry) const;
+
   private:
 };
 
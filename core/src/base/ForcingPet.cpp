@@ -0,0 +1,66 @@
+#include "ForcingPet.h"
+
+#include "ForcingPetHargreaves.h"
+#include "ForcingPetOudin.h"
+
+ForcingPet::ForcingPet()
+    : Forcing(PET),
+      m_dayOfYear(nullptr) {}
+
+ForcingPet* ForcingPet::Factory(const string& method) {
+    if (method == "oudin") {
+        return new ForcingPetOudin();
+    } else if (method == "hargreaves") {
+        return new ForcingPetHargreaves();
+    }
+
+    throw InvalidArgument(wxString::Format(_("The PET method '%s' is not available in the engine."), method));
+}
+
+bool ForcingPet::IsOk() {
+    if (m_dayOfYear == nullptr) {
+        wxLogError(_("The day of the year is not linked to the PET forcing."));
+        return false;
+    }
+    if (m_extraterrestrialRadiation.size() != 366) {
+        wxLogError(_("The latitude of the PET forcing was not set."));
+        return false;
+    }
+
+    return true;
+}
+
+void ForcingPet::RemapPointers(const CloneRegistry& registry) {
+    Forcing::RemapPointers(registry);
+    m_dayOfYear = registry.Get(m_dayOfYear);
+}
+
+void ForcingPet::SetLatitude(double latitude) {
+    if (std::isnan(latitude)) {
+        throw InvalidArgument(_("The latitude is required to compute the PET."));
+    }
+
+    // Extraterrestrial radiation (equation 21 in Allen et al., 1998), as in pyet.
+    m_extraterrestrialRadiation.resize(366);
+    for (int i = 0; i < 366; ++i) {
+        double dayOfYear = i + 1;
+        double dr = 1 + 0.033 * cos(2.0 * M_PI / 365.0 * dayOfYear);
+        double solarDeclination = 0.409 * sin(2.0 * M_PI / 365.0 * dayOfYear - 1.39);
+        double sunsetAngle = acos(wxMax(-1.0, wxMin(1.0, -tan(solarDeclination) * tan(latitude))));
+        m_extraterrestrialRadiation[i] = 118.08 / M_PI * dr *
+                                         (sunsetAngle * sin(solarDeclination) * sin(latitude) +
+                                          cos(solarDeclination) * cos(latitude) * sin(sunsetAngle));
+    }
+}
+
+float* ForcingPet::GetParameterValuePointer(const ProcessSettings& processSettings, const string& name) {
+    for (auto parameter : processSettings.parameters) {
+        if (parameter->GetName() == name) {
+            wxASSERT(parameter->GetValuePointer());
+            parameter->SetAsLinked();
+            return parameter->GetValuePointer();
+        }
+    }
+
+    throw MissingParameter(wxString::Format(_("The parameter '%s' could not be found."), name));
+}
@@ -0,0 +1,88 @@
+#ifndef HYDROBRICKS_FORCING_PET_H
+#define HYDROBRICKS_FORCING_PET_H
+
+#include "Forcing.h"
+#include "Includes.h"
+#include "SettingsModel.h"
+
+/**
+ * PET forcing computed in the engine for each time step from other forcing variables (e.g., temperature), the
+ * latitude of the hydro unit and the day of the year, instead of being provided as a time series.
+ */
+class ForcingPet : public Forcing {
+  public:
+    ForcingPet();
+
+    ~ForcingPet() override = default;
+
+    /**
+     * Factory method to create a PET forcing generator.
+     *
+     * @param method name of the PET method ('oudin' or 'hargreaves').
+     * @return the created PET forcing.
+     */
+    static ForcingPet* Factory(const string& method);
+
+    /**
+     * Check that everything is correctly defined.
+     *
+     * @return true is everything is correctly defined.
+     */
+    virtual bool IsOk();
+
+    /**
+     * @copydoc Forcing::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
+    /**
+     * Get the types of the forcing variables needed to compute the PET.
+     *
+     * @return the forcing types.
+     */
+    virtual vector<VariableType> GetInputTypes() = 0;
+
+    /**
+     * Attach a forcing variable needed to compute the PET.
+     *
+     * @param forcing the forcing of the hydro unit.
+     */
+    virtual void AttachForcing(Forcing* forcing) = 0;
+
+    /**
+     * Assign the parameters of the PET method.
+     *
+     * @param processSettings settings of the process using the PET and containing the parameters.
+     */
+    virtual void SetParameters(const ProcessSettings& processSettings) = 0;
+
+    /**
+     * Set the latitude of the hydro unit and compute the extraterrestrial radiation for every day of the year.
+     *
+     * @param latitude the latitude [rad].
+     */
+    void SetLatitude(double latitude);
+
+    void SetDayOfYearPointer(int* dayOfYear) {
+        wxASSERT(dayOfYear);
+        m_dayOfYear = dayOfYear;
+    }
+
+  protected:
+    int* m_dayOfYear;
+    axd m_extraterrestrialRadiation;  // [MJ m-2 d-1] for each day of the year (1-366).
+
+    double GetExtraterrestrialRadiation() const {
+        return m_extraterrestrialRadiation[*m_dayOfYear - 1];
+    }
+
+    static double GetLatentHeat(double temperature) {
+        return 2.501 - 0.002361 * temperature;
+    }
+
+    static float* GetParameterValuePointer(const ProcessSettings& processSettings, const string& name);
+
+  private:
+};
+
+#endif  // HYDROBRICKS_FORCING_PET_H
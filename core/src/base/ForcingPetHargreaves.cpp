@@ -0,0 +1,57 @@
+#include "ForcingPetHargreaves.h"
+
+ForcingPetHargreaves::ForcingPetHargreaves()
+    : ForcingPet(),
+      m_temperature(nullptr),
+      m_temperatureMin(nullptr),
+      m_temperatureMax(nullptr),
+      m_k(nullptr) {}
+
+bool ForcingPetHargreaves::IsOk() {
+    if (!ForcingPet::IsOk()) {
+        return false;
+    }
+    if (m_temperature == nullptr || m_temperatureMin == nullptr || m_temperatureMax == nullptr) {
+        wxLogError(_("The temperatures are not linked to the PET forcing."));
+        return false;
+    }
+    if (m_k == nullptr) {
+        wxLogError(_("The parameters of the PET forcing are not set."));
+        return false;
+    }
+
+    return true;
+}
+
+void ForcingPetHargreaves::RemapPointers(const CloneRegistry& registry) {
+    ForcingPet::RemapPointers(registry);
+    m_temperature = registry.Get(m_temperature);
+    m_temperatureMin = registry.Get(m_temperatureMin);
+    m_temperatureMax = registry.Get(m_temperatureMax);
+    m_k = registry.Get(m_k);
+}
+
+void ForcingPetHargreaves::AttachForcing(Forcing* forcing) {
+    if (forcing->GetType() == Temperature) {
+        m_temperature = forcing;
+    } else if (forcing->GetType() == TemperatureMin) {
+        m_temperatureMin = forcing;
+    } else if (forcing->GetType() == TemperatureMax) {
+        m_temperatureMax = forcing;
+    } else {
+        throw InvalidArgument("Forcing must be of type Temperature, TemperatureMin or TemperatureMax");
+    }
+}
+
+void ForcingPetHargreaves::SetParameters(const ProcessSettings& processSettings) {
+    m_k = GetParameterValuePointer(processSettings, "pet_k");
+}
+
+double ForcingPetHargreaves::GetValue() {
+    double temperature = m_temperature->GetValue();
+    double temperatureRange = wxMax(m_temperatureMax->GetValue() - m_temperatureMin->GetValue(), 0.0);
+    double pet = *m_k / 0.0135 * 0.0023 * (temperature + 17.8) * sqrt(temperatureRange) *
+                 GetExtraterrestrialRadiation() / GetLatentHeat(temperature);
+
+    return wxMax(pet, 0.0);
+}
@@ -0,0 +1,52 @@
+#ifndef HYDROBRICKS_FORCING_PET_HARGREAVES_H
+#define HYDROBRICKS_FORCING_PET_HARGREAVES_H
+
+#include "ForcingPet.h"
+#include "Includes.h"
+
+/**
+ * PET according to Hargreaves and Samani (1982), computed from the mean, minimum and maximum temperatures.
+ */
+class ForcingPetHargreaves : public ForcingPet {
+  public:
+    ForcingPetHargreaves();
+
+    ~ForcingPetHargreaves() override = default;
+
+    /**
+     * @copydoc ForcingPet::IsOk()
+     */
+    bool IsOk() override;
+
+    /**
+     * @copydoc Forcing::Clone()
+     */
+    Forcing* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ForcingPetHargreaves(*this), registry);
+    }
+
+    /**
+     * @copydoc Forcing::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
+    vector<VariableType> GetInputTypes() override {
+        return {Temperature, TemperatureMin, TemperatureMax};
+    }
+
+    void AttachForcing(Forcing* forcing) override;
+
+    void SetParameters(const ProcessSettings& processSettings) override;
+
+    double GetValue() override;
+
+  protected:
+    Forcing* m_temperature;
+    Forcing* m_temperatureMin;
+    Forcing* m_temperatureMax;
+    float* m_k;
+
+  private:
+};
+
+#endif  // HYDROBRICKS_FORCING_PET_HARGREAVES_H
@@ -0,0 +1,52 @@
+#include "ForcingPetOudin.h"
+
+ForcingPetOudin::ForcingPetOudin()
+    : ForcingPet(),
+      m_temperature(nullptr),
+      m_k1(nullptr),
+      m_k2(nullptr) {}
+
+bool ForcingPetOudin::IsOk() {
+    if (!ForcingPet::IsOk()) {
+        return false;
+    }
+    if (m_temperature == nullptr) {
+        wxLogError(_("The temperature is not linked to the PET forcing."));
+        return false;
+    }
+    if (m_k1 == nullptr || m_k2 == nullptr) {
+        wxLogError(_("The parameters of the PET forcing are not set."));
+        return false;
+    }
+
+    return true;
+}
+
+void ForcingPetOudin::RemapPointers(const CloneRegistry& registry) {
+    ForcingPet::RemapPointers(registry);
+    m_temperature = registry.Get(m_temperature);
+    m_k1 = registry.Get(m_k1);
+    m_k2 = registry.Get(m_k2);
+}
+
+void ForcingPetOudin::AttachForcing(Forcing* forcing) {
+    if (forcing->GetType() == Temperature) {
+        m_temperature = forcing;
+    } else {
+        throw InvalidArgument("Forcing must be of type Temperature");
+    }
+}
+
+void ForcingPetOudin::SetParameters(const ProcessSettings& processSettings) {
+    m_k1 = GetParameterValuePointer(processSettings, "pet_k1");
+    m_k2 = GetParameterValuePointer(processSettings, "pet_k2");
+}
+
+double ForcingPetOudin::GetValue() {
+    double temperature = m_temperature->GetValue();
+    if (temperature + *m_k2 <= 0) {
+        return 0;
+    }
+
+    return GetExtraterrestrialRadiation() * (temperature + *m_k2) / (GetLatentHeat(temperature) * *m_k1);
+}
@@ -0,0 +1,51 @@
+#ifndef HYDROBRICKS_FORCING_PET_OUDIN_H
+#define HYDROBRICKS_FORCING_PET_OUDIN_H
+
+#include "ForcingPet.h"
+#include "Includes.h"
+
+/**
+ * PET according to Oudin et al. (2005), computed from the mean temperature.
+ */
+class ForcingPetOudin : public ForcingPet {
+  public:
+    ForcingPetOudin();
+
+    ~ForcingPetOudin() override = default;
+
+    /**
+     * @copydoc ForcingPet::IsOk()
+     */
+    bool IsOk() override;
+
+    /**
+     * @copydoc Forcing::Clone()
+     */
+    Forcing* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ForcingPetOudin(*this), registry);
+    }
+
+    /**
+     * @copydoc Forcing::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
+    vector<VariableType> GetInputTypes() override {
+        return {Temperature};
+    }
+
+    void AttachForcing(Forcing* forcing) override;
+
+    void SetParameters(const ProcessSettings& processSettings) override;
+
+    double GetValue() override;
+
+  protected:
+    Forcing* m_temperature;
+    float* m_k1;
+    float* m_k2;
+
+  private:
+};
+
+#endif  // HYDROBRICKS_FORCING_PET_OUDIN_H
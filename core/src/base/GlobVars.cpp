@@ -1,6 +1,4 @@
 #include "GlobVars.h"
 
-double g_timeStepInDays = 1;
-
 // Constants
 const double g_dayInSec = 86400.0;
@@ -1,8 +1,6 @@
 #ifndef GLOB_VARS_H
 #define GLOB_VARS_H
 
-extern double g_timeStepInDays;
-
 // Constants
 extern const double g_dayInSec;
 
@@ -46,7 +46,9 @@
 #include <algorithm>
 #include <cmath>
 #include <exception>
+#include <memory>
 #include <numeric>
+#include <unordered_map>
 #include <vector>
 
 //---------------------------------
@@ -88,6 +90,7 @@ typedef vector<double> vecDouble;
 typedef vector<double*> vecDoublePt;
 typedef Eigen::ArrayXd axd;
 typedef Eigen::ArrayXi axi;
+typedef Eigen::Array<bool, Eigen::Dynamic, 1> axb;
 typedef Eigen::ArrayXXd axxd;
 typedef vector<Eigen::ArrayXd> vecAxd;
 typedef vector<Eigen::ArrayXXd> vecAxxd;
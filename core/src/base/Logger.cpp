@@ -31,6 +31,19 @@ void Logger::InitContainers(int timeSize, SubBasin* subBasin, SettingsModel& mod
     }
 }
 
+void Logger::CopyValuePointers(const Logger& logger, const CloneRegistry& registry) {
+    wxASSERT(m_subBasinValuesPt.size() == logger.m_subBasinValuesPt.size());
+    wxASSERT(m_hydroUnitValuesPt.size() == logger.m_hydroUnitValuesPt.size());
+    wxASSERT(m_hydroUnitFractionsPt.size() == logger.m_hydroUnitFractionsPt.size());
+    m_subBasinValuesPt = registry.Get(logger.m_subBasinValuesPt);
+    for (int iLabel = 0; iLabel < m_hydroUnitValuesPt.size(); ++iLabel) {
+        m_hydroUnitValuesPt[iLabel] = registry.Get(logger.m_hydroUnitValuesPt[iLabel]);
+    }
+    for (int iLabel = 0; iLabel < m_hydroUnitFractionsPt.size(); ++iLabel) {
+        m_hydroUnitFractionsPt[iLabel] = registry.Get(logger.m_hydroUnitFractionsPt[iLabel]);
+    }
+}
+
 void Logger::Reset() {
     m_cursor = 0;
 }
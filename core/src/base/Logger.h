@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_LOGGER_H
 #define HYDROBRICKS_LOGGER_H
 
+#include "CloneRegistry.h"
 #include "Includes.h"
 #include "SettingsModel.h"
 #include "SubBasin.h"
@@ -13,6 +14,15 @@ class Logger : public wxObject {
 
     void InitContainers(int timeSize, SubBasin* subBasin, SettingsModel& modelSettings);
 
+    /**
+     * Record the values of a copy of the model corresponding to the ones recorded by the logger of the original
+     * model (see CloneRegistry). The containers must have been initialized with InitContainers().
+     *
+     * @param logger the logger of the original model.
+     * @param registry the registry of the original elements and their copies.
+     */
+    void CopyValuePointers(const Logger& logger, const CloneRegistry& registry);
+
     void Reset();
 
     void SetSubBasinValuePointer(int iLabel, double* valPt);
@@ -1,14 +1,20 @@
 #include "ModelHydro.h"
 
+#include "Behaviour.h"
+#include "CloneRegistry.h"
 #include "FluxForcing.h"
 #include "FluxSimple.h"
 #include "FluxToAtmosphere.h"
 #include "FluxToBrick.h"
 #include "FluxToBrickInstantaneous.h"
 #include "FluxToOutlet.h"
+#include "ForcingPet.h"
 #include "Includes.h"
 #include "LandCover.h"
 #include "SurfaceComponent.h"
+#include "TimeSeriesDistributed.h"
+#include "TimeSeriesSpatialized.h"
+#include "TimeSeriesUniform.h"
 
 ModelHydro::ModelHydro(SubBasin* subBasin)
     : m_subBasin(subBasin) {
@@ -18,7 +24,11 @@ ModelHydro::ModelHydro(SubBasin* subBasin)
     m_timer.SetParametersUpdater(&m_parametersUpdater);
 }
 
-ModelHydro::~ModelHydro() = default;
+ModelHydro::~ModelHydro() {
+    for (auto behaviour : m_ownedBehaviours) {
+        wxDELETE(behaviour);
+    }
+}
 
 bool ModelHydro::InitializeWithBasin(SettingsModel& modelSettings, SettingsBasin& basinSettings) {
     wxDELETE(m_subBasin);
@@ -34,11 +44,12 @@ bool ModelHydro::InitializeWithBasin(SettingsModel& modelSettings, SettingsBasin
 }
 
 bool ModelHydro::Initialize(SettingsModel& modelSettings, SettingsBasin& basinProp) {
+    m_basinSettings = basinProp;
+
     try {
         BuildModelStructure(modelSettings);
 
         m_timer.Initialize(modelSettings.GetTimerSettings());
-        g_timeStepInDays = *m_timer.GetTimeStepPointer();
         m_processor.Initialize(modelSettings.GetSolverSettings());
         if (modelSettings.LogAll()) {
             m_logger.RecordFractions();
@@ -56,6 +67,71 @@ bool ModelHydro::Initialize(SettingsModel& modelSettings, SettingsBasin& basinPr
     return true;
 }
 
+ModelHydro* ModelHydro::Clone(SettingsModel& modelSettings, SettingsModel& cloneSettings) {
+    vector<float*> parameters = modelSettings.GetParameterValuePointers();
+    vector<float*> parametersClone = cloneSettings.GetParameterValuePointers();
+    if (parameters.size() != parametersClone.size()) {
+        wxLogError(_("The settings of the model copy do not match the ones of the model."));
+        return nullptr;
+    }
+
+    auto clone = new ModelHydro();
+    clone->m_basinSettings = m_basinSettings;
+
+    try {
+        // Copy the structure, then connect the copied elements to each other and to the copied settings.
+        CloneRegistry registry;
+        for (int i = 0; i < parameters.size(); ++i) {
+            registry.Add(parameters[i], parametersClone[i]);
+        }
+        registry.Add(m_timer.GetDayOfYearPointer(), clone->m_timer.GetDayOfYearPointer());
+        clone->m_subBasin = m_subBasin->Clone(registry);
+        clone->m_subBasin->RemapPointers(registry);
+
+        clone->m_timer.Initialize(cloneSettings.GetTimerSettings());
+        clone->m_processor.Initialize(cloneSettings.GetSolverSettings());
+        if (cloneSettings.LogAll()) {
+            clone->m_logger.RecordFractions();
+        }
+        clone->m_logger.InitContainers(clone->m_timer.GetTimeStepsNb(), clone->m_subBasin, cloneSettings);
+        clone->m_logger.CopyValuePointers(m_logger, registry);
+    } catch (const std::exception& e) {
+        wxLogError(_("An exception occurred while copying the model: %s."), e.what());
+        wxDELETE(clone->m_subBasin);
+        wxDELETE(clone);
+        return nullptr;
+    }
+
+    if (!clone->m_subBasin->AssignFractions(clone->m_basinSettings)) {
+        wxDELETE(clone->m_subBasin);
+        wxDELETE(clone);
+        return nullptr;
+    }
+
+    for (auto timeSeries : m_timeSeries) {
+        TimeSeries* timeSeriesCopy = timeSeries->Clone();
+        if (!clone->AddTimeSeries(timeSeriesCopy)) {
+            wxDELETE(timeSeriesCopy);
+            clone->ClearTimeSeries();
+            wxDELETE(clone->m_subBasin);
+            wxDELETE(clone);
+            return nullptr;
+        }
+    }
+    clone->AttachTimeSeriesToHydroUnits();
+
+    for (int i = 0; i < m_behavioursManager.GetBehavioursNb(); ++i) {
+        Behaviour* behaviour = m_behavioursManager.GetBehaviour(i)->Clone();
+        clone->m_ownedBehaviours.push_back(behaviour);
+        clone->AddBehaviour(behaviour);
+    }
+
+    // Start from the initial state, as after the setup.
+    clone->Reset();
+
+    return clone;
+}
+
 void ModelHydro::BuildModelStructure(SettingsModel& modelSettings) {
     if (modelSettings.GetStructuresNb() > 1) {
         throw NotImplemented();
@@ -78,6 +154,20 @@ void ModelHydro::UpdateParameters(SettingsModel& modelSettings) {
     UpdateHydroUnitsParameters(modelSettings);
 }
 
+void ModelHydro::CompileParameters(SettingsModel& modelSettings, const vecStr& parameterNames) {
+    m_parameterHandles = ResolveParameters(modelSettings, parameterNames);
+}
+
+void ModelHydro::SetParameterValues(const axd& values) {
+    if (values.size() != m_parameterHandles.size()) {
+        throw InvalidArgument(wxString::Format(_("The number of parameter values (%d) does not match the number of "
+                                                 "compiled parameters (%d)."),
+                                               int(values.size()), int(m_parameterHandles.size())));
+    }
+
+    WriteParameterValues(m_parameterHandles, values);
+}
+
 void ModelHydro::CreateSubBasinComponents(SettingsModel& modelSettings) {
     for (int iBrick = 0; iBrick < modelSettings.GetSubBasinBricksNb(); ++iBrick) {
         modelSettings.SelectSubBasinBrick(iBrick);
@@ -240,6 +330,13 @@ void ModelHydro::UpdateHydroUnitsParameters(SettingsModel& modelSettings) {
                 ProcessSettings processSettings = modelSettings.GetProcessSettings(iProcess);
                 Process* process = brick->GetProcess(iProcess);
                 process->SetParameters(processSettings);
+
+                // The parameters of the PET computed in the engine belong to the process using it
+                if (!processSettings.petMethod.empty()) {
+                    auto pet = dynamic_cast<ForcingPet*>(unit->GetForcing(PET));
+                    wxASSERT(pet);
+                    pet->SetParameters(processSettings);
+                }
             }
         }
 
@@ -613,8 +710,12 @@ void ModelHydro::BuildForcingConnections(BrickSettings& brickSettings, HydroUnit
 void ModelHydro::BuildForcingConnections(ProcessSettings& processSettings, HydroUnit* unit, Process* process) {
     for (auto forcingType : processSettings.forcing) {
         if (!unit->HasForcing(forcingType)) {
-            auto newForcing = new Forcing(forcingType);
-            unit->AddForcing(newForcing);
+            if (forcingType == PET && !processSettings.petMethod.empty()) {
+                unit->AddForcing(CreatePetForcing(processSettings, unit));
+            } else {
+                auto newForcing = new Forcing(forcingType);
+                unit->AddForcing(newForcing);
+            }
         }
 
         auto forcing = unit->GetForcing(forcingType);
@@ -622,6 +723,28 @@ void ModelHydro::BuildForcingConnections(ProcessSettings& processSettings, Hydro
     }
 }
 
+Forcing* ModelHydro::CreatePetForcing(ProcessSettings& processSettings, HydroUnit* unit) {
+    ForcingPet* pet = ForcingPet::Factory(processSettings.petMethod);
+    pet->SetLatitude(unit->GetPropertyDouble("latitude", "radians"));
+    pet->SetDayOfYearPointer(m_timer.GetDayOfYearPointer());
+    pet->SetParameters(processSettings);
+
+    for (auto forcingType : pet->GetInputTypes()) {
+        if (!unit->HasForcing(forcingType)) {
+            auto newForcing = new Forcing(forcingType);
+            unit->AddForcing(newForcing);
+        }
+        pet->AttachForcing(unit->GetForcing(forcingType));
+    }
+
+    if (!pet->IsOk()) {
+        wxDELETE(pet);
+        throw ConceptionIssue(_("The PET forcing computed in the engine is not correctly defined."));
+    }
+
+    return pet;
+}
+
 void ModelHydro::BuildForcingConnections(SplitterSettings& splitterSettings, HydroUnit* unit, Splitter* splitter) {
     for (auto forcingType : splitterSettings.forcing) {
         if (!unit->HasForcing(forcingType)) {
@@ -822,11 +945,143 @@ bool ModelHydro::Run() {
     return true;
 }
 
+axxd ModelHydro::RunBatch(SettingsModel& modelSettings, const axxd& parameterValues, const vecStr& parameterNames) {
+    if (parameterValues.cols() != parameterNames.size()) {
+        throw InvalidArgument(wxString::Format(_("The number of parameter values (%d) does not match the number of "
+                                                 "parameter names (%d)."),
+                                               int(parameterValues.cols()), int(parameterNames.size())));
+    }
+
+    vector<vector<float*>> parameterHandles = ResolveParameters(modelSettings, parameterNames);
+    vector<vecFloat> originalValues = ReadParameterValues(parameterHandles);
+    axxd discharge = axxd::Constant(parameterValues.rows(), m_timer.GetTimeStepsNb(), NAN_D);
+
+    for (int iRun = 0; iRun < parameterValues.rows(); ++iRun) {
+        if (!RunWithParameters(parameterHandles, parameterValues.row(iRun).transpose())) {
+            wxLogError(_("The run %d of the batch failed."), iRun);
+            continue;
+        }
+        discharge.row(iRun) = GetOutletDischarge().transpose();
+    }
+
+    RestoreParameterValues(parameterHandles, originalValues);
+
+    return discharge;
+}
+
+axd ModelHydro::RunBatchEvaluation(SettingsModel& modelSettings, const axxd& parameterValues,
+                                   const vecStr& parameterNames, const axd& observations, const string& metric) {
+    if (parameterValues.cols() != parameterNames.size()) {
+        throw InvalidArgument(wxString::Format(_("The number of parameter values (%d) does not match the number of "
+                                                 "parameter names (%d)."),
+                                               int(parameterValues.cols()), int(parameterNames.size())));
+    }
+    if (observations.size() != m_timer.GetTimeStepsNb()) {
+        throw InvalidArgument(wxString::Format(_("The length of the observations (%d) does not match the number of "
+                                                 "time steps (%d)."),
+                                               int(observations.size()), m_timer.GetTimeStepsNb()));
+    }
+
+    vector<vector<float*>> parameterHandles = ResolveParameters(modelSettings, parameterNames);
+    vector<vecFloat> originalValues = ReadParameterValues(parameterHandles);
+    axd values = axd::Constant(parameterValues.rows(), NAN_D);
+
+    for (int iRun = 0; iRun < parameterValues.rows(); ++iRun) {
+        if (!RunWithParameters(parameterHandles, parameterValues.row(iRun).transpose())) {
+            wxLogError(_("The run %d of the batch failed."), iRun);
+            continue;
+        }
+        values[iRun] = EvaluateMetric(metric, GetOutletDischarge(), observations);
+    }
+
+    RestoreParameterValues(parameterHandles, originalValues);
+
+    return values;
+}
+
+vector<std::pair<string, string>> ModelHydro::ParseParameterNames(const vecStr& parameterNames) {
+    vector<std::pair<string, string>> parameters;
+    parameters.reserve(parameterNames.size());
+
+    for (const auto& parameterName : parameterNames) {
+        size_t pos = parameterName.find(':');
+        if (pos == string::npos || pos == 0 || pos == parameterName.size() - 1) {
+            throw InvalidArgument(wxString::Format(_("The parameter name '%s' is not in the 'component:name' format."),
+                                                   parameterName));
+        }
+        parameters.emplace_back(parameterName.substr(0, pos), parameterName.substr(pos + 1));
+    }
+
+    return parameters;
+}
+
+vector<vector<float*>> ModelHydro::ResolveParameters(SettingsModel& modelSettings, const vecStr& parameterNames) {
+    vector<std::pair<string, string>> parameters = ParseParameterNames(parameterNames);
+
+    vector<vector<float*>> parameterHandles;
+    parameterHandles.reserve(parameters.size());
+    for (const auto& parameter : parameters) {
+        vector<float*> valuePointers = modelSettings.GetParameterValuePointers(parameter.first, parameter.second);
+        if (valuePointers.empty()) {
+            throw InvalidArgument(wxString::Format(_("The parameter '%s:%s' could not be resolved."), parameter.first,
+                                                   parameter.second));
+        }
+        parameterHandles.push_back(valuePointers);
+    }
+
+    // Make sure the components point to the values of these settings.
+    UpdateParameters(modelSettings);
+
+    return parameterHandles;
+}
+
+void ModelHydro::WriteParameterValues(const vector<vector<float*>>& parameterHandles, const axd& values) {
+    wxASSERT(values.size() == parameterHandles.size());
+    for (int iParam = 0; iParam < parameterHandles.size(); ++iParam) {
+        for (auto valuePointer : parameterHandles[iParam]) {
+            *valuePointer = float(values[iParam]);
+        }
+    }
+}
+
+vector<vecFloat> ModelHydro::ReadParameterValues(const vector<vector<float*>>& parameterHandles) {
+    vector<vecFloat> values;
+    values.reserve(parameterHandles.size());
+    for (const auto& valuePointers : parameterHandles) {
+        vecFloat parameterValues;
+        parameterValues.reserve(valuePointers.size());
+        for (auto valuePointer : valuePointers) {
+            parameterValues.push_back(*valuePointer);
+        }
+        values.push_back(parameterValues);
+    }
+
+    return values;
+}
+
+void ModelHydro::RestoreParameterValues(const vector<vector<float*>>& parameterHandles,
+                                        const vector<vecFloat>& values) {
+    wxASSERT(values.size() == parameterHandles.size());
+    for (int iParam = 0; iParam < parameterHandles.size(); ++iParam) {
+        for (int i = 0; i < parameterHandles[iParam].size(); ++i) {
+            *parameterHandles[iParam][i] = values[iParam][i];
+        }
+    }
+}
+
+bool ModelHydro::RunWithParameters(const vector<vector<float*>>& parameterHandles, const axd& values) {
+    Reset();
+    WriteParameterValues(parameterHandles, values);
+
+    return Run();
+}
+
 void ModelHydro::Reset() {
     m_timer.Reset();
     m_logger.Reset();
     m_behavioursManager.Reset();
     m_subBasin->Reset();
+    m_processor.Reset();
 }
 
 void ModelHydro::SaveAsInitialState() {
@@ -900,6 +1155,126 @@ bool ModelHydro::CreateTimeSeries(const string& varName, const axd& time, const
     return true;
 }
 
+bool ModelHydro::CreateTimeSeriesFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                            std::shared_ptr<const double> data) {
+    TimeSeries* timeSeries = TimeSeries::CreateFromBuffer(varName, time, ids, std::move(data));
+    if (!AddTimeSeries(timeSeries)) {
+        wxDELETE(timeSeries);
+        return false;
+    }
+    return true;
+}
+
+bool ModelHydro::CreateUniformTimeSeriesFromBuffer(const string& varName, const axd& time,
+                                                   std::shared_ptr<const double> data) {
+    TimeSeries* timeSeries = TimeSeries::CreateUniformFromBuffer(varName, time, std::move(data));
+    if (!AddTimeSeries(timeSeries)) {
+        wxDELETE(timeSeries);
+        return false;
+    }
+    return true;
+}
+
+bool ModelHydro::CreateSpatializedTimeSeriesFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                                       std::shared_ptr<const double> data) {
+    TimeSeries* timeSeries = TimeSeries::CreateSpatializedFromBuffer(varName, time, ids, std::move(data));
+    if (!AddTimeSeries(timeSeries)) {
+        wxDELETE(timeSeries);
+        return false;
+    }
+    return true;
+}
+
+bool ModelHydro::SetTimeSeriesElevationGradients(const string& varName, const string& method, const axd& elevations,
+                                                 double refElevation, const axd& gradients, const axd& gradients2,
+                                                 double elevationThreshold) {
+    VariableType type = TimeSeries::MatchVariableType(varName);
+
+    for (auto timeSeries : m_timeSeries) {
+        if (timeSeries->GetVariableType() != type) {
+            continue;
+        }
+        auto timeSeriesSpatialized = dynamic_cast<TimeSeriesSpatialized*>(timeSeries);
+        if (timeSeriesSpatialized == nullptr) {
+            wxLogError(_("The time series of '%s' is not spatialized from station data."), varName);
+            return false;
+        }
+        timeSeriesSpatialized->SetElevationGradients(method, elevations, refElevation, gradients, gradients2,
+                                                     elevationThreshold);
+        return true;
+    }
+
+    wxLogError(_("No time series found for '%s'."), varName);
+    return false;
+}
+
+bool ModelHydro::UpdateTimeSeriesValues(const string& varName, const axxd& data) {
+    TimeSeriesDistributed* timeSeries = GetTimeSeriesToUpdate(varName, int(data.cols()));
+    if (timeSeries == nullptr) {
+        return false;
+    }
+
+    // Single copy of the data (column-major), shared by the time series of the units.
+    auto values = std::make_shared<axxd>(data);
+    std::shared_ptr<const double> buffer(values, values->data());
+
+    return timeSeries->SetBuffer(buffer, int(data.rows()), 1, int(data.rows()));
+}
+
+bool ModelHydro::UpdateTimeSeriesValuesFromBuffer(const string& varName, std::shared_ptr<const double> data,
+                                                  int timeStepsNb, int unitsNb) {
+    TimeSeriesDistributed* timeSeries = GetTimeSeriesToUpdate(varName, unitsNb);
+    if (timeSeries == nullptr) {
+        return false;
+    }
+
+    return timeSeries->SetBuffer(data, timeStepsNb, unitsNb, 1);
+}
+
+bool ModelHydro::UpdateUniformTimeSeriesValuesFromBuffer(const string& varName, std::shared_ptr<const double> data,
+                                                         int timeStepsNb) {
+    VariableType type = TimeSeries::MatchVariableType(varName);
+
+    for (auto timeSeries : m_timeSeries) {
+        if (timeSeries->GetVariableType() != type) {
+            continue;
+        }
+        auto timeSeriesUniform = dynamic_cast<TimeSeriesUniform*>(timeSeries);
+        if (timeSeriesUniform == nullptr) {
+            wxLogError(_("The time series of '%s' is not uniform and cannot be updated as such."), varName);
+            return false;
+        }
+        return timeSeriesUniform->SetBuffer(data, timeStepsNb);
+    }
+
+    wxLogError(_("No time series found for '%s'."), varName);
+    return false;
+}
+
+TimeSeriesDistributed* ModelHydro::GetTimeSeriesToUpdate(const string& varName, int unitsNb) {
+    VariableType type = TimeSeries::MatchVariableType(varName);
+
+    for (auto timeSeries : m_timeSeries) {
+        if (timeSeries->GetVariableType() != type) {
+            continue;
+        }
+        auto timeSeriesDistributed = dynamic_cast<TimeSeriesDistributed*>(timeSeries);
+        if (timeSeriesDistributed == nullptr) {
+            wxLogError(_("The time series of '%s' is not distributed and cannot be updated."), varName);
+            return nullptr;
+        }
+        if (timeSeriesDistributed->GetUnitsNb() != unitsNb) {
+            wxLogError(_("The number of hydro units (%d) does not match the time series of '%s' (%d)."), unitsNb,
+                       varName, timeSeriesDistributed->GetUnitsNb());
+            return nullptr;
+        }
+        return timeSeriesDistributed;
+    }
+
+    wxLogError(_("No time series found for '%s'."), varName);
+    return nullptr;
+}
+
 void ModelHydro::ClearTimeSeries() {
     for (auto ts : m_timeSeries) {
         wxDELETE(ts);
@@ -9,6 +9,13 @@
 #include "SubBasin.h"
 #include "TimeSeries.h"
 
+class TimeSeriesDistributed;
+
+/**
+ * The hydrological model. Each instance owns its complete state (structure, time step, solver, forcing and logger),
+ * so that separate instances can be run concurrently from different threads. A single instance must not be used
+ * from multiple threads at the same time.
+ */
 class ModelHydro : public wxObject {
   public:
     ModelHydro(SubBasin* subBasin = nullptr);
@@ -19,14 +26,73 @@ class ModelHydro : public wxObject {
 
     bool Initialize(SettingsModel& modelSettings, SettingsBasin& basinProp);
 
+    /**
+     * Create an independent copy of the initialized model, ready to be run. The elements of the structure are copied
+     * and connected to each other (see CloneRegistry) instead of being built again from the settings, and the forcing
+     * time series and behaviours are duplicated. The copy starts from the initial state of the model (see
+     * SaveAsInitialState()).
+     *
+     * @param modelSettings The model settings this model was built (or last updated) with.
+     * @param cloneSettings A copy of the model settings (see SettingsModel::Clone()) for the parameters of the copy
+     * to be changed independently. It must outlive the copy as the components point to its parameter values.
+     * @return The copy of the model (owned by the caller) or nullptr if it failed.
+     */
+    ModelHydro* Clone(SettingsModel& modelSettings, SettingsModel& cloneSettings);
+
     void UpdateParameters(SettingsModel& modelSettings);
 
+    /**
+     * Resolve the parameters to the storage of their values once, so that they can then be changed with
+     * SetParameterValues() without any lookup in the settings or the model structure.
+     *
+     * @param modelSettings The model settings used to build the model.
+     * @param parameterNames The parameter names as 'component:name'.
+     */
+    void CompileParameters(SettingsModel& modelSettings, const vecStr& parameterNames);
+
+    /**
+     * Set the values of the parameters defined with CompileParameters().
+     *
+     * @param values The parameter values (in the order of the compiled parameter names).
+     */
+    void SetParameterValues(const axd& values);
+
+    int GetCompiledParametersNb() const {
+        return int(m_parameterHandles.size());
+    }
+
     bool IsOk();
 
     bool ForcingLoaded();
 
     bool Run();
 
+    /**
+     * Run the model successively for several parameter sets and collect the outlet discharge.
+     *
+     * @param modelSettings The model settings used to build the model.
+     * @param parameterValues The parameter values (one row per parameter set, one column per parameter).
+     * @param parameterNames The parameter names as 'component:name' (one per column of parameterValues).
+     * @return The outlet discharge (one row per parameter set, one column per time step).
+     * @note The parameter values in place before the batch are restored at the end of the batch.
+     */
+    axxd RunBatch(SettingsModel& modelSettings, const axxd& parameterValues, const vecStr& parameterNames);
+
+    /**
+     * Run the model successively for several parameter sets and only return the value of a goodness of fit metric
+     * for each run.
+     *
+     * @param modelSettings The model settings used to build the model.
+     * @param parameterValues The parameter values (one row per parameter set, one column per parameter).
+     * @param parameterNames The parameter names as 'component:name' (one per column of parameterValues).
+     * @param observations The observed discharge time series.
+     * @param metric The name of the metric (see EvaluateMetric()).
+     * @return The metric value for each parameter set.
+     * @note The parameter values in place before the batch are restored at the end of the batch.
+     */
+    axd RunBatchEvaluation(SettingsModel& modelSettings, const axxd& parameterValues, const vecStr& parameterNames,
+                           const axd& observations, const string& metric);
+
     void Reset();
 
     void SaveAsInitialState();
@@ -53,6 +119,95 @@ class ModelHydro : public wxObject {
 
     bool CreateTimeSeries(const string& varName, const axd& time, const axi& ids, const axxd& data);
 
+    /**
+     * Create a time series reading its values directly in the provided buffer and add it to the model.
+     *
+     * @param varName The name of the variable.
+     * @param time The dates of the time steps (MJD).
+     * @param ids The ids of the hydro units.
+     * @param data The values as a contiguous row-major array (one row per time step, one column per hydro unit).
+     * @return True if successful.
+     */
+    bool CreateTimeSeriesFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                    std::shared_ptr<const double> data);
+
+    /**
+     * Create a uniform time series (same values for all hydro units) reading its values directly in the provided
+     * buffer and add it to the model. The data is shared by all hydro units.
+     *
+     * @param varName The name of the variable.
+     * @param time The dates of the time steps (MJD).
+     * @param data The contiguous values (one per time step).
+     * @return True if successful.
+     */
+    bool CreateUniformTimeSeriesFromBuffer(const string& varName, const axd& time, std::shared_ptr<const double> data);
+
+    /**
+     * Create a time series computing the values of the hydro units on the fly from a single station series and add
+     * it to the model. The values are those of the station until elevation gradients are set with
+     * SetTimeSeriesElevationGradients.
+     *
+     * @param varName The name of the variable.
+     * @param time The dates of the time steps (MJD).
+     * @param ids The ids of the hydro units.
+     * @param data The contiguous station values (one per time step).
+     * @return True if successful.
+     */
+    bool CreateSpatializedTimeSeriesFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                               std::shared_ptr<const double> data);
+
+    /**
+     * Set the elevation gradients of a time series created with CreateSpatializedTimeSeriesFromBuffer. Can be
+     * called again (e.g. during the calibration) without rebuilding the time series.
+     *
+     * @param varName The name of the variable.
+     * @param method The spatialization method: 'additive_elevation_gradient', 'multiplicative_elevation_gradient'
+     * or 'multiplicative_elevation_threshold_gradients'.
+     * @param elevations The elevations of the hydro units (in the order of the ids).
+     * @param refElevation The reference (station) elevation.
+     * @param gradients The gradients per 100 m (a single value or one value per month).
+     * @param gradients2 The gradients per 100 m above the elevation threshold (threshold method only).
+     * @param elevationThreshold The elevation threshold to switch from gradients to gradients2.
+     * @return True if successful.
+     */
+    bool SetTimeSeriesElevationGradients(const string& varName, const string& method, const axd& elevations,
+                                         double refElevation, const axd& gradients, const axd& gradients2,
+                                         double elevationThreshold);
+
+    /**
+     * Replace the values of an existing time series without rebuilding it (e.g. after a change of a forcing
+     * parameter). The data must cover the same period and hydro units.
+     *
+     * @param varName The name of the variable.
+     * @param data The new values (one row per time step, one column per hydro unit).
+     * @return True if successful.
+     */
+    bool UpdateTimeSeriesValues(const string& varName, const axxd& data);
+
+    /**
+     * Replace the values of an existing time series by the ones of the provided buffer, without copying them.
+     *
+     * @param varName The name of the variable.
+     * @param data The new values as a contiguous row-major array (one row per time step, one column per hydro unit).
+     * @param timeStepsNb The number of time steps (rows) of the data.
+     * @param unitsNb The number of hydro units (columns) of the data.
+     * @return True if successful.
+     */
+    bool UpdateTimeSeriesValuesFromBuffer(const string& varName, std::shared_ptr<const double> data, int timeStepsNb,
+                                          int unitsNb);
+
+    /**
+     * Replace the values of an existing uniform time series (or the station values of a spatialized time series) by
+     * the ones of the provided buffer, without copying them.
+     *
+     * @param varName The name of the variable.
+     * @param data The new contiguous values (one per time step).
+     * @param timeStepsNb The number of time steps of the data.
+     * @return True if successful.
+     */
+    bool UpdateUniformTimeSeriesValuesFromBuffer(const string& varName, std::shared_ptr<const double> data,
+                                                 int timeStepsNb);
+
     void ClearTimeSeries();
 
     bool AttachTimeSeriesToHydroUnits();
@@ -89,6 +244,9 @@ class ModelHydro : public wxObject {
     BehavioursManager m_behavioursManager;
     ParametersUpdater m_parametersUpdater;
     vector<TimeSeries*> m_timeSeries;
+    vector<Behaviour*> m_ownedBehaviours;
+    SettingsBasin m_basinSettings;
+    vector<vector<float*>> m_parameterHandles;
 
   private:
     void BuildModelStructure(SettingsModel& modelSettings);
@@ -115,6 +273,15 @@ class ModelHydro : public wxObject {
 
     void BuildForcingConnections(SplitterSettings& splitterSettings, HydroUnit* unit, Splitter* splitter);
 
+    /**
+     * Create the PET forcing computed in the engine and connect it to the forcing it depends on.
+     *
+     * @param processSettings settings of the process using the PET (with the PET method and parameters).
+     * @param unit the related hydro unit.
+     * @return the created PET forcing.
+     */
+    Forcing* CreatePetForcing(ProcessSettings& processSettings, HydroUnit* unit);
+
     void BuildSubBasinBricksFluxes(SettingsModel& modelSettings);
 
     void BuildHydroUnitBricksFluxes(SettingsModel& modelSettings, HydroUnit* unit);
@@ -127,6 +294,35 @@ class ModelHydro : public wxObject {
 
     bool InitializeTimeSeries();
 
+    /**
+     * Get the distributed time series of a variable for an update of its values.
+     *
+     * @param varName The name of the variable.
+     * @param unitsNb The number of hydro units of the new values.
+     * @return The time series or nullptr if not found or not matching.
+     */
+    TimeSeriesDistributed* GetTimeSeriesToUpdate(const string& varName, int unitsNb);
+
+    static vector<std::pair<string, string>> ParseParameterNames(const vecStr& parameterNames);
+
+    /**
+     * Get the pointers to the values of the parameters and link the model components to them.
+     *
+     * @param modelSettings The model settings used to build the model.
+     * @param parameterNames The parameter names as 'component:name'.
+     * @return The pointers to the values of each parameter.
+     */
+    vector<vector<float*>> ResolveParameters(SettingsModel& modelSettings, const vecStr& parameterNames);
+
+    static void WriteParameterValues(const vector<vector<float*>>& parameterHandles, const axd& values);
+
+    static vector<vecFloat> ReadParameterValues(const vector<vector<float*>>& parameterHandles);
+
+    static void RestoreParameterValues(const vector<vector<float*>>& parameterHandles,
+                                       const vector<vecFloat>& values);
+
+    bool RunWithParameters(const vector<vector<float*>>& parameterHandles, const axd& values);
+
     bool UpdateForcing();
 };
 
@@ -9,6 +9,15 @@ class Parameter : public wxObject {
 
     ~Parameter() override = default;
 
+    /**
+     * Create a copy of the parameter.
+     *
+     * @return the copy of the parameter (owned by the caller).
+     */
+    virtual Parameter* Clone() const {
+        return new Parameter(*this);
+    }
+
     bool IsLinked() const {
         return m_linked;
     }
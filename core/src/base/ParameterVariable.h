@@ -21,6 +21,10 @@ class ParameterVariableYearly : public ParameterVariable {
 
     ~ParameterVariableYearly() override = default;
 
+    ParameterVariableYearly* Clone() const override {
+        return new ParameterVariableYearly(*this);
+    }
+
     bool SetValues(int yearStart, int yearEnd, const vecFloat& values);
 
     bool UpdateParameter(int year);
@@ -37,6 +41,10 @@ class ParameterVariableMonthly : public ParameterVariable {
 
     ~ParameterVariableMonthly() override = default;
 
+    ParameterVariableMonthly* Clone() const override {
+        return new ParameterVariableMonthly(*this);
+    }
+
     bool SetValues(const vecFloat& values);
 
     bool UpdateParameter(int month);
@@ -51,6 +59,10 @@ class ParameterVariableDates : public ParameterVariable {
 
     ~ParameterVariableDates() override = default;
 
+    ParameterVariableDates* Clone() const override {
+        return new ParameterVariableDates(*this);
+    }
+
     bool SetTimeAndValues(const vecDouble& time, const vecFloat& values);
 
     bool UpdateParameter(double timeReference);
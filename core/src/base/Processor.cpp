@@ -1,24 +1,56 @@
 #include "Processor.h"
 
+#include "FluxToOutlet.h"
 #include "ModelHydro.h"
+#include "ProcessOutflowLinear.h"
 #include "SubBasin.h"
 
 Processor::Processor()
     : m_solver(nullptr),
       m_model(nullptr),
+      m_timeStepInDays(nullptr),
       m_solvableConnectionsNb(0),
-      m_directConnectionsNb(0) {}
+      m_directConnectionsNb(0),
+      m_analyticalLinearStorages(false),
+      m_vectorizedProcesses(false),
+      m_threadsNb(1),
+      m_threadPool(nullptr),
+      m_activeBricksOutdated(true) {}
 
 Processor::~Processor() {
+    for (auto group : m_iterableBrickGroups) {
+        wxDELETE(group);
+    }
+    for (auto group : m_directBrickGroups) {
+        wxDELETE(group);
+    }
     wxDELETE(m_solver);
+    wxDELETE(m_threadPool);
 }
 
 void Processor::Initialize(const SolverSettings& solverSettings) {
+    wxASSERT(m_model);
+    m_timeStepInDays = m_model->GetTimeMachine()->GetTimeStepPointer();
+    m_analyticalLinearStorages = solverSettings.analyticalLinearStorages;
+    m_vectorizedProcesses = solverSettings.vectorizedProcesses;
+    m_threadsNb = wxMax(1, wxMin(solverSettings.threadsNb, m_model->GetSubBasin()->GetHydroUnitsNb()));
     m_solver = Solver::Factory(solverSettings);
     m_solver->Connect(this);
     ConnectToElementsToSolve();
     m_solver->InitializeContainers();
     m_changeRatesNoSolver = axd::Zero(m_directConnectionsNb);
+    if (m_threadsNb > 1) {
+        m_threadPool = new ThreadPool(m_threadsNb);
+        DeferFluxesToSubBasinBricks();
+    }
+}
+
+void Processor::Reset() {
+    if (m_solver) {
+        m_solver->Reset();
+    }
+    m_changeRatesNoSolver.setZero();
+    InvalidateActiveBricks();
 }
 
 void Processor::SetModel(ModelHydro* model) {
@@ -27,52 +59,368 @@ void Processor::SetModel(ModelHydro* model) {
 
 void Processor::ConnectToElementsToSolve() {
     SubBasin* basin = m_model->GetSubBasin();
+    int unitsNb = basin->GetHydroUnitsNb();
 
-    for (int iUnit = 0; iUnit < basin->GetHydroUnitsNb(); ++iUnit) {
+    vector<vector<Splitter*>> unitsSplitters(unitsNb);
+    vector<vector<Brick*>> unitsIterableBricks(unitsNb);
+    vector<vector<Brick*>> unitsDirectBricks(unitsNb);
+    vector<vector<Brick*>> unitsAnalyticalBricks(unitsNb);
+
+    for (int iUnit = 0; iUnit < unitsNb; ++iUnit) {
         HydroUnit* unit = basin->GetHydroUnit(iUnit);
+        for (int iSplitter = 0; iSplitter < unit->GetSplittersCount(); ++iSplitter) {
+            unitsSplitters[iUnit].push_back(unit->GetSplitter(iSplitter));
+        }
+
         bool solverRequired = false;
         for (int iBrick = 0; iBrick < unit->GetBricksCount(); ++iBrick) {
             Brick* brick = unit->GetBrick(iBrick);
 
+            // Linear storages draining to the outlet are integrated analytically after the solver
+            if (m_analyticalLinearStorages && IsLinearStorage(brick)) {
+                unitsAnalyticalBricks[iUnit].push_back(brick);
+                continue;
+            }
+
             // Add the bricks that need a solver and all their children
             if (brick->NeedsSolver() || solverRequired) {
-                m_iterableBricks.push_back(brick);
+                unitsIterableBricks[iUnit].push_back(brick);
                 solverRequired = true;
+            } else {
+                unitsDirectBricks[iUnit].push_back(brick);
+            }
+        }
+    }
 
-                // Get state variables from bricks
-                vecDoublePt bricksValues = brick->GetDynamicContentChanges();
-                StoreStateVariableChanges(bricksValues);
+    // The hydro units are split into contiguous groups, one per thread.
+    for (int iGroup = 0; iGroup < m_threadsNb; ++iGroup) {
+        int firstUnit = unitsNb * iGroup / m_threadsNb;
+        int endUnit = unitsNb * (iGroup + 1) / m_threadsNb;
 
-                // Get state variables from processes
-                vecDoublePt processValues = brick->GetStateVariableChangesFromProcesses();
-                StoreStateVariableChanges(processValues);
+        ElementsRange splittersRange;
+        splittersRange.first = int(m_splitters.size());
+        for (int iUnit = firstUnit; iUnit < endUnit; ++iUnit) {
+            m_splitters.insert(m_splitters.end(), unitsSplitters[iUnit].begin(), unitsSplitters[iUnit].end());
+        }
+        splittersRange.end = int(m_splitters.size());
+        m_splittersRanges.push_back(splittersRange);
+
+        // The hydro units share the same structure: handle each brick type for all units of the group in a row.
+        vector<vector<Brick*>> groupDirectBricks(unitsDirectBricks.begin() + firstUnit,
+                                                 unitsDirectBricks.begin() + endUnit);
+        ElementsRange directRange;
+        directRange.first = int(m_directBricks.size());
+        directRange.firstRate = m_directConnectionsNb;
+        ElementsRange directGroupsRange;
+        directGroupsRange.first = int(m_directBrickGroups.size());
+        if (m_vectorizedProcesses) {
+            for (const auto& bricks : GatherHydroUnitsBricks(groupDirectBricks)) {
+                AddDirectBrickGroups(bricks);
+            }
+        } else {
+            for (auto brick : InterleaveHydroUnitsBricks(groupDirectBricks)) {
+                m_directBricks.push_back(brick);
 
-                // Count connections
-                m_solvableConnectionsNb += brick->GetProcessesConnectionsNb();
-            } else {
                 // Count connections
                 m_directConnectionsNb += brick->GetProcessesConnectionsNb();
             }
         }
+        directRange.end = int(m_directBricks.size());
+        m_directRanges.push_back(directRange);
+        directGroupsRange.end = int(m_directBrickGroups.size());
+        m_directBrickGroupsRanges.push_back(directGroupsRange);
+
+        vector<vector<Brick*>> groupIterableBricks(unitsIterableBricks.begin() + firstUnit,
+                                                   unitsIterableBricks.begin() + endUnit);
+        ElementsRange iterableRange;
+        iterableRange.first = int(m_iterableBricks.size());
+        iterableRange.firstRate = m_solvableConnectionsNb;
+        ElementsRange groupsRange;
+        groupsRange.first = int(m_iterableBrickGroups.size());
+        if (m_vectorizedProcesses) {
+            for (const auto& bricks : GatherHydroUnitsBricks(groupIterableBricks)) {
+                AddIterableBrickGroups(bricks);
+            }
+        } else {
+            for (auto brick : InterleaveHydroUnitsBricks(groupIterableBricks)) {
+                AddIterableBrick(brick);
+            }
+        }
+        iterableRange.end = int(m_iterableBricks.size());
+        m_iterableRanges.push_back(iterableRange);
+        groupsRange.end = int(m_iterableBrickGroups.size());
+        m_iterableBrickGroupsRanges.push_back(groupsRange);
+
+        vector<vector<Brick*>> groupAnalyticalBricks(unitsAnalyticalBricks.begin() + firstUnit,
+                                                     unitsAnalyticalBricks.begin() + endUnit);
+        ElementsRange analyticalRange;
+        analyticalRange.first = int(m_analyticalBricks.size());
+        for (auto brick : InterleaveHydroUnitsBricks(groupAnalyticalBricks)) {
+            m_analyticalBricks.push_back(brick);
+        }
+        analyticalRange.end = int(m_analyticalBricks.size());
+        m_analyticalRanges.push_back(analyticalRange);
     }
 
+    // The sub-basin bricks are handled last, once all the hydro units are processed.
+    ElementsRange iterableRange;
+    iterableRange.first = int(m_iterableBricks.size());
+    iterableRange.firstRate = m_solvableConnectionsNb;
+    ElementsRange analyticalRange;
+    analyticalRange.first = int(m_analyticalBricks.size());
+    ElementsRange groupsRange;
+    groupsRange.first = int(m_iterableBrickGroups.size());
+
     for (int iBrick = 0; iBrick < basin->GetBricksCount(); ++iBrick) {
         Brick* brick = basin->GetBrick(iBrick);
 
+        if (m_analyticalLinearStorages && IsLinearStorage(brick)) {
+            m_analyticalBricks.push_back(brick);
+            continue;
+        }
+
         // Add the bricks need a solver here
-        m_iterableBricks.push_back(brick);
+        if (m_vectorizedProcesses) {
+            AddIterableBrickGroups({brick});
+        } else {
+            AddIterableBrick(brick);
+        }
+    }
+
+    iterableRange.end = int(m_iterableBricks.size());
+    m_iterableRanges.push_back(iterableRange);
+    groupsRange.end = int(m_iterableBrickGroups.size());
+    m_iterableBrickGroupsRanges.push_back(groupsRange);
+    analyticalRange.end = int(m_analyticalBricks.size());
+    m_analyticalRanges.push_back(analyticalRange);
+
+    // No splitters nor direct bricks at the sub-basin level
+    ElementsRange emptyRange;
+    emptyRange.first = int(m_splitters.size());
+    emptyRange.end = int(m_splitters.size());
+    m_splittersRanges.push_back(emptyRange);
+    emptyRange.first = int(m_directBricks.size());
+    emptyRange.end = int(m_directBricks.size());
+    emptyRange.firstRate = m_directConnectionsNb;
+    m_directRanges.push_back(emptyRange);
+    emptyRange.first = int(m_directBrickGroups.size());
+    emptyRange.end = int(m_directBrickGroups.size());
+    m_directBrickGroupsRanges.push_back(emptyRange);
+}
+
+void Processor::AddIterableBrick(Brick* brick) {
+    m_iterableBricks.push_back(brick);
+
+    // Get state variables from bricks
+    vecDoublePt bricksValues = brick->GetDynamicContentChanges();
+    StoreStateVariableChanges(bricksValues);
+
+    // Get state variables from processes
+    vecDoublePt processValues = brick->GetStateVariableChangesFromProcesses();
+    StoreStateVariableChanges(processValues);
+
+    // Count connections
+    m_solvableConnectionsNb += brick->GetProcessesConnectionsNb();
+}
+
+vector<vector<Brick*>> Processor::SplitIntoSimilarBricks(const vector<Brick*>& bricks) {
+    vector<vector<Brick*>> similarBricks;
+    size_t first = 0;
+    while (first < bricks.size()) {
+        size_t end = first + 1;
+        while (end < bricks.size() && BrickGroup::AreSimilar(bricks[first], bricks[end])) {
+            end++;
+        }
+        similarBricks.emplace_back(bricks.begin() + first, bricks.begin() + end);
+        first = end;
+    }
+
+    return similarBricks;
+}
+
+void Processor::AddIterableBrickGroups(const vector<Brick*>& bricks) {
+    for (const auto& groupBricks : SplitIntoSimilarBricks(bricks)) {
+        m_iterableBrickGroups.push_back(new BrickGroup(groupBricks, m_solvableConnectionsNb));
+        for (auto brick : groupBricks) {
+            AddIterableBrick(brick);
+        }
+    }
+}
+
+void Processor::AddDirectBrickGroups(const vector<Brick*>& bricks) {
+    for (const auto& groupBricks : SplitIntoSimilarBricks(bricks)) {
+        m_directBrickGroups.push_back(new BrickGroup(groupBricks, m_directConnectionsNb));
+        for (auto brick : groupBricks) {
+            m_directBricks.push_back(brick);
+
+            // Count connections
+            m_directConnectionsNb += brick->GetProcessesConnectionsNb();
+        }
+    }
+}
+
+void Processor::UpdateActiveBricks() {
+    if (m_vectorizedProcesses) {
+        SelectActiveBrickGroupsBricks(m_directBrickGroups, m_directBrickGroupsRanges, m_activeDirectBricks,
+                                      m_activeDirectRanges, m_activeDirectBrickGroupsBricks);
+        SelectActiveBrickGroupsBricks(m_iterableBrickGroups, m_iterableBrickGroupsRanges, m_activeIterableBricks,
+                                      m_activeIterableRanges, m_activeIterableBrickGroupsBricks);
+    } else {
+        SelectActiveBricks(m_directBricks, m_directRanges, m_activeDirectBricks, m_activeDirectRanges);
+        SelectActiveBricks(m_iterableBricks, m_iterableRanges, m_activeIterableBricks, m_activeIterableRanges);
+    }
+    SelectActiveBricks(m_analyticalBricks, m_analyticalRanges, m_activeAnalyticalBricks, m_activeAnalyticalRanges);
+
+    int linearStoragesNb = int(m_activeAnalyticalBricks.size());
+    m_linearStorages.contents = axd::Zero(linearStoragesNb);
+    m_linearStorages.inputs = axd::Zero(linearStoragesNb);
+    m_linearStorages.responseFactors = axd::Zero(linearStoragesNb);
+    m_linearStorages.decays = axd::Zero(linearStoragesNb);
+    m_linearStorages.outputs = axd::Zero(linearStoragesNb);
+
+    // The rates of the bricks that became inactive must not be applied anymore.
+    m_solver->ResetChangeRates();
+    m_activeBricksOutdated = false;
+}
+
+void Processor::SelectActiveBricks(const vector<Brick*>& bricks, const vector<ElementsRange>& ranges,
+                                   vector<ActiveBrick>& activeBricks, vector<ElementsRange>& activeRanges) {
+    activeBricks.clear();
+    activeRanges.clear();
+
+    for (const auto& range : ranges) {
+        ElementsRange activeRange;
+        activeRange.first = int(activeBricks.size());
+        activeRange.firstRate = range.firstRate;
+        int iRate = range.firstRate;
+        for (int i = range.first; i < range.end; ++i) {
+            Brick* brick = bricks[i];
+            if (!brick->IsNull()) {
+                ActiveBrick activeBrick;
+                activeBrick.brick = brick;
+                activeBrick.firstRate = iRate;
+                activeBricks.push_back(activeBrick);
+            }
+            iRate += brick->GetProcessesConnectionsNb();
+        }
+        activeRange.end = int(activeBricks.size());
+        activeRanges.push_back(activeRange);
+    }
+}
+
+void Processor::SelectActiveBrickGroupsBricks(const vector<BrickGroup*>& groups,
+                                              const vector<ElementsRange>& groupsRanges,
+                                              vector<ActiveBrick>& activeBricks, vector<ElementsRange>& activeRanges,
+                                              vector<ElementsRange>& activeGroupsBricks) {
+    activeBricks.clear();
+    activeRanges.clear();
+    activeGroupsBricks.clear();
+
+    for (const auto& range : groupsRanges) {
+        ElementsRange activeRange;
+        activeRange.first = int(activeBricks.size());
+        for (int iGroup = range.first; iGroup < range.end; ++iGroup) {
+            BrickGroup* group = groups[iGroup];
+            group->UpdateActiveBricks();
+
+            ElementsRange groupRange;
+            groupRange.first = int(activeBricks.size());
+            groupRange.firstRate = group->GetFirstRate();
+            for (int i = 0; i < group->GetBricksNb(); ++i) {
+                Brick* brick = group->GetBrick(i);
+                if (!brick->IsNull()) {
+                    ActiveBrick activeBrick;
+                    activeBrick.brick = brick;
+                    activeBrick.firstRate = group->GetFirstRate() + i * group->GetConnectionsNb();
+                    activeBricks.push_back(activeBrick);
+                }
+            }
+            groupRange.end = int(activeBricks.size());
+            activeGroupsBricks.push_back(groupRange);
+        }
+        activeRange.end = int(activeBricks.size());
+        activeRanges.push_back(activeRange);
+    }
+}
+
+void Processor::DeferFluxesToSubBasinBricks() {
+    SubBasin* basin = m_model->GetSubBasin();
+    vector<Brick*> subBasinBricks;
+    for (int iBrick = 0; iBrick < basin->GetBricksCount(); ++iBrick) {
+        subBasinBricks.push_back(basin->GetBrick(iBrick));
+    }
+
+    for (int iUnit = 0; iUnit < basin->GetHydroUnitsNb(); ++iUnit) {
+        HydroUnit* unit = basin->GetHydroUnit(iUnit);
+        for (int iBrick = 0; iBrick < unit->GetBricksCount(); ++iBrick) {
+            for (auto process : unit->GetBrick(iBrick)->GetProcesses()) {
+                for (auto flux : process->GetOutputFluxes()) {
+                    if (!flux->IsInstantaneous()) {
+                        continue;
+                    }
+                    auto instantaneousFlux = dynamic_cast<FluxToBrickInstantaneous*>(flux);
+                    wxASSERT(instantaneousFlux);
+                    Brick* target = instantaneousFlux->GetTargetBrick();
+                    if (std::find(subBasinBricks.begin(), subBasinBricks.end(), target) != subBasinBricks.end()) {
+                        instantaneousFlux->SetAsDeferred();
+                        m_deferredFluxes.push_back(instantaneousFlux);
+                    }
+                }
+            }
+        }
+    }
+}
+
+void Processor::TransferDeferredFluxes() {
+    for (auto flux : m_deferredFluxes) {
+        flux->TransferDeferredAmount();
+    }
+}
+
+bool Processor::IsLinearStorage(Brick* brick) {
+    if (!brick->NeedsSolver() || brick->GetProcesses().empty() || brick->GetWaterContainer()->HasMaximumCapacity()) {
+        return false;
+    }
+
+    for (auto process : brick->GetProcesses()) {
+        if (dynamic_cast<ProcessOutflowLinear*>(process) == nullptr) {
+            return false;
+        }
+        for (auto flux : process->GetOutputFluxes()) {
+            if (dynamic_cast<FluxToOutlet*>(flux) == nullptr) {
+                return false;
+            }
+        }
+    }
 
-        // Get state variables from bricks
-        vecDoublePt bricksValues = brick->GetDynamicContentChanges();
-        StoreStateVariableChanges(bricksValues);
+    return true;
+}
 
-        // Get state variables from processes
-        vecDoublePt processValues = brick->GetStateVariableChangesFromProcesses();
-        StoreStateVariableChanges(processValues);
+vector<Brick*> Processor::InterleaveHydroUnitsBricks(const vector<vector<Brick*>>& unitsBricks) {
+    vector<Brick*> bricks;
+    for (const auto& sameBricks : GatherHydroUnitsBricks(unitsBricks)) {
+        bricks.insert(bricks.end(), sameBricks.begin(), sameBricks.end());
+    }
 
-        // Count connections
-        m_solvableConnectionsNb += brick->GetProcessesConnectionsNb();
+    return bricks;
+}
+
+vector<vector<Brick*>> Processor::GatherHydroUnitsBricks(const vector<vector<Brick*>>& unitsBricks) {
+    size_t maxBricksNb = 0;
+    for (const auto& unitBricks : unitsBricks) {
+        maxBricksNb = std::max(maxBricksNb, unitBricks.size());
+    }
+
+    vector<vector<Brick*>> bricks(maxBricksNb);
+    for (size_t iBrick = 0; iBrick < maxBricksNb; ++iBrick) {
+        for (const auto& unitBricks : unitsBricks) {
+            if (iBrick < unitBricks.size()) {
+                bricks[iBrick].push_back(unitBricks[iBrick]);
+            }
+        }
     }
+
+    return bricks;
 }
 
 void Processor::StoreStateVariableChanges(vecDoublePt& values) {
@@ -92,25 +440,43 @@ bool Processor::ProcessTimeStep() {
 
     SubBasin* basin = m_model->GetSubBasin();
 
-    // Process the bricks that do not need a solver.
-    int ptIndex = 0;
-    for (int iUnit = 0; iUnit < basin->GetHydroUnitsNb(); ++iUnit) {
-        HydroUnit* unit = basin->GetHydroUnit(iUnit);
-        for (int iSplitter = 0; iSplitter < unit->GetSplittersCount(); ++iSplitter) {
-            Splitter* splitter = unit->GetSplitter(iSplitter);
-            splitter->Compute();
+    if (m_activeBricksOutdated) {
+        UpdateActiveBricks();
+    }
+
+    // Compute the splitters of the hydro units.
+    auto computeSplitters = [this](const ElementsRange& range) {
+        for (int i = range.first; i < range.end; ++i) {
+            m_splitters[i]->Compute();
         }
-        for (int iBrick = 0; iBrick < unit->GetBricksCount(); ++iBrick) {
-            Brick* brick = unit->GetBrick(iBrick);
-            if (brick->NeedsSolver()) {
-                continue;
-            }
-            if (brick->IsNull()) {
-                continue;
+    };
+    ForEachRange(m_splittersRanges, computeSplitters);
+
+    // Process the bricks that do not need a solver.
+    if (m_vectorizedProcesses) {
+        auto applyDirectChanges = [this](const ElementsRange& range) {
+            for (int i = range.first; i < range.end; ++i) {
+                m_directBrickGroups[i]->UpdateInputs();
+                ApplyDirectChanges(i);
             }
+        };
+        ForEachRange(m_directBrickGroupsRanges, applyDirectChanges);
 
-            ApplyDirectChanges(brick, ptIndex);
-        }
+        // Gather the parameters and forcing of the processes of the bricks that need a solver.
+        auto updateInputs = [this](const ElementsRange& range) {
+            for (int i = range.first; i < range.end; ++i) {
+                m_iterableBrickGroups[i]->UpdateInputs();
+            }
+        };
+        ForEachRange(m_iterableBrickGroupsRanges, updateInputs);
+    } else {
+        auto applyDirectChanges = [this](const ElementsRange& range) {
+            for (int i = range.first; i < range.end; ++i) {
+                int ptIndex = m_activeDirectBricks[i].firstRate;
+                ApplyDirectChanges(m_activeDirectBricks[i].brick, ptIndex);
+            }
+        };
+        ForEachRange(m_activeDirectRanges, applyDirectChanges);
     }
 
     // Process the bricks that need a solver
@@ -118,6 +484,10 @@ bool Processor::ProcessTimeStep() {
         return false;
     }
 
+    // Process the linear storages once their inputs are known
+    auto applyAnalyticalChanges = [this](const ElementsRange& range) { ApplyAnalyticalChanges(range); };
+    ForEachRange(m_activeAnalyticalRanges, applyAnalyticalChanges);
+
     if (!basin->ComputeOutletDischarge()) {
         return false;
     }
@@ -144,21 +514,16 @@ void Processor::ApplyDirectChanges(Brick* brick, int& ptIndex) {
     iRate = ptIndex;
     for (auto process : brick->GetProcesses()) {
         // Get the change rates (per day) independently of the time step and constraints
-        vecDouble rates = process->GetChangeRates();
-
-        int iRateCopy = iRate;
-        for (double rate : rates) {
-            wxASSERT(m_changeRatesNoSolver.rows() > iRateCopy);
-            m_changeRatesNoSolver(iRateCopy) = rate;
-            iRateCopy++;
-        }
+        int connectionsNb = process->GetConnectionsNb();
+        wxASSERT(m_changeRatesNoSolver.rows() >= iRate + connectionsNb);
+        process->GetChangeRates(&m_changeRatesNoSolver(iRate));
 
         // Apply constraints for the current brick (e.g. maximum capacity or avoid negative values)
-        process->GetWaterContainer()->ApplyConstraints(g_timeStepInDays);
+        process->GetWaterContainer()->ApplyConstraints(*m_timeStepInDays);
 
         // Apply changes
-        for (int i = 0; i < rates.size(); ++i) {
-            process->ApplyChange(i, m_changeRatesNoSolver(iRate), g_timeStepInDays);
+        for (int i = 0; i < connectionsNb; ++i) {
+            process->ApplyChange(i, m_changeRatesNoSolver(iRate), *m_timeStepInDays);
             m_changeRatesNoSolver(iRate) = 0;
             iRate++;
             ptIndex++;
@@ -167,3 +532,102 @@ void Processor::ApplyDirectChanges(Brick* brick, int& ptIndex) {
 
     brick->Finalize();
 }
+
+void Processor::ApplyDirectChanges(int groupIndex) {
+    BrickGroup* group = m_directBrickGroups[groupIndex];
+    const ElementsRange& groupBricks = m_activeDirectBrickGroupsBricks[groupIndex];
+    if (groupBricks.first == groupBricks.end) {
+        return;
+    }
+
+    // Initialize the change rates to 0 and link to fluxes
+    for (int iBrick = groupBricks.first; iBrick < groupBricks.end; ++iBrick) {
+        const ActiveBrick& activeBrick = m_activeDirectBricks[iBrick];
+        activeBrick.brick->UpdateContentFromInputs();
+        int iRate = activeBrick.firstRate;
+        for (auto process : activeBrick.brick->GetProcesses()) {
+            for (int i = 0; i < process->GetOutputFluxesNb(); ++i) {
+                wxASSERT(m_changeRatesNoSolver.rows() > iRate);
+                m_changeRatesNoSolver(iRate) = 0;
+
+                // Link to fluxes to enforce subsequent constraints
+                process->StoreInOutgoingFlux(&m_changeRatesNoSolver(iRate), i);
+                iRate++;
+            }
+        }
+    }
+
+    int firstConnection = 0;
+    for (int iProcess = 0; iProcess < group->GetProcessesNb(); ++iProcess) {
+        // Get the change rates (per day) of all the bricks independently of the time step and constraints
+        group->ComputeChangeRates(iProcess, m_changeRatesNoSolver);
+
+        int connectionsNb = group->GetBrick(0)->GetProcesses()[iProcess]->GetConnectionsNb();
+        for (int iBrick = groupBricks.first; iBrick < groupBricks.end; ++iBrick) {
+            const ActiveBrick& activeBrick = m_activeDirectBricks[iBrick];
+            Process* process = activeBrick.brick->GetProcesses()[iProcess];
+
+            // Apply constraints for the current brick (e.g. maximum capacity or avoid negative values)
+            process->GetWaterContainer()->ApplyConstraints(*m_timeStepInDays);
+
+            // Apply changes
+            int iRate = activeBrick.firstRate + firstConnection;
+            for (int i = 0; i < connectionsNb; ++i) {
+                process->ApplyChange(i, m_changeRatesNoSolver(iRate), *m_timeStepInDays);
+                m_changeRatesNoSolver(iRate) = 0;
+                iRate++;
+            }
+        }
+        firstConnection += connectionsNb;
+    }
+
+    for (int iBrick = groupBricks.first; iBrick < groupBricks.end; ++iBrick) {
+        m_activeDirectBricks[iBrick].brick->Finalize();
+    }
+}
+
+void Processor::ApplyAnalyticalChanges(const ElementsRange& range) {
+    int bricksNb = range.end - range.first;
+    if (bricksNb == 0) {
+        return;
+    }
+
+    // The ranges of the threads are disjoint segments of the arrays
+    auto contents = m_linearStorages.contents.segment(range.first, bricksNb);
+    auto inputs = m_linearStorages.inputs.segment(range.first, bricksNb);
+    auto responseFactors = m_linearStorages.responseFactors.segment(range.first, bricksNb);
+    auto decays = m_linearStorages.decays.segment(range.first, bricksNb);
+    auto outputs = m_linearStorages.outputs.segment(range.first, bricksNb);
+
+    // Gather the states, inputs and parameters of the bricks
+    for (int i = 0; i < bricksNb; ++i) {
+        Brick* brick = m_activeAnalyticalBricks[range.first + i].brick;
+        brick->UpdateContentFromInputs();
+
+        WaterContainer* container = brick->GetWaterContainer();
+        contents[i] = container->GetContentWithoutChanges();
+        inputs[i] = container->GetContentWithChanges() - contents[i];
+
+        double responseFactor = 0;
+        for (auto process : brick->GetProcesses()) {
+            responseFactor += static_cast<ProcessOutflowLinear*>(process)->GetResponseFactor();
+        }
+        responseFactors[i] = responseFactor;
+    }
+
+    // Closed-form solution of dS/dt = I - k S with constant inputs over the time step, for all bricks at once
+    double timeStepInDays = *m_timeStepInDays;
+    decays = (-responseFactors * timeStepInDays).exp();
+    outputs = contents + inputs - (contents * decays + inputs * (1.0 - decays) / (responseFactors * timeStepInDays));
+    outputs = (responseFactors > 0).select(outputs.max(0.0) / responseFactors, 0.0);
+
+    // Share the outputs between the outflows according to their response factor
+    for (int i = 0; i < bricksNb; ++i) {
+        Brick* brick = m_activeAnalyticalBricks[range.first + i].brick;
+        for (auto process : brick->GetProcesses()) {
+            double output = static_cast<ProcessOutflowLinear*>(process)->GetResponseFactor() * outputs[i];
+            process->ApplyChange(0, output / timeStepInDays, timeStepInDays);
+        }
+        brick->Finalize();
+    }
+}
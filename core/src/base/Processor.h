@@ -2,11 +2,45 @@
 #define HYDROBRICKS_PROCESSOR_H
 
 #include "Brick.h"
+#include "BrickGroup.h"
+#include "FluxToBrickInstantaneous.h"
 #include "Includes.h"
 #include "Solver.h"
+#include "Splitter.h"
+#include "ThreadPool.h"
 
 class ModelHydro;
 
+/**
+ * Range of elements (splitters or bricks) of the processor lists belonging to a group of hydro units.
+ */
+struct ElementsRange {
+    int first = 0;      // Index of the first element.
+    int end = 0;        // Index after the last element.
+    int firstRate = 0;  // Index of the first change rate of the elements.
+};
+
+/**
+ * Brick taking part in the computations (i.e. not null) along with the index of its first change rate.
+ */
+struct ActiveBrick {
+    Brick* brick = nullptr;
+    int firstRate = 0;
+};
+
+/**
+ * States, inputs and parameters of the linear storages integrated analytically, stored as contiguous arrays (one
+ * value per brick, in the order of the list of active bricks) so that the closed-form solution is computed for all
+ * the bricks at once.
+ */
+struct LinearStoragesArrays {
+    axd contents;         // Contents at the beginning of the time step.
+    axd inputs;           // Inputs over the time step.
+    axd responseFactors;  // Sum of the response factors of the outflows.
+    axd decays;           // Fraction of the contents remaining at the end of the time step.
+    axd outputs;          // Outputs over the time step per unit of response factor.
+};
+
 class Processor : public wxObject {
   public:
     explicit Processor();
@@ -23,6 +57,57 @@ class Processor : public wxObject {
 
     bool ProcessTimeStep();
 
+    Solver* GetSolver() {
+        return m_solver;
+    }
+
+    /**
+     * Apply a function to the ranges of active iterable bricks: first to the ranges of the hydro units
+     * (concurrently when multiple threads are used), then to the range of the sub-basin bricks.
+     *
+     * @param function The function to apply to each range.
+     */
+    template <typename Function>
+    void ForEachIterableRange(Function function) {
+        ForEachRange(m_activeIterableRanges, function);
+    }
+
+    /**
+     * Apply a function to the ranges of the groups of iterable bricks, in the same way as ForEachIterableRange().
+     *
+     * @param function The function to apply to each range.
+     */
+    template <typename Function>
+    void ForEachIterableBrickGroupRange(Function function) {
+        ForEachRange(m_iterableBrickGroupsRanges, function);
+    }
+
+    /**
+     * Check if the processes are evaluated by groups of similar bricks (see BrickGroup).
+     *
+     * @return True if the bricks are grouped.
+     */
+    bool HasBrickGroups() const {
+        return m_vectorizedProcesses;
+    }
+
+    /**
+     * Reset the processor and its solver to their initial state, before a new run.
+     */
+    void Reset();
+
+    /**
+     * Flag the lists of active bricks to be rebuilt before the next time step (e.g. after a change of land cover
+     * area fractions).
+     */
+    void InvalidateActiveBricks() {
+        m_activeBricksOutdated = true;
+    }
+
+    int GetThreadsNb() const {
+        return m_threadsNb;
+    }
+
     vecDoublePt* GetStateVariablesVectorPt() {
         return &m_stateVariableChanges;
     }
@@ -31,6 +116,39 @@ class Processor : public wxObject {
         return &m_iterableBricks;
     }
 
+    vector<Brick*>* GetDirectBricksVectorPt() {
+        return &m_directBricks;
+    }
+
+    vector<Brick*>* GetAnalyticalBricksVectorPt() {
+        return &m_analyticalBricks;
+    }
+
+    vector<ActiveBrick>* GetActiveIterableBricksVectorPt() {
+        return &m_activeIterableBricks;
+    }
+
+    vector<ActiveBrick>* GetActiveDirectBricksVectorPt() {
+        return &m_activeDirectBricks;
+    }
+
+    vector<ActiveBrick>* GetActiveAnalyticalBricksVectorPt() {
+        return &m_activeAnalyticalBricks;
+    }
+
+    vector<BrickGroup*>* GetIterableBrickGroupsVectorPt() {
+        return &m_iterableBrickGroups;
+    }
+
+    /**
+     * Get the ranges of the active bricks of each group, indexing the list of active iterable bricks.
+     *
+     * @return The ranges of the active bricks of the groups.
+     */
+    vector<ElementsRange>* GetActiveIterableBrickGroupsBricksVectorPt() {
+        return &m_activeIterableBrickGroupsBricks;
+    }
+
     int GetNbSolvableConnections() const {
         return m_solvableConnectionsNb;
     }
@@ -39,19 +157,187 @@ class Processor : public wxObject {
         return m_directConnectionsNb;
     }
 
+    /**
+     * Get the time step (in days) of the model the processor belongs to.
+     *
+     * @return The time step in days.
+     */
+    double GetTimeStepInDays() const {
+        wxASSERT(m_timeStepInDays);
+        return *m_timeStepInDays;
+    }
+
   protected:
     Solver* m_solver;
     ModelHydro* m_model;
+    double* m_timeStepInDays;
     int m_solvableConnectionsNb;
     int m_directConnectionsNb;
+    bool m_analyticalLinearStorages;
+    bool m_vectorizedProcesses;
+    int m_threadsNb;
+    ThreadPool* m_threadPool;
     vecDoublePt m_stateVariableChanges;
     vector<Brick*> m_iterableBricks;
+    vector<Brick*> m_directBricks;
+    vector<Brick*> m_analyticalBricks;
+    vector<Splitter*> m_splitters;
+    vector<BrickGroup*> m_iterableBrickGroups;
+    vector<BrickGroup*> m_directBrickGroups;
+    vector<ElementsRange> m_iterableRanges;
+    vector<ElementsRange> m_directRanges;
+    vector<ElementsRange> m_analyticalRanges;
+    vector<ElementsRange> m_splittersRanges;
+    vector<ElementsRange> m_iterableBrickGroupsRanges;
+    vector<ElementsRange> m_directBrickGroupsRanges;
+    vector<FluxToBrickInstantaneous*> m_deferredFluxes;
+    bool m_activeBricksOutdated;
+    vector<ActiveBrick> m_activeIterableBricks;
+    vector<ActiveBrick> m_activeDirectBricks;
+    vector<ActiveBrick> m_activeAnalyticalBricks;
+    vector<ElementsRange> m_activeIterableRanges;
+    vector<ElementsRange> m_activeDirectRanges;
+    vector<ElementsRange> m_activeAnalyticalRanges;
+    vector<ElementsRange> m_activeIterableBrickGroupsBricks;
+    vector<ElementsRange> m_activeDirectBrickGroupsBricks;
+    LinearStoragesArrays m_linearStorages;
     axd m_changeRatesNoSolver;
 
   private:
+    /**
+     * Order the bricks of the hydro units so that the same brick (and thus the same process types) is handled
+     * consecutively for all hydro units, while keeping the order of the bricks within each hydro unit.
+     *
+     * @param unitsBricks The bricks of each hydro unit.
+     * @return The bricks of all hydro units in a single vector.
+     */
+    static vector<Brick*> InterleaveHydroUnitsBricks(const vector<vector<Brick*>>& unitsBricks);
+
+    /**
+     * Gather the same brick of the hydro units (i.e. the bricks with the same index in each hydro unit).
+     *
+     * @param unitsBricks The bricks of each hydro unit.
+     * @return The lists of the bricks having the same index in the hydro units.
+     */
+    static vector<vector<Brick*>> GatherHydroUnitsBricks(const vector<vector<Brick*>>& unitsBricks);
+
+    /**
+     * Check if the brick is a linear storage that can be integrated analytically: a storage without capacity
+     * whose processes are only linear outflows to the outlet.
+     *
+     * @param brick The brick to check.
+     * @return True if the brick can be integrated analytically.
+     */
+    static bool IsLinearStorage(Brick* brick);
+
+    void AddIterableBrick(Brick* brick);
+
+    /**
+     * Split a list of bricks into runs of consecutive similar bricks (see BrickGroup::AreSimilar()).
+     *
+     * @param bricks The bricks to split.
+     * @return The runs of similar bricks.
+     */
+    static vector<vector<Brick*>> SplitIntoSimilarBricks(const vector<Brick*>& bricks);
+
+    /**
+     * Add the iterable bricks as groups of consecutive similar bricks (see BrickGroup).
+     *
+     * @param bricks The bricks to add.
+     */
+    void AddIterableBrickGroups(const vector<Brick*>& bricks);
+
+    /**
+     * Add the bricks that do not need a solver as groups of consecutive similar bricks (see BrickGroup).
+     *
+     * @param bricks The bricks to add.
+     */
+    void AddDirectBrickGroups(const vector<Brick*>& bricks);
+
+    /**
+     * Select the active bricks of the groups of bricks.
+     *
+     * @param groups The groups of bricks.
+     * @param groupsRanges The ranges of the groups.
+     * @param activeBricks The resulting list of active bricks.
+     * @param activeRanges The resulting ranges, indexing the list of active bricks.
+     * @param activeGroupsBricks The resulting ranges of the active bricks of each group.
+     */
+    static void SelectActiveBrickGroupsBricks(const vector<BrickGroup*>& groups,
+                                              const vector<ElementsRange>& groupsRanges,
+                                              vector<ActiveBrick>& activeBricks, vector<ElementsRange>& activeRanges,
+                                              vector<ElementsRange>& activeGroupsBricks);
+
+    /**
+     * Rebuild the lists of active bricks, i.e. the bricks that are not null, so that the null bricks (e.g. land
+     * covers with a zero area fraction) are not visited at every time step.
+     */
+    void UpdateActiveBricks();
+
+    /**
+     * Select the active bricks of the given ranges.
+     *
+     * @param bricks The list of bricks.
+     * @param ranges The ranges of the bricks.
+     * @param activeBricks The resulting list of active bricks.
+     * @param activeRanges The resulting ranges, indexing the list of active bricks.
+     */
+    static void SelectActiveBricks(const vector<Brick*>& bricks, const vector<ElementsRange>& ranges,
+                                   vector<ActiveBrick>& activeBricks, vector<ElementsRange>& activeRanges);
+
+    /**
+     * Defer the instantaneous fluxes from the hydro units to the sub-basin bricks, which are shared by the hydro
+     * units processed concurrently.
+     */
+    void DeferFluxesToSubBasinBricks();
+
+    /**
+     * Transfer the deferred instantaneous fluxes to their target (in a deterministic order).
+     */
+    void TransferDeferredFluxes();
+
+    /**
+     * Apply a function to the ranges of the hydro units (concurrently when multiple threads are used) and then
+     * to the last range (sub-basin elements).
+     *
+     * @param ranges The ranges of the elements.
+     * @param function The function to apply to each range.
+     */
+    template <typename Function>
+    void ForEachRange(const vector<ElementsRange>& ranges, Function& function) {
+        wxASSERT(!ranges.empty());
+        int unitRangesNb = int(ranges.size()) - 1;
+        if (m_threadPool) {
+            m_threadPool->Run(unitRangesNb, [&ranges, &function](int i) { function(ranges[i]); });
+            TransferDeferredFluxes();
+        } else {
+            for (int i = 0; i < unitRangesNb; ++i) {
+                function(ranges[i]);
+            }
+        }
+        function(ranges.back());
+    }
+
     void StoreStateVariableChanges(vecDoublePt& values);
 
     void ApplyDirectChanges(Brick* brick, int& ptIndex);
+
+    /**
+     * Apply the processes of a group of bricks that do not need a solver. Each process is evaluated for all the
+     * bricks at once and applied before the next process, as in ApplyDirectChanges().
+     *
+     * @param groupIndex The index of the group in the list of the direct brick groups.
+     */
+    void ApplyDirectChanges(int groupIndex);
+
+    /**
+     * Apply the closed-form solution of the linear storages over the time step. The inputs are considered constant
+     * over the time step. The states, inputs and parameters of the bricks are gathered into arrays, the solution is
+     * computed for all bricks at once, and the outputs are then applied to the bricks.
+     *
+     * @param range The range of the active linear storage bricks.
+     */
+    void ApplyAnalyticalChanges(const ElementsRange& range);
 };
 
 #endif  // HYDROBRICKS_PROCESSOR_H
@@ -39,8 +39,71 @@ SettingsModel::~SettingsModel() {
     }
 }
 
-void SettingsModel::SetSolver(const string& solverName) {
+SettingsModel* SettingsModel::Clone() const {
+    auto clone = new SettingsModel();
+    clone->m_logAll = m_logAll;
+    clone->m_modelStructures = m_modelStructures;
+    clone->m_solver = m_solver;
+    clone->m_timer = m_timer;
+
+    // The structures copy holds the same parameter pointers: duplicate them.
+    for (auto& modelStructure : clone->m_modelStructures) {
+        for (auto& brick : modelStructure.hydroUnitBricks) {
+            CloneParameters(brick.parameters);
+            for (auto& process : brick.processes) {
+                CloneParameters(process.parameters);
+            }
+        }
+        for (auto& brick : modelStructure.subBasinBricks) {
+            CloneParameters(brick.parameters);
+            for (auto& process : brick.processes) {
+                CloneParameters(process.parameters);
+            }
+        }
+        for (auto& splitter : modelStructure.hydroUnitSplitters) {
+            CloneParameters(splitter.parameters);
+        }
+        for (auto& splitter : modelStructure.subBasinSplitters) {
+            CloneParameters(splitter.parameters);
+        }
+    }
+
+    if (m_selectedStructure == nullptr || !clone->SelectStructure(m_selectedStructure->id)) {
+        clone->m_selectedStructure = &clone->m_modelStructures[0];
+    }
+
+    return clone;
+}
+
+void SettingsModel::CloneParameters(vector<Parameter*>& parameters) {
+    for (auto& parameter : parameters) {
+        wxASSERT(parameter);
+        parameter = parameter->Clone();
+    }
+}
+
+void SettingsModel::SetSolver(const string& solverName, double absTolerance, double relTolerance) {
+    if (absTolerance <= 0 || relTolerance < 0) {
+        throw InvalidArgument(_("The solver tolerances must be positive."));
+    }
     m_solver.name = solverName;
+    m_solver.absTolerance = absTolerance;
+    m_solver.relTolerance = relTolerance;
+}
+
+void SettingsModel::SetAnalyticalLinearStorages(bool active) {
+    m_solver.analyticalLinearStorages = active;
+}
+
+void SettingsModel::SetVectorizedProcesses(bool active) {
+    m_solver.vectorizedProcesses = active;
+}
+
+void SettingsModel::SetThreads(int threadsNb) {
+    if (threadsNb < 1) {
+        throw InvalidArgument(_("The number of threads must be at least 1."));
+    }
+    m_solver.threadsNb = threadsNb;
 }
 
 void SettingsModel::SetTimer(const string& start, const string& end, int timeStep, const string& timeStepUnit) {
@@ -224,6 +287,25 @@ void SettingsModel::AddProcessForcing(const string& name) {
     }
 }
 
+void SettingsModel::AddProcessPetForcing(const string& method) {
+    wxASSERT(m_selectedProcess);
+
+    if (method == "forcing") {
+        AddProcessForcing("pet");
+        return;
+    } else if (method == "oudin") {
+        AddProcessParameter("pet_k1", 100.0f);
+        AddProcessParameter("pet_k2", 5.0f);
+    } else if (method == "hargreaves") {
+        AddProcessParameter("pet_k", 0.0135f);
+    } else {
+        throw InvalidArgument(wxString::Format(_("The PET method '%s' is not available in the engine."), method));
+    }
+
+    m_selectedProcess->forcing.push_back(PET);
+    m_selectedProcess->petMethod = method;
+}
+
 void SettingsModel::AddProcessOutput(const string& target) {
     wxASSERT(m_selectedProcess);
 
@@ -724,6 +806,7 @@ bool SettingsModel::ParseStructure(const string& path) {
             if (base == "socont") {
                 int soilStorageNb = 1;
                 string surfaceRunoff = "socont_runoff";
+                string petMethod = "forcing";
                 if (YAML::Node options = settings["options"]) {
                     if (YAML::Node parameter = options["soil_storage_nb"]) {
                         soilStorageNb = parameter.as<int>();
@@ -731,8 +814,12 @@ bool SettingsModel::ParseStructure(const string& path) {
                     if (YAML::Node parameter = options["surface_runoff"]) {
                         surfaceRunoff = parameter.as<string>();
                     }
+                    if (YAML::Node parameter = options["pet_method"]) {
+                        petMethod = parameter.as<string>();
+                    }
                 }
-                return GenerateStructureSocont(landCoverTypes, landCoverNames, soilStorageNb, surfaceRunoff);
+                return GenerateStructureSocont(landCoverTypes, landCoverNames, soilStorageNb, surfaceRunoff,
+                                               petMethod);
             } else {
                 wxLogError(_("Model base '%s' not recognized."));
                 return false;
@@ -852,6 +939,20 @@ bool SettingsModel::ParseParameters(const string& path) {
 }
 
 bool SettingsModel::SetParameter(const string& component, const string& name, float value) {
+    vector<float*> valuePointers = GetParameterValuePointers(component, name);
+    if (valuePointers.empty()) {
+        return false;
+    }
+
+    for (auto valuePointer : valuePointers) {
+        *valuePointer = value;
+    }
+
+    return true;
+}
+
+vector<float*> SettingsModel::GetParameterValuePointers(const string& component, const string& name) {
+    vector<float*> valuePointers;
     bool isBrick = false;
     bool isSplitter = false;
 
@@ -864,34 +965,71 @@ bool SettingsModel::SetParameter(const string& component, const string& name, fl
         // Specific actions needed
     } else {
         wxLogError(_("Cannot find the component '%s'."), component);
-        return false;
+        return valuePointers;
     }
 
     // Can be: brick, splitter or process parameter.
     if (isBrick) {
         if (BrickHasParameter(name)) {
-            SetBrickParameterValue(name, value);
+            valuePointers.push_back(FindParameterValuePointer(m_selectedBrick->parameters, name));
         } else {
             SelectProcessWithParameter(name);
-            SetProcessParameterValue(name, value);
+            valuePointers.push_back(FindParameterValuePointer(m_selectedProcess->parameters, name));
         }
-        return true;
     } else if (isSplitter) {
-        SetSplitterParameterValue(name, value);
-        return true;
+        valuePointers.push_back(FindParameterValuePointer(m_selectedSplitter->parameters, name));
     } else {
-        if (component == "snowpack") {
-            for (int index : m_selectedStructure->landCoverBricks) {
-                BrickSettings brickSettings = m_selectedStructure->hydroUnitBricks[index];
-                SelectHydroUnitBrick(brickSettings.name + "_snowpack");
-                SelectProcessWithParameter(name);
-                SetProcessParameterValue(name, value);
+        for (int index : m_selectedStructure->landCoverBricks) {
+            BrickSettings brickSettings = m_selectedStructure->hydroUnitBricks[index];
+            SelectHydroUnitBrick(brickSettings.name + "_snowpack");
+            SelectProcessWithParameter(name);
+            valuePointers.push_back(FindParameterValuePointer(m_selectedProcess->parameters, name));
+        }
+    }
+
+    return valuePointers;
+}
+
+vector<float*> SettingsModel::GetParameterValuePointers() {
+    vector<float*> valuePointers;
+    auto addParameters = [&valuePointers](const vector<Parameter*>& parameters) {
+        for (auto parameter : parameters) {
+            valuePointers.push_back(parameter->GetValuePointer());
+        }
+    };
+
+    for (auto& modelStructure : m_modelStructures) {
+        for (auto& brick : modelStructure.hydroUnitBricks) {
+            addParameters(brick.parameters);
+            for (auto& process : brick.processes) {
+                addParameters(process.parameters);
             }
-            return true;
+        }
+        for (auto& brick : modelStructure.subBasinBricks) {
+            addParameters(brick.parameters);
+            for (auto& process : brick.processes) {
+                addParameters(process.parameters);
+            }
+        }
+        for (auto& splitter : modelStructure.hydroUnitSplitters) {
+            addParameters(splitter.parameters);
+        }
+        for (auto& splitter : modelStructure.subBasinSplitters) {
+            addParameters(splitter.parameters);
         }
     }
 
-    return false;
+    return valuePointers;
+}
+
+float* SettingsModel::FindParameterValuePointer(vector<Parameter*>& parameters, const string& name) {
+    for (auto parameter : parameters) {
+        if (parameter->GetName() == name) {
+            return parameter->GetValuePointer();
+        }
+    }
+
+    throw InvalidArgument(wxString::Format(_("The parameter '%s' was not found."), name));
 }
 
 vecStr SettingsModel::ParseLandCoverNames(const YAML::Node& settings) {
@@ -942,11 +1080,15 @@ bool SettingsModel::LogAll(const YAML::Node& settings) {
 }
 
 bool SettingsModel::GenerateStructureSocont(vecStr& landCoverTypes, vecStr& landCoverNames, int soilStorageNb,
-                                            const string& surfaceRunoff) {
+                                            const string& surfaceRunoff, const string& petMethod) {
     if (landCoverNames.size() != landCoverTypes.size()) {
         wxLogError(_("The length of the land cover names and types do not match."));
         return false;
     }
+    if (petMethod != "forcing" && petMethod != "oudin" && petMethod != "hargreaves") {
+        wxLogError(_("The PET method %s is not recognised in Socont."), petMethod);
+        return false;
+    }
 
     // Precipitation
     GeneratePrecipitationSplitters(true);
@@ -1010,7 +1152,7 @@ bool SettingsModel::GenerateStructureSocont(vecStr& landCoverTypes, vecStr& land
         AddHydroUnitBrick("slow_reservoir", "storage");
         AddBrickParameter("capacity", 200.0f);
         AddBrickProcess("et", "et:socont");
-        AddProcessForcing("pet");
+        AddProcessPetForcing(petMethod);
         AddBrickProcess("outflow", "outflow:linear", "outlet");
         AddProcessParameter("response_factor", 0.2f);
         AddBrickProcess("overflow", "overflow", "outlet");
@@ -1019,7 +1161,7 @@ bool SettingsModel::GenerateStructureSocont(vecStr& landCoverTypes, vecStr& land
         AddHydroUnitBrick("slow_reservoir", "storage");
         AddBrickParameter("capacity", 200.0f);
         AddBrickProcess("et", "et:socont");
-        AddProcessForcing("pet");
+        AddProcessPetForcing(petMethod);
         AddBrickProcess("outflow", "outflow:linear", "outlet");
         AddProcessParameter("response_factor", 0.2f);
         AddBrickProcess("percolation", "outflow:constant", "slow_reservoir_2");
@@ -8,6 +8,11 @@
 
 struct SolverSettings {
     string name;
+    double absTolerance = 0.1;   // Absolute tolerance [mm] of the adaptive solvers.
+    double relTolerance = 0.01;  // Relative tolerance [-] of the adaptive solvers.
+    bool analyticalLinearStorages = false;  // Integrate the linear storages with their closed-form solution.
+    bool vectorizedProcesses = false;       // Evaluate the processes of the same brick for all units at once.
+    int threadsNb = 1;                      // Number of threads sharing the hydro units.
 };
 
 struct TimerSettings {
@@ -31,6 +36,7 @@ struct ProcessSettings {
     vector<Parameter*> parameters;
     vector<VariableType> forcing;
     vector<OutputSettings> outputs;
+    string petMethod;  // Method of the PET computed in the engine (empty when provided as a time series).
 };
 
 struct SplitterSettings {
@@ -69,10 +75,51 @@ class SettingsModel : public wxObject {
 
     ~SettingsModel() override;
 
-    bool GenerateStructureSocont(vecStr& landCoverTypes, vecStr& landCoverNames, int soilStorageNb = 1,
-                                 const string& surfaceRunoff = "socont_runoff");
+    /**
+     * Create a deep copy of the settings. The parameters are duplicated so that the values of the copy can be changed
+     * without affecting the original settings.
+     *
+     * @return the copy of the settings (owned by the caller).
+     */
+    SettingsModel* Clone() const;
 
-    void SetSolver(const string& solverName);
+    bool GenerateStructureSocont(vecStr& landCoverTypes, vecStr& landCoverNames, int soilStorageNb = 1,
+                                 const string& surfaceRunoff = "socont_runoff", const string& petMethod = "forcing");
+
+    /**
+     * Set the solver to use: "euler_explicit", "heun_explicit", "rk4" (or "runge_kutta"), or one of the adaptive
+     * solvers "heun_euler" and "bogacki_shampine" (or "rk23"). Only "heun_euler" needs fewer change rate evaluations
+     * than "rk4" on calm periods (2 per time step). "bogacki_shampine" is more accurate, but its first stage is
+     * computed again at every time step, so that it needs at least as many evaluations as "rk4" (4 per time step).
+     *
+     * @param solverName The name of the solver.
+     * @param absTolerance The absolute tolerance [mm] per time step (only used by the adaptive solvers).
+     * @param relTolerance The relative tolerance [-] (only used by the adaptive solvers).
+     */
+    void SetSolver(const string& solverName, double absTolerance = 0.1, double relTolerance = 0.01);
+
+    /**
+     * Integrate the storages that only have linear outflows to the outlet with the closed-form solution
+     * (exponential decay) instead of the solver.
+     *
+     * @param active Option to activate the analytical integration.
+     */
+    void SetAnalyticalLinearStorages(bool active = true);
+
+    /**
+     * Evaluate the processes of the same brick of all the hydro units at once, on contiguous arrays of contents,
+     * parameters and forcing (see BrickGroup), instead of process by process.
+     *
+     * @param active Option to activate the vectorized evaluation.
+     */
+    void SetVectorizedProcesses(bool active = true);
+
+    /**
+     * Set the number of threads used to process the hydro units within a simulation.
+     *
+     * @param threadsNb The number of threads.
+     */
+    void SetThreads(int threadsNb);
 
     void SetTimer(const string& start, const string& end, int timeStep, const string& timeStepUnit);
 
@@ -102,6 +149,15 @@ class SettingsModel : public wxObject {
 
     void AddProcessForcing(const string& name);
 
+    /**
+     * Add the PET forcing to the selected process, either provided as a time series or computed in the engine
+     * from the temperature, the latitude of the hydro unit and the day of the year. The parameters of the PET method
+     * are added to the process.
+     *
+     * @param method The PET method: 'forcing' (time series), 'oudin' or 'hargreaves'.
+     */
+    void AddProcessPetForcing(const string& method);
+
     void AddProcessOutput(const string& target);
 
     void SetProcessOutputsAsInstantaneous();
@@ -178,6 +234,24 @@ class SettingsModel : public wxObject {
 
     bool SetParameter(const string& component, const string& name, float value);
 
+    /**
+     * Get the pointers to the values of a parameter. A parameter can be shared by several components (e.g. the
+     * snowpack parameters are defined for every land cover).
+     *
+     * @param component The name of the component (brick, splitter, or 'snowpack').
+     * @param name The name of the parameter.
+     * @return The pointers to the parameter values, or an empty vector if the component was not found.
+     */
+    vector<float*> GetParameterValuePointers(const string& component, const string& name);
+
+    /**
+     * Get the pointers to the values of all the parameters, in the order of the model structures. The order is the
+     * same for the copies of the settings (see Clone()).
+     *
+     * @return The pointers to the parameter values.
+     */
+    vector<float*> GetParameterValuePointers();
+
     int GetStructuresNb() const {
         return int(m_modelStructures.size());
     }
@@ -299,6 +373,10 @@ class SettingsModel : public wxObject {
     string ParseSolver(const YAML::Node& settings);
 
     bool LogAll(const YAML::Node& settings);
+
+    static void CloneParameters(vector<Parameter*>& parameters);
+
+    static float* FindParameterValuePointer(vector<Parameter*>& parameters, const string& name);
 };
 
 #endif  // HYDROBRICKS_SETTINGS_MODEL_H
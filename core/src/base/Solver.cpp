@@ -1,13 +1,15 @@
 #include "Solver.h"
 
 #include "Processor.h"
+#include "SolverAdaptive.h"
 #include "SolverEulerExplicit.h"
 #include "SolverHeunExplicit.h"
 #include "SolverRK4.h"
 
 Solver::Solver()
     : m_processor(nullptr),
-      m_nIterations(1) {}
+      m_nIterations(1),
+      m_rateEvaluationsNb(0) {}
 
 Solver* Solver::Factory(const SolverSettings& solverSettings) {
     if (solverSettings.name == "rk4" || solverSettings.name == "runge_kutta") {
@@ -16,6 +18,12 @@ Solver* Solver::Factory(const SolverSettings& solverSettings) {
         return new SolverEulerExplicit();
     } else if (solverSettings.name == "heun_explicit") {
         return new SolverHeunExplicit();
+    } else if (solverSettings.name == "heun_euler") {
+        return new SolverAdaptive(SolverAdaptive::HeunEuler, solverSettings.absTolerance,
+                                  solverSettings.relTolerance);
+    } else if (solverSettings.name == "bogacki_shampine" || solverSettings.name == "rk23") {
+        return new SolverAdaptive(SolverAdaptive::BogackiShampine, solverSettings.absTolerance,
+                                  solverSettings.relTolerance);
     }
     throw InvalidArgument(wxString::Format(_("Incorrect solver name: %s."), solverSettings.name));
 }
@@ -27,6 +35,11 @@ void Solver::InitializeContainers() {
     m_changeRates = axxd::Zero(m_processor->GetNbSolvableConnections(), m_nIterations);
 }
 
+void Solver::Reset() {
+    m_stateVariableChanges.setZero();
+    m_changeRates.setZero();
+}
+
 void Solver::SaveStateVariables(int col) {
     wxASSERT(m_processor);
     int counter = 0;
@@ -38,48 +51,100 @@ void Solver::SaveStateVariables(int col) {
 
 void Solver::ComputeChangeRates(int col, bool applyConstraints) {
     wxASSERT(m_processor);
-    int iRate = 0;
-    for (auto brick : *(m_processor->GetIterableBricksVectorPt())) {
-        double sumRates = 0.0;
-        for (auto process : brick->GetProcesses()) {
-            // Get the change rates (per day) independently of the time step and constraints (null bricks handled)
-            vecDouble rates = process->GetChangeRates();
-
-            for (int i = 0; i < rates.size(); ++i) {
-                wxASSERT(m_changeRates.rows() > iRate);
-                m_changeRates(iRate, col) = rates[i];
-                sumRates += rates[i];
-
-                // Link to fluxes to enforce subsequent constraints
-                if (applyConstraints) {
-                    process->StoreInOutgoingFlux(&m_changeRates(iRate, col), i);
+    m_rateEvaluationsNb++;
+    if (m_processor->HasBrickGroups()) {
+        ComputeBrickGroupsChangeRates(col, applyConstraints);
+        return;
+    }
+
+    vector<ActiveBrick>& bricks = *(m_processor->GetActiveIterableBricksVectorPt());
+    double timeStepInDays = m_processor->GetTimeStepInDays();
+    m_processor->ForEachIterableRange([&](const ElementsRange& range) {
+        for (int iBrick = range.first; iBrick < range.end; ++iBrick) {
+            Brick* brick = bricks[iBrick].brick;
+            int iRate = bricks[iBrick].firstRate;
+            double sumRates = 0.0;
+            for (auto process : brick->GetProcesses()) {
+                // Get the change rates (per day) independently of the time step and constraints
+                int connectionsNb = process->GetConnectionsNb();
+                wxASSERT(m_changeRates.rows() >= iRate + connectionsNb);
+                process->GetChangeRates(&m_changeRates(iRate, col));
+
+                for (int i = 0; i < connectionsNb; ++i) {
+                    sumRates += m_changeRates(iRate, col);
+
+                    // Link to fluxes to enforce subsequent constraints
+                    if (applyConstraints) {
+                        process->StoreInOutgoingFlux(&m_changeRates(iRate, col), i);
+                    }
+                    iRate++;
                 }
-                iRate++;
+            }
+
+            // Apply constraints for the current brick (e.g. maximum capacity or avoid negative values)
+            if (applyConstraints && sumRates > PRECISION) {
+                brick->ApplyConstraints(timeStepInDays);
             }
         }
+    });
+}
+
+void Solver::ComputeBrickGroupsChangeRates(int col, bool applyConstraints) {
+    vector<BrickGroup*>& groups = *(m_processor->GetIterableBrickGroupsVectorPt());
+    vector<ElementsRange>& groupsBricks = *(m_processor->GetActiveIterableBrickGroupsBricksVectorPt());
+    vector<ActiveBrick>& bricks = *(m_processor->GetActiveIterableBricksVectorPt());
+    double timeStepInDays = m_processor->GetTimeStepInDays();
+    m_processor->ForEachIterableBrickGroupRange([&](const ElementsRange& range) {
+        for (int iGroup = range.first; iGroup < range.end; ++iGroup) {
+            // Get the change rates (per day) of all the bricks of the group at once
+            groups[iGroup]->ComputeChangeRates(m_changeRates.col(col));
+
+            for (int iBrick = groupsBricks[iGroup].first; iBrick < groupsBricks[iGroup].end; ++iBrick) {
+                Brick* brick = bricks[iBrick].brick;
+                int iRate = bricks[iBrick].firstRate;
+                double sumRates = 0.0;
+                for (auto process : brick->GetProcesses()) {
+                    for (int i = 0; i < process->GetConnectionsNb(); ++i) {
+                        wxASSERT(m_changeRates.rows() > iRate);
+                        sumRates += m_changeRates(iRate, col);
+
+                        // Link to fluxes to enforce subsequent constraints
+                        if (applyConstraints) {
+                            process->StoreInOutgoingFlux(&m_changeRates(iRate, col), i);
+                        }
+                        iRate++;
+                    }
+                }
 
-        // Apply constraints for the current brick (e.g. maximum capacity or avoid negative values)
-        if (applyConstraints && sumRates > PRECISION) {
-            brick->ApplyConstraints(g_timeStepInDays);
+                // Apply constraints for the current brick (e.g. maximum capacity or avoid negative values)
+                if (applyConstraints && sumRates > PRECISION) {
+                    brick->ApplyConstraints(timeStepInDays);
+                }
+            }
         }
-    }
+    });
 }
 
 void Solver::ApplyConstraintsFor(int col) {
     wxASSERT(m_processor);
-    int iRate = 0;
-    for (auto brick : *(m_processor->GetIterableBricksVectorPt())) {
-        for (auto process : brick->GetProcesses()) {
-            for (int i = 0; i < process->GetConnectionsNb(); ++i) {
-                wxASSERT(m_changeRates.rows() > iRate);
-                // Link to fluxes to enforce subsequent constraints
-                process->StoreInOutgoingFlux(&m_changeRates(iRate, col), i);
-                iRate++;
+    vector<ActiveBrick>& bricks = *(m_processor->GetActiveIterableBricksVectorPt());
+    double timeStepInDays = m_processor->GetTimeStepInDays();
+    m_processor->ForEachIterableRange([&](const ElementsRange& range) {
+        for (int iBrick = range.first; iBrick < range.end; ++iBrick) {
+            Brick* brick = bricks[iBrick].brick;
+            int iRate = bricks[iBrick].firstRate;
+            for (auto process : brick->GetProcesses()) {
+                for (int i = 0; i < process->GetConnectionsNb(); ++i) {
+                    wxASSERT(m_changeRates.rows() > iRate);
+                    // Link to fluxes to enforce subsequent constraints
+                    process->StoreInOutgoingFlux(&m_changeRates(iRate, col), i);
+                    iRate++;
+                }
             }
+            // Apply constraints for the current brick (e.g. maximum capacity or avoid negative values)
+            brick->ApplyConstraints(timeStepInDays);
         }
-        // Apply constraints for the current brick (e.g. maximum capacity or avoid negative values)
-        brick->ApplyConstraints(g_timeStepInDays);
-    }
+    });
 }
 
 void Solver::ResetStateVariableChanges() {
@@ -108,48 +173,38 @@ void Solver::SetStateVariablesToAvgOf(int col1, int col2) {
 }
 
 void Solver::ApplyProcesses(int col) const {
-    wxASSERT(m_processor);
-    int iRate = 0;
-    for (auto brick : *(m_processor->GetIterableBricksVectorPt())) {
-        if (brick->IsNull()) {
-            continue;
-        }
-        brick->UpdateContentFromInputs();
-        for (auto process : brick->GetProcesses()) {
-            for (int iConnect = 0; iConnect < process->GetConnectionsNb(); ++iConnect) {
-                process->ApplyChange(iConnect, m_changeRates(iRate, col), g_timeStepInDays);
-                iRate++;
-            }
-        }
-    }
+    ApplyProcesses(m_changeRates.col(col));
 }
 
-void Solver::ApplyProcesses(const axd& changeRates) const {
+void Solver::ApplyProcesses(const Eigen::Ref<const axd>& changeRates) const {
     wxASSERT(m_processor);
-    int iRate = 0;
-    for (auto brick : *(m_processor->GetIterableBricksVectorPt())) {
-        if (brick->IsNull()) {
-            continue;
-        }
-        brick->UpdateContentFromInputs();
-        for (auto process : brick->GetProcesses()) {
-            for (int iConnect = 0; iConnect < process->GetConnectionsNb(); ++iConnect) {
-                process->ApplyChange(iConnect, changeRates(iRate), g_timeStepInDays);
-                iRate++;
+    vector<ActiveBrick>& bricks = *(m_processor->GetActiveIterableBricksVectorPt());
+    double timeStepInDays = m_processor->GetTimeStepInDays();
+    m_processor->ForEachIterableRange([&](const ElementsRange& range) {
+        for (int iBrick = range.first; iBrick < range.end; ++iBrick) {
+            Brick* brick = bricks[iBrick].brick;
+            int iRate = bricks[iBrick].firstRate;
+            brick->UpdateContentFromInputs();
+            for (auto process : brick->GetProcesses()) {
+                for (int iConnect = 0; iConnect < process->GetConnectionsNb(); ++iConnect) {
+                    process->ApplyChange(iConnect, changeRates(iRate), timeStepInDays);
+                    iRate++;
+                }
             }
         }
-    }
+    });
 }
 
 void Solver::Finalize() const {
     wxASSERT(m_processor);
-    for (auto brick : *(m_processor->GetIterableBricksVectorPt())) {
-        if (brick->IsNull()) {
-            continue;
-        }
-        brick->Finalize();
-        for (auto process : brick->GetProcesses()) {
-            process->Finalize();
+    vector<ActiveBrick>& bricks = *(m_processor->GetActiveIterableBricksVectorPt());
+    m_processor->ForEachIterableRange([&](const ElementsRange& range) {
+        for (int iBrick = range.first; iBrick < range.end; ++iBrick) {
+            Brick* brick = bricks[iBrick].brick;
+            brick->Finalize();
+            for (auto process : brick->GetProcesses()) {
+                process->Finalize();
+            }
         }
-    }
+    });
 }
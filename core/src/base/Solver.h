@@ -40,11 +40,33 @@ class Solver : public wxObject {
      */
     void InitializeContainers();
 
+    /**
+     * Reset the solver to its initial state, before a new run.
+     */
+    virtual void Reset();
+
+    /**
+     * Reset the stored change rates to zero.
+     */
+    void ResetChangeRates() {
+        m_changeRates.setZero();
+    }
+
+    /**
+     * Get the number of evaluations of the change rates since the creation of the solver.
+     *
+     * @return The number of evaluations of the change rates.
+     */
+    int GetRateEvaluationsNb() const {
+        return m_rateEvaluationsNb;
+    }
+
   protected:
     Processor* m_processor;
     axxd m_stateVariableChanges;
     axxd m_changeRates;
     int m_nIterations;
+    int m_rateEvaluationsNb;
 
     /**
      * Save the state variables.
@@ -61,6 +83,15 @@ class Solver : public wxObject {
      */
     void ComputeChangeRates(int col, bool applyConstraints = true);
 
+    /**
+     * Compute the change rates of all processes by groups of similar bricks (see BrickGroup), and then apply the
+     * constraints brick by brick.
+     *
+     * @param col The column of the internal storage where the change rates must be saved (= iteration).
+     * @param applyConstraints Option to apply the constraints (e.g., storage max capacity).
+     */
+    void ComputeBrickGroupsChangeRates(int col, bool applyConstraints);
+
     /**
      * Enforce the constraints for the change rates in the provided column.
      *
@@ -98,7 +129,7 @@ class Solver : public wxObject {
      *
      * @param changeRates The change rate values to use.
      */
-    void ApplyProcesses(const axd& changeRates) const;
+    void ApplyProcesses(const Eigen::Ref<const axd>& changeRates) const;
 
     /**
      * Apply all changes.
@@ -0,0 +1,154 @@
+#include "SolverAdaptive.h"
+
+#include "Processor.h"
+
+SolverAdaptive::SolverAdaptive(Method method, double absTolerance, double relTolerance)
+    : Solver(),
+      m_absTolerance(absTolerance),
+      m_relTolerance(relTolerance),
+      m_minSubStep(0.001),
+      m_subStep(1.0),
+      m_acceptedSubStepsNb(0),
+      m_rejectedSubStepsNb(0) {
+    switch (method) {
+        case HeunEuler:
+            // Heun's method (2nd order) with an embedded Euler step (1st order) for the error estimate.
+            m_stagesNb = 2;
+            m_errorOrder = 2;
+            m_firstSameAsLast = false;
+            m_c = {0.0, 1.0};
+            m_a = {{}, {1.0}};
+            m_b = {1.0 / 2.0, 1.0 / 2.0};
+            m_bError = {-1.0 / 2.0, 1.0 / 2.0};
+            break;
+        case BogackiShampine:
+            // Bogacki-Shampine 3(2) method. The last stage is evaluated at the new state and can be reused.
+            m_stagesNb = 4;
+            m_errorOrder = 3;
+            m_firstSameAsLast = true;
+            m_c = {0.0, 1.0 / 2.0, 3.0 / 4.0, 1.0};
+            m_a = {{}, {1.0 / 2.0}, {0.0, 3.0 / 4.0}, {2.0 / 9.0, 1.0 / 3.0, 4.0 / 9.0}};
+            m_b = {2.0 / 9.0, 1.0 / 3.0, 4.0 / 9.0, 0.0};
+            m_bError = {2.0 / 9.0 - 7.0 / 24.0, 1.0 / 3.0 - 1.0 / 4.0, 4.0 / 9.0 - 1.0 / 3.0, -1.0 / 8.0};
+            break;
+        default:
+            throw ShouldNotHappen();
+    }
+
+    // Stages, followed by a working column, the accumulated rates and the error estimate.
+    m_nIterations = m_stagesNb + 3;
+}
+
+void SolverAdaptive::Reset() {
+    Solver::Reset();
+
+    // The sub-step size adapted during the previous run must not affect the new one
+    m_subStep = 1.0;
+}
+
+bool SolverAdaptive::Solve() {
+    wxASSERT(m_processor);
+    double timeStep = m_processor->GetTimeStepInDays();
+    int colWork = m_stagesNb;
+    int colSum = m_stagesNb + 1;
+    int colError = m_stagesNb + 2;
+
+    // Compute the change rates for k1 = f(tn, Sn)
+    ComputeChangeRates(0);
+    m_changeRates.col(colSum).setZero();
+
+    // Sub-steps are expressed as fractions of the time step
+    double t = 0;
+    double h = m_subStep;
+
+    while (t < 1.0 - PRECISION) {
+        double hStep = wxMin(h, 1.0 - t);
+
+        // Compute the change rates of the subsequent stages
+        for (int i = 1; i < m_stagesNb; ++i) {
+            m_changeRates.col(colWork) = m_changeRates.col(colSum);
+            for (int j = 0; j < i; ++j) {
+                if (m_a[i][j] != 0) {
+                    m_changeRates.col(colWork) += hStep * m_a[i][j] * m_changeRates.col(j);
+                }
+            }
+            SetStateVariablesToFractionOf(colWork, t + m_c[i] * hStep);
+            ComputeChangeRates(i, false);
+        }
+
+        // Combine the stages into the sub-step rates and the error estimate
+        m_changeRates.col(colWork).setZero();
+        m_changeRates.col(colError).setZero();
+        for (int j = 0; j < m_stagesNb; ++j) {
+            if (m_b[j] != 0) {
+                m_changeRates.col(colWork) += m_b[j] * m_changeRates.col(j);
+            }
+            if (m_bError[j] != 0) {
+                m_changeRates.col(colError) += m_bError[j] * m_changeRates.col(j);
+            }
+        }
+
+        // Ratio between the estimated error (mm) and the tolerance
+        double amountFactor = hStep * timeStep;
+        double errorRatio = 0;
+        if (m_changeRates.rows() > 0) {
+            errorRatio = (amountFactor * m_changeRates.col(colError).abs() /
+                          (m_absTolerance + m_relTolerance * amountFactor * m_changeRates.col(colWork).abs()))
+                             .maxCoeff();
+        }
+
+        if (errorRatio <= 1.0 || hStep <= m_minSubStep) {
+            // Accept the sub-step
+            m_changeRates.col(colSum) += hStep * m_changeRates.col(colWork);
+            t += hStep;
+            m_acceptedSubStepsNb++;
+
+            // Change rates at the beginning of the next sub-step
+            if (t < 1.0 - PRECISION) {
+                if (m_firstSameAsLast) {
+                    m_changeRates.col(0) = m_changeRates.col(m_stagesNb - 1);
+                } else {
+                    m_changeRates.col(colWork) = m_changeRates.col(colSum);
+                    SetStateVariablesToFractionOf(colWork, t);
+                    ComputeChangeRates(0, false);
+                }
+            }
+        } else {
+            m_rejectedSubStepsNb++;
+        }
+
+        // Adapt the sub-step size
+        double factor = 5.0;
+        if (errorRatio > 0) {
+            factor = wxMax(0.2, wxMin(5.0, 0.9 * std::pow(errorRatio, -1.0 / m_errorOrder)));
+        }
+        h = wxMax(m_minSubStep, hStep * factor);
+    }
+
+    // Keep the sub-step size for the next time step
+    m_subStep = wxMin(1.0, h);
+
+    // Reset state variable changes to 0
+    ResetStateVariableChanges();
+
+    // Apply the rates averaged over the time step
+    ApplyConstraintsFor(colSum);
+    ApplyProcesses(colSum);
+    Finalize();
+
+    return true;
+}
+
+void SolverAdaptive::SetStateVariablesToFractionOf(int col, double fraction) {
+    wxASSERT(fraction > 0);
+
+    // The changes are linear in the rates: apply the average rates over the full time step and scale the result.
+    m_changeRates.col(col) /= fraction;
+    ResetStateVariableChanges();
+    ApplyConstraintsFor(col);
+    ApplyProcesses(col);
+
+    for (auto value : *(m_processor->GetStateVariablesVectorPt())) {
+        *value *= fraction;
+    }
+}
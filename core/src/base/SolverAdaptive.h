@@ -0,0 +1,75 @@
+#ifndef HYDROBRICKS_SOLVER_ADAPTIVE_H
+#define HYDROBRICKS_SOLVER_ADAPTIVE_H
+
+#include "Includes.h"
+#include "Solver.h"
+
+/**
+ * Embedded explicit Runge-Kutta solver with error control. The time step is split into sub-steps whose size
+ * is adapted to the estimated local error: calm periods are solved in a single sub-step while fast changing
+ * fluxes lead to a finer integration within the time step.
+ */
+class SolverAdaptive : public Solver {
+  public:
+    enum Method {
+        HeunEuler,
+        BogackiShampine
+    };
+
+    explicit SolverAdaptive(Method method = BogackiShampine, double absTolerance = 0.1, double relTolerance = 0.01);
+
+    /**
+     * @copydoc Solver::Solve()
+     */
+    bool Solve() override;
+
+    /**
+     * @copydoc Solver::Reset()
+     */
+    void Reset() override;
+
+    /**
+     * Get the number of sub-steps accepted since the creation of the solver.
+     *
+     * @return The number of accepted sub-steps.
+     */
+    int GetAcceptedSubStepsNb() const {
+        return m_acceptedSubStepsNb;
+    }
+
+    /**
+     * Get the number of sub-steps rejected since the creation of the solver.
+     *
+     * @return The number of rejected sub-steps.
+     */
+    int GetRejectedSubStepsNb() const {
+        return m_rejectedSubStepsNb;
+    }
+
+  protected:
+    int m_stagesNb;
+    int m_errorOrder;
+    bool m_firstSameAsLast;
+    vecDouble m_c;
+    vector<vecDouble> m_a;
+    vecDouble m_b;
+    vecDouble m_bError;
+    double m_absTolerance;
+    double m_relTolerance;
+    double m_minSubStep;
+    double m_subStep;
+    int m_acceptedSubStepsNb;
+    int m_rejectedSubStepsNb;
+
+  private:
+    /**
+     * Set the state variables to the values reached after the provided fraction of the time step.
+     *
+     * @param col The column of the internal storage containing the change rates weighted by the elapsed
+     * fractions of the time step (overwritten).
+     * @param fraction The elapsed fraction of the time step.
+     */
+    void SetStateVariablesToFractionOf(int col, double fraction);
+};
+
+#endif  // HYDROBRICKS_SOLVER_ADAPTIVE_H
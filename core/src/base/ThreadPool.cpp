@@ -0,0 +1,96 @@
+#include "ThreadPool.h"
+
+ThreadPool::ThreadPool(int threadsNb)
+    : m_task(nullptr),
+      m_tasksNb(0),
+      m_nextTask(0),
+      m_busyWorkersNb(0),
+      m_batchId(0),
+      m_stop(false) {
+    wxASSERT(threadsNb > 0);
+    for (int i = 1; i < threadsNb; ++i) {
+        m_workers.emplace_back(&ThreadPool::WorkerLoop, this);
+    }
+}
+
+ThreadPool::~ThreadPool() {
+    {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        m_stop = true;
+    }
+    m_startCondition.notify_all();
+    for (auto& worker : m_workers) {
+        worker.join();
+    }
+}
+
+void ThreadPool::Run(int tasksNb, const std::function<void(int)>& task) {
+    {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        m_task = &task;
+        m_tasksNb = tasksNb;
+        m_nextTask = 0;
+        m_busyWorkersNb = int(m_workers.size());
+        m_exception = nullptr;
+        m_batchId++;
+    }
+    m_startCondition.notify_all();
+
+    ExecuteTasks();
+
+    std::unique_lock<std::mutex> lock(m_mutex);
+    m_doneCondition.wait(lock, [this] { return m_busyWorkersNb == 0; });
+    m_task = nullptr;
+
+    if (m_exception) {
+        std::exception_ptr exception = m_exception;
+        m_exception = nullptr;
+        std::rethrow_exception(exception);
+    }
+}
+
+void ThreadPool::WorkerLoop() {
+    long lastBatchId = 0;
+    while (true) {
+        {
+            std::unique_lock<std::mutex> lock(m_mutex);
+            m_startCondition.wait(lock, [this, lastBatchId] { return m_stop || m_batchId != lastBatchId; });
+            if (m_stop) {
+                return;
+            }
+            lastBatchId = m_batchId;
+        }
+
+        ExecuteTasks();
+
+        {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            m_busyWorkersNb--;
+        }
+        m_doneCondition.notify_one();
+    }
+}
+
+void ThreadPool::ExecuteTasks() {
+    while (true) {
+        int iTask;
+        const std::function<void(int)>* task;
+        {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            if (m_nextTask >= m_tasksNb) {
+                return;
+            }
+            iTask = m_nextTask++;
+            task = m_task;
+        }
+
+        try {
+            (*task)(iTask);
+        } catch (...) {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            if (!m_exception) {
+                m_exception = std::current_exception();
+            }
+        }
+    }
+}
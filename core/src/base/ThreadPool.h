@@ -0,0 +1,61 @@
+#ifndef HYDROBRICKS_THREAD_POOL_H
+#define HYDROBRICKS_THREAD_POOL_H
+
+#include <condition_variable>
+#include <functional>
+#include <mutex>
+#include <thread>
+
+#include "Includes.h"
+
+/**
+ * Persistent pool of threads executing batches of indexed tasks. The calling thread takes part in the
+ * execution and the call returns once all the tasks of the batch are done.
+ */
+class ThreadPool {
+  public:
+    /**
+     * Create the pool.
+     *
+     * @param threadsNb The total number of threads (including the calling thread).
+     */
+    explicit ThreadPool(int threadsNb);
+
+    ~ThreadPool();
+
+    ThreadPool(const ThreadPool&) = delete;
+
+    ThreadPool& operator=(const ThreadPool&) = delete;
+
+    /**
+     * Execute the task for every index in [0, tasksNb[ and wait for completion. An exception raised by a task
+     * is rethrown in the calling thread.
+     *
+     * @param tasksNb The number of tasks.
+     * @param task The task to execute, receiving the task index.
+     */
+    void Run(int tasksNb, const std::function<void(int)>& task);
+
+    int GetThreadsNb() const {
+        return int(m_workers.size()) + 1;
+    }
+
+  private:
+    vector<std::thread> m_workers;
+    std::mutex m_mutex;
+    std::condition_variable m_startCondition;
+    std::condition_variable m_doneCondition;
+    const std::function<void(int)>* m_task;
+    int m_tasksNb;
+    int m_nextTask;
+    int m_busyWorkersNb;
+    long m_batchId;
+    bool m_stop;
+    std::exception_ptr m_exception;
+
+    void WorkerLoop();
+
+    void ExecuteTasks();
+};
+
+#endif  // HYDROBRICKS_THREAD_POOL_H
@@ -2,6 +2,7 @@
 
 TimeMachine::TimeMachine()
     : m_date(0),
+      m_dayOfYear(0),
       m_start(0),
       m_end(0),
       m_timeStep(0),
@@ -17,6 +18,7 @@ void TimeMachine::Initialize(double start, double end, int timeStep, TimeUnit ti
     m_timeStep = timeStep;
     m_timeStepUnit = timeStepUnit;
     UpdateTimeStepInDays();
+    UpdateDayOfYear();
 }
 
 void TimeMachine::Initialize(const TimerSettings& settings) {
@@ -36,10 +38,12 @@ void TimeMachine::Initialize(const TimerSettings& settings) {
     }
 
     UpdateTimeStepInDays();
+    UpdateDayOfYear();
 }
 
 void TimeMachine::Reset() {
     m_date = m_start;
+    UpdateDayOfYear();
 }
 
 bool TimeMachine::IsOver() {
@@ -49,6 +53,7 @@ bool TimeMachine::IsOver() {
 void TimeMachine::IncrementTime() {
     wxASSERT(m_timeStepInDays > 0);
     m_date += m_timeStepInDays;
+    UpdateDayOfYear();
 
     if (m_parametersUpdater) {
         m_parametersUpdater->DateUpdate(m_date);
@@ -83,3 +88,8 @@ void TimeMachine::UpdateTimeStepInDays() {
             wxLogError(_("The provided time step unit is not allowed."));
     }
 }
+
+void TimeMachine::UpdateDayOfYear() {
+    Time date = GetTimeStructFromMJD(m_date);
+    m_dayOfYear = int(std::floor(m_date - GetMJD(date.year))) + 1;
+}
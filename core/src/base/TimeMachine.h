@@ -42,6 +42,15 @@ class TimeMachine : public wxObject {
         return &m_timeStepInDays;
     }
 
+    /**
+     * Get a pointer to the day of the year (1-366) of the current date.
+     *
+     * @return pointer to the day of the year.
+     */
+    int* GetDayOfYearPointer() {
+        return &m_dayOfYear;
+    }
+
     void SetParametersUpdater(ParametersUpdater* parametersUpdater) {
         m_parametersUpdater = parametersUpdater;
     }
@@ -53,6 +62,7 @@ class TimeMachine : public wxObject {
   protected:
   private:
     double m_date;
+    int m_dayOfYear;
     double m_start;
     double m_end;
     int m_timeStep;
@@ -60,6 +70,8 @@ class TimeMachine : public wxObject {
     double m_timeStepInDays;
     ParametersUpdater* m_parametersUpdater;
     BehavioursManager* m_behavioursManager;
+
+    void UpdateDayOfYear();
 };
 
 #endif  // HYDROBRICKS_TIME_MACHINE_H
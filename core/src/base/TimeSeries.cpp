@@ -2,6 +2,7 @@
 
 #include "FileNetcdf.h"
 #include "TimeSeriesDistributed.h"
+#include "TimeSeriesSpatialized.h"
 #include "TimeSeriesUniform.h"
 
 TimeSeries::TimeSeries(VariableType type)
@@ -59,22 +60,23 @@ bool TimeSeries::Parse(const string& path, vector<TimeSeries*>& vecTimeSeries) {
             // Retrieve values from netCDF
             vecInt dimIds = file.GetVarDimIds(iVar, 2);
 
+            // The values of all units are kept in a single block shared by the time series of the units.
+            auto values = std::make_shared<axxd>();
+            int timeStride, unitStride;
             if (dimIds[0] == dimIdTime) {
-                axxd values = file.GetVarDouble2D(iVar, unitsNb, timeLength);
-                for (int i = 0; i < values.rows(); ++i) {
-                    axd valuesUnit = values.row(i);
-                    auto forcingData = new TimeSeriesDataRegular(start, end, timeStep, timeUnit);
-                    forcingData->SetValues(vector<double>(valuesUnit.data(), valuesUnit.data() + valuesUnit.rows()));
-                    timeSeries->AddData(forcingData, ids[i]);
-                }
+                *values = file.GetVarDouble2D(iVar, unitsNb, timeLength);
+                timeStride = int(values->rows());
+                unitStride = 1;
             } else {
-                axxd values = file.GetVarDouble2D(iVar, timeLength, unitsNb);
-                for (int i = 0; i < values.cols(); ++i) {
-                    axd valuesUnit = values.col(i);
-                    auto forcingData = new TimeSeriesDataRegular(start, end, timeStep, timeUnit);
-                    forcingData->SetValues(vector<double>(valuesUnit.data(), valuesUnit.data() + valuesUnit.rows()));
-                    timeSeries->AddData(forcingData, ids[i]);
-                }
+                *values = file.GetVarDouble2D(iVar, timeLength, unitsNb);
+                timeStride = 1;
+                unitStride = int(values->rows());
+            }
+            std::shared_ptr<const double> buffer(values, values->data());
+            for (int i = 0; i < unitsNb; ++i) {
+                auto forcingData = new TimeSeriesDataStrided(start, end, timeStep, timeUnit);
+                forcingData->SetBuffer(buffer, timeLength, timeStride, i * unitStride);
+                timeSeries->AddData(forcingData, ids[i]);
             }
 
             vecTimeSeries.push_back(timeSeries);
@@ -89,17 +91,33 @@ bool TimeSeries::Parse(const string& path, vector<TimeSeries*>& vecTimeSeries) {
 }
 
 TimeSeries* TimeSeries::Create(const string& varName, const axd& time, const axi& ids, const axxd& data) {
-    // Get time
-    Time startSt = GetTimeStructFromMJD(time[0]);
-    Time endSt = GetTimeStructFromMJD(time[time.size() - 1]);
-    double start = GetMJD(startSt.year, startSt.month, startSt.day, startSt.hour, startSt.min);
-    double end = GetMJD(endSt.year, endSt.month, endSt.day, endSt.hour, endSt.min);
+    if (data.rows() != time.size() || data.cols() != ids.size()) {
+        wxLogError(_("Dimension mismatch in the forcing data."));
+        throw InvalidArgument(wxString::Format(_("Dimension mismatch in the forcing data (%d != %d and/or %d != %d)."),
+                                               int(data.rows()), int(time.size()), int(data.cols()), int(ids.size())));
+    }
+
+    // Single copy of the data (column-major), shared by the time series of the units.
+    auto values = std::make_shared<axxd>(data);
+    std::shared_ptr<const double> buffer(values, values->data());
+
+    return CreateStrided(varName, time, ids, buffer, 1, int(data.rows()));
+}
+
+TimeSeries* TimeSeries::CreateFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                         std::shared_ptr<const double> data) {
+    return CreateStrided(varName, time, ids, data, int(ids.size()), 1);
+}
+
+TimeSeries* TimeSeries::CreateStrided(const string& varName, const axd& time, const axi& ids,
+                                      const std::shared_ptr<const double>& data, int timeStride, int unitStride) {
+    wxASSERT(data);
 
-    // Time step
+    // Get time properties
+    double start, end;
     int timeStep;
     TimeUnit timeUnit;
-    double timeStepData = time[1] - time[0];
-    ExtractTimeStep(timeStepData, timeStep, timeUnit);
+    ExtractTimeProperties(time, start, end, timeStep, timeUnit);
 
     // Get forcing type
     VariableType varType = MatchVariableType(varName);
@@ -107,16 +125,11 @@ TimeSeries* TimeSeries::Create(const string& varName, const axd& time, const axi
     // Instantiate time series
     auto timeSeries = new TimeSeriesDistributed(varType);
 
-    if (data.rows() != time.size() || data.cols() != ids.size()) {
-        wxLogError(_("Dimension mismatch in the forcing data."));
-        throw InvalidArgument(wxString::Format(_("Dimension mismatch in the forcing data (%d != %d and/or %d != %d)."),
-                                               int(data.rows()), int(time.size()), int(data.cols()), int(ids.size())));
-    }
-
-    for (int i = 0; i < data.cols(); ++i) {
-        axd valuesUnit = data.col(i);
-        auto forcingData = new TimeSeriesDataRegular(start, end, timeStep, timeUnit);
-        if (!forcingData->SetValues(vector<double>(valuesUnit.data(), valuesUnit.data() + valuesUnit.rows()))) {
+    for (int i = 0; i < ids.size(); ++i) {
+        auto forcingData = new TimeSeriesDataStrided(start, end, timeStep, timeUnit);
+        if (!forcingData->SetBuffer(data, int(time.size()), timeStride, i * unitStride)) {
+            wxDELETE(forcingData);
+            wxDELETE(timeSeries);
             throw InvalidArgument("Time series creation failed.");
         }
         timeSeries->AddData(forcingData, ids[i]);
@@ -125,12 +138,67 @@ TimeSeries* TimeSeries::Create(const string& varName, const axd& time, const axi
     return timeSeries;
 }
 
+TimeSeries* TimeSeries::CreateUniformFromBuffer(const string& varName, const axd& time,
+                                                std::shared_ptr<const double> data) {
+    wxASSERT(data);
+
+    // Get time properties
+    double start, end;
+    int timeStep;
+    TimeUnit timeUnit;
+    ExtractTimeProperties(time, start, end, timeStep, timeUnit);
+
+    // Single data shared by all hydro units
+    auto timeSeries = new TimeSeriesUniform(MatchVariableType(varName));
+    auto forcingData = new TimeSeriesDataStrided(start, end, timeStep, timeUnit);
+    if (!forcingData->SetBuffer(std::move(data), int(time.size()), 1, 0)) {
+        wxDELETE(forcingData);
+        wxDELETE(timeSeries);
+        throw InvalidArgument("Time series creation failed.");
+    }
+    timeSeries->SetData(forcingData);
+
+    return timeSeries;
+}
+
+TimeSeries* TimeSeries::CreateSpatializedFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                                    std::shared_ptr<const double> data) {
+    wxASSERT(data);
+
+    // Get time properties
+    double start, end;
+    int timeStep;
+    TimeUnit timeUnit;
+    ExtractTimeProperties(time, start, end, timeStep, timeUnit);
+
+    // Station data
+    auto stationData = new TimeSeriesDataStrided(start, end, timeStep, timeUnit);
+    if (!stationData->SetBuffer(std::move(data), int(time.size()), 1, 0)) {
+        wxDELETE(stationData);
+        throw InvalidArgument("Time series creation failed.");
+    }
+
+    // Month of each time step (for the monthly gradients)
+    vecInt months(time.size());
+    for (int i = 0; i < time.size(); ++i) {
+        months[i] = GetTimeStructFromMJD(time[i]).month - 1;
+    }
+
+    vecInt unitIds(ids.data(), ids.data() + ids.size());
+
+    return new TimeSeriesSpatialized(MatchVariableType(varName), stationData, months, unitIds);
+}
+
 VariableType TimeSeries::MatchVariableType(const string& varName) {
     VariableType varType;
     if (StringsMatch(varName, "precipitation") || StringsMatch(varName, "p")) {
         varType = Precipitation;
     } else if (StringsMatch(varName, "temperature") || StringsMatch(varName, "t")) {
         varType = Temperature;
+    } else if (StringsMatch(varName, "temperature_min") || StringsMatch(varName, "t_min")) {
+        varType = TemperatureMin;
+    } else if (StringsMatch(varName, "temperature_max") || StringsMatch(varName, "t_max")) {
+        varType = TemperatureMax;
     } else if (StringsMatch(varName, "pet") || StringsMatch(varName, "etp")) {
         varType = PET;
     } else if (StringsMatch(varName, "custom_1")) {
@@ -145,6 +213,17 @@ VariableType TimeSeries::MatchVariableType(const string& varName) {
     return varType;
 }
 
+void TimeSeries::ExtractTimeProperties(const axd& time, double& start, double& end, int& timeStep,
+                                       TimeUnit& timeUnit) {
+    Time startSt = GetTimeStructFromMJD(time[0]);
+    Time endSt = GetTimeStructFromMJD(time[time.size() - 1]);
+    start = GetMJD(startSt.year, startSt.month, startSt.day, startSt.hour, startSt.min);
+    end = GetMJD(endSt.year, endSt.month, endSt.day, endSt.hour, endSt.min);
+
+    double timeStepData = time[1] - time[0];
+    ExtractTimeStep(timeStepData, timeStep, timeUnit);
+}
+
 void TimeSeries::ExtractTimeStep(double timeStepData, int& timeStep, TimeUnit& timeUnit) {
     timeStep = 0;
     timeUnit = Day;
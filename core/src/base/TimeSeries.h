@@ -15,6 +15,54 @@ class TimeSeries : public wxObject {
 
     static TimeSeries* Create(const string& varName, const axd& time, const axi& ids, const axxd& data);
 
+    /**
+     * Create a distributed time series reading its values directly in the provided buffer, without copying them.
+     *
+     * @param varName The name of the variable.
+     * @param time The dates of the time steps (MJD).
+     * @param ids The ids of the hydro units.
+     * @param data The values as a contiguous row-major array (one row per time step, one column per hydro unit).
+     * The buffer is shared with the time series and must not be modified while in use.
+     * @return The time series (owned by the caller).
+     */
+    static TimeSeries* CreateFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                        std::shared_ptr<const double> data);
+
+    /**
+     * Create a uniform time series (same values for all hydro units) reading its values directly in the provided
+     * buffer, without copying them.
+     *
+     * @param varName The name of the variable.
+     * @param time The dates of the time steps (MJD).
+     * @param data The contiguous values (one per time step). The buffer is shared with the time series and must not
+     * be modified while in use.
+     * @return The time series (owned by the caller).
+     */
+    static TimeSeries* CreateUniformFromBuffer(const string& varName, const axd& time,
+                                               std::shared_ptr<const double> data);
+
+    /**
+     * Create a time series computing the values of the hydro units on the fly from a single station series (e.g.
+     * with elevation gradients, see TimeSeriesSpatialized::SetElevationGradients). The station values are read
+     * directly in the provided buffer, without copying them.
+     *
+     * @param varName The name of the variable.
+     * @param time The dates of the time steps (MJD).
+     * @param ids The ids of the hydro units.
+     * @param data The contiguous station values (one per time step). The buffer is shared with the time series and
+     * must not be modified while in use.
+     * @return The time series (owned by the caller).
+     */
+    static TimeSeries* CreateSpatializedFromBuffer(const string& varName, const axd& time, const axi& ids,
+                                                   std::shared_ptr<const double> data);
+
+    /**
+     * Create a deep copy of the time series (including the data).
+     *
+     * @return the copy of the time series (owned by the caller).
+     */
+    virtual TimeSeries* Clone() const = 0;
+
     virtual bool SetCursorToDate(double date) = 0;
 
     virtual bool AdvanceOneTimeStep() = 0;
@@ -33,13 +81,30 @@ class TimeSeries : public wxObject {
         return m_type;
     }
 
+    static VariableType MatchVariableType(const string& varName);
+
   protected:
     VariableType m_type;
 
   private:
-    static void ExtractTimeStep(double timeStepData, int& timeStep, TimeUnit& timeUnit);
+    /**
+     * Create a distributed time series reading its values in a shared buffer.
+     *
+     * @param varName The name of the variable.
+     * @param time The dates of the time steps (MJD).
+     * @param ids The ids of the hydro units.
+     * @param data The shared buffer containing the values of all hydro units.
+     * @param timeStride The distance between two consecutive time steps in the buffer.
+     * @param unitStride The distance between two consecutive hydro units in the buffer.
+     * @return The time series (owned by the caller).
+     */
+    static TimeSeries* CreateStrided(const string& varName, const axd& time, const axi& ids,
+                                     const std::shared_ptr<const double>& data, int timeStride, int unitStride);
+
+    static void ExtractTimeProperties(const axd& time, double& start, double& end, int& timeStep,
+                                      TimeUnit& timeUnit);
 
-    static VariableType MatchVariableType(const string& varName);
+    static void ExtractTimeStep(double timeStepData, int& timeStep, TimeUnit& timeUnit);
 };
 
 #endif  // HYDROBRICKS_TIME_SERIES_H
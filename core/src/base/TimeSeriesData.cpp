@@ -111,6 +111,69 @@ double TimeSeriesDataRegular::GetEnd() {
     return m_end;
 }
 
+/*
+ * TimeSeriesDataStrided
+ */
+
+TimeSeriesDataStrided::TimeSeriesDataStrided(double start, double end, int timeStep, TimeUnit timeStepUnit)
+    : TimeSeriesDataRegular(start, end, timeStep, timeStepUnit),
+      m_length(0),
+      m_stride(1),
+      m_offset(0) {}
+
+bool TimeSeriesDataStrided::SetBuffer(std::shared_ptr<const double> buffer, int length, int stride, int offset) {
+    wxASSERT(buffer);
+    double calcEnd = IncrementDateBy(m_start, m_timeStep * (length - 1), m_timeStepUnit);
+    if (calcEnd != m_end) {
+        wxLogError(_("The size of the time series data does not match the time properties."));
+        wxLogError(_("End of the data (%d) != end of the dates (%d)."), calcEnd, m_end);
+        return false;
+    }
+
+    m_buffer = std::move(buffer);
+    m_length = length;
+    m_stride = stride;
+    m_offset = offset;
+    return true;
+}
+
+bool TimeSeriesDataStrided::SetValues(const vecDouble& values) {
+    // Store the values in a buffer owned by the time series
+    auto buffer = std::make_shared<vecDouble>(values);
+    return SetBuffer(std::shared_ptr<const double>(buffer, buffer->data()), int(values.size()), 1, 0);
+}
+
+double TimeSeriesDataStrided::GetValueFor(double date) {
+    SetCursorToDate(date);
+    return GetCurrentValue();
+}
+
+double TimeSeriesDataStrided::GetCurrentValue() {
+    wxASSERT(m_buffer);
+    wxASSERT(m_length > m_cursor);
+    return m_buffer.get()[size_t(m_cursor) * m_stride + m_offset];
+}
+
+double TimeSeriesDataStrided::GetSum() {
+    double sum = 0;
+    const double* values = m_buffer.get() + m_offset;
+    for (int i = 0; i < m_length; ++i) {
+        sum += values[size_t(i) * m_stride];
+    }
+
+    return sum;
+}
+
+bool TimeSeriesDataStrided::AdvanceOneTimeStep() {
+    if (m_cursor >= m_length) {
+        wxLogError(_("The desired date is after the data ending date."));
+        return false;
+    }
+    m_cursor++;
+
+    return true;
+}
+
 /*
  * TimeSeriesDataIrregular
  */
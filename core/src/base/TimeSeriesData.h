@@ -9,6 +9,8 @@ class TimeSeriesData : public wxObject {
 
     ~TimeSeriesData() override = default;
 
+    virtual TimeSeriesData* Clone() const = 0;
+
     virtual bool SetValues(const vecDouble& values);
 
     virtual double GetValueFor(double date);
@@ -25,6 +27,10 @@ class TimeSeriesData : public wxObject {
 
     virtual double GetEnd() = 0;
 
+    int GetCursor() const {
+        return m_cursor;
+    }
+
   protected:
     vecDouble m_values;
     int m_cursor;
@@ -38,6 +44,10 @@ class TimeSeriesDataRegular : public TimeSeriesData {
 
     ~TimeSeriesDataRegular() override = default;
 
+    TimeSeriesDataRegular* Clone() const override {
+        return new TimeSeriesDataRegular(*this);
+    }
+
     bool SetValues(const vecDouble& values) override;
 
     double GetValueFor(double date) override;
@@ -63,12 +73,78 @@ class TimeSeriesDataRegular : public TimeSeriesData {
   private:
 };
 
+/**
+ * Regular time series reading its values in a buffer shared with other time series (e.g. a time x units array
+ * holding the data of all hydro units). The value of a time step is found at (cursor * stride + offset). The buffer
+ * is kept alive as long as a time series uses it, and the copies (Clone()) share it. It is never modified by the
+ * core, but its owner can overwrite it in place, in which case all the time series sharing it see the new values.
+ */
+class TimeSeriesDataStrided : public TimeSeriesDataRegular {
+  public:
+    TimeSeriesDataStrided(double start, double end, int timeStep, TimeUnit timeStepUnit);
+
+    ~TimeSeriesDataStrided() override = default;
+
+    TimeSeriesDataStrided* Clone() const override {
+        return new TimeSeriesDataStrided(*this);
+    }
+
+    /**
+     * Set the shared buffer to read the values from.
+     *
+     * @param buffer The shared buffer.
+     * @param length The number of time steps.
+     * @param stride The distance (in number of values) between two consecutive time steps.
+     * @param offset The position of the first value in the buffer.
+     * @return True if the length matches the time properties.
+     */
+    bool SetBuffer(std::shared_ptr<const double> buffer, int length, int stride, int offset);
+
+    bool SetValues(const vecDouble& values) override;
+
+    double GetValueFor(double date) override;
+
+    double GetCurrentValue() override;
+
+    double GetSum() override;
+
+    bool AdvanceOneTimeStep() override;
+
+    /**
+     * Get the value of a given time step, without moving the cursor.
+     *
+     * @param index The index of the time step.
+     * @return The value.
+     */
+    double GetValueAt(int index) const {
+        wxASSERT(m_buffer);
+        wxASSERT(index >= 0 && index < m_length);
+        return m_buffer.get()[size_t(index) * m_stride + m_offset];
+    }
+
+    int GetLength() const {
+        return m_length;
+    }
+
+  protected:
+    std::shared_ptr<const double> m_buffer;
+    int m_length;
+    int m_stride;
+    int m_offset;
+
+  private:
+};
+
 class TimeSeriesDataIrregular : public TimeSeriesData {
   public:
     explicit TimeSeriesDataIrregular(vecDouble& dates);
 
     ~TimeSeriesDataIrregular() override = default;
 
+    TimeSeriesDataIrregular* Clone() const override {
+        return new TimeSeriesDataIrregular(*this);
+    }
+
     bool SetValues(const vecDouble& values) override;
 
     double GetValueFor(double date) override;
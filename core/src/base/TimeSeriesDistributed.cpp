@@ -9,8 +9,19 @@ TimeSeriesDistributed::~TimeSeriesDistributed() {
     }
 }
 
+TimeSeries* TimeSeriesDistributed::Clone() const {
+    wxASSERT(m_data.size() == m_unitIds.size());
+    auto clone = new TimeSeriesDistributed(m_type);
+    for (int i = 0; i < m_data.size(); ++i) {
+        clone->AddData(m_data[i]->Clone(), m_unitIds[i]);
+    }
+
+    return clone;
+}
+
 void TimeSeriesDistributed::AddData(TimeSeriesData* data, int unitId) {
     wxASSERT(data);
+    m_dataIndices.emplace(unitId, int(m_data.size()));
     m_data.push_back(data);
     m_unitIds.push_back(unitId);
 }
@@ -61,11 +72,28 @@ double TimeSeriesDistributed::GetTotal(const SettingsBasin* basinSettings) {
 TimeSeriesData* TimeSeriesDistributed::GetDataPointer(int unitId) {
     wxASSERT(m_data.size() == m_unitIds.size());
 
+    auto it = m_dataIndices.find(unitId);
+    if (it != m_dataIndices.end()) {
+        return m_data[it->second];
+    }
+
+    throw ShouldNotHappen();
+}
+bool TimeSeriesDistributed::SetBuffer(const std::shared_ptr<const double>& data, int length, int timeStride,
+                                      int unitStride) {
+    for (auto unitData : m_data) {
+        if (dynamic_cast<TimeSeriesDataStrided*>(unitData) == nullptr) {
+            wxLogError(_("The values of this time series cannot be replaced."));
+            return false;
+        }
+    }
+
     for (int i = 0; i < m_data.size(); ++i) {
-        if (m_unitIds[i] == unitId) {
-            return m_data[i];
+        auto unitData = static_cast<TimeSeriesDataStrided*>(m_data[i]);
+        if (!unitData->SetBuffer(data, length, timeStride, i * unitStride)) {
+            return false;
         }
     }
 
-    throw ShouldNotHappen();
-}
\ No newline at end of file
+    return true;
+}
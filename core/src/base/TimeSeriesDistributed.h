@@ -10,6 +10,8 @@ class TimeSeriesDistributed : public TimeSeries {
 
     ~TimeSeriesDistributed() override;
 
+    TimeSeries* Clone() const override;
+
     void AddData(TimeSeriesData* data, int unitId);
 
     bool SetCursorToDate(double date) override;
@@ -28,9 +30,26 @@ class TimeSeriesDistributed : public TimeSeries {
 
     TimeSeriesData* GetDataPointer(int unitId) override;
 
+    /**
+     * Replace the values of all hydro units by the ones of a new shared buffer, keeping the time series objects
+     * (and thus their attachment to the hydro units). Only possible for strided data.
+     *
+     * @param data The shared buffer containing the values of all hydro units.
+     * @param length The number of time steps.
+     * @param timeStride The distance between two consecutive time steps in the buffer.
+     * @param unitStride The distance between two consecutive hydro units in the buffer.
+     * @return True if successful.
+     */
+    bool SetBuffer(const std::shared_ptr<const double>& data, int length, int timeStride, int unitStride);
+
+    int GetUnitsNb() const {
+        return int(m_unitIds.size());
+    }
+
   protected:
     vecInt m_unitIds;
     vector<TimeSeriesData*> m_data;
+    std::unordered_map<int, int> m_dataIndices;  // Index of the data by hydro unit id.
 
   private:
 };
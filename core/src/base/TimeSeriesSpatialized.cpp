@@ -0,0 +1,169 @@
+#include "TimeSeriesSpatialized.h"
+
+/*
+ * TimeSeriesDataSpatialized
+ */
+
+TimeSeriesDataSpatialized::TimeSeriesDataSpatialized(TimeSeriesSpatialized* timeSeries, int index)
+    : TimeSeriesData(),
+      m_timeSeries(timeSeries),
+      m_index(index) {
+    wxASSERT(m_timeSeries);
+}
+
+double TimeSeriesDataSpatialized::GetValueFor(double date) {
+    if (!m_timeSeries->GetStationData()->SetCursorToDate(date)) {
+        throw InvalidArgument(_("The date is outside of the time series period."));
+    }
+    return GetCurrentValue();
+}
+
+double TimeSeriesDataSpatialized::GetCurrentValue() {
+    return m_timeSeries->GetUnitCurrentValue(m_index);
+}
+
+double TimeSeriesDataSpatialized::GetSum() {
+    double sum = 0;
+    int length = m_timeSeries->GetStationData()->GetLength();
+    for (int i = 0; i < length; ++i) {
+        sum += m_timeSeries->GetUnitValueAt(m_index, i);
+    }
+
+    return sum;
+}
+
+bool TimeSeriesDataSpatialized::SetCursorToDate(double) {
+    // The cursor is the one of the station data.
+    return true;
+}
+
+bool TimeSeriesDataSpatialized::AdvanceOneTimeStep() {
+    // The cursor is the one of the station data.
+    return true;
+}
+
+double TimeSeriesDataSpatialized::GetStart() {
+    return m_timeSeries->GetStart();
+}
+
+double TimeSeriesDataSpatialized::GetEnd() {
+    return m_timeSeries->GetEnd();
+}
+
+/*
+ * TimeSeriesSpatialized
+ */
+
+TimeSeriesSpatialized::TimeSeriesSpatialized(VariableType type, TimeSeriesDataStrided* stationData,
+                                             const vecInt& months, const vecInt& unitIds)
+    : TimeSeriesUniform(type),
+      m_stationData(stationData),
+      m_months(months),
+      m_unitIds(unitIds),
+      m_nonNegative(type == Precipitation || type == PET) {
+    wxASSERT(stationData);
+    SetData(stationData);
+
+    for (int i = 0; i < m_unitIds.size(); ++i) {
+        m_unitData.push_back(new TimeSeriesDataSpatialized(this, i));
+        m_dataIndices.emplace(m_unitIds[i], i);
+    }
+
+    // No spatial variability until gradients are set
+    m_factors = axxd::Ones(int(m_unitIds.size()), 12);
+    m_offsets = axxd::Zero(int(m_unitIds.size()), 12);
+}
+
+TimeSeriesSpatialized::~TimeSeriesSpatialized() {
+    for (auto data : m_unitData) {
+        wxDELETE(data);
+    }
+}
+
+TimeSeries* TimeSeriesSpatialized::Clone() const {
+    auto clone = new TimeSeriesSpatialized(m_type, m_stationData->Clone(), m_months, m_unitIds);
+    clone->m_factors = m_factors;
+    clone->m_offsets = m_offsets;
+
+    return clone;
+}
+
+double TimeSeriesSpatialized::GetTotal(const SettingsBasin* basinSettings) {
+    double total = 0;
+    double areaTotal = basinSettings->GetTotalArea();
+    for (int i = 0; i < basinSettings->GetHydroUnitsNb(); ++i) {
+        double area = basinSettings->GetHydroUnitSettings(i).area;
+        int id = basinSettings->GetHydroUnitSettings(i).id;
+        double sumUnit = GetDataPointer(id)->GetSum();
+        total += sumUnit * area / areaTotal;
+    }
+
+    return total;
+}
+
+TimeSeriesData* TimeSeriesSpatialized::GetDataPointer(int unitId) {
+    auto it = m_dataIndices.find(unitId);
+    if (it != m_dataIndices.end()) {
+        return m_unitData[it->second];
+    }
+
+    throw ShouldNotHappen();
+}
+
+void TimeSeriesSpatialized::SetElevationGradients(const string& method, const axd& elevations, double refElevation,
+                                                  const axd& gradients, const axd& gradients2,
+                                                  double elevationThreshold) {
+    if (elevations.size() != m_unitIds.size()) {
+        throw InvalidArgument(wxString::Format(_("The number of elevations (%d) does not match the number of hydro "
+                                                 "units (%d)."),
+                                               int(elevations.size()), int(m_unitIds.size())));
+    }
+
+    axd grad = GetMonthlyValues(gradients);
+
+    if (method == "additive_elevation_gradient") {
+        for (int iMonth = 0; iMonth < 12; ++iMonth) {
+            m_factors.col(iMonth) = 1;
+            m_offsets.col(iMonth) = grad[iMonth] * (elevations - refElevation) / 100;
+        }
+    } else if (method == "multiplicative_elevation_gradient") {
+        for (int iMonth = 0; iMonth < 12; ++iMonth) {
+            m_factors.col(iMonth) = 1 + grad[iMonth] * (elevations - refElevation) / 100;
+            m_offsets.col(iMonth) = 0;
+        }
+    } else if (method == "multiplicative_elevation_threshold_gradients") {
+        if (std::isnan(elevationThreshold)) {
+            throw InvalidArgument(_("The elevation threshold was not provided."));
+        }
+        axd grad2 = GetMonthlyValues(gradients2);
+        for (int iMonth = 0; iMonth < 12; ++iMonth) {
+            for (int iUnit = 0; iUnit < elevations.size(); ++iUnit) {
+                double elevation = elevations[iUnit];
+                if (elevation < elevationThreshold) {
+                    m_factors(iUnit, iMonth) = 1 + grad[iMonth] * (elevation - refElevation) / 100;
+                } else if (refElevation > elevationThreshold) {
+                    m_factors(iUnit, iMonth) = 1 + grad2[iMonth] * (elevation - refElevation) / 100;
+                } else {
+                    double factorBelow = 1 + grad[iMonth] * (elevationThreshold - refElevation) / 100;
+                    m_factors(iUnit, iMonth) = factorBelow * (1 + grad2[iMonth] * (elevation - elevationThreshold) /
+                                                                      100);
+                }
+            }
+            m_offsets.col(iMonth) = 0;
+        }
+    } else {
+        throw InvalidArgument(wxString::Format(_("The spatialization method '%s' is not supported."), method));
+    }
+}
+
+axd TimeSeriesSpatialized::GetMonthlyValues(const axd& values) {
+    if (values.size() == 1) {
+        return axd::Constant(12, values[0]);
+    }
+    if (values.size() == 12) {
+        return values;
+    }
+
+    throw InvalidArgument(wxString::Format(_("The gradient should have a length of 1 or 12 (here: %d)."),
+                                           int(values.size())));
+}
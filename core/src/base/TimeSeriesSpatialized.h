@@ -0,0 +1,121 @@
+#ifndef HYDROBRICKS_TIME_SERIES_SPATIALIZED_H
+#define HYDROBRICKS_TIME_SERIES_SPATIALIZED_H
+
+#include "Includes.h"
+#include "TimeSeriesUniform.h"
+
+class TimeSeriesSpatialized;
+
+/**
+ * Data of a hydro unit computed on the fly from the station data of a spatialized time series. The cursor is the
+ * one of the station data, which is handled by the time series.
+ */
+class TimeSeriesDataSpatialized : public TimeSeriesData {
+  public:
+    TimeSeriesDataSpatialized(TimeSeriesSpatialized* timeSeries, int index);
+
+    ~TimeSeriesDataSpatialized() override = default;
+
+    TimeSeriesDataSpatialized* Clone() const override {
+        return new TimeSeriesDataSpatialized(*this);
+    }
+
+    double GetValueFor(double date) override;
+
+    double GetCurrentValue() override;
+
+    double GetSum() override;
+
+    bool SetCursorToDate(double date) override;
+
+    bool AdvanceOneTimeStep() override;
+
+    double GetStart() override;
+
+    double GetEnd() override;
+
+  protected:
+    TimeSeriesSpatialized* m_timeSeries;
+    int m_index;
+
+  private:
+};
+
+/**
+ * Time series of the hydro units computed on the fly from a single station series and elevation gradients. The value
+ * of a hydro unit is (station value * factor + offset), with a factor and an offset per hydro unit and per month. The
+ * memory thus scales with the number of time steps plus the number of hydro units.
+ */
+class TimeSeriesSpatialized : public TimeSeriesUniform {
+  public:
+    /**
+     * @param type The variable type.
+     * @param stationData The station data (owned by the time series).
+     * @param months The month index (0-11) of each time step of the station data.
+     * @param unitIds The ids of the hydro units.
+     */
+    TimeSeriesSpatialized(VariableType type, TimeSeriesDataStrided* stationData, const vecInt& months,
+                          const vecInt& unitIds);
+
+    ~TimeSeriesSpatialized() override;
+
+    TimeSeries* Clone() const override;
+
+    bool IsDistributed() override {
+        return true;
+    }
+
+    double GetTotal(const SettingsBasin* basinSettings) override;
+
+    TimeSeriesData* GetDataPointer(int unitId) override;
+
+    /**
+     * Compute the factors and offsets of the hydro units from elevation gradients.
+     *
+     * @param method The spatialization method: 'additive_elevation_gradient', 'multiplicative_elevation_gradient'
+     * or 'multiplicative_elevation_threshold_gradients'.
+     * @param elevations The elevations of the hydro units (in the order of the ids).
+     * @param refElevation The reference (station) elevation.
+     * @param gradients The gradients per 100 m (a single value or one value per month).
+     * @param gradients2 The gradients per 100 m above the elevation threshold (threshold method only).
+     * @param elevationThreshold The elevation threshold to switch from gradients to gradients2.
+     */
+    void SetElevationGradients(const string& method, const axd& elevations, double refElevation,
+                               const axd& gradients, const axd& gradients2, double elevationThreshold);
+
+    double GetUnitValueAt(int index, int timeIndex) const {
+        int month = m_months[timeIndex];
+        double value = m_stationData->GetValueAt(timeIndex) * m_factors(index, month) + m_offsets(index, month);
+        if (m_nonNegative && value < 0) {
+            return 0;
+        }
+        return value;
+    }
+
+    double GetUnitCurrentValue(int index) const {
+        return GetUnitValueAt(index, m_stationData->GetCursor());
+    }
+
+    TimeSeriesDataStrided* GetStationData() {
+        return m_stationData;
+    }
+
+    int GetUnitsNb() const {
+        return int(m_unitIds.size());
+    }
+
+  protected:
+    TimeSeriesDataStrided* m_stationData;
+    vecInt m_months;
+    vecInt m_unitIds;
+    vector<TimeSeriesDataSpatialized*> m_unitData;
+    std::unordered_map<int, int> m_dataIndices;  // Index of the data by hydro unit id.
+    axxd m_factors;                               // Factors by hydro unit (rows) and month (cols).
+    axxd m_offsets;                               // Offsets by hydro unit (rows) and month (cols).
+    bool m_nonNegative;
+
+  private:
+    static axd GetMonthlyValues(const axd& values);
+};
+
+#endif  // HYDROBRICKS_TIME_SERIES_SPATIALIZED_H
@@ -8,6 +8,24 @@ TimeSeriesUniform::~TimeSeriesUniform() {
     wxDELETE(m_data);
 }
 
+TimeSeries* TimeSeriesUniform::Clone() const {
+    wxASSERT(m_data);
+    auto clone = new TimeSeriesUniform(m_type);
+    clone->SetData(m_data->Clone());
+
+    return clone;
+}
+
+bool TimeSeriesUniform::SetBuffer(const std::shared_ptr<const double>& data, int length) {
+    auto stridedData = dynamic_cast<TimeSeriesDataStrided*>(m_data);
+    if (stridedData == nullptr) {
+        wxLogError(_("The values of this time series cannot be replaced."));
+        return false;
+    }
+
+    return stridedData->SetBuffer(data, length, 1, 0);
+}
+
 bool TimeSeriesUniform::SetCursorToDate(double date) {
     wxASSERT(m_data);
     if (!m_data->SetCursorToDate(date)) {
@@ -37,7 +55,8 @@ double TimeSeriesUniform::GetEnd() {
 }
 
 double TimeSeriesUniform::GetTotal(const SettingsBasin*) {
-    throw NotImplemented();
+    wxASSERT(m_data);
+    return m_data->GetSum();
 }
 
 TimeSeriesData* TimeSeriesUniform::GetDataPointer(int) {
@@ -10,11 +10,23 @@ class TimeSeriesUniform : public TimeSeries {
 
     ~TimeSeriesUniform() override;
 
+    TimeSeries* Clone() const override;
+
     void SetData(TimeSeriesData* data) {
         wxASSERT(data);
         m_data = data;
     }
 
+    /**
+     * Replace the values of the time series by the ones of the provided buffer, without copying them. Only
+     * possible if the data reads its values in a shared buffer.
+     *
+     * @param data The shared buffer containing the values (one per time step).
+     * @param length The number of time steps.
+     * @return True if successful.
+     */
+    bool SetBuffer(const std::shared_ptr<const double>& data, int length);
+
     bool SetCursorToDate(double date) override;
 
     bool AdvanceOneTimeStep() override;
@@ -521,3 +521,43 @@ double GetMJD(int year, int month, int day, int hour, int minute, int second) {
 
     return mjd;
 }
+
+double EvaluateMetric(const string& metric, const axd& simulation, const axd& observations) {
+    if (simulation.size() != observations.size()) {
+        throw InvalidArgument(wxString::Format(_("The simulated (%d) and observed (%d) series have different lengths."),
+                                               int(simulation.size()), int(observations.size())));
+    }
+
+    // Remove time steps with NaNs
+    auto valid = (simulation == simulation && observations == observations).cast<int>();
+    int count = valid.sum();
+    if (count == 0) {
+        return NAN_D;
+    }
+    axd sim(count);
+    axd obs(count);
+    for (int i = 0, j = 0; i < simulation.size(); ++i) {
+        if (valid[i]) {
+            sim[j] = simulation[i];
+            obs[j] = observations[i];
+            j++;
+        }
+    }
+
+    if (metric == "nse") {
+        return 1.0 - (sim - obs).square().sum() / (obs - obs.mean()).square().sum();
+    } else if (metric == "kge_2012") {
+        double simMean = sim.mean();
+        double obsMean = obs.mean();
+        double simStd = std::sqrt((sim - simMean).square().mean());
+        double obsStd = std::sqrt((obs - obsMean).square().mean());
+        double r = ((sim - simMean) * (obs - obsMean)).mean() / (simStd * obsStd);
+        double beta = simMean / obsMean;
+        double gamma = (simStd / simMean) / (obsStd / obsMean);
+        return 1.0 - std::sqrt(std::pow(r - 1, 2) + std::pow(beta - 1, 2) + std::pow(gamma - 1, 2));
+    } else if (metric == "rmse") {
+        return std::sqrt((sim - obs).square().mean());
+    }
+
+    throw InvalidArgument(wxString::Format(_("The metric '%s' is not supported."), metric));
+}
@@ -191,4 +191,15 @@ double ParseDate(const string& dateStr, TimeFormat format);
  */
 double GetMJD(int year, int month = 1, int day = 1, int hour = 0, int minute = 0, int second = 0);
 
+/**
+ * Compute a goodness of fit metric between a simulated and an observed time series. Time steps with a NaN value in
+ * one of the series are ignored.
+ *
+ * @param metric The name of the metric (as in HydroErr): 'nse', 'kge_2012' or 'rmse'.
+ * @param simulation The simulated time series.
+ * @param observations The observed time series.
+ * @return The value of the metric.
+ */
+double EvaluateMetric(const string& metric, const axd& simulation, const axd& observations);
+
 #endif  // HYDROBRICKS_UTILS_H
@@ -6,6 +6,14 @@ Behaviour::Behaviour()
     : m_manager(nullptr),
       m_cursor(0) {}
 
+Behaviour* Behaviour::Clone() const {
+    auto clone = new Behaviour(*this);
+    clone->SetManager(nullptr);
+    clone->Reset();
+
+    return clone;
+}
+
 bool Behaviour::Apply(double) {
     return false;
 }
@@ -10,6 +10,13 @@ class Behaviour : public wxObject {
 
     ~Behaviour() override = default;
 
+    /**
+     * Create a copy of the behaviour. The copy is not attached to any manager.
+     *
+     * @return the copy of the behaviour (owned by the caller).
+     */
+    virtual Behaviour* Clone() const;
+
     void Reset();
 
     bool virtual Apply(double date);
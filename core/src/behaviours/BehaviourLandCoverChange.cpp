@@ -6,6 +6,14 @@
 
 BehaviourLandCoverChange::BehaviourLandCoverChange() = default;
 
+Behaviour* BehaviourLandCoverChange::Clone() const {
+    auto clone = new BehaviourLandCoverChange(*this);
+    clone->SetManager(nullptr);
+    clone->Reset();
+
+    return clone;
+}
+
 void BehaviourLandCoverChange::AddChange(double date, int hydroUnitId, const string& landCoverName, double area) {
     int landCoverId = GetLandCoverId(landCoverName);
 
@@ -28,6 +36,7 @@ bool BehaviourLandCoverChange::Apply(double) {
     string landCoverName = m_landCoverNames[m_landCoverIds[m_cursor]];
     double areaFraction = m_areas[m_cursor] / unit->GetArea();
     unit->ChangeLandCoverAreaFraction(landCoverName, areaFraction);
+    m_manager->NotifyLandCoverChange();
 
     return true;
 }
@@ -10,6 +10,8 @@ class BehaviourLandCoverChange : public Behaviour {
 
     ~BehaviourLandCoverChange() override = default;
 
+    Behaviour* Clone() const override;
+
     void AddChange(double date, int hydroUnitId, const string& landCoverName, double area);
 
     bool Apply(double date) override;
@@ -2,6 +2,14 @@
 
 BehaviourSnowRedistribution::BehaviourSnowRedistribution() {}
 
+Behaviour* BehaviourSnowRedistribution::Clone() const {
+    auto clone = new BehaviourSnowRedistribution(*this);
+    clone->SetManager(nullptr);
+    clone->Reset();
+
+    return clone;
+}
+
 bool BehaviourSnowRedistribution::Apply(double) {
     return false;
 }
\ No newline at end of file
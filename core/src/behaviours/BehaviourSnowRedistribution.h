@@ -10,6 +10,8 @@ class BehaviourSnowRedistribution : public Behaviour {
 
     ~BehaviourSnowRedistribution() override = default;
 
+    Behaviour* Clone() const override;
+
     bool Apply(double date) override;
 
   protected:
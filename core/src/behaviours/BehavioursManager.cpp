@@ -81,3 +81,8 @@ void BehavioursManager::DateUpdate(double date) {
 HydroUnit* BehavioursManager::GetHydroUnitById(int id) {
     return m_model->GetSubBasin()->GetHydroUnitById(id);
 }
+
+void BehavioursManager::NotifyLandCoverChange() {
+    wxASSERT(m_model);
+    m_model->GetProcessor()->InvalidateActiveBricks();
+}
@@ -27,10 +27,20 @@ class BehavioursManager : public wxObject {
 
     int GetBehaviourItemsNb();
 
+    Behaviour* GetBehaviour(int index) {
+        wxASSERT(m_behaviours.size() > index);
+        return m_behaviours[index];
+    }
+
     void DateUpdate(double date);
 
     HydroUnit* GetHydroUnitById(int id);
 
+    /**
+     * Notify the model that land cover area fractions changed, so that the active bricks get updated.
+     */
+    void NotifyLandCoverChange();
+
     vecDouble GetDates() {
         return m_dates;
     }
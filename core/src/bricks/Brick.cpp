@@ -38,6 +38,24 @@ Brick* Brick::Factory(const BrickSettings& brickSettings) {
     return nullptr;
 }
 
+Brick* Brick::InitializeClone(Brick* clone, CloneRegistry& registry) const {
+    registry.Add(this, clone);
+    clone->m_container = m_container->Clone(registry);
+    for (auto process : m_processes) {
+        process->Clone(registry);
+    }
+
+    return clone;
+}
+
+void Brick::RemapPointers(const CloneRegistry& registry) {
+    m_container->RemapPointers(registry);
+    m_processes = registry.Get(m_processes);
+    for (auto process : m_processes) {
+        process->RemapPointers(registry);
+    }
+}
+
 void Brick::Reset() {
     m_container->Reset();
     for (auto process : m_processes) {
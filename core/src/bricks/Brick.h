@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_BRICK_H
 #define HYDROBRICKS_BRICK_H
 
+#include "CloneRegistry.h"
 #include "Flux.h"
 #include "Includes.h"
 #include "Process.h"
@@ -21,6 +22,21 @@ class Brick : public wxObject {
      */
     static Brick* Factory(const BrickSettings& brickSettings);
 
+    /**
+     * Create a copy of the brick, of its containers and of its processes for a copy of the model (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the brick.
+     */
+    virtual Brick* Clone(CloneRegistry& registry) const = 0;
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    virtual void RemapPointers(const CloneRegistry& registry);
+
     /**
      * Check if the brick has a parameter with the provided name.
      *
@@ -141,6 +157,15 @@ class Brick : public wxObject {
     WaterContainer* m_container;
     vector<Process*> m_processes;
 
+    /**
+     * Register the copy of the brick and copy its containers and processes.
+     *
+     * @param clone the member-wise copy of the brick.
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the brick.
+     */
+    virtual Brick* InitializeClone(Brick* clone, CloneRegistry& registry) const;
+
   private:
 };
 
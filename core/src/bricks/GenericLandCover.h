@@ -8,6 +8,13 @@ class GenericLandCover : public LandCover {
   public:
     GenericLandCover();
 
+    /**
+     * @copydoc Brick::Clone()
+     */
+    Brick* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new GenericLandCover(*this), registry);
+    }
+
     /**
      * @copydoc Brick::SetParameters()
      */
@@ -6,6 +6,18 @@ Glacier::Glacier()
     m_ice = new IceContainer(this);
 }
 
+Brick* Glacier::InitializeClone(Brick* clone, CloneRegistry& registry) const {
+    LandCover::InitializeClone(clone, registry);
+    static_cast<Glacier*>(clone)->m_ice = static_cast<IceContainer*>(m_ice->Clone(registry));
+
+    return clone;
+}
+
+void Glacier::RemapPointers(const CloneRegistry& registry) {
+    LandCover::RemapPointers(registry);
+    m_ice->RemapPointers(registry);
+}
+
 void Glacier::Reset() {
     m_container->Reset();
     m_ice->Reset();
@@ -10,6 +10,18 @@ class Glacier : public LandCover {
   public:
     Glacier();
 
+    /**
+     * @copydoc Brick::Clone()
+     */
+    Brick* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new Glacier(*this), registry);
+    }
+
+    /**
+     * @copydoc Brick::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     void Reset() override;
 
     void SaveAsInitialState() override;
@@ -44,6 +56,11 @@ class Glacier : public LandCover {
   protected:
     IceContainer* m_ice;
 
+    /**
+     * @copydoc Brick::InitializeClone()
+     */
+    Brick* InitializeClone(Brick* clone, CloneRegistry& registry) const override;
+
   private:
 };
 
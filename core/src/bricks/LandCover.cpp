@@ -9,6 +9,13 @@ LandCover::LandCover()
     m_needsSolver = false;
 }
 
+Brick* LandCover::InitializeClone(Brick* clone, CloneRegistry& registry) const {
+    Brick::InitializeClone(clone, registry);
+    registry.Add(&m_areaFraction, &static_cast<LandCover*>(clone)->m_areaFraction);
+
+    return clone;
+}
+
 void LandCover::SetAreaFraction(double value) {
     m_areaFraction = value;
     for (auto process : m_processes) {
@@ -38,6 +38,11 @@ class LandCover : public Brick {
   protected:
     double m_areaFraction;
 
+    /**
+     * @copydoc Brick::InitializeClone()
+     */
+    Brick* InitializeClone(Brick* clone, CloneRegistry& registry) const override;
+
   private:
 };
 
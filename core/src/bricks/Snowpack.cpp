@@ -6,6 +6,18 @@ Snowpack::Snowpack()
     m_snow = new SnowContainer(this);
 }
 
+Brick* Snowpack::InitializeClone(Brick* clone, CloneRegistry& registry) const {
+    SurfaceComponent::InitializeClone(clone, registry);
+    static_cast<Snowpack*>(clone)->m_snow = static_cast<SnowContainer*>(m_snow->Clone(registry));
+
+    return clone;
+}
+
+void Snowpack::RemapPointers(const CloneRegistry& registry) {
+    SurfaceComponent::RemapPointers(registry);
+    m_snow->RemapPointers(registry);
+}
+
 void Snowpack::Reset() {
     m_container->Reset();
     m_snow->Reset();
@@ -9,6 +9,18 @@ class Snowpack : public SurfaceComponent {
   public:
     Snowpack();
 
+    /**
+     * @copydoc Brick::Clone()
+     */
+    Brick* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new Snowpack(*this), registry);
+    }
+
+    /**
+     * @copydoc Brick::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     void Reset() override;
 
     void SaveAsInitialState() override;
@@ -43,6 +55,11 @@ class Snowpack : public SurfaceComponent {
   protected:
     SnowContainer* m_snow;
 
+    /**
+     * @copydoc Brick::InitializeClone()
+     */
+    Brick* InitializeClone(Brick* clone, CloneRegistry& registry) const override;
+
   private:
 };
 
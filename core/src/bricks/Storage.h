@@ -8,6 +8,13 @@ class Storage : public Brick {
   public:
     Storage();
 
+    /**
+     * @copydoc Brick::Clone()
+     */
+    Brick* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new Storage(*this), registry);
+    }
+
     /**
      * @copydoc Brick::SetParameters()
      */
@@ -10,6 +10,11 @@ SurfaceComponent::SurfaceComponent()
     m_needsSolver = false;
 }
 
+void SurfaceComponent::RemapPointers(const CloneRegistry& registry) {
+    Brick::RemapPointers(registry);
+    m_parent = registry.Get(m_parent);
+}
+
 void SurfaceComponent::SetAreaFraction(double value) {
     wxASSERT(m_parent);
     m_areaFraction = value;
@@ -11,6 +11,11 @@ class SurfaceComponent : public Brick {
   public:
     SurfaceComponent();
 
+    /**
+     * @copydoc Brick::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     bool CanHaveAreaFraction() override {
         return true;
     }
@@ -8,6 +8,13 @@ class Urban : public LandCover {
   public:
     Urban();
 
+    /**
+     * @copydoc Brick::Clone()
+     */
+    Brick* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new Urban(*this), registry);
+    }
+
     /**
      * @copydoc Brick::SetParameters()
      */
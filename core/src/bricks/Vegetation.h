@@ -8,6 +8,13 @@ class Vegetation : public LandCover {
   public:
     Vegetation();
 
+    /**
+     * @copydoc Brick::Clone()
+     */
+    Brick* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new Vegetation(*this), registry);
+    }
+
     /**
      * @copydoc Brick::SetParameters()
      */
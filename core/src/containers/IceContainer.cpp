@@ -7,6 +7,11 @@ IceContainer::IceContainer(Brick* brick)
       m_noMeltWhenSnowCover(false),
       m_relatedSnowpack(nullptr) {}
 
+void IceContainer::RemapPointers(const CloneRegistry& registry) {
+    WaterContainer::RemapPointers(registry);
+    m_relatedSnowpack = registry.Get(m_relatedSnowpack);
+}
+
 void IceContainer::ApplyConstraints(double timeStep) {
     if (m_noMeltWhenSnowCover) {
         if (m_relatedSnowpack == nullptr) {
@@ -11,6 +11,18 @@ class IceContainer : public WaterContainer {
   public:
     IceContainer(Brick* brick);
 
+    /**
+     * @copydoc WaterContainer::Clone()
+     */
+    WaterContainer* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new IceContainer(*this), registry);
+    }
+
+    /**
+     * @copydoc WaterContainer::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     void ApplyConstraints(double timeStep) override;
 
     void SetNoMeltWhenSnowCover(const float* value) {
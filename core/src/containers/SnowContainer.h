@@ -10,6 +10,13 @@ class SnowContainer : public WaterContainer {
   public:
     SnowContainer(Brick* brick);
 
+    /**
+     * @copydoc WaterContainer::Clone()
+     */
+    WaterContainer* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new SnowContainer(*this), registry);
+    }
+
   protected:
   private:
 };
@@ -13,6 +13,32 @@ WaterContainer::WaterContainer(Brick* brick)
       m_parent(brick),
       m_overflow(nullptr) {}
 
+WaterContainer* WaterContainer::InitializeClone(WaterContainer* clone, CloneRegistry& registry) const {
+    registry.Add(this, clone);
+    registry.Add(&m_content, &clone->m_content);
+    for (auto flux : m_inputs) {
+        if (flux->IsForcing()) {
+            flux->Clone(registry);
+        }
+    }
+
+    return clone;
+}
+
+void WaterContainer::RemapPointers(const CloneRegistry& registry) {
+    m_capacity = registry.Get(m_capacity);
+    m_parent = registry.Get(m_parent);
+    m_overflow = registry.Get(m_overflow);
+    m_inputs = registry.Get(m_inputs);
+    for (auto flux : m_inputs) {
+        if (flux->IsForcing()) {
+            flux->RemapPointers(registry);
+        }
+    }
+    m_outgoingRatesBuffer.clear();
+    m_incomingRatesBuffer.clear();
+}
+
 bool WaterContainer::IsOk() {
     if (m_inputs.empty()) {
         return true;
@@ -46,8 +72,9 @@ void WaterContainer::AddAmountToStaticContentChange(double change) {
 void WaterContainer::ApplyConstraints(double timeStep) {
     if (m_infiniteStorage) return;
 
-    // Get outgoing change rates
-    vecDoublePt outgoingRates;
+    // Get outgoing change rates (the buffers are reused to avoid allocations at every call)
+    vecDoublePt& outgoingRates = m_outgoingRatesBuffer;
+    outgoingRates.clear();
     double outputs = 0;
     for (auto process : m_parent->GetProcesses()) {
         if (process->GetWaterContainer() != this) {
@@ -71,7 +98,8 @@ void WaterContainer::ApplyConstraints(double timeStep) {
     }
 
     // Get incoming change rates
-    vecDoublePt incomingRates;
+    vecDoublePt& incomingRates = m_incomingRatesBuffer;
+    incomingRates.clear();
     double inputs = 0;
     double inputsStatic = 0;
     for (auto& input : m_inputs) {
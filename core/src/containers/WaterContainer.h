@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_WATER_CONTAINER_H
 #define HYDROBRICKS_WATER_CONTAINER_H
 
+#include "CloneRegistry.h"
 #include "Includes.h"
 #include "Process.h"
 
@@ -10,6 +11,24 @@ class WaterContainer : public wxObject {
   public:
     WaterContainer(Brick* brick);
 
+    /**
+     * Create a copy of the container and of the forcing fluxes it receives for a copy of the model (see
+     * CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the container.
+     */
+    virtual WaterContainer* Clone(CloneRegistry& registry) const {
+        return InitializeClone(new WaterContainer(*this), registry);
+    }
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    virtual void RemapPointers(const CloneRegistry& registry);
+
     virtual bool IsOk();
 
     void SubtractAmountFromDynamicContentChange(double change);
@@ -131,6 +150,15 @@ class WaterContainer : public wxObject {
     }
 
   protected:
+    /**
+     * Register the copy of the container and of its content, and copy the forcing fluxes it receives.
+     *
+     * @param clone the member-wise copy of the container.
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the container.
+     */
+    WaterContainer* InitializeClone(WaterContainer* clone, CloneRegistry& registry) const;
+
   private:
     double m_content;               // [mm]
     double m_contentChangeDynamic;  // [mm]
@@ -141,6 +169,8 @@ class WaterContainer : public wxObject {
     Brick* m_parent;
     Process* m_overflow;
     vector<Flux*> m_inputs;
+    vecDoublePt m_outgoingRatesBuffer;
+    vecDoublePt m_incomingRatesBuffer;
 };
 
 #endif  // HYDROBRICKS_WATER_CONTAINER_H
@@ -13,6 +13,18 @@ Flux::Flux()
       m_modifier(nullptr),
       m_type("water") {}
 
+Flux* Flux::RegisterClone(Flux* clone, CloneRegistry& registry) const {
+    registry.Add(this, clone);
+    registry.Add(&m_amount, &clone->m_amount);
+
+    return clone;
+}
+
+void Flux::RemapPointers(const CloneRegistry&) {
+    // Linked again to the solver of the copy.
+    m_changeRate = nullptr;
+}
+
 void Flux::Reset() {
     m_amount = 0;
 }
@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_FLUX_H
 #define HYDROBRICKS_FLUX_H
 
+#include "CloneRegistry.h"
 #include "Includes.h"
 
 class Modifier;
@@ -16,6 +17,21 @@ class Flux : public wxObject {
      */
     virtual bool IsOk() = 0;
 
+    /**
+     * Create a copy of the flux for a copy of the model (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the flux.
+     */
+    virtual Flux* Clone(CloneRegistry& registry) const = 0;
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    virtual void RemapPointers(const CloneRegistry& registry);
+
     virtual void Reset();
 
     /**
@@ -101,6 +117,15 @@ class Flux : public wxObject {
     Modifier* m_modifier;
     string m_type;
 
+    /**
+     * Register the copy of the flux and of the values it exposes.
+     *
+     * @param clone the copy of the flux.
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the flux.
+     */
+    Flux* RegisterClone(Flux* clone, CloneRegistry& registry) const;
+
   private:
 };
 
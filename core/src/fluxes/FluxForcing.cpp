@@ -13,6 +13,11 @@ double FluxForcing::GetAmount() {
     return m_amount;
 }
 
+void FluxForcing::RemapPointers(const CloneRegistry& registry) {
+    Flux::RemapPointers(registry);
+    m_forcing = registry.Get(m_forcing);
+}
+
 void FluxForcing::AttachForcing(Forcing* forcing) {
     m_forcing = forcing;
 }
@@ -14,6 +14,18 @@ class FluxForcing : public Flux {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Flux::Clone()
+     */
+    Flux* Clone(CloneRegistry& registry) const override {
+        return RegisterClone(new FluxForcing(*this), registry);
+    }
+
+    /**
+     * @copydoc Flux::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Flux::GetAmount()
      */
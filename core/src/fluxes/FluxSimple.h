@@ -13,6 +13,13 @@ class FluxSimple : public Flux {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Flux::Clone()
+     */
+    Flux* Clone(CloneRegistry& registry) const override {
+        return RegisterClone(new FluxSimple(*this), registry);
+    }
+
     /**
      * @copydoc Flux::GetAmount()
      */
@@ -13,6 +13,13 @@ class FluxToAtmosphere : public Flux {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Flux::Clone()
+     */
+    Flux* Clone(CloneRegistry& registry) const override {
+        return RegisterClone(new FluxToAtmosphere(*this), registry);
+    }
+
     /**
      * @copydoc Flux::GetAmount()
      */
@@ -10,6 +10,11 @@ bool FluxToBrick::IsOk() {
     return true;
 }
 
+void FluxToBrick::RemapPointers(const CloneRegistry& registry) {
+    Flux::RemapPointers(registry);
+    m_toBrick = registry.Get(m_toBrick);
+}
+
 double FluxToBrick::GetAmount() {
     return m_amount;
 }
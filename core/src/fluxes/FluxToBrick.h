@@ -15,6 +15,18 @@ class FluxToBrick : public Flux {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Flux::Clone()
+     */
+    Flux* Clone(CloneRegistry& registry) const override {
+        return RegisterClone(new FluxToBrick(*this), registry);
+    }
+
+    /**
+     * @copydoc Flux::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Flux::GetAmount()
      */
@@ -22,6 +34,10 @@ class FluxToBrick : public Flux {
 
     void UpdateFlux(double amount) override;
 
+    Brick* GetTargetBrick() {
+        return m_toBrick;
+    }
+
   protected:
     Brick* m_toBrick;
 
@@ -3,7 +3,9 @@
 #include "Brick.h"
 
 FluxToBrickInstantaneous::FluxToBrickInstantaneous(Brick* brick)
-    : FluxToBrick(brick) {}
+    : FluxToBrick(brick),
+      m_deferred(false),
+      m_deferredAmount(0) {}
 
 bool FluxToBrickInstantaneous::IsOk() {
     return true;
@@ -24,5 +26,17 @@ void FluxToBrickInstantaneous::UpdateFlux(double amount) {
     } else {
         m_amount = amount;
     }
+    if (m_deferred) {
+        m_deferredAmount += m_amount;
+        return;
+    }
     m_toBrick->GetWaterContainer()->AddAmountToStaticContentChange(m_amount);
 }
+
+void FluxToBrickInstantaneous::TransferDeferredAmount() {
+    wxASSERT(m_toBrick);
+    if (m_deferredAmount != 0) {
+        m_toBrick->GetWaterContainer()->AddAmountToStaticContentChange(m_deferredAmount);
+        m_deferredAmount = 0;
+    }
+}
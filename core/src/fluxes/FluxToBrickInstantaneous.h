@@ -15,6 +15,13 @@ class FluxToBrickInstantaneous : public FluxToBrick {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Flux::Clone()
+     */
+    Flux* Clone(CloneRegistry& registry) const override {
+        return RegisterClone(new FluxToBrickInstantaneous(*this), registry);
+    }
+
     bool IsInstantaneous() override {
         return true;
     }
@@ -28,7 +35,23 @@ class FluxToBrickInstantaneous : public FluxToBrick {
 
     void UpdateFlux(double amount) override;
 
+    /**
+     * Defer the transfer of the amounts to the target brick until TransferDeferredAmount() is called. Used
+     * when the target brick is shared by bricks processed concurrently.
+     */
+    void SetAsDeferred() {
+        m_deferred = true;
+    }
+
+    /**
+     * Transfer the deferred amounts to the target brick.
+     */
+    void TransferDeferredAmount();
+
   protected:
+    bool m_deferred;
+    double m_deferredAmount;
+
   private:
 };
 
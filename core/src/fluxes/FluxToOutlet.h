@@ -13,6 +13,13 @@ class FluxToOutlet : public Flux {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Flux::Clone()
+     */
+    Flux* Clone(CloneRegistry& registry) const override {
+        return RegisterClone(new FluxToOutlet(*this), registry);
+    }
+
     /**
      * @copydoc Flux::GetAmount()
      */
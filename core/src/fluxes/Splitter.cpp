@@ -23,6 +23,23 @@ Splitter* Splitter::Factory(const SplitterSettings& splitterSettings) {
     return nullptr;
 }
 
+Splitter* Splitter::InitializeClone(Splitter* clone, CloneRegistry& registry) const {
+    registry.Add(this, clone);
+    for (auto flux : m_outputs) {
+        flux->Clone(registry);
+    }
+
+    return clone;
+}
+
+void Splitter::RemapPointers(const CloneRegistry& registry) {
+    m_inputs = registry.Get(m_inputs);
+    m_outputs = registry.Get(m_outputs);
+    for (auto flux : m_outputs) {
+        flux->RemapPointers(registry);
+    }
+}
+
 float* Splitter::GetParameterValuePointer(const SplitterSettings& splitterSettings, const string& name) {
     for (auto parameter : splitterSettings.parameters) {
         if (parameter->GetName() == name) {
@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_SPLITTER_H
 #define HYDROBRICKS_SPLITTER_H
 
+#include "CloneRegistry.h"
 #include "Flux.h"
 #include "Forcing.h"
 #include "Includes.h"
@@ -21,6 +22,21 @@ class Splitter : public wxObject {
      */
     virtual bool IsOk() = 0;
 
+    /**
+     * Create a copy of the splitter and of its outgoing fluxes for a copy of the model (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the splitter.
+     */
+    virtual Splitter* Clone(CloneRegistry& registry) const = 0;
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    virtual void RemapPointers(const CloneRegistry& registry);
+
     /**
      * Assign the parameters to the splitter.
      *
@@ -71,6 +87,15 @@ class Splitter : public wxObject {
     vector<Flux*> m_inputs;
     vector<Flux*> m_outputs;
 
+    /**
+     * Register the copy of the splitter and copy its outgoing fluxes.
+     *
+     * @param clone the member-wise copy of the splitter.
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the splitter.
+     */
+    Splitter* InitializeClone(Splitter* clone, CloneRegistry& registry) const;
+
   private:
 };
 
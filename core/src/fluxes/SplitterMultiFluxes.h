@@ -15,6 +15,13 @@ class SplitterMultiFluxes : public Splitter {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Splitter::Clone()
+     */
+    Splitter* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new SplitterMultiFluxes(*this), registry);
+    }
+
     void SetParameters(const SplitterSettings& splitterSettings) override;
 
     double* GetValuePointer(const string& name) override;
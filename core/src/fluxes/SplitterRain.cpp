@@ -13,6 +13,11 @@ bool SplitterRain::IsOk() {
     return true;
 }
 
+void SplitterRain::RemapPointers(const CloneRegistry& registry) {
+    Splitter::RemapPointers(registry);
+    m_precipitation = registry.Get(m_precipitation);
+}
+
 void SplitterRain::SetParameters(const SplitterSettings&) {
     //
 }
@@ -16,6 +16,14 @@ bool SplitterSnowRain::IsOk() {
     return true;
 }
 
+void SplitterSnowRain::RemapPointers(const CloneRegistry& registry) {
+    Splitter::RemapPointers(registry);
+    m_precipitation = registry.Get(m_precipitation);
+    m_temperature = registry.Get(m_temperature);
+    m_transitionStart = registry.Get(m_transitionStart);
+    m_transitionEnd = registry.Get(m_transitionEnd);
+}
+
 void SplitterSnowRain::SetParameters(const SplitterSettings& splitterSettings) {
     m_transitionStart = GetParameterValuePointer(splitterSettings, "transition_start");
     m_transitionEnd = GetParameterValuePointer(splitterSettings, "transition_end");
@@ -14,6 +14,18 @@ class SplitterSnowRain : public Splitter {
      */
     bool IsOk() override;
 
+    /**
+     * @copydoc Splitter::Clone()
+     */
+    Splitter* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new SplitterSnowRain(*this), registry);
+    }
+
+    /**
+     * @copydoc Splitter::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     void SetParameters(const SplitterSettings& splitterSettings) override;
 
     void AttachForcing(Forcing* forcing) override;
@@ -52,6 +52,23 @@ Process* Process::Factory(const ProcessSettings& processSettings, Brick* brick)
     return nullptr;
 }
 
+Process* Process::InitializeClone(Process* clone, CloneRegistry& registry) const {
+    registry.Add(this, clone);
+    for (auto flux : m_outputs) {
+        flux->Clone(registry);
+    }
+
+    return clone;
+}
+
+void Process::RemapPointers(const CloneRegistry& registry) {
+    m_container = registry.Get(m_container);
+    m_outputs = registry.Get(m_outputs);
+    for (auto flux : m_outputs) {
+        flux->RemapPointers(registry);
+    }
+}
+
 void Process::Reset() {
     for (auto flux : m_outputs) {
         flux->Reset();
@@ -88,14 +105,14 @@ float* Process::GetParameterValuePointer(const ProcessSettings& processSettings,
     throw MissingParameter(wxString::Format(_("The parameter '%s' could not be found."), name));
 }
 
-vecDouble Process::GetChangeRates() {
+void Process::GetChangeRates(double* rates) {
+    wxASSERT(rates);
     if (m_container->GetContentWithChanges() <= PRECISION) {
-        vecDouble res(GetConnectionsNb());
-        std::fill(res.begin(), res.end(), 0);
-        return res;
+        std::fill(rates, rates + GetConnectionsNb(), 0.0);
+        return;
     }
 
-    return GetRates();
+    GetRates(rates);
 }
 
 void Process::StoreInOutgoingFlux(double* rate, int index) {
@@ -122,14 +139,12 @@ double* Process::GetValuePointer(const string&) {
 double Process::GetSumChangeRatesOtherProcesses() {
     double sumOtherProcesses = 0;
 
-    vector<Process*> otherProcesses = m_container->GetParentBrick()->GetProcesses();
-    for (auto process : otherProcesses) {
+    for (auto process : m_container->GetParentBrick()->GetProcesses()) {
         wxASSERT(process);
         if (process == this) {
             continue;
         }
-        vector<Flux*> fluxes = process->GetOutputFluxes();
-        for (auto flux : fluxes) {
+        for (auto flux : process->GetOutputFluxes()) {
             wxASSERT(flux);
             sumOtherProcesses += *flux->GetAmountPointer();
         }
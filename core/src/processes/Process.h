@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_PROCESS_H
 #define HYDROBRICKS_PROCESS_H
 
+#include "CloneRegistry.h"
 #include "Flux.h"
 #include "Forcing.h"
 #include "Includes.h"
@@ -25,6 +26,21 @@ class Process : public wxObject {
      */
     static Process* Factory(const ProcessSettings& processSettings, Brick* brick);
 
+    /**
+     * Create a copy of the process and of its outgoing fluxes for a copy of the model (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the process.
+     */
+    virtual Process* Clone(CloneRegistry& registry) const = 0;
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    virtual void RemapPointers(const CloneRegistry& registry);
+
     /**
      * Reset all the fluxes connected to the process.
      */
@@ -77,7 +93,7 @@ class Process : public wxObject {
         m_outputs.push_back(flux);
     }
 
-    vector<Flux*> GetOutputFluxes() {
+    vector<Flux*>& GetOutputFluxes() {
         return m_outputs;
     }
 
@@ -95,7 +111,12 @@ class Process : public wxObject {
 
     virtual int GetConnectionsNb() = 0;
 
-    virtual vecDouble GetChangeRates();
+    /**
+     * Compute the change rates (per day) independently of the time step and constraints.
+     *
+     * @param rates pointer to the preallocated storage where the rates must be written (one value per connection).
+     */
+    void GetChangeRates(double* rates);
 
     virtual void StoreInOutgoingFlux(double* rate, int index);
 
@@ -128,6 +149,13 @@ class Process : public wxObject {
         return m_container;
     }
 
+    /**
+     * Get the sum of the amounts of the outgoing fluxes of the other processes of the brick.
+     *
+     * @return The sum of the amounts of the other processes.
+     */
+    double GetSumChangeRatesOtherProcesses();
+
     virtual void SetTargetBrick(Brick*) {
         throw ShouldNotHappen();
     }
@@ -137,9 +165,21 @@ class Process : public wxObject {
     WaterContainer* m_container;
     vector<Flux*> m_outputs;
 
-    double GetSumChangeRatesOtherProcesses();
+    /**
+     * Register the copy of the process and copy its outgoing fluxes.
+     *
+     * @param clone the member-wise copy of the process.
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the process.
+     */
+    Process* InitializeClone(Process* clone, CloneRegistry& registry) const;
 
-    virtual vecDouble GetRates() = 0;
+    /**
+     * Compute the change rates of the process (when the container is not empty).
+     *
+     * @param rates pointer to the preallocated storage where the rates must be written (one value per connection).
+     */
+    virtual void GetRates(double* rates) = 0;
 
   private:
 };
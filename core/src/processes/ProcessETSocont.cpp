@@ -8,6 +8,11 @@ ProcessETSocont::ProcessETSocont(WaterContainer* container)
       m_pet(nullptr),
       m_exponent(0.5) {}
 
+void ProcessETSocont::RemapPointers(const CloneRegistry& registry) {
+    Process::RemapPointers(registry);
+    m_pet = registry.Get(m_pet);
+}
+
 bool ProcessETSocont::IsOk() {
     return ProcessET::IsOk();
 }
@@ -20,7 +25,7 @@ void ProcessETSocont::AttachForcing(Forcing* forcing) {
     }
 }
 
-vecDouble ProcessETSocont::GetRates() {
+void ProcessETSocont::GetRates(double* rates) {
     wxASSERT(m_container->HasMaximumCapacity());
-    return {m_pet->GetValue() * pow(m_container->GetTargetFillingRatio(), m_exponent)};
+    rates[0] = m_pet->GetValue() * pow(m_container->GetTargetFillingRatio(), m_exponent);
 }
@@ -11,6 +11,18 @@ class ProcessETSocont : public ProcessET {
 
     ~ProcessETSocont() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessETSocont(*this), registry);
+    }
+
+    /**
+     * @copydoc Process::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Process::IsOk()
      */
@@ -18,11 +30,30 @@ class ProcessETSocont : public ProcessET {
 
     void AttachForcing(Forcing* forcing) override;
 
+    /**
+     * Get the potential evapotranspiration of the current time step.
+     *
+     * @return The PET [mm/d].
+     */
+    double GetPet() {
+        wxASSERT(m_pet);
+        return m_pet->GetValue();
+    }
+
+    /**
+     * Get the exponent applied to the filling ratio of the storage.
+     *
+     * @return The exponent [-].
+     */
+    float GetExponent() const {
+        return m_exponent;
+    }
+
   protected:
     Forcing* m_pet;
     float m_exponent;
 
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
@@ -7,6 +7,11 @@ ProcessInfiltration::ProcessInfiltration(WaterContainer* container)
     : Process(container),
       m_targetBrick(nullptr) {}
 
+void ProcessInfiltration::RemapPointers(const CloneRegistry& registry) {
+    Process::RemapPointers(registry);
+    m_targetBrick = registry.Get(m_targetBrick);
+}
+
 bool ProcessInfiltration::IsOk() {
     if (m_outputs.size() != 1) {
         wxLogError(_("An infiltration process should have a single output."));
@@ -11,6 +11,11 @@ class ProcessInfiltration : public Process {
 
     ~ProcessInfiltration() override = default;
 
+    /**
+     * @copydoc Process::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Process::IsOk()
      */
@@ -28,6 +33,10 @@ class ProcessInfiltration : public Process {
         m_targetBrick = targetBrick;
     }
 
+    Brick* GetTargetBrick() {
+        return m_targetBrick;
+    }
+
   protected:
     Brick* m_targetBrick;
 
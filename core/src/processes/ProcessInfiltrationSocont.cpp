@@ -10,10 +10,11 @@ void ProcessInfiltrationSocont::SetParameters(const ProcessSettings& processSett
     Process::SetParameters(processSettings);
 }
 
-vecDouble ProcessInfiltrationSocont::GetRates() {
+void ProcessInfiltrationSocont::GetRates(double* rates) {
     if (GetTargetCapacity() <= 0) {
-        return {0};
+        rates[0] = 0;
+        return;
     }
 
-    return {m_container->GetContentWithChanges() * (1 - pow(GetTargetFillingRatio(), 2))};
+    rates[0] = m_container->GetContentWithChanges() * (1 - pow(GetTargetFillingRatio(), 2));
 }
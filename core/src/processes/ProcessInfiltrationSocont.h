@@ -11,13 +11,20 @@ class ProcessInfiltrationSocont : public ProcessInfiltration {
 
     ~ProcessInfiltrationSocont() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessInfiltrationSocont(*this), registry);
+    }
+
     /**
      * @copydoc Process::SetParameters()
      */
     void SetParameters(const ProcessSettings& processSettings) override;
 
   protected:
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
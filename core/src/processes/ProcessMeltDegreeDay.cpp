@@ -9,6 +9,13 @@ ProcessMeltDegreeDay::ProcessMeltDegreeDay(WaterContainer* container)
       m_degreeDayFactor(nullptr),
       m_meltingTemperature(nullptr) {}
 
+void ProcessMeltDegreeDay::RemapPointers(const CloneRegistry& registry) {
+    Process::RemapPointers(registry);
+    m_temperature = registry.Get(m_temperature);
+    m_degreeDayFactor = registry.Get(m_degreeDayFactor);
+    m_meltingTemperature = registry.Get(m_meltingTemperature);
+}
+
 bool ProcessMeltDegreeDay::IsOk() {
     if (!ProcessMelt::IsOk()) {
         return false;
@@ -40,9 +47,10 @@ void ProcessMeltDegreeDay::AttachForcing(Forcing* forcing) {
     }
 }
 
-vecDouble ProcessMeltDegreeDay::GetRates() {
+void ProcessMeltDegreeDay::GetRates(double* rates) {
     if (!m_container->ContentAccessible()) {
-        return {0};
+        rates[0] = 0;
+        return;
     }
 
     double melt = 0;
@@ -50,5 +58,5 @@ vecDouble ProcessMeltDegreeDay::GetRates() {
         melt = (m_temperature->GetValue() - *m_meltingTemperature) * *m_degreeDayFactor;
     }
 
-    return {melt};
+    rates[0] = melt;
 }
@@ -11,6 +11,18 @@ class ProcessMeltDegreeDay : public ProcessMelt {
 
     ~ProcessMeltDegreeDay() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessMeltDegreeDay(*this), registry);
+    }
+
+    /**
+     * @copydoc Process::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Process::IsOk()
      */
@@ -20,12 +32,32 @@ class ProcessMeltDegreeDay : public ProcessMelt {
 
     void AttachForcing(Forcing* forcing) override;
 
+    /**
+     * Get the temperature of the current time step.
+     *
+     * @return The temperature [°C].
+     */
+    double GetTemperature() {
+        wxASSERT(m_temperature);
+        return m_temperature->GetValue();
+    }
+
+    double GetDegreeDayFactor() const {
+        wxASSERT(m_degreeDayFactor);
+        return *m_degreeDayFactor;
+    }
+
+    double GetMeltingTemperature() const {
+        wxASSERT(m_meltingTemperature);
+        return *m_meltingTemperature;
+    }
+
   protected:
     Forcing* m_temperature;
     float* m_degreeDayFactor;
     float* m_meltingTemperature;
 
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
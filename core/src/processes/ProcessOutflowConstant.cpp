@@ -7,6 +7,11 @@ ProcessOutflowConstant::ProcessOutflowConstant(WaterContainer* container)
     : ProcessOutflow(container),
       m_rate(nullptr) {}
 
+void ProcessOutflowConstant::RemapPointers(const CloneRegistry& registry) {
+    Process::RemapPointers(registry);
+    m_rate = registry.Get(m_rate);
+}
+
 void ProcessOutflowConstant::SetParameters(const ProcessSettings& processSettings) {
     Process::SetParameters(processSettings);
     if (HasParameter(processSettings, "percolation_rate")) {
@@ -16,6 +21,6 @@ void ProcessOutflowConstant::SetParameters(const ProcessSettings& processSetting
     }
 }
 
-vecDouble ProcessOutflowConstant::GetRates() {
-    return {*m_rate};
+void ProcessOutflowConstant::GetRates(double* rates) {
+    rates[0] = *m_rate;
 }
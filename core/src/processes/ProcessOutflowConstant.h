@@ -11,15 +11,37 @@ class ProcessOutflowConstant : public ProcessOutflow {
 
     ~ProcessOutflowConstant() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessOutflowConstant(*this), registry);
+    }
+
+    /**
+     * @copydoc Process::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Process::SetParameters()
      */
     void SetParameters(const ProcessSettings& processSettings) override;
 
+    /**
+     * Get the constant outflow rate.
+     *
+     * @return The outflow rate [mm/d].
+     */
+    double GetRate() const {
+        wxASSERT(m_rate);
+        return *m_rate;
+    }
+
   protected:
     float* m_rate;  // [mm/d]
 
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
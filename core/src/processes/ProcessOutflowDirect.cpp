@@ -6,6 +6,6 @@
 ProcessOutflowDirect::ProcessOutflowDirect(WaterContainer* container)
     : ProcessOutflow(container) {}
 
-vecDouble ProcessOutflowDirect::GetRates() {
-    return {m_container->GetContentWithChanges()};
+void ProcessOutflowDirect::GetRates(double* rates) {
+    rates[0] = m_container->GetContentWithChanges();
 }
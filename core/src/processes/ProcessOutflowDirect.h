@@ -11,8 +11,15 @@ class ProcessOutflowDirect : public ProcessOutflow {
 
     ~ProcessOutflowDirect() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessOutflowDirect(*this), registry);
+    }
+
   protected:
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
@@ -7,11 +7,16 @@ ProcessOutflowLinear::ProcessOutflowLinear(WaterContainer* container)
     : ProcessOutflow(container),
       m_responseFactor(nullptr) {}
 
+void ProcessOutflowLinear::RemapPointers(const CloneRegistry& registry) {
+    Process::RemapPointers(registry);
+    m_responseFactor = registry.Get(m_responseFactor);
+}
+
 void ProcessOutflowLinear::SetParameters(const ProcessSettings& processSettings) {
     Process::SetParameters(processSettings);
     m_responseFactor = GetParameterValuePointer(processSettings, "response_factor");
 }
 
-vecDouble ProcessOutflowLinear::GetRates() {
-    return {(*m_responseFactor) * m_container->GetContentWithChanges()};
+void ProcessOutflowLinear::GetRates(double* rates) {
+    rates[0] = (*m_responseFactor) * m_container->GetContentWithChanges();
 }
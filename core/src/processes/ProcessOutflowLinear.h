@@ -11,15 +11,37 @@ class ProcessOutflowLinear : public ProcessOutflow {
 
     ~ProcessOutflowLinear() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessOutflowLinear(*this), registry);
+    }
+
+    /**
+     * @copydoc Process::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Process::SetParameters()
      */
     void SetParameters(const ProcessSettings& processSettings) override;
 
+    /**
+     * Get the response factor of the linear storage.
+     *
+     * @return The response factor [1/d].
+     */
+    double GetResponseFactor() const {
+        wxASSERT(m_responseFactor);
+        return *m_responseFactor;
+    }
+
   protected:
     float* m_responseFactor;  // [1/d]
 
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
@@ -10,8 +10,8 @@ void ProcessOutflowOverflow::SetParameters(const ProcessSettings& processSetting
     Process::SetParameters(processSettings);
 }
 
-vecDouble ProcessOutflowOverflow::GetRates() {
-    return {0};
+void ProcessOutflowOverflow::GetRates(double* rates) {
+    rates[0] = 0;
 }
 
 void ProcessOutflowOverflow::StoreInOutgoingFlux(double* rate, int index) {
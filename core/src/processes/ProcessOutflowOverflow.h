@@ -11,6 +11,13 @@ class ProcessOutflowOverflow : public ProcessOutflow {
 
     ~ProcessOutflowOverflow() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessOutflowOverflow(*this), registry);
+    }
+
     /**
      * @copydoc Process::SetParameters()
      */
@@ -19,7 +26,7 @@ class ProcessOutflowOverflow : public ProcessOutflow {
     void StoreInOutgoingFlux(double* rate, int index) override;
 
   protected:
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
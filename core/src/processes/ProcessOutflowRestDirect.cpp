@@ -6,6 +6,6 @@
 ProcessOutflowRestDirect::ProcessOutflowRestDirect(WaterContainer* container)
     : ProcessOutflow(container) {}
 
-vecDouble ProcessOutflowRestDirect::GetRates() {
-    return {wxMax(m_container->GetContentWithChanges() - GetSumChangeRatesOtherProcesses(), 0)};
+void ProcessOutflowRestDirect::GetRates(double* rates) {
+    rates[0] = wxMax(m_container->GetContentWithChanges() - GetSumChangeRatesOtherProcesses(), 0);
 }
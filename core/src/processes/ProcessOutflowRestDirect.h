@@ -11,8 +11,15 @@ class ProcessOutflowRestDirect : public ProcessOutflow {
 
     ~ProcessOutflowRestDirect() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessOutflowRestDirect(*this), registry);
+    }
+
   protected:
-    vecDouble GetRates() override;
+    void GetRates(double* rates) override;
 
   private:
 };
@@ -11,6 +11,12 @@ ProcessRunoffSocont::ProcessRunoffSocont(WaterContainer* container)
       m_areaUnit(0),
       m_areaFraction(nullptr) {}
 
+void ProcessRunoffSocont::RemapPointers(const CloneRegistry& registry) {
+    Process::RemapPointers(registry);
+    m_beta = registry.Get(m_beta);
+    m_areaFraction = registry.Get(m_areaFraction);
+}
+
 void ProcessRunoffSocont::SetHydroUnitProperties(HydroUnit* unit, Brick* brick) {
     if (brick->IsLandCover()) {
         auto* landCover = dynamic_cast<LandCover*>(brick);
@@ -33,7 +39,7 @@ double ProcessRunoffSocont::GetArea() {
     return m_areaUnit;
 }
 
-vecDouble ProcessRunoffSocont::GetRates() {
+void ProcessRunoffSocont::GetRates(double* rates) {
     // Considers the runoff on an inclined plane with a water depth of 0 at the top and of h at the bottom.
     // The water depth is assumed to be linear from the top to the bottom of the plane.
     // The storage shape is the ratio between the water depth at the bottom and the average water depth -> 2.
@@ -48,5 +54,5 @@ vecDouble ProcessRunoffSocont::GetRates() {
     // Simplified computation:
     double runoff = 1000 * (qquick / GetArea()) * dt;  // [mm/d]
 
-    return {wxMin(runoff, m_container->GetContentWithChanges())};
+    rates[0] = wxMin(runoff, m_container->GetContentWithChanges());
 }
@@ -13,6 +13,18 @@ class ProcessRunoffSocont : public ProcessOutflow {
 
     ~ProcessRunoffSocont() override = default;
 
+    /**
+     * @copydoc Process::Clone()
+     */
+    Process* Clone(CloneRegistry& registry) const override {
+        return InitializeClone(new ProcessRunoffSocont(*this), registry);
+    }
+
+    /**
+     * @copydoc Process::RemapPointers()
+     */
+    void RemapPointers(const CloneRegistry& registry) override;
+
     /**
      * @copydoc Process::SetHydroUnitProperties()
      */
@@ -23,15 +35,29 @@ class ProcessRunoffSocont : public ProcessOutflow {
      */
     void SetParameters(const ProcessSettings& processSettings) override;
 
+    double GetBeta() const {
+        wxASSERT(m_beta);
+        return *m_beta;
+    }
+
+    double GetSlope() const {
+        return m_slope;
+    }
+
+    /**
+     * Get the area drained by the process (area of the hydro unit times the area fraction of the land cover).
+     *
+     * @return The area [m^2].
+     */
+    double GetArea();
+
   protected:
     float m_slope;           // []
     float* m_beta;           // []
     double* m_areaFraction;  // []
     double m_areaUnit;       // [m^2]
 
-    vecDouble GetRates() override;
-
-    double GetArea();
+    void GetRates(double* rates) override;
 
   private:
 };
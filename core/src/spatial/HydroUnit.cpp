@@ -16,6 +16,40 @@ HydroUnit::~HydroUnit() {
     }
 }
 
+HydroUnit* HydroUnit::Clone(CloneRegistry& registry) const {
+    auto clone = new HydroUnit(*this);
+    registry.Add(this, clone);
+    for (auto& property : clone->m_properties) {
+        property = new HydroUnitProperty(*property);
+    }
+    for (auto& forcing : clone->m_forcing) {
+        forcing = forcing->Clone(registry);
+    }
+    for (auto brick : m_bricks) {
+        brick->Clone(registry);
+    }
+    for (auto splitter : m_splitters) {
+        splitter->Clone(registry);
+    }
+
+    return clone;
+}
+
+void HydroUnit::RemapPointers(const CloneRegistry& registry) {
+    for (auto forcing : m_forcing) {
+        forcing->RemapPointers(registry);
+    }
+    m_bricks = registry.Get(m_bricks);
+    for (auto brick : m_bricks) {
+        brick->RemapPointers(registry);
+    }
+    m_landCoverBricks = registry.Get(m_landCoverBricks);
+    m_splitters = registry.Get(m_splitters);
+    for (auto splitter : m_splitters) {
+        splitter->RemapPointers(registry);
+    }
+}
+
 void HydroUnit::Reset() {
     for (auto brick : m_bricks) {
         brick->Reset();
@@ -2,6 +2,7 @@
 #define HYDROBRICKS_HYDRO_UNIT_H
 
 #include "Brick.h"
+#include "CloneRegistry.h"
 #include "Forcing.h"
 #include "HydroUnitProperty.h"
 #include "Includes.h"
@@ -23,6 +24,21 @@ class HydroUnit : public wxObject {
 
     ~HydroUnit() override;
 
+    /**
+     * Create a copy of the hydro unit and of all its elements for a copy of the model (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the hydro unit.
+     */
+    HydroUnit* Clone(CloneRegistry& registry) const;
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    void RemapPointers(const CloneRegistry& registry);
+
     void Reset();
 
     void SaveAsInitialState();
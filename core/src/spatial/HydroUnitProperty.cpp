@@ -19,7 +19,7 @@ HydroUnitProperty::HydroUnitProperty(string name, string valueString, string uni
 double HydroUnitProperty::GetValue(const string& unit) const {
     if (m_unit == unit) {
         return m_value;
-    } else if (m_unit == "degrees") {
+    } else if (m_unit == "degrees" || m_unit == "deg") {
         if (unit == "radians") {
             return m_value * M_PI / 180.0;
         } else if (unit == "percent") {
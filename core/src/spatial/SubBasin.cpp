@@ -16,6 +16,43 @@ SubBasin::~SubBasin() {
     }
 }
 
+SubBasin* SubBasin::Clone(CloneRegistry& registry) const {
+    if (!m_inConnectors.empty() || !m_outConnectors.empty()) {
+        throw NotImplemented();
+    }
+
+    auto clone = new SubBasin(*this);
+    clone->m_needsCleanup = true;
+    registry.Add(this, clone);
+    registry.Add(&m_outletTotal, &clone->m_outletTotal);
+    for (auto& hydroUnit : clone->m_hydroUnits) {
+        hydroUnit = hydroUnit->Clone(registry);
+    }
+    for (auto brick : m_bricks) {
+        brick->Clone(registry);
+    }
+    for (auto splitter : m_splitters) {
+        splitter->Clone(registry);
+    }
+
+    return clone;
+}
+
+void SubBasin::RemapPointers(const CloneRegistry& registry) {
+    for (auto hydroUnit : m_hydroUnits) {
+        hydroUnit->RemapPointers(registry);
+    }
+    m_bricks = registry.Get(m_bricks);
+    for (auto brick : m_bricks) {
+        brick->RemapPointers(registry);
+    }
+    m_splitters = registry.Get(m_splitters);
+    for (auto splitter : m_splitters) {
+        splitter->RemapPointers(registry);
+    }
+    m_outletFluxes = registry.Get(m_outletFluxes);
+}
+
 bool SubBasin::Initialize(SettingsBasin& basinSettings) {
     try {
         BuildBasin(basinSettings);
@@ -118,6 +155,7 @@ void SubBasin::AddSplitter(Splitter* splitter) {
 }
 
 void SubBasin::AddHydroUnit(HydroUnit* unit) {
+    m_hydroUnitIndices.emplace(unit->GetId(), int(m_hydroUnits.size()));
     m_hydroUnits.push_back(unit);
     m_area += unit->GetArea();
 }
@@ -134,10 +172,9 @@ HydroUnit* SubBasin::GetHydroUnit(int index) {
 }
 
 HydroUnit* SubBasin::GetHydroUnitById(int id) {
-    for (auto unit : m_hydroUnits) {
-        if (unit->GetId() == id) {
-            return unit;
-        }
+    auto it = m_hydroUnitIndices.find(id);
+    if (it != m_hydroUnitIndices.end()) {
+        return m_hydroUnits[it->second];
     }
     wxLogError(_("The hydro unit %d was not found"), id);
     return nullptr;
@@ -1,6 +1,7 @@
 #ifndef HYDROBRICKS_SUBBASIN_H
 #define HYDROBRICKS_SUBBASIN_H
 
+#include "CloneRegistry.h"
 #include "Connector.h"
 #include "HydroUnit.h"
 #include "Includes.h"
@@ -13,6 +14,22 @@ class SubBasin : public wxObject {
 
     ~SubBasin() override;
 
+    /**
+     * Create a copy of the sub basin and of all its elements for a copy of the model (see CloneRegistry). The copy
+     * owns its hydro units.
+     *
+     * @param registry the registry of the original elements and their copies.
+     * @return the copy of the sub basin.
+     */
+    SubBasin* Clone(CloneRegistry& registry) const;
+
+    /**
+     * Replace the pointers to the elements of the original model by the ones of the copy (see CloneRegistry).
+     *
+     * @param registry the registry of the original elements and their copies.
+     */
+    void RemapPointers(const CloneRegistry& registry);
+
     bool Initialize(SettingsBasin& basinSettings);
 
     void BuildBasin(SettingsBasin& basinSettings);
@@ -80,6 +97,7 @@ class SubBasin : public wxObject {
     vector<Brick*> m_bricks;
     vector<Splitter*> m_splitters;
     vector<HydroUnit*> m_hydroUnits;
+    std::unordered_map<int, int> m_hydroUnitIndices;  // Index of the hydro units by id.
     vector<Connector*> m_inConnectors;
     vector<Connector*> m_outConnectors;
     vector<Flux*> m_outletFluxes;
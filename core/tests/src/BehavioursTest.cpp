@@ -232,4 +232,64 @@ TEST_F(BehavioursInModel2LandCovers, DatesGetSortedCorrectly) {
     }
 
     EXPECT_TRUE(model.Run());
-}
\ No newline at end of file
+}
+TEST_F(BehavioursInModel2LandCovers, ActiveBricksGetUpdatedOnLandCoverChange) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+    basinSettings.AddLandCover("ground", "", 0.5);
+    basinSettings.AddLandCover("glacier_ice", "", 0.0);
+    basinSettings.AddLandCover("glacier_debris", "", 0.5);
+    basinSettings.AddHydroUnit(2, 100);
+    basinSettings.AddLandCover("ground", "", 0.5);
+    basinSettings.AddLandCover("glacier_ice", "", 0.3);
+    basinSettings.AddLandCover("glacier_debris", "", 0.2);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    EXPECT_TRUE(model.Initialize(m_model, basinSettings));
+    EXPECT_TRUE(model.IsOk());
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AddTimeSeries(m_tsTemp));
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPet));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    BehaviourLandCoverChange behaviour;
+    behaviour.AddChange(GetMJD(2020, 1, 4), 1, "glacier_ice", 20);
+    behaviour.AddChange(GetMJD(2020, 1, 4), 1, "glacier_debris", 30);
+    // The glacier is removed before any snow accumulation to keep the water balance closed.
+    behaviour.AddChange(GetMJD(2020, 1, 1), 2, "glacier_ice", 0);
+    behaviour.AddChange(GetMJD(2020, 1, 1), 2, "glacier_debris", 50);
+
+    EXPECT_TRUE(model.AddBehaviour(&behaviour));
+
+    EXPECT_TRUE(model.Run());
+
+    // The glacier of the first unit became active while the one of the second unit was removed.
+    vector<ActiveBrick>* activeBricks = model.GetProcessor()->GetActiveDirectBricksVectorPt();
+    auto isActive = [activeBricks](Brick* brick) {
+        return std::any_of(activeBricks->begin(), activeBricks->end(),
+                           [brick](const ActiveBrick& activeBrick) { return activeBrick.brick == brick; });
+    };
+    EXPECT_TRUE(isActive(subBasin.GetHydroUnit(0)->GetLandCover("glacier_ice")));
+    EXPECT_FALSE(isActive(subBasin.GetHydroUnit(1)->GetLandCover("glacier_ice")));
+    EXPECT_TRUE(isActive(subBasin.GetHydroUnit(1)->GetLandCover("glacier_debris")));
+    EXPECT_LT(activeBricks->size(), model.GetProcessor()->GetDirectBricksVectorPt()->size());
+
+    Logger* logger = model.GetLogger();
+
+    // Water balance components
+    double precip = 80;
+    double totalGlacierMelt = logger->GetTotalHydroUnits("glacier_ice:melt:output");
+    totalGlacierMelt += logger->GetTotalHydroUnits("glacier_debris:melt:output");
+    double discharge = logger->GetTotalOutletDischarge();
+    double et = logger->GetTotalET();
+    double storage = logger->GetTotalWaterStorageChanges();
+
+    // Balance
+    double balance = discharge + et + storage - precip - totalGlacierMelt;
+
+    EXPECT_NEAR(balance, 0.0, 0.0000001);
+}
@@ -0,0 +1,115 @@
+#include <gtest/gtest.h>
+
+#include "ForcingPetHargreaves.h"
+#include "ForcingPetOudin.h"
+
+class ForcingPetTest : public ::testing::Test {
+  protected:
+    TimeSeriesDataRegular* m_temperatureData{};
+    TimeSeriesDataRegular* m_temperatureMinData{};
+    TimeSeriesDataRegular* m_temperatureMaxData{};
+    Forcing* m_temperature{};
+    Forcing* m_temperatureMin{};
+    Forcing* m_temperatureMax{};
+    ProcessSettings m_processSettings;
+    int m_dayOfYear = 180;
+
+    void SetUp() override {
+        m_temperatureData = new TimeSeriesDataRegular(GetMJD(2020, 6, 28), GetMJD(2020, 6, 29), 1, Day);
+        m_temperatureData->SetValues({15.0, -10.0});
+        m_temperature = new Forcing(Temperature);
+        m_temperature->AttachTimeSeriesData(m_temperatureData);
+
+        m_temperatureMinData = new TimeSeriesDataRegular(GetMJD(2020, 6, 28), GetMJD(2020, 6, 29), 1, Day);
+        m_temperatureMinData->SetValues({8.0, -12.0});
+        m_temperatureMin = new Forcing(TemperatureMin);
+        m_temperatureMin->AttachTimeSeriesData(m_temperatureMinData);
+
+        m_temperatureMaxData = new TimeSeriesDataRegular(GetMJD(2020, 6, 28), GetMJD(2020, 6, 29), 1, Day);
+        m_temperatureMaxData->SetValues({20.0, -8.0});
+        m_temperatureMax = new Forcing(TemperatureMax);
+        m_temperatureMax->AttachTimeSeriesData(m_temperatureMaxData);
+
+        m_processSettings.parameters.push_back(new Parameter("pet_k1", 100));
+        m_processSettings.parameters.push_back(new Parameter("pet_k2", 5));
+        m_processSettings.parameters.push_back(new Parameter("pet_k", 0.0135f));
+    }
+
+    void TearDown() override {
+        wxDELETE(m_temperature);
+        wxDELETE(m_temperatureMin);
+        wxDELETE(m_temperatureMax);
+        wxDELETE(m_temperatureData);
+        wxDELETE(m_temperatureMinData);
+        wxDELETE(m_temperatureMaxData);
+        for (auto parameter : m_processSettings.parameters) {
+            wxDELETE(parameter);
+        }
+    }
+
+    void SetupPet(ForcingPet* pet) {
+        pet->SetLatitude(46.0 * M_PI / 180.0);
+        pet->SetDayOfYearPointer(&m_dayOfYear);
+        pet->SetParameters(m_processSettings);
+        for (auto forcing : {m_temperature, m_temperatureMin, m_temperatureMax}) {
+            auto types = pet->GetInputTypes();
+            if (std::find(types.begin(), types.end(), forcing->GetType()) != types.end()) {
+                pet->AttachForcing(forcing);
+            }
+        }
+    }
+};
+
+TEST_F(ForcingPetTest, FactoryCreatesMethods) {
+    ForcingPet* oudin = ForcingPet::Factory("oudin");
+    ForcingPet* hargreaves = ForcingPet::Factory("hargreaves");
+    EXPECT_EQ(oudin->GetType(), PET);
+    EXPECT_EQ(hargreaves->GetInputTypes().size(), 3);
+    EXPECT_THROW(ForcingPet::Factory("penman"), InvalidArgument);
+    wxDELETE(oudin);
+    wxDELETE(hargreaves);
+}
+
+TEST_F(ForcingPetTest, OudinMatchesReferenceValues) {
+    ForcingPetOudin pet;
+    SetupPet(&pet);
+    EXPECT_TRUE(pet.IsOk());
+
+    EXPECT_NEAR(pet.GetValue(), 3.38418151, 0.0000001);
+
+    m_dayOfYear = 1;
+    EXPECT_NEAR(pet.GetValue(), 0.82256107, 0.0000001);
+
+    // No PET when the temperature is below -k2
+    m_temperatureData->AdvanceOneTimeStep();
+    EXPECT_DOUBLE_EQ(pet.GetValue(), 0.0);
+}
+
+TEST_F(ForcingPetTest, OudinFollowsParameterValues) {
+    ForcingPetOudin pet;
+    SetupPet(&pet);
+    double value = pet.GetValue();
+
+    m_processSettings.parameters[0]->SetValue(200);
+    EXPECT_NEAR(pet.GetValue(), value / 2, 0.0000001);
+}
+
+TEST_F(ForcingPetTest, HargreavesMatchesReferenceValues) {
+    ForcingPetHargreaves pet;
+    SetupPet(&pet);
+    EXPECT_TRUE(pet.IsOk());
+
+    EXPECT_NEAR(pet.GetValue(), 4.42197166, 0.000001);
+
+    m_dayOfYear = 1;
+    EXPECT_NEAR(pet.GetValue(), 1.07480693, 0.000001);
+}
+
+TEST_F(ForcingPetTest, IsNotOkWithoutLatitude) {
+    ForcingPetOudin pet;
+    pet.SetDayOfYearPointer(&m_dayOfYear);
+    pet.SetParameters(m_processSettings);
+    pet.AttachForcing(m_temperature);
+    wxLogNull logNo;
+    EXPECT_FALSE(pet.IsOk());
+}
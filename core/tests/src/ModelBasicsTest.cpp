@@ -1,6 +1,8 @@
 #include <gtest/gtest.h>
 #include <wx/stdpaths.h>
 
+#include <thread>
+
 #include "ModelHydro.h"
 #include "ProcessOutflowLinear.h"
 #include "SettingsModel.h"
@@ -367,3 +369,405 @@ TEST_F(ModelBasics, Model2ClosesBalance) {
 
     EXPECT_NEAR(balance, 0.0, 0.0000001);
 }
+
+TEST_F(ModelBasics, RunBatchMatchesIndividualRuns) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    SettingsModel settingsModel = m_model1;
+    model.Initialize(settingsModel, basinSettings);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    axxd parameterValues(3, 1);
+    parameterValues << 0.1, 0.3, 0.5;
+    axxd discharge = model.RunBatch(settingsModel, parameterValues, {"storage:response_factor"});
+
+    EXPECT_EQ(discharge.rows(), 3);
+    EXPECT_EQ(discharge.cols(), 10);
+
+    for (int i = 0; i < parameterValues.rows(); ++i) {
+        model.Reset();
+        EXPECT_TRUE(settingsModel.SetParameter("storage", "response_factor", float(parameterValues(i, 0))));
+        model.UpdateParameters(settingsModel);
+        EXPECT_TRUE(model.Run());
+        axd expected = model.GetOutletDischarge();
+        for (int t = 0; t < expected.size(); ++t) {
+            EXPECT_DOUBLE_EQ(discharge(i, t), expected[t]);
+        }
+    }
+}
+
+TEST_F(ModelBasics, RunBatchEvaluationComputesMetric) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    SettingsModel settingsModel = m_model1;
+    model.Initialize(settingsModel, basinSettings);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    axxd parameterValues(2, 1);
+    parameterValues << 0.3, 0.5;
+    axxd discharge = model.RunBatch(settingsModel, parameterValues, {"storage:response_factor"});
+    axd observations = discharge.row(0).transpose();
+
+    axd nse = model.RunBatchEvaluation(settingsModel, parameterValues, {"storage:response_factor"}, observations,
+                                       "nse");
+
+    EXPECT_EQ(nse.size(), 2);
+    EXPECT_DOUBLE_EQ(nse[0], 1.0);
+    EXPECT_LT(nse[1], 1.0);
+}
+
+TEST_F(ModelBasics, RunBatchRestoresTheParameterValues) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    SettingsModel settingsModel = m_model1;
+    model.Initialize(settingsModel, basinSettings);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    EXPECT_TRUE(model.Run());
+    axd expected = model.GetOutletDischarge();
+
+    axxd parameterValues(2, 1);
+    parameterValues << 0.1, 0.5;
+    model.RunBatch(settingsModel, parameterValues, {"storage:response_factor"});
+
+    model.Reset();
+    EXPECT_TRUE(model.Run());
+    axd discharge = model.GetOutletDischarge();
+    for (int t = 0; t < expected.size(); ++t) {
+        EXPECT_DOUBLE_EQ(discharge[t], expected[t]);
+    }
+}
+
+TEST_F(ModelBasics, RunBatchFailsWithWrongParameterName) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    SettingsModel settingsModel = m_model1;
+    model.Initialize(settingsModel, basinSettings);
+
+    axxd parameterValues(1, 1);
+    parameterValues << 0.3;
+
+    EXPECT_THROW(model.RunBatch(settingsModel, parameterValues, {"response_factor"}), InvalidArgument);
+}
+
+TEST_F(ModelBasics, CompiledParametersMatchSetParameter) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    SettingsModel settingsModel = m_model1;
+    model.Initialize(settingsModel, basinSettings);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    model.CompileParameters(settingsModel, {"storage:response_factor"});
+    EXPECT_EQ(model.GetCompiledParametersNb(), 1);
+
+    for (float value : {0.1f, 0.4f}) {
+        model.Reset();
+        EXPECT_TRUE(settingsModel.SetParameter("storage", "response_factor", value));
+        model.UpdateParameters(settingsModel);
+        EXPECT_TRUE(model.Run());
+        axd expected = model.GetOutletDischarge();
+
+        // Change the value in between to make sure the compiled parameter is effective
+        EXPECT_TRUE(settingsModel.SetParameter("storage", "response_factor", 0.9f));
+
+        model.Reset();
+        axd values(1);
+        values << value;
+        model.SetParameterValues(values);
+        EXPECT_TRUE(model.Run());
+        axd discharge = model.GetOutletDischarge();
+        for (int t = 0; t < expected.size(); ++t) {
+            EXPECT_DOUBLE_EQ(discharge[t], expected[t]);
+        }
+    }
+}
+
+TEST_F(ModelBasics, SetParameterValuesFailsWithWrongSize) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    SettingsModel settingsModel = m_model1;
+    model.Initialize(settingsModel, basinSettings);
+
+    model.CompileParameters(settingsModel, {"storage:response_factor"});
+
+    axd values(2);
+    values << 0.1, 0.2;
+
+    EXPECT_THROW(model.SetParameterValues(values), InvalidArgument);
+    EXPECT_THROW(model.CompileParameters(settingsModel, {"storage:unknown_parameter"}), InvalidArgument);
+}
+
+TEST_F(ModelBasics, UpdateTimeSeriesValuesReplacesForcing) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+    basinSettings.AddHydroUnit(2, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    model.Initialize(m_model1, basinSettings);
+
+    axd time = axd::LinSpaced(10, GetMJD(2020, 1, 1), GetMJD(2020, 1, 10));
+    axi ids(2);
+    ids << 1, 2;
+    axxd data = axxd::Zero(10, 2);
+    data(1, 0) = 10.0;
+    data(2, 1) = 5.0;
+
+    ASSERT_TRUE(model.CreateTimeSeries("precipitation", time, ids, data));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+    EXPECT_TRUE(model.Run());
+    double discharge = model.GetTotalOutletDischarge();
+    EXPECT_GT(discharge, 0.0);
+
+    // The system is linear: doubling the precipitation doubles the discharge
+    model.Reset();
+    ASSERT_TRUE(model.UpdateTimeSeriesValues("precipitation", 2 * data));
+    EXPECT_TRUE(model.Run());
+    EXPECT_NEAR(model.GetTotalOutletDischarge(), 2 * discharge, 0.0000001);
+
+    wxLogNull logNo;
+    EXPECT_FALSE(model.UpdateTimeSeriesValues("precipitation", axxd::Zero(9, 2)));
+    EXPECT_FALSE(model.UpdateTimeSeriesValues("precipitation", axxd::Zero(10, 3)));
+    EXPECT_FALSE(model.UpdateTimeSeriesValues("temperature", data));
+
+    model.ClearTimeSeries();
+}
+
+TEST_F(ModelBasics, ModelsWithDifferentTimeStepsAreIndependent) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin1;
+    EXPECT_TRUE(subBasin1.Initialize(basinSettings));
+    ModelHydro model1(&subBasin1);
+    model1.Initialize(m_model1, basinSettings);
+    ASSERT_TRUE(model1.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model1.AttachTimeSeriesToHydroUnits());
+    EXPECT_TRUE(model1.Run());
+    axd reference = model1.GetOutletDischarge();
+
+    // Build a second model with an hourly time step
+    SubBasin subBasin2;
+    EXPECT_TRUE(subBasin2.Initialize(basinSettings));
+    ModelHydro model2(&subBasin2);
+    SettingsModel settingsModel2 = m_model1;
+    settingsModel2.SetTimer("2020-01-01", "2020-01-10", 1, "hour");
+    model2.Initialize(settingsModel2, basinSettings);
+
+    EXPECT_DOUBLE_EQ(model1.GetProcessor()->GetTimeStepInDays(), 1.0);
+    EXPECT_DOUBLE_EQ(model2.GetProcessor()->GetTimeStepInDays(), 1.0 / 24.0);
+
+    model1.Reset();
+    EXPECT_TRUE(model1.Run());
+    axd discharge = model1.GetOutletDischarge();
+
+    for (int t = 0; t < reference.size(); ++t) {
+        EXPECT_DOUBLE_EQ(discharge[t], reference[t]);
+    }
+}
+
+TEST_F(ModelBasics, ModelsRunConcurrentlyInThreads) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    const int modelsNb = 4;
+    vector<SubBasin*> subBasins;
+    vector<ModelHydro*> models;
+    vector<axd> references;
+    for (int i = 0; i < modelsNb; ++i) {
+        auto subBasin = new SubBasin();
+        EXPECT_TRUE(subBasin->Initialize(basinSettings));
+        auto model = new ModelHydro(subBasin);
+        model->Initialize(m_model2, basinSettings);
+
+        // Each model gets its own time series as the data cursor is not shared
+        auto data = new TimeSeriesDataRegular(GetMJD(2020, 1, 1), GetMJD(2020, 1, 10), 1, Day);
+        data->SetValues({0.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0});
+        auto timeSeries = new TimeSeriesUniform(Precipitation);
+        timeSeries->SetData(data);
+        ASSERT_TRUE(model->AddTimeSeries(timeSeries));
+        ASSERT_TRUE(model->AttachTimeSeriesToHydroUnits());
+
+        EXPECT_TRUE(model->Run());
+        references.push_back(model->GetOutletDischarge());
+        model->Reset();
+
+        subBasins.push_back(subBasin);
+        models.push_back(model);
+    }
+
+    vector<std::thread> threads;
+    vector<int> results(modelsNb, 0);
+    for (int i = 0; i < modelsNb; ++i) {
+        threads.emplace_back([&models, &results, i]() { results[i] = models[i]->Run() ? 1 : 0; });
+    }
+    for (auto& thread : threads) {
+        thread.join();
+    }
+
+    for (int i = 0; i < modelsNb; ++i) {
+        EXPECT_EQ(results[i], 1);
+        axd discharge = models[i]->GetOutletDischarge();
+        for (int t = 0; t < discharge.size(); ++t) {
+            EXPECT_DOUBLE_EQ(discharge[t], references[i][t]);
+        }
+        models[i]->ClearTimeSeries();
+        wxDELETE(models[i]);
+        wxDELETE(subBasins[i]);
+    }
+}
+
+TEST_F(ModelBasics, ClonedModelRunsLikeOriginal) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    model.Initialize(m_model2, basinSettings);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    SettingsModel* settingsClone = m_model2.Clone();
+    ModelHydro* clone = model.Clone(m_model2, *settingsClone);
+    ASSERT_TRUE(clone != nullptr);
+    EXPECT_TRUE(clone->IsOk());
+    EXPECT_TRUE(clone->ForcingLoaded());
+    EXPECT_NE(clone->GetSubBasin(), model.GetSubBasin());
+
+    EXPECT_TRUE(model.Run());
+    EXPECT_TRUE(clone->Run());
+
+    axd expected = model.GetOutletDischarge();
+    axd discharge = clone->GetOutletDischarge();
+    EXPECT_EQ(discharge.size(), expected.size());
+    for (int t = 0; t < expected.size(); ++t) {
+        EXPECT_DOUBLE_EQ(discharge[t], expected[t]);
+    }
+
+    SubBasin* subBasinClone = clone->GetSubBasin();
+    clone->ClearTimeSeries();
+    wxDELETE(clone);
+    wxDELETE(subBasinClone);
+    wxDELETE(settingsClone);
+}
+
+TEST_F(ModelBasics, ClonedModelIsIndependent) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    model.Initialize(m_model2, basinSettings);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    EXPECT_TRUE(model.Run());
+    axd reference = model.GetOutletDischarge();
+    model.Reset();
+
+    SettingsModel* settingsClone = m_model2.Clone();
+    ModelHydro* clone = model.Clone(m_model2, *settingsClone);
+    ASSERT_TRUE(clone != nullptr);
+
+    // Changing the parameters of the clone must not affect the original model
+    EXPECT_TRUE(settingsClone->SetParameter("storage_2", "response_factor", 0.1f));
+    clone->UpdateParameters(*settingsClone);
+    EXPECT_TRUE(clone->Run());
+
+    // Running the clone must not move the cursor of the original forcing
+    EXPECT_TRUE(model.Run());
+
+    axd discharge = model.GetOutletDischarge();
+    axd dischargeClone = clone->GetOutletDischarge();
+    for (int t = 0; t < reference.size(); ++t) {
+        EXPECT_DOUBLE_EQ(discharge[t], reference[t]);
+    }
+    EXPECT_GT((dischargeClone - reference).abs().sum(), 0.1);
+
+    SubBasin* subBasinClone = clone->GetSubBasin();
+    clone->ClearTimeSeries();
+    wxDELETE(clone);
+    wxDELETE(subBasinClone);
+    wxDELETE(settingsClone);
+}
+
+TEST_F(ModelBasics, ClonedModelStartsFromInitialState) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    model.Initialize(m_model2, basinSettings);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    // The original model is not reset: the copy must not inherit its state
+    EXPECT_TRUE(model.Run());
+    axd reference = model.GetOutletDischarge();
+
+    SettingsModel* settingsClone = m_model2.Clone();
+    ModelHydro* clone = model.Clone(m_model2, *settingsClone);
+    ASSERT_TRUE(clone != nullptr);
+    EXPECT_TRUE(clone->Run());
+
+    axd discharge = clone->GetOutletDischarge();
+    EXPECT_EQ(discharge.size(), reference.size());
+    for (int t = 0; t < reference.size(); ++t) {
+        EXPECT_DOUBLE_EQ(discharge[t], reference[t]);
+    }
+
+    SubBasin* subBasinClone = clone->GetSubBasin();
+    clone->ClearTimeSeries();
+    wxDELETE(clone);
+    wxDELETE(subBasinClone);
+    wxDELETE(settingsClone);
+}
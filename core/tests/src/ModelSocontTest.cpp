@@ -437,6 +437,59 @@ TEST_F(ModelSocontBasic, WaterBalanceClosesWith2HydroUnits) {
     EXPECT_NEAR(balance, 0.0, 0.0000001);
 }
 
+TEST_F(ModelSocontBasic, WaterBalanceClosesWith2HydroUnitsAnalyticalLinearStorages) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+    basinSettings.AddLandCover("ground", "", 0.5);
+    basinSettings.AddLandCover("glacier", "", 0.5);
+    basinSettings.AddHydroUnit(2, 50);
+    basinSettings.AddLandCover("ground", "", 0.2);
+    basinSettings.AddLandCover("glacier", "", 0.8);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    m_model.SetAnalyticalLinearStorages();
+
+    ModelHydro model(&subBasin);
+    EXPECT_TRUE(model.Initialize(m_model, basinSettings));
+    EXPECT_TRUE(model.IsOk());
+
+    // The slow reservoir 2, the surface runoff and the glacier area storages are linear storages
+    vector<Brick*>* analyticalBricks = model.GetProcessor()->GetAnalyticalBricksVectorPt();
+    EXPECT_EQ(analyticalBricks->size(), 6);
+    for (auto brick : *analyticalBricks) {
+        EXPECT_TRUE(brick->GetName() == "slow_reservoir_2" || brick->GetName() == "surface_runoff" ||
+                    brick->GetName() == "glacier_area_rain_snowmelt_storage" ||
+                    brick->GetName() == "glacier_area_icemelt_storage");
+    }
+    for (auto brick : *model.GetProcessor()->GetIterableBricksVectorPt()) {
+        EXPECT_NE(brick->GetName(), "slow_reservoir_2");
+        EXPECT_NE(brick->GetName(), "surface_runoff");
+    }
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AddTimeSeries(m_tsTemp));
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPet));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    EXPECT_TRUE(model.Run());
+
+    Logger* logger = model.GetLogger();
+
+    // Water balance components
+    double precip = 80;
+    double totalGlacierMelt = logger->GetTotalHydroUnits("glacier:melt:output");
+    double discharge = logger->GetTotalOutletDischarge();
+    double et = logger->GetTotalET();
+    double storage = logger->GetTotalWaterStorageChanges();
+
+    // Balance
+    double balance = discharge + et + storage - precip - totalGlacierMelt;
+
+    EXPECT_NEAR(balance, 0.0, 0.0000001);
+}
+
 TEST_F(ModelSocontBasic, WaterBalanceClosesWith4HydroUnits) {
     SettingsBasin basinSettings;
     basinSettings.AddHydroUnit(1, 100);
@@ -526,4 +579,248 @@ TEST(ModelSocont, WaterBalanceCloses) {
     double balance = discharge + et + storage + snow - precip;
 
     EXPECT_NEAR(balance, 0.0, 0.0000001);
-}
\ No newline at end of file
+}
+
+TEST_F(ModelSocontBasic, ProcessorHandlesSameBricksOfHydroUnitsConsecutively) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+    basinSettings.AddLandCover("ground", "", 0.5);
+    basinSettings.AddLandCover("glacier", "", 0.5);
+    basinSettings.AddHydroUnit(2, 50);
+    basinSettings.AddLandCover("ground", "", 0.2);
+    basinSettings.AddLandCover("glacier", "", 0.8);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    EXPECT_TRUE(model.Initialize(m_model, basinSettings));
+    EXPECT_TRUE(model.IsOk());
+
+    HydroUnit* unit1 = subBasin.GetHydroUnit(0);
+    HydroUnit* unit2 = subBasin.GetHydroUnit(1);
+
+    vector<Brick*>* directBricks = model.GetProcessor()->GetDirectBricksVectorPt();
+    vector<Brick*>* iterableBricks = model.GetProcessor()->GetIterableBricksVectorPt();
+    EXPECT_EQ(directBricks->size() + iterableBricks->size(),
+              unit1->GetBricksCount() + unit2->GetBricksCount() + subBasin.GetBricksCount());
+
+    for (auto bricks : {directBricks, iterableBricks}) {
+        int unitBricksNb = int(bricks->size());
+        if (bricks == iterableBricks) {
+            unitBricksNb -= subBasin.GetBricksCount();
+        }
+        for (int i = 0; i < unitBricksNb; i += 2) {
+            EXPECT_EQ((*bricks)[i]->GetName(), (*bricks)[i + 1]->GetName());
+            EXPECT_TRUE(unit1->HasBrick((*bricks)[i]->GetName()));
+            EXPECT_EQ((*bricks)[i], unit1->GetBrick((*bricks)[i]->GetName()));
+            EXPECT_EQ((*bricks)[i + 1], unit2->GetBrick((*bricks)[i]->GetName()));
+        }
+    }
+}
+
+TEST_F(ModelSocontBasic, MultithreadedRunMatchesSingleThread) {
+    SettingsBasin basinSettings;
+    for (int i = 1; i <= 7; ++i) {
+        basinSettings.AddHydroUnit(i, 100 + 10 * i);
+        basinSettings.AddLandCover("ground", "", 0.1 * i);
+        basinSettings.AddLandCover("glacier", "", 1 - 0.1 * i);
+    }
+
+    vecAxd outlets;
+    vecDouble glacierMelts;
+    for (int threadsNb : {1, 3}) {
+        SubBasin subBasin;
+        EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+        m_model.SetThreads(threadsNb);
+
+        ModelHydro model(&subBasin);
+        EXPECT_TRUE(model.Initialize(m_model, basinSettings));
+        EXPECT_TRUE(model.IsOk());
+        EXPECT_EQ(model.GetProcessor()->GetThreadsNb(), threadsNb);
+
+        ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+        ASSERT_TRUE(model.AddTimeSeries(m_tsTemp));
+        ASSERT_TRUE(model.AddTimeSeries(m_tsPet));
+        ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+        EXPECT_TRUE(model.Run());
+
+        Logger* logger = model.GetLogger();
+        outlets.push_back(logger->GetSubBasinValues()[0]);
+        glacierMelts.push_back(logger->GetTotalHydroUnits("glacier:melt:output"));
+
+        // Water balance
+        double precip = 80;
+        double discharge = logger->GetTotalOutletDischarge();
+        double et = logger->GetTotalET();
+        double storage = logger->GetTotalWaterStorageChanges();
+        double balance = discharge + et + storage - precip - glacierMelts.back();
+        EXPECT_NEAR(balance, 0.0, 0.0000001);
+    }
+
+    EXPECT_GT(glacierMelts[0], 0);
+    EXPECT_DOUBLE_EQ(glacierMelts[0], glacierMelts[1]);
+    for (int j = 0; j < outlets[0].size(); ++j) {
+        EXPECT_DOUBLE_EQ(outlets[0][j], outlets[1][j]);
+    }
+}
+
+TEST_F(ModelSocontBasic, VectorizedProcessesMatchObjectEvaluation) {
+    SettingsBasin basinSettings;
+    for (int i = 1; i <= 7; ++i) {
+        basinSettings.AddHydroUnit(i, 100 + 10 * i);
+        basinSettings.AddLandCover("ground", "", i == 7 ? 1 : 0.1 * i);
+        basinSettings.AddLandCover("glacier", "", i == 7 ? 0 : 1 - 0.1 * i);
+        basinSettings.AddHydroUnitPropertyDouble("slope", 0.1 * i, "m/m");
+    }
+
+    for (const string& surfaceRunoff : {"linear_storage", "socont_runoff"}) {
+        SettingsModel modelSettings;
+        modelSettings.SetSolver("heun_explicit");
+        modelSettings.SetTimer("2020-01-01", "2020-01-10", 1, "day");
+        modelSettings.SetLogAll(true);
+        vecStr landCoverTypes = {"ground", "glacier"};
+        vecStr landCoverNames = {"ground", "glacier"};
+        modelSettings.GenerateStructureSocont(landCoverTypes, landCoverNames, 2, surfaceRunoff);
+        if (surfaceRunoff == "socont_runoff") {
+            modelSettings.SelectHydroUnitBrick("surface_runoff");
+            modelSettings.SelectProcess("runoff");
+            modelSettings.AddProcessParameter("beta", 500.0f);
+        }
+
+        vecAxd outlets;
+        vecDouble glacierMelts;
+        vecDouble ets;
+        for (auto [vectorized, threadsNb] : vector<std::pair<bool, int>>{{false, 1}, {true, 1}, {true, 3}}) {
+            SubBasin subBasin;
+            EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+            modelSettings.SetVectorizedProcesses(vectorized);
+            modelSettings.SetThreads(threadsNb);
+
+            ModelHydro model(&subBasin);
+            EXPECT_TRUE(model.Initialize(modelSettings, basinSettings));
+            EXPECT_TRUE(model.IsOk());
+
+            // The same brick of the hydro units is evaluated as a single group
+            Processor* processor = model.GetProcessor();
+            EXPECT_EQ(processor->HasBrickGroups(), vectorized);
+            if (vectorized) {
+                EXPECT_LT(processor->GetIterableBrickGroupsVectorPt()->size(), processor->GetIterableBricksVectorPt()->size());
+            }
+
+            ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+            ASSERT_TRUE(model.AddTimeSeries(m_tsTemp));
+            ASSERT_TRUE(model.AddTimeSeries(m_tsPet));
+            ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+            EXPECT_TRUE(model.Run());
+
+            Logger* logger = model.GetLogger();
+            outlets.push_back(logger->GetSubBasinValues()[0]);
+            glacierMelts.push_back(logger->GetTotalHydroUnits("glacier:melt:output"));
+            ets.push_back(logger->GetTotalET());
+
+            // Water balance
+            double precip = 80;
+            double discharge = logger->GetTotalOutletDischarge();
+            double storage = logger->GetTotalWaterStorageChanges();
+            double balance = discharge + ets.back() + storage - precip - glacierMelts.back();
+            EXPECT_NEAR(balance, 0.0, 0.0000001);
+        }
+
+        EXPECT_GT(glacierMelts[0], 0);
+        EXPECT_GT(ets[0], 0);
+        for (int k = 1; k < outlets.size(); ++k) {
+            EXPECT_EQ(glacierMelts[0], glacierMelts[k]);
+            EXPECT_EQ(ets[0], ets[k]);
+            for (int j = 0; j < outlets[0].size(); ++j) {
+                EXPECT_EQ(outlets[0][j], outlets[k][j]);
+            }
+        }
+    }
+}
+
+TEST_F(ModelSocontBasic, PetComputedInEngineClosesWaterBalance) {
+    SettingsModel modelSettings;
+    modelSettings.SetLogAll(true);
+    modelSettings.SetSolver("heun_explicit");
+    modelSettings.SetTimer("2020-07-01", "2020-07-10", 1, "day");
+    vecStr landCoverTypes = {"ground", "glacier"};
+    vecStr landCoverNames = {"ground", "glacier"};
+    ASSERT_TRUE(modelSettings.GenerateStructureSocont(landCoverTypes, landCoverNames, 1, "linear_storage", "oudin"));
+
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+    basinSettings.AddHydroUnitPropertyDouble("latitude", 46.5, "deg");
+    basinSettings.AddLandCover("ground", "", 0.5);
+    basinSettings.AddLandCover("glacier", "", 0.5);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    EXPECT_TRUE(model.Initialize(modelSettings, basinSettings));
+    EXPECT_TRUE(model.IsOk());
+
+    auto precip = new TimeSeriesDataRegular(GetMJD(2020, 7, 1), GetMJD(2020, 7, 10), 1, Day);
+    precip->SetValues({0.0, 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, 0.0});
+    auto tsPrecip = new TimeSeriesUniform(Precipitation);
+    tsPrecip->SetData(precip);
+    auto temperature = new TimeSeriesDataRegular(GetMJD(2020, 7, 1), GetMJD(2020, 7, 10), 1, Day);
+    temperature->SetValues({12.0, 14.0, 15.0, 16.0, 18.0, 17.0, 16.0, 14.0, 12.0, 10.0});
+    auto tsTemp = new TimeSeriesUniform(Temperature);
+    tsTemp->SetData(temperature);
+
+    // No PET time series: the PET is computed from the temperature and the latitude.
+    ASSERT_TRUE(model.AddTimeSeries(tsPrecip));
+    ASSERT_TRUE(model.AddTimeSeries(tsTemp));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    EXPECT_TRUE(model.Run());
+
+    Logger* logger = model.GetLogger();
+
+    // Water balance components
+    double precipTotal = 80;
+    double totalGlacierMelt = logger->GetTotalHydroUnits("glacier:melt:output");
+    double discharge = logger->GetTotalOutletDischarge();
+    double et = logger->GetTotalET();
+    double storage = logger->GetTotalWaterStorageChanges();
+
+    // Balance
+    double balance = discharge + et + storage - precipTotal - totalGlacierMelt;
+
+    EXPECT_GT(et, 0.0);
+    EXPECT_NEAR(balance, 0.0, 0.0000001);
+}
+
+TEST(ModelSocont, PetComputedInEngineNeedsTheLatitude) {
+    SettingsModel modelSettings;
+    modelSettings.SetSolver("heun_explicit");
+    modelSettings.SetTimer("2020-07-01", "2020-07-10", 1, "day");
+    vecStr landCoverTypes = {"ground"};
+    vecStr landCoverNames = {"ground"};
+    ASSERT_TRUE(modelSettings.GenerateStructureSocont(landCoverTypes, landCoverNames, 1, "linear_storage", "oudin"));
+
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+    basinSettings.AddLandCover("ground", "", 1);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    ModelHydro model(&subBasin);
+    wxLogNull logNo;
+    EXPECT_FALSE(model.Initialize(modelSettings, basinSettings));
+}
+
+TEST(ModelSocont, UnknownPetMethodFails) {
+    SettingsModel modelSettings;
+    vecStr landCoverTypes = {"ground"};
+    vecStr landCoverNames = {"ground"};
+    wxLogNull logNo;
+    EXPECT_FALSE(modelSettings.GenerateStructureSocont(landCoverTypes, landCoverNames, 1, "linear_storage", "penman"));
+}
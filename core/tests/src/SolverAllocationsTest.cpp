@@ -0,0 +1,103 @@
+#include <gtest/gtest.h>
+
+#include <new>
+
+#include "ModelHydro.h"
+#include "SettingsModel.h"
+#include "TimeSeriesUniform.h"
+
+// Count the heap allocations. The global operator new is replaced for the whole test binary, but the allocations
+// are only counted in the measured region and on the thread that enables the counting.
+static thread_local bool g_countAllocations = false;
+static thread_local long g_allocationsNb = 0;
+
+void* operator new(size_t size) {
+    if (g_countAllocations) {
+        g_allocationsNb++;
+    }
+    void* pt = std::malloc(size == 0 ? 1 : size);
+    if (pt == nullptr) {
+        throw std::bad_alloc();
+    }
+    return pt;
+}
+
+void operator delete(void* pt) noexcept {
+    std::free(pt);
+}
+
+void operator delete(void* pt, size_t) noexcept {
+    std::free(pt);
+}
+
+class SolverAllocations : public ::testing::TestWithParam<string> {
+  protected:
+    SettingsModel m_model;
+    SettingsBasin m_basinSettings;
+    vector<TimeSeriesUniform*> m_timeSeries;
+    int m_timeStepsNb = 366;
+
+    void SetUp() override {
+        m_model.SetSolver(GetParam());
+        m_model.SetTimer("2020-01-01", "2020-12-31", 1, "day");
+        vecStr landCoverTypes = {"ground", "glacier"};
+        vecStr landCoverNames = {"ground", "glacier"};
+        m_model.GenerateStructureSocont(landCoverTypes, landCoverNames, 2, "linear_storage");
+
+        for (int i = 0; i < 100; ++i) {
+            m_basinSettings.AddHydroUnit(i + 1, 100);
+            m_basinSettings.AddLandCover("ground", "", 0.7);
+            m_basinSettings.AddLandCover("glacier", "", 0.3);
+        }
+
+        vecDouble precip(m_timeStepsNb), temperature(m_timeStepsNb), pet(m_timeStepsNb);
+        for (int i = 0; i < m_timeStepsNb; ++i) {
+            precip[i] = (i % 3) * 5.0;
+            temperature[i] = -5.0 + 15.0 * sin(i / 58.0);
+            pet[i] = 2.0;
+        }
+        AddTimeSeries(Precipitation, precip);
+        AddTimeSeries(Temperature, temperature);
+        AddTimeSeries(PET, pet);
+    }
+
+    void TearDown() override {
+        for (auto timeSeries : m_timeSeries) {
+            wxDELETE(timeSeries);
+        }
+    }
+
+    void AddTimeSeries(VariableType type, const vecDouble& values) {
+        auto data = new TimeSeriesDataRegular(GetMJD(2020, 1, 1), GetMJD(2020, 12, 31), 1, Day);
+        data->SetValues(values);
+        auto timeSeries = new TimeSeriesUniform(type);
+        timeSeries->SetData(data);
+        m_timeSeries.push_back(timeSeries);
+    }
+};
+
+TEST_P(SolverAllocations, RunDoesNotAllocatePerTimeStep) {
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(m_basinSettings));
+
+    ModelHydro model(&subBasin);
+    EXPECT_TRUE(model.Initialize(m_model, m_basinSettings));
+    for (auto timeSeries : m_timeSeries) {
+        ASSERT_TRUE(model.AddTimeSeries(timeSeries));
+    }
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    // First run to size the internal buffers
+    EXPECT_TRUE(model.Run());
+    model.Reset();
+
+    g_allocationsNb = 0;
+    g_countAllocations = true;
+    bool success = model.Run();
+    g_countAllocations = false;
+
+    EXPECT_TRUE(success);
+    EXPECT_LT(double(g_allocationsNb) / m_timeStepsNb, 1.0);
+}
+
+INSTANTIATE_TEST_SUITE_P(Solvers, SolverAllocations, ::testing::Values("euler_explicit", "heun_explicit", "rk4"));
@@ -1,7 +1,10 @@
 #include <gtest/gtest.h>
 
+#include <map>
+
 #include "ModelHydro.h"
 #include "SettingsModel.h"
+#include "SolverAdaptive.h"
 #include "TimeSeriesUniform.h"
 
 TEST(Solver, FactoryBuildsSolvers) {
@@ -32,6 +35,21 @@ TEST(Solver, FactoryBuildsSolvers) {
     solver = Solver::Factory(settings);
     EXPECT_TRUE(solver != nullptr);
     wxDELETE(solver);
+
+    settings.name = "heun_euler";
+    solver = Solver::Factory(settings);
+    EXPECT_TRUE(solver != nullptr);
+    wxDELETE(solver);
+
+    settings.name = "bogacki_shampine";
+    solver = Solver::Factory(settings);
+    EXPECT_TRUE(solver != nullptr);
+    wxDELETE(solver);
+
+    settings.name = "rk23";
+    solver = Solver::Factory(settings);
+    EXPECT_TRUE(solver != nullptr);
+    wxDELETE(solver);
 }
 
 TEST(Solver, FactoryThrowsExceptionIfNameInvalid) {
@@ -41,6 +59,13 @@ TEST(Solver, FactoryThrowsExceptionIfNameInvalid) {
     EXPECT_THROW(Solver::Factory(settings), InvalidArgument);
 }
 
+TEST(Solver, SetSolverThrowsExceptionIfToleranceInvalid) {
+    SettingsModel settings;
+
+    EXPECT_THROW(settings.SetSolver("heun_euler", 0.0, 0.001), InvalidArgument);
+    EXPECT_THROW(settings.SetSolver("heun_euler", 0.01, -0.1), InvalidArgument);
+}
+
 /**
  * Model: simple linear storage
  */
@@ -186,6 +211,228 @@ TEST_F(SolverLinearStorage, UsingRungeKutta) {
     EXPECT_NEAR(30.0 - basinOutputs[0].sum() - storageContent, 0, 0.00000000000001);
 }
 
+TEST_F(SolverLinearStorage, UsingAdaptiveSolvers) {
+    // Analytical solution of dS/dt = P - k S with a constant precipitation over each day
+    double k = 0.3;
+    vecDouble precip = {0.0, 10.0, 10.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                        0.0, 0.0,  0.0,  0.0,  0.0, 0.0, 0.0, 0.0, 0.0, 0.0};
+    vecDouble expectedOutputs;
+    double content = 0;
+    for (double p : precip) {
+        double newContent = content * std::exp(-k) + p / k * (1 - std::exp(-k));
+        expectedOutputs.push_back(p - (newContent - content));
+        content = newContent;
+    }
+
+    for (const string& solverName : {"heun_euler", "bogacki_shampine"}) {
+        SettingsBasin basinSettings;
+        basinSettings.AddHydroUnit(1, 100);
+
+        SubBasin subBasin;
+        EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+        m_model.SetSolver(solverName, 0.0001, 0.0001);
+
+        ModelHydro model(&subBasin);
+        model.Initialize(m_model, basinSettings);
+
+        ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+        ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+        EXPECT_TRUE(model.Run());
+
+        // Check resulting discharge
+        vecAxd basinOutputs = model.GetLogger()->GetSubBasinValues();
+
+        for (auto& basinOutput : basinOutputs) {
+            for (int j = 0; j < basinOutput.size(); ++j) {
+                EXPECT_NEAR(basinOutput[j], expectedOutputs[j], 0.001);
+            }
+        }
+
+        // Check water balance
+        vecAxxd unitContent = model.GetLogger()->GetHydroUnitValues();
+        double storageContent = unitContent[0](19, 0);
+        EXPECT_NEAR(storageContent, content, 0.001);
+        EXPECT_NEAR(30.0 - basinOutputs[0].sum() - storageContent, 0, 0.00000000000001);
+
+        // The time steps were subdivided
+        auto solver = dynamic_cast<SolverAdaptive*>(model.GetProcessor()->GetSolver());
+        ASSERT_TRUE(solver != nullptr);
+        EXPECT_GT(solver->GetAcceptedSubStepsNb(), 20);
+    }
+}
+
+TEST_F(SolverLinearStorage, UsingAnalyticalLinearStorages) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(1, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    m_model.SetSolver("heun_explicit");
+    m_model.SetAnalyticalLinearStorages();
+
+    ModelHydro model(&subBasin);
+    model.Initialize(m_model, basinSettings);
+
+    // The storage is not handled by the solver anymore
+    EXPECT_EQ(model.GetProcessor()->GetIterableBricksVectorPt()->size(), 0);
+    EXPECT_EQ(model.GetProcessor()->GetAnalyticalBricksVectorPt()->size(), 1);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    EXPECT_TRUE(model.Run());
+
+    // Check resulting discharge against the analytical solution
+    vecAxd basinOutputs = model.GetLogger()->GetSubBasinValues();
+
+    double k = 0.3;
+    vecDouble precip = {0.0, 10.0, 10.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                        0.0, 0.0,  0.0,  0.0,  0.0, 0.0, 0.0, 0.0, 0.0, 0.0};
+    double content = 0;
+    for (int j = 0; j < precip.size(); ++j) {
+        double newContent = content * std::exp(-k) + precip[j] / k * (1 - std::exp(-k));
+        EXPECT_NEAR(basinOutputs[0][j], precip[j] - (newContent - content), 0.000001);
+        content = newContent;
+    }
+
+    // Check water balance
+    vecAxxd unitContent = model.GetLogger()->GetHydroUnitValues();
+    double storageContent = unitContent[0](19, 0);
+    EXPECT_NEAR(storageContent, content, 0.000001);
+    EXPECT_NEAR(30.0 - basinOutputs[0].sum() - storageContent, 0, 0.00000000000001);
+}
+
+TEST_F(SolverLinearStorage, UsingAnalyticalLinearStoragesOnSeveralHydroUnits) {
+    SettingsBasin basinSettings;
+    for (int id = 1; id <= 5; ++id) {
+        basinSettings.AddHydroUnit(id, 20.0 * id);
+    }
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    m_model.SetAnalyticalLinearStorages();
+    m_model.SetThreads(2);
+
+    ModelHydro model(&subBasin);
+    model.Initialize(m_model, basinSettings);
+    EXPECT_EQ(model.GetProcessor()->GetAnalyticalBricksVectorPt()->size(), 5);
+
+    ASSERT_TRUE(model.AddTimeSeries(m_tsPrecip));
+    ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+    EXPECT_TRUE(model.Run());
+
+    // All the storages follow the analytical solution
+    vecAxxd unitContents = model.GetLogger()->GetHydroUnitValues();
+    vecAxd basinOutputs = model.GetLogger()->GetSubBasinValues();
+
+    double k = 0.3;
+    vecDouble precip = {0.0, 10.0, 10.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                        0.0, 0.0,  0.0,  0.0,  0.0, 0.0, 0.0, 0.0, 0.0, 0.0};
+    double content = 0;
+    for (int j = 0; j < precip.size(); ++j) {
+        double newContent = content * std::exp(-k) + precip[j] / k * (1 - std::exp(-k));
+        EXPECT_NEAR(basinOutputs[0][j], precip[j] - (newContent - content), 0.000001);
+        for (int iUnit = 0; iUnit < 5; ++iUnit) {
+            EXPECT_NEAR(unitContents[0](j, iUnit), newContent, 0.000001);
+        }
+        content = newContent;
+    }
+}
+
+TEST_F(SolverLinearStorage, AdaptiveSolverNeedsFewerEvaluationsThanRungeKuttaOnDryPeriods) {
+    // Short rain event followed by a long dry period
+    m_model.SetTimer("2020-01-01", "2020-03-31", 1, "day");
+    auto data = new TimeSeriesDataRegular(GetMJD(2020, 1, 1), GetMJD(2020, 3, 31), 1, Day);
+    vecDouble precip(91, 0.0);
+    precip[1] = 10.0;
+    precip[2] = 10.0;
+    precip[3] = 10.0;
+    data->SetValues(precip);
+
+    std::map<string, int> evaluations;
+    std::map<string, double> outflows;
+
+    for (const string& solverName : {"rk4", "heun_euler", "bogacki_shampine"}) {
+        SettingsBasin basinSettings;
+        basinSettings.AddHydroUnit(1, 100);
+
+        SubBasin subBasin;
+        EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+        m_model.SetSolver(solverName);
+
+        ModelHydro model(&subBasin);
+        model.Initialize(m_model, basinSettings);
+
+        auto tsPrecip = new TimeSeriesUniform(Precipitation);
+        tsPrecip->SetData(data->Clone());
+        ASSERT_TRUE(model.AddTimeSeries(tsPrecip));
+        ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+        EXPECT_TRUE(model.Run());
+
+        vecAxd basinOutputs = model.GetLogger()->GetSubBasinValues();
+        evaluations[solverName] = model.GetProcessor()->GetSolver()->GetRateEvaluationsNb();
+        outflows[solverName] = basinOutputs[0].sum();
+
+        wxDELETE(tsPrecip);
+    }
+
+    wxDELETE(data);
+
+    EXPECT_EQ(evaluations["rk4"], 4 * 91);
+    EXPECT_LT(evaluations["heun_euler"], evaluations["rk4"]);
+    EXPECT_NEAR(outflows["heun_euler"], outflows["rk4"], 0.01);
+
+    // The first stage of the Bogacki-Shampine method is computed again at every time step
+    EXPECT_GE(evaluations["bogacki_shampine"], evaluations["rk4"]);
+    EXPECT_NEAR(outflows["bogacki_shampine"], outflows["rk4"], 0.01);
+}
+
+TEST_F(SolverLinearStorage, AdaptiveSolverGivesIdenticalResultsAfterReset) {
+    // Rain at the beginning and at the end of the period, so that the last time step is sub-stepped
+    auto data = new TimeSeriesDataRegular(GetMJD(2020, 1, 1), GetMJD(2020, 1, 20), 1, Day);
+    data->SetValues(
+        {10.0, 10.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 50.0, 50.0});
+    auto tsPrecip = new TimeSeriesUniform(Precipitation);
+    tsPrecip->SetData(data);
+
+    for (const string& solverName : {"heun_euler", "bogacki_shampine"}) {
+        SettingsBasin basinSettings;
+        basinSettings.AddHydroUnit(1, 100);
+
+        SubBasin subBasin;
+        EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+        m_model.SetSolver(solverName, 0.0001, 0.0001);
+
+        ModelHydro model(&subBasin);
+        model.Initialize(m_model, basinSettings);
+
+        ASSERT_TRUE(model.AddTimeSeries(tsPrecip));
+        ASSERT_TRUE(model.AttachTimeSeriesToHydroUnits());
+
+        EXPECT_TRUE(model.Run());
+        axd reference = model.GetOutletDischarge();
+
+        model.Reset();
+        EXPECT_TRUE(model.Run());
+        axd discharge = model.GetOutletDischarge();
+
+        EXPECT_EQ(discharge.size(), reference.size());
+        for (int t = 0; t < reference.size(); ++t) {
+            EXPECT_DOUBLE_EQ(discharge[t], reference[t]);
+        }
+    }
+
+    wxDELETE(tsPrecip);
+}
+
 /**
  * Model: 2 linear storages in cascade
  */
@@ -49,3 +49,20 @@ TEST(SubBasin, SubBasinIsOk) {
 
     EXPECT_TRUE(subBasin.IsOk());
 }
+
+TEST(SubBasin, GetHydroUnitById) {
+    SettingsBasin basinSettings;
+    basinSettings.AddHydroUnit(12, 100);
+    basinSettings.AddHydroUnit(3, 100);
+    basinSettings.AddHydroUnit(27, 100);
+
+    SubBasin subBasin;
+    EXPECT_TRUE(subBasin.Initialize(basinSettings));
+
+    EXPECT_EQ(subBasin.GetHydroUnitById(12), subBasin.GetHydroUnit(0));
+    EXPECT_EQ(subBasin.GetHydroUnitById(3), subBasin.GetHydroUnit(1));
+    EXPECT_EQ(subBasin.GetHydroUnitById(27), subBasin.GetHydroUnit(2));
+
+    wxLogNull logNo;
+    EXPECT_EQ(subBasin.GetHydroUnitById(4), nullptr);
+}
@@ -51,3 +51,16 @@ TEST(TimeMachine, IsOver) {
 
     EXPECT_TRUE(timer.IsOver());
 }
+
+TEST(TimeMachine, DayOfYearFollowsTheDate) {
+    TimeMachine timer;
+    timer.Initialize(GetMJD(2020, 12, 30), GetMJD(2021, 1, 5), 1, Day);
+    int* dayOfYear = timer.GetDayOfYearPointer();
+    EXPECT_EQ(*dayOfYear, 365);
+    timer.IncrementTime();
+    EXPECT_EQ(*dayOfYear, 366);
+    timer.IncrementTime();
+    EXPECT_EQ(*dayOfYear, 1);
+    timer.Reset();
+    EXPECT_EQ(*dayOfYear, 365);
+}
@@ -1,6 +1,8 @@
 #include <gtest/gtest.h>
 
+#include "TimeSeries.h"
 #include "TimeSeriesData.h"
+#include "TimeSeriesSpatialized.h"
 #include "TimeSeriesUniform.h"
 
 TEST(TimeSeries, VariableType) {
@@ -44,3 +46,172 @@ TEST(TimeSeries, ParseFile) {
     date = GetMJD(2014, 11, 27);
     EXPECT_FLOAT_EQ(vecTimeSeries[1]->GetDataPointer(5)->GetValueFor(date), 8.23046875f);
 }
+
+TEST(TimeSeriesDataStrided, ReadsValuesInSharedBuffer) {
+    // Two units, row-major (time x units)
+    auto values = std::make_shared<vecDouble>(vecDouble{1.0, 10.0, 2.0, 20.0, 3.0, 30.0});
+    std::shared_ptr<const double> buffer(values, values->data());
+
+    TimeSeriesDataStrided tsData(GetMJD(2020, 1, 1), GetMJD(2020, 1, 3), 1, Day);
+    EXPECT_TRUE(tsData.SetBuffer(buffer, 3, 2, 1));
+
+    EXPECT_TRUE(tsData.SetCursorToDate(GetMJD(2020, 1, 1)));
+    EXPECT_DOUBLE_EQ(tsData.GetCurrentValue(), 10.0);
+    EXPECT_TRUE(tsData.AdvanceOneTimeStep());
+    EXPECT_DOUBLE_EQ(tsData.GetCurrentValue(), 20.0);
+    EXPECT_DOUBLE_EQ(tsData.GetValueFor(GetMJD(2020, 1, 3)), 30.0);
+    EXPECT_DOUBLE_EQ(tsData.GetSum(), 60.0);
+}
+
+TEST(TimeSeriesDataStrided, SetBufferTooShort) {
+    wxLogNull logNo;
+
+    auto values = std::make_shared<vecDouble>(vecDouble{1.0, 2.0});
+    std::shared_ptr<const double> buffer(values, values->data());
+
+    TimeSeriesDataStrided tsData(GetMJD(2020, 1, 1), GetMJD(2020, 1, 3), 1, Day);
+    EXPECT_FALSE(tsData.SetBuffer(buffer, 2, 1, 0));
+}
+
+TEST(TimeSeries, CreateFromBufferMatchesCreate) {
+    axd time(3);
+    time << GetMJD(2020, 1, 1), GetMJD(2020, 1, 2), GetMJD(2020, 1, 3);
+    axi ids(2);
+    ids << 4, 7;
+    axxd data(3, 2);
+    data << 1.0, 10.0, 2.0, 20.0, 3.0, 30.0;
+
+    // Same values in a row-major buffer
+    auto values = std::make_shared<vecDouble>(vecDouble{1.0, 10.0, 2.0, 20.0, 3.0, 30.0});
+    std::shared_ptr<const double> buffer(values, values->data());
+
+    TimeSeries* timeSeries = TimeSeries::Create("precipitation", time, ids, data);
+    TimeSeries* timeSeriesBuffer = TimeSeries::CreateFromBuffer("precipitation", time, ids, buffer);
+
+    for (int id : {4, 7}) {
+        for (int i = 0; i < time.size(); ++i) {
+            EXPECT_DOUBLE_EQ(timeSeriesBuffer->GetDataPointer(id)->GetValueFor(time[i]),
+                             timeSeries->GetDataPointer(id)->GetValueFor(time[i]));
+        }
+    }
+    EXPECT_DOUBLE_EQ(timeSeriesBuffer->GetDataPointer(7)->GetValueFor(time[1]), 20.0);
+
+    wxDELETE(timeSeries);
+    wxDELETE(timeSeriesBuffer);
+}
+
+TEST(TimeSeries, CreateUniformFromBufferSharesDataBetweenUnits) {
+    axd time(3);
+    time << GetMJD(2020, 1, 1), GetMJD(2020, 1, 2), GetMJD(2020, 1, 3);
+    auto values = std::make_shared<vecDouble>(vecDouble{1.0, 2.0, 3.0});
+    std::shared_ptr<const double> buffer(values, values->data());
+
+    TimeSeries* timeSeries = TimeSeries::CreateUniformFromBuffer("pet", time, buffer);
+
+    EXPECT_FALSE(timeSeries->IsDistributed());
+    EXPECT_EQ(timeSeries->GetVariableType(), PET);
+    EXPECT_EQ(timeSeries->GetDataPointer(4), timeSeries->GetDataPointer(7));
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(4)->GetValueFor(time[1]), 2.0);
+
+    // Replace the values
+    auto newValues = std::make_shared<vecDouble>(vecDouble{4.0, 5.0, 6.0});
+    auto timeSeriesUniform = dynamic_cast<TimeSeriesUniform*>(timeSeries);
+    ASSERT_TRUE(timeSeriesUniform != nullptr);
+    EXPECT_TRUE(timeSeriesUniform->SetBuffer(std::shared_ptr<const double>(newValues, newValues->data()), 3));
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetValueFor(time[2]), 6.0);
+
+    wxDELETE(timeSeries);
+}
+
+class TimeSeriesSpatializedTest : public ::testing::Test {
+  protected:
+    axd m_time;
+    axi m_ids;
+    axd m_elevations;
+    std::shared_ptr<const double> m_buffer;
+
+    void SetUp() override {
+        m_time.resize(3);
+        m_time << GetMJD(2020, 1, 31), GetMJD(2020, 2, 1), GetMJD(2020, 2, 2);
+        m_ids.resize(2);
+        m_ids << 4, 7;
+        m_elevations.resize(2);
+        m_elevations << 1000, 2000;
+        auto values = std::make_shared<vecDouble>(vecDouble{10.0, 20.0, 30.0});
+        m_buffer = std::shared_ptr<const double>(values, values->data());
+    }
+};
+
+TEST_F(TimeSeriesSpatializedTest, AdditiveGradientIsAppliedOnTheFly) {
+    TimeSeries* timeSeries = TimeSeries::CreateSpatializedFromBuffer("temperature", m_time, m_ids, m_buffer);
+    auto timeSeriesSpatialized = dynamic_cast<TimeSeriesSpatialized*>(timeSeries);
+    ASSERT_TRUE(timeSeriesSpatialized != nullptr);
+    EXPECT_TRUE(timeSeries->IsDistributed());
+
+    // Station values until the gradients are set
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetValueFor(m_time[1]), 20.0);
+
+    // Monthly gradients (-0.5 in January, -1 in February)
+    axd gradients = axd::Constant(12, -1.0);
+    gradients[0] = -0.5;
+    timeSeriesSpatialized->SetElevationGradients("additive_elevation_gradient", m_elevations, 1500, gradients, axd(),
+                                                 NAN_D);
+
+    EXPECT_TRUE(timeSeries->SetCursorToDate(m_time[0]));
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(4)->GetCurrentValue(), 12.5);
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetCurrentValue(), 7.5);
+    EXPECT_TRUE(timeSeries->AdvanceOneTimeStep());
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(4)->GetCurrentValue(), 25.0);
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetCurrentValue(), 15.0);
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetSum(), 7.5 + 15.0 + 25.0);
+
+    wxDELETE(timeSeries);
+}
+
+TEST_F(TimeSeriesSpatializedTest, MultiplicativeGradientsAreNotNegative) {
+    TimeSeries* timeSeries = TimeSeries::CreateSpatializedFromBuffer("precipitation", m_time, m_ids, m_buffer);
+    auto timeSeriesSpatialized = dynamic_cast<TimeSeriesSpatialized*>(timeSeries);
+    ASSERT_TRUE(timeSeriesSpatialized != nullptr);
+
+    axd gradients = axd::Constant(1, 0.1);
+    axd gradients2 = axd::Constant(1, -0.2);
+    timeSeriesSpatialized->SetElevationGradients("multiplicative_elevation_threshold_gradients", m_elevations, 1000,
+                                                 gradients, gradients2, 1500);
+
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(4)->GetValueFor(m_time[0]), 10.0);
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetValueFor(m_time[0]), 10.0 * 1.5 * (1 - 0.2 * 5));
+
+    timeSeriesSpatialized->SetElevationGradients("multiplicative_elevation_gradient", m_elevations, 1000,
+                                                 axd::Constant(1, -0.02), axd(), NAN_D);
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetValueFor(m_time[0]), 8.0);
+    timeSeriesSpatialized->SetElevationGradients("multiplicative_elevation_gradient", m_elevations, 1000,
+                                                 axd::Constant(1, -0.2), axd(), NAN_D);
+    EXPECT_DOUBLE_EQ(timeSeries->GetDataPointer(7)->GetValueFor(m_time[0]), 0.0);
+
+    TimeSeries* clone = timeSeries->Clone();
+    EXPECT_DOUBLE_EQ(clone->GetDataPointer(4)->GetValueFor(m_time[2]), 30.0);
+    EXPECT_DOUBLE_EQ(clone->GetDataPointer(7)->GetValueFor(m_time[2]), 0.0);
+
+    wxDELETE(timeSeries);
+    wxDELETE(clone);
+}
+
+TEST_F(TimeSeriesSpatializedTest, WrongGradientsThrow) {
+    TimeSeries* timeSeries = TimeSeries::CreateSpatializedFromBuffer("temperature", m_time, m_ids, m_buffer);
+    auto timeSeriesSpatialized = dynamic_cast<TimeSeriesSpatialized*>(timeSeries);
+    ASSERT_TRUE(timeSeriesSpatialized != nullptr);
+
+    wxLogNull logNo;
+
+    EXPECT_THROW(timeSeriesSpatialized->SetElevationGradients("additive_elevation_gradient", m_elevations, 1500,
+                                                              axd::Constant(3, -0.5), axd(), NAN_D),
+                 InvalidArgument);
+    EXPECT_THROW(timeSeriesSpatialized->SetElevationGradients("additive_elevation_gradient", axd::Constant(3, 1000),
+                                                              1500, axd::Constant(1, -0.5), axd(), NAN_D),
+                 InvalidArgument);
+    EXPECT_THROW(timeSeriesSpatialized->SetElevationGradients("unknown", m_elevations, 1500, axd::Constant(1, -0.5),
+                                                              axd(), NAN_D),
+                 InvalidArgument);
+
+    wxDELETE(timeSeries);
+}
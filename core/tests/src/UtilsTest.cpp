@@ -789,3 +789,35 @@ TEST(Utils, IncrementDateBy2Minutes) {
 
     EXPECT_FLOAT_EQ(newDate, GetMJD(2020, 1, 1, 0, 2));
 }
+
+TEST(Utils, EvaluateMetricNSE) {
+    axd sim(5), obs(5);
+    sim << 1.0, 2.0, 3.0, 4.0, 5.0;
+    obs << 1.2, 1.8, 3.5, 3.9, 4.4;
+
+    EXPECT_NEAR(EvaluateMetric("nse", sim, obs), 0.9089963598543942, 1e-10);
+}
+
+TEST(Utils, EvaluateMetricKGE2012) {
+    axd sim(5), obs(5);
+    sim << 1.0, 2.0, 3.0, 4.0, 5.0;
+    obs << 1.2, 1.8, 3.5, 3.9, 4.4;
+
+    EXPECT_NEAR(EvaluateMetric("kge_2012", sim, obs), 0.8705508079111659, 1e-10);
+}
+
+TEST(Utils, EvaluateMetricRMSEIgnoresNaNs) {
+    axd sim(6), obs(6);
+    sim << 1.0, 2.0, 3.0, 4.0, 5.0, 6.0;
+    obs << 1.2, 1.8, 3.5, 3.9, 4.4, NAN_D;
+
+    EXPECT_NEAR(EvaluateMetric("rmse", sim, obs), 0.374165738677394, 1e-10);
+}
+
+TEST(Utils, EvaluateMetricUnknownThrows) {
+    axd sim(2), obs(2);
+    sim << 1.0, 2.0;
+    obs << 1.0, 2.0;
+
+    EXPECT_THROW(EvaluateMetric("foo", sim, obs), InvalidArgument);
+}
@@ -76,6 +76,13 @@ except ImportError:
 else:
     has_pyproj = True
 
+try:
+    from scipy import sparse
+except ImportError:
+    has_scipy = False
+else:
+    has_scipy = True
+
 try:
     import xarray as xr
 except ImportError:
@@ -107,5 +114,5 @@ init()
 __all__ = ('ParameterSet', 'HydroUnits', 'Forcing', 'Observations', 'TimeSeries',
            'Catchment', 'init', 'init_log', 'close_log', 'set_debug_log_level',
            'set_max_log_level', 'set_message_log_level', 'Dataset', 'rasterio', 'gpd',
-           'mapping', 'mask', 'SpotpySetup', 'spotpy', 'pyet', 'pyproj', 'xr', 'rxr',
-           'xrs')
+           'mapping', 'mask', 'SpotpySetup', 'spotpy', 'pyet', 'pyproj', 'sparse', 'xr',
+           'rxr', 'xrs')
@@ -1,4 +1,5 @@
 import sys
+from collections import OrderedDict
 
 if sys.version_info < (3, 11):
     try:
@@ -17,6 +18,7 @@ from cftime import num2date
 
 import hydrobricks as hb
 
+from . import pet as pet_methods
 from .time_series import TimeSeries1D, TimeSeries2D
 
 
@@ -44,18 +46,91 @@ class Forcing:
         WIND = auto()  # Wind speed [m s-1]
         PRESSURE = auto()  # Atmospheric pressure [kPa]
 
+    PYET_VARIABLE_NAMES = {
+        Variable.T: 'tmean',
+        Variable.T_MIN: 'tmin',
+        Variable.T_MAX: 'tmax',
+        Variable.T_DEW_POINT: 'tdew',
+        Variable.RH: 'rh',
+        Variable.RH_MIN: 'rhmin',
+        Variable.RH_MAX: 'rhmax',
+        Variable.R_NET: 'rn',
+        Variable.R_SOLAR: 'rs',
+        Variable.WIND: 'wind',
+        Variable.PRESSURE: 'pressure',
+    }
+
     def __init__(self, hydro_units):
         super().__init__()
         self.data1D = TimeSeries1D()
         self.data2D = TimeSeries2D()
         self.hydro_units = hydro_units.hydro_units
         self._operations = []
+        self._updated_variables = []
+        self._native_spatializations = {}
+        self._precomputed = {}
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        self._cache_max_size = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
         self._is_initialized = False
 
     def is_initialized(self):
         """ Return True if the forcing is initialized. """
         return self._is_initialized
 
+    def get_updated_variables(self):
+        """
+        Return the spatialized variables that were computed again by the last call
+        to apply_operations().
+        """
+        return self._updated_variables
+
+    def set_cache_size(self, max_size):
+        """
+        Set the maximum size of the cache storing the spatialized and PET results
+        for the resolved values of the parameters used by the operations. When the
+        same values are used again (e.g., by samplers revisiting parameter sets),
+        the results are taken from the cache instead of being computed again. The
+        least recently used results are discarded first.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum size of the cache in bytes. 0 (default) disables the cache.
+        """
+        self._cache_max_size = max_size
+        self._trim_cache()
+
+    def get_cache_info(self):
+        """
+        Get the statistics of the cache of the operation results.
+
+        Returns
+        -------
+        A dict with the number of cache hits ('hits') and misses ('misses'), the
+        number of stored results ('entries'), their size in bytes ('size') and the
+        maximum size of the cache in bytes ('max_size').
+        """
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'entries': len(self._cache),
+            'size': self._cache_size,
+            'max_size': self._cache_max_size,
+        }
+
+    def clear_cache(self):
+        """
+        Remove all results from the cache of the operation results and reset the
+        statistics.
+        """
+        self._cache.clear()
+        self._cache_size = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def get_variable_enum(self, variable):
         """
         Match the variable name to the enum corresponding value.
@@ -134,6 +209,8 @@ class Forcing:
             content[enum_val] = content.pop(key)
 
         self.data1D.load_from_csv(path, column_time, time_format, content)
+        self._precomputed = {}
+        self.clear_cache()
 
     def correct_station_data(self, **kwargs):
         """
@@ -191,6 +268,13 @@ class Forcing:
         elevation_threshold : int/float
             Threshold elevation to switch from gradient to gradient_2.
             For method(s): 'elevation_multi_gradients'
+        native : bool, optional
+            If True, the values of the hydro units are computed on the fly by the
+            core from the station data and the gradients (elevation gradient
+            methods only), instead of being stored for every hydro unit. The memory
+            then scales with the number of time steps plus the number of hydro
+            units, and a change of gradient only requires updating the gradients
+            in the model. Default: False.
         """
         kwargs['type'] = 'spatialize_from_station'
         self._operations.append(kwargs)
@@ -201,8 +285,10 @@ class Forcing:
 
         Parameters
         ----------
-        variable : str
-            Name of the variable to spatialize.
+        variable : str|list
+            Name of the variable to spatialize, or list of the variables to
+            spatialize from the same files (with 'var_name' as a list of the same
+            length). The variables are then regridded in a single pass.
         method : str
             Name of the method to use. Can be:
             * regrid_from_netcdf: regrid data from a single or multiple netCDF files.
@@ -214,8 +300,8 @@ class Forcing:
             a single file.
         data_crs : int, optional
             CRS (as EPSG id) of the data file. If None, the CRS is read from the file.
-        var_name : str
-            Name of the variable to read.
+        var_name : str|list
+            Name of the variable to read (or list of names, one per variable).
         dim_time : str
             Name of the time dimension.
         dim_x : str
@@ -225,6 +311,27 @@ class Forcing:
         raster_hydro_units : str|Path
             Path to a raster containing the hydro unit ids to use for the
             spatialization.
+        weights_cache : bool, optional
+            Save the regridding weights to disk and reuse them for the same data grid
+            and hydro units raster. Default: True.
+        cache_dir : str|Path, optional
+            Directory of the weights cache. Default: the hydrobricks cache directory.
+        start_date : str|datetime, optional
+            Start of the period to extract from the files. Default: the first time
+            step of the files.
+        end_date : str|datetime, optional
+            End of the period to extract from the files. Default: the last time step
+            of the files.
+        memmap_dir : str|Path, optional
+            Directory in which the spatialized series are written as memory-mapped
+            files instead of being kept in memory.
+        regrid_method : str, optional
+            Regridding method: 'weights' (default) or 'reproject'.
+        executor : str, optional
+            Execution backend of the regridding: 'thread' (default) or 'process'
+            (for the 'reproject' method only).
+        n_workers : int, optional
+            Number of threads or processes. Default: the number of CPUs.
         """
         kwargs['type'] = 'spatialize_from_grid'
         self._operations.append(kwargs)
@@ -252,15 +359,24 @@ class Forcing:
             hydro unit will be used.
         other options : see pyet documentation for function-specific options. These
             options will be passed to the pyet function.
+
+        Notes
+        -----
+        The Oudin, Hargreaves and Hamon methods are computed for all hydro units at
+        once by hydrobricks (same equations as pyet), which does not require pyet.
+        The other methods are computed by pyet for each hydro unit.
         """
-        if not hb.has_pyet:
+        method = kwargs.get('method', None)
+        if not hb.has_pyet and pet_methods.get_vectorized_method(
+                method, self._get_pet_options(kwargs)) is None:
             raise ImportError("pyet is required to do this.")
 
         kwargs['type'] = 'compute_pet'
 
         self._operations.append(kwargs)
 
-    def apply_operations(self, parameters=None, apply_to_all=True):
+    def apply_operations(self, parameters=None, apply_to_all=True,
+                         in_place=False):
         """
         Apply the pre-defined operations.
 
@@ -273,14 +389,24 @@ class Forcing:
             operations will only be applied to the variables related to parameters
             defined in the parameters.allow_changing list. This is useful to avoid
             re-applying, during the calibration phase, operations that have already
-            been applied previously.
+            been applied previously. The new values are stored in new arrays, and
+            the models keep the previous ones until Model.update_forcing() is called.
+        in_place : bool
+            If True (and apply_to_all is False), the spatialized arrays are
+            overwritten instead of being allocated again. These arrays are shared
+            without copy with the models they were set to (see Model.set_forcing()),
+            including their clones: all these models directly see the new values,
+            and none of them must be running. Not used when the cache is enabled.
+            Default: False.
         """
         # The operations will be applied in the order defined in the list
         operation_types = ['prior_correction', 'spatialize_from_station',
                            'spatialize_from_grid', 'compute_pet']
 
+        self._updated_variables = []
         for operation_type in operation_types:
-            self._apply_operations_of_type(operation_type, parameters, apply_to_all)
+            self._apply_operations_of_type(operation_type, parameters, apply_to_all,
+                                           in_place)
 
         self._is_initialized = True
 
@@ -329,7 +455,7 @@ class Forcing:
             else:
                 var_data = nc.createVariable(
                     variable, 'float32', ('time', 'hydro_units'), zlib=True)
-            var_data[:, :] = self.data2D.data[idx]
+            var_data[:, :] = self._get_spatialized_data(idx)
 
         nc.close()
 
@@ -368,21 +494,92 @@ class Forcing:
                                  if var not in ['id', 'time']]
 
         # Load data
+        self._native_spatializations = {}
+        self._precomputed = {}
+        self.clear_cache()
         self.data2D.data = []
         for variable in self.data2D.data_name:
             self.data2D.data.append(nc.variables[variable][:])
 
         nc.close()
 
+    def get_uniform_data(self, variable):
+        """
+        Get the single series of a variable having the same values for all hydro
+        units (e.g., spatialized with the 'constant' method).
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable.
+
+        Returns
+        -------
+        The 1D array of the values (time) if the variable is uniform, None otherwise.
+        """
+        variable = self.get_variable_enum(variable)
+        idx = self.data2D.data_name.index(variable)
+        data = self.data2D.data[idx]
+        if data is None or not isinstance(data, np.ndarray) or data.ndim != 2:
+            return None
+        # Uniform data are stored as a broadcast view of a single series
+        if data.shape[1] > 1 and data.strides[1] == 0:
+            return data[:, 0]
+        return None
+
+    def get_native_spatialization(self, variable):
+        """
+        Get the definition of a variable spatialized on the fly by the core (option
+        'native' of spatialize_from_station_data()).
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable.
+
+        Returns
+        -------
+        A dict with the station data ('data'), the method ('method'), the hydro
+        units elevations ('elevations'), the reference elevation ('ref_elevation'),
+        the gradients ('gradients' and 'gradients_2') and the elevation threshold
+        ('elevation_threshold') if the variable is spatialized by the core, None
+        otherwise.
+        """
+        variable = self.get_variable_enum(variable)
+        native = self._native_spatializations.get(variable, None)
+        if native is None:
+            return None
+
+        options = native['options']
+        gradient = options.get('gradient', None)
+        if gradient is None:
+            gradient = options.get('gradient_1', None)
+        gradient_2 = options.get('gradient_2', None)
+        if gradient_2 is None:
+            gradient_2 = []
+        elevation_threshold = options.get('elevation_threshold', None)
+        if elevation_threshold is None:
+            elevation_threshold = np.nan
+
+        return {
+            'data': native['data'],
+            'method': native['method'],
+            'elevations': self._get_unit_elevations(),
+            'ref_elevation': float(options['ref_elevation']),
+            'gradients': np.atleast_1d(np.asarray(gradient, dtype=float)),
+            'gradients_2': np.atleast_1d(np.asarray(gradient_2, dtype=float)),
+            'elevation_threshold': float(elevation_threshold),
+        }
+
     def get_total_precipitation(self):
         idx = self.data2D.data_name.index(self.Variable.P)
-        data = self.data2D.data[idx].sum(axis=0)
+        data = self._get_spatialized_data(idx).sum(axis=0)
         areas = self.hydro_units[('area', 'm2')]
         tot_precip = data * areas.values / areas.sum()
         return tot_precip.sum()
 
     def _apply_operations_of_type(self, operation_type, parameters=None,
-                                  apply_to_all=True):
+                                  apply_to_all=True, in_place=False):
         for operation_ref in self._operations:
             operation = operation_ref.copy()
 
@@ -408,17 +605,126 @@ class Forcing:
                             apply_operation = True
 
             # Apply the operation (or not)
-            if apply_to_all or apply_operation:
-                if operation_type == 'prior_correction':
-                    self._apply_prior_correction(**operation)
-                elif operation_type == 'spatialize_from_station':
-                    self._apply_spatialization_from_station_data(**operation)
-                elif operation_type == 'spatialize_from_grid':
-                    self._apply_spatialization_from_gridded_data(**operation)
-                elif operation_type == 'compute_pet':
-                    self._apply_pet_computation(**operation)
-                else:
-                    raise ValueError(f'Unknown operation type: {operation_type}')
+            if not apply_to_all and not apply_operation:
+                continue
+
+            # Results previously computed with the same parameter values
+            cache_key = self._get_cache_key(operation_ref, parameters)
+            if cache_key is not None and self._load_from_cache(cache_key):
+                continue
+
+            if operation_type == 'prior_correction':
+                self._apply_prior_correction(**operation)
+            elif operation_type == 'spatialize_from_station':
+                # The arrays stored in the cache must not be modified in place
+                reuse_output = (in_place and not apply_to_all and
+                                self._cache_max_size == 0)
+                self._apply_spatialization_from_station_data(
+                    **operation, reuse_output=reuse_output)
+                self._add_updated_variable(operation['variable'])
+            elif operation_type == 'spatialize_from_grid':
+                self._apply_spatialization_from_gridded_data(**operation)
+                variables = operation['variable']
+                if isinstance(variables, str):
+                    variables = [variables]
+                for variable in variables:
+                    self._add_updated_variable(variable)
+            elif operation_type == 'compute_pet':
+                self._apply_pet_computation(**operation)
+                self._add_updated_variable(self.Variable.PET)
+            else:
+                raise ValueError(f'Unknown operation type: {operation_type}')
+
+            if cache_key is not None:
+                self._save_to_cache(cache_key)
+
+    def _get_cache_key(self, operation, parameters):
+        # Only the spatialized and PET arrays computed in Python are cached
+        if self._cache_max_size <= 0 or operation.get('native', False):
+            return None
+        if operation['type'] == 'spatialize_from_station':
+            variable = self.get_variable_enum(operation['variable'])
+            inputs = [variable]
+        elif operation['type'] == 'compute_pet':
+            variable = self.Variable.PET
+            inputs = [self.get_variable_enum(v) for v in
+                      self._remove_lat_elevation_options(operation['use'])]
+        else:
+            return None
+
+        # Parameter values of the operation and of those producing its inputs
+        key = [variable]
+        for i, other in enumerate(self._operations):
+            if other is not operation:
+                if other['type'] not in ['prior_correction',
+                                         'spatialize_from_station']:
+                    continue
+                if self.get_variable_enum(other['variable']) not in inputs:
+                    continue
+            key.append((i, self._get_resolved_parameter_values(other, parameters)))
+
+        return tuple(key)
+
+    @staticmethod
+    def _get_resolved_parameter_values(operation, parameters):
+        values = []
+        for key, value in operation.items():
+            if isinstance(value, str) and value.startswith('param:'):
+                value = parameters.get(value.replace('param:', ''))
+                if isinstance(value, (list, tuple, np.ndarray)):
+                    value = tuple(np.asarray(value, dtype=float).ravel().tolist())
+                values.append((key, value))
+        return tuple(values)
+
+    def _load_from_cache(self, cache_key):
+        if cache_key not in self._cache:
+            self._cache_misses += 1
+            return False
+
+        self._cache_hits += 1
+        self._cache.move_to_end(cache_key)
+        variable = cache_key[0]
+        data = self._cache[cache_key]
+        idx = self.data2D.data_name.index(variable)
+        if self.data2D.data[idx] is not data:
+            # The model needs the values only if they changed
+            self.data2D.data[idx] = data
+            self._add_updated_variable(variable)
+        return True
+
+    def _save_to_cache(self, cache_key):
+        variable = cache_key[0]
+        data = self.data2D.data[self.data2D.data_name.index(variable)]
+        if type(data) is not np.ndarray:
+            return
+        size = self._get_array_size(data)
+        if size > self._cache_max_size:
+            return
+        if cache_key in self._cache:
+            self._cache_size -= self._get_array_size(self._cache.pop(cache_key))
+        self._cache[cache_key] = data
+        self._cache_size += size
+        self._trim_cache()
+
+    def _trim_cache(self):
+        # Discard the least recently used results
+        while self._cache and self._cache_size > self._cache_max_size:
+            _, data = self._cache.popitem(last=False)
+            self._cache_size -= self._get_array_size(data)
+
+    @staticmethod
+    def _get_array_size(data):
+        # Memory actually used (a broadcast view uses the memory of a single series)
+        size = data.itemsize
+        for dim, stride in zip(data.shape, data.strides):
+            if stride != 0:
+                size *= dim
+        return size
+
+    def _add_updated_variable(self, variable):
+        variable = self.get_variable_enum(variable)
+        if variable not in self._updated_variables:
+            self._updated_variables.append(variable)
 
     def _apply_prior_correction(self, variable, method='multiplicative', **kwargs):
         variable = self.get_variable_enum(variable)
@@ -439,6 +745,7 @@ class Forcing:
             raise ValueError(f'Unknown method: {method}')
 
     def _apply_spatialization_from_station_data(self, variable, method='default',
+                                                native=False, reuse_output=False,
                                                 **kwargs):
         # Checking that the correction_factor option is not used here anymore
         if 'correction_factor' in kwargs:
@@ -446,10 +753,8 @@ class Forcing:
                              'in the correct_station_data() method.')
 
         variable = self.get_variable_enum(variable)
-        unit_values = np.zeros((len(self.data1D.time), len(self.hydro_units)))
-        hydro_units = self.hydro_units.reset_index()
         idx_1d = self.data1D.data_name.index(variable)
-        data_raw = self.data1D.data[idx_1d].copy()
+        data_raw = self.data1D.data[idx_1d]
 
         # Specify default methods
         if method == 'default':
@@ -462,11 +767,8 @@ class Forcing:
             else:
                 raise ValueError(f'Unknown default method for variable: {variable}')
 
-        # Extract kwargs (None if not provided)
-        ref_elevation = kwargs.get('ref_elevation', None)
-        gradient = kwargs.get('gradient', None)
-
         # Check inputs
+        gradient = kwargs.get('gradient', None)
         if gradient is None:
             gradient = kwargs.get('gradient_1', None)
 
@@ -475,70 +777,172 @@ class Forcing:
                 raise ValueError(f'The gradient should have a length of 1 or 12. '
                                  f'Here: {len(gradient)}')
 
-        # Apply methods
-        for i_unit, unit in hydro_units.iterrows():
-
-            elevation = unit['elevation'].values
-
-            if method == 'constant':
-                unit_values[:, i_unit] = data_raw
-
-            elif method == 'additive_elevation_gradient':
-                if ref_elevation is None:
-                    raise ValueError('Reference elevation not provided.')
-                if isinstance(gradient, float) or isinstance(gradient, list) \
-                        and len(gradient) == 1:
-                    unit_values[:, i_unit] = data_raw + gradient * (
-                            elevation - ref_elevation) / 100
-                elif isinstance(gradient, list) and len(gradient) == 12:
-                    for m in range(12):
-                        month = self.data1D.time.dt.month == m + 1
-                        month = month.to_numpy()
-                        unit_values[month, i_unit] = data_raw[month] + gradient[m] * (
-                                elevation - ref_elevation) / 100
-                else:
-                    raise ValueError(f'Wrong gradient format: {gradient}')
-
-            elif method == 'multiplicative_elevation_gradient':
-                if ref_elevation is None:
-                    raise ValueError('Reference elevation not provided.')
-                if isinstance(gradient, float) or isinstance(gradient, list) \
-                        and len(gradient) == 1:
-                    unit_values[:, i_unit] = data_raw * (
-                            1 + gradient * (elevation - ref_elevation) / 100)
-                elif isinstance(gradient, list) and len(gradient) == 12:
-                    for m in range(12):
-                        month = self.data1D.time.dt.month == m + 1
-                        month = month.to_numpy()
-                        unit_values[month, i_unit] = \
-                            data_raw[month] * (1 + gradient[m] * (
-                                    elevation - ref_elevation) / 100)
-                else:
-                    raise ValueError(f'Wrong gradient format: {gradient}')
-
-            elif method == 'multiplicative_elevation_threshold_gradients':
-                gradient_2 = kwargs.get('gradient_2', None)
-                elevation_threshold = kwargs.get('elevation_threshold', None)
-                if elevation < elevation_threshold:
-                    unit_values[:, i_unit] = data_raw * (
-                            1 + gradient * (elevation - ref_elevation) / 100)
-                elif ref_elevation > elevation_threshold:
-                    unit_values[:, i_unit] = data_raw * (
-                            1 + gradient_2 * (elevation - ref_elevation) / 100)
-                else:
-                    precip_below = data_raw * (1 + gradient * (
-                            elevation_threshold - ref_elevation) / 100)
-                    unit_values[:, i_unit] = precip_below * (
-                            1 + gradient_2 * (elevation - elevation_threshold) / 100)
+        # Constant values: a single series shared by all hydro units (broadcast view)
+        if method == 'constant':
+            if self._can_be_negative(variable):
+                data_raw = data_raw.copy()
+            else:
+                data_raw = np.maximum(data_raw, 0)
+            unit_values = np.broadcast_to(data_raw[:, np.newaxis],
+                                          (len(data_raw), len(self.hydro_units)))
+            self._store_spatialized_data(variable, unit_values)
+            return
+
+        # Values computed on the fly by the core: only the station data is kept
+        if native:
+            if method not in ['additive_elevation_gradient',
+                              'multiplicative_elevation_gradient',
+                              'multiplicative_elevation_threshold_gradients']:
+                raise ValueError(f'The method {method} cannot be computed by the '
+                                 f'core (native option).')
+            if kwargs.get('ref_elevation', None) is None:
+                raise ValueError('Reference elevation not provided.')
+            self._store_spatialized_data(variable, None)
+            self._native_spatializations[variable] = {
+                'method': method, 'data': data_raw.copy(), 'options': kwargs}
+            return
+
+        out = None
+        if reuse_output:
+            out = self._get_reusable_output(variable)
+        unit_values = self._spatialize_station_values(
+            variable, method, data_raw, out=out, **kwargs)
+
+        # Store outputs
+        self._store_spatialized_data(variable, unit_values)
+
+    def _spatialize_station_values(self, variable, method, data_raw, units=None,
+                                   out=None, **kwargs):
+        # Extract kwargs (None if not provided)
+        ref_elevation = kwargs.get('ref_elevation', None)
+        gradient = kwargs.get('gradient', None)
+        if gradient is None:
+            gradient = kwargs.get('gradient_1', None)
 
+        if ref_elevation is None:
+            raise ValueError('Reference elevation not provided.')
+
+        # Table of the coefficients by month (rows) and hydro unit (columns)
+        gradient = self._get_monthly_gradients(gradient)[:, np.newaxis]
+        elevation_delta = self._get_elevation_deltas(ref_elevation)
+        if method == 'additive_elevation_gradient':
+            coefficients = gradient * elevation_delta
+        elif method == 'multiplicative_elevation_gradient':
+            coefficients = 1 + gradient * elevation_delta
+        elif method == 'multiplicative_elevation_threshold_gradients':
+            gradient_2 = kwargs.get('gradient_2', None)
+            elevation_threshold = kwargs.get('elevation_threshold', None)
+            if gradient_2 is None or elevation_threshold is None:
+                raise ValueError('The second gradient and the elevation threshold '
+                                 'must be provided.')
+            gradient_2 = self._get_monthly_gradients(gradient_2)[:, np.newaxis]
+            if ref_elevation > elevation_threshold:
+                coefficients_above = 1 + gradient_2 * elevation_delta
             else:
-                raise ValueError(f'Unknown method: {method}')
+                coefficients_above = (1 + gradient * (
+                        elevation_threshold - ref_elevation) / 100) * (
+                        1 + gradient_2 * self._get_elevation_deltas(
+                            elevation_threshold))
+            coefficients = np.where(self._get_threshold_mask(elevation_threshold),
+                                    1 + gradient * elevation_delta,
+                                    coefficients_above)
+        else:
+            raise ValueError(f'Unknown method: {method}')
+
+        if units is not None:
+            coefficients = coefficients[:, units]
+
+        # Expand the coefficients over time and apply them to the station data
+        shape = (len(data_raw), coefficients.shape[1])
+        if out is None or out.shape != shape:
+            out = np.empty(shape)
+        np.take(coefficients, self._get_month_indices(), axis=0, out=out,
+                mode='clip')
+        if method == 'additive_elevation_gradient':
+            out += data_raw[:, np.newaxis]
+        else:
+            out *= data_raw[:, np.newaxis]
 
         # Check outputs
         if not self._can_be_negative(variable):
-            unit_values[unit_values < 0] = 0
+            np.maximum(out, 0, out=out)
 
-        # Store outputs
+        return out
+
+    def _get_monthly_gradients(self, gradient):
+        # Gradient value for every month (constant or monthly)
+        if isinstance(gradient, (list, tuple, np.ndarray)):
+            gradient = np.asarray(gradient, dtype=float)
+        elif isinstance(gradient, (int, float)):
+            gradient = np.array([gradient], dtype=float)
+        else:
+            raise ValueError(f'Wrong gradient format: {gradient}')
+
+        if gradient.size == 1:
+            return np.full(12, gradient[0])
+        if gradient.size == 12:
+            return gradient
+
+        raise ValueError(f'Wrong gradient format: {gradient}')
+
+    def _get_month_indices(self):
+        # Month index (0-11) of every time step, computed once
+        if 'month_indices' not in self._precomputed:
+            months = self.data1D.time.dt.month.to_numpy()
+            self._precomputed['month_indices'] = months.astype(np.intp) - 1
+        return self._precomputed['month_indices']
+
+    def _get_elevation_deltas(self, ref_elevation):
+        # Elevation differences (in hundreds of meters) to a reference elevation
+        key = ('elevation_deltas', float(ref_elevation))
+        if key not in self._precomputed:
+            elevations = self._get_unit_elevations()
+            self._precomputed[key] = (elevations - ref_elevation) / 100
+        return self._precomputed[key]
+
+    def _get_threshold_mask(self, elevation_threshold):
+        # Hydro units below an elevation threshold
+        key = ('below_threshold', float(elevation_threshold))
+        if key not in self._precomputed:
+            elevations = self._get_unit_elevations()
+            self._precomputed[key] = elevations < elevation_threshold
+        return self._precomputed[key]
+
+    def _get_unit_elevations(self):
+        return self.hydro_units['elevation'].to_numpy(dtype=float).ravel()
+
+    def _get_reusable_output(self, variable):
+        # Existing array that can be overwritten by the new values (seen by the
+        # models sharing it)
+        if variable not in self.data2D.data_name:
+            return None
+        data = self.data2D.data[self.data2D.data_name.index(variable)]
+        if type(data) is not np.ndarray or data.dtype != np.float64:
+            return None
+        if not data.flags.c_contiguous or not data.flags.writeable:
+            return None
+        return data
+
+    def _get_spatialized_data(self, idx, i_unit=None):
+        data = self.data2D.data[idx]
+        variable = self.data2D.data_name[idx]
+        if data is None and variable in self._native_spatializations:
+            # Compute the values computed by the core otherwise
+            native = self._native_spatializations[variable]
+            units = None if i_unit is None else [i_unit]
+            data = self._spatialize_station_values(
+                variable, native['method'], native['data'], units=units,
+                **native['options'])
+            if i_unit is not None:
+                return data[:, 0]
+            return data
+
+        if i_unit is not None:
+            return data[:, i_unit]
+        return data
+
+    def _store_spatialized_data(self, variable, unit_values):
+        self._native_spatializations.pop(variable, None)
         if variable in self.data2D.data_name:
             idx_2d = self.data2D.data_name.index(variable)
             self.data2D.data[idx_2d] = unit_values
@@ -549,7 +953,10 @@ class Forcing:
 
     def _apply_spatialization_from_gridded_data(self, variable, method='default',
                                                 **kwargs):
-        variable = self.get_variable_enum(variable)
+        if isinstance(variable, str):
+            variables = [self.get_variable_enum(variable)]
+        else:
+            variables = [self.get_variable_enum(v) for v in variable]
 
         # Specify default methods
         if method == 'default':
@@ -564,15 +971,76 @@ class Forcing:
             dim_x = kwargs.get('dim_x', 'x')
             dim_y = kwargs.get('dim_y', 'y')
             raster_hydro_units = kwargs.get('raster_hydro_units', None)
+            if isinstance(var_name, str) == isinstance(variable, str):
+                var_names = [var_name] if isinstance(var_name, str) else var_name
+            else:
+                var_names = None
+            if var_names is None or len(var_names) != len(variables):
+                raise ValueError('The variables and the names of the variables to '
+                                 'read (var_name) do not match.')
+            weights_cache = kwargs.get('weights_cache', True)
+            cache_dir = kwargs.get('cache_dir', None)
+            start_date = kwargs.get('start_date', None)
+            end_date = kwargs.get('end_date', None)
+            memmap_dir = kwargs.get('memmap_dir', None)
+            regrid_method = kwargs.get('regrid_method', 'weights')
+            executor = kwargs.get('executor', 'thread')
+            n_workers = kwargs.get('n_workers', None)
             self.data2D.regrid_from_netcdf(
-                path, file_pattern=file_pattern, data_crs=data_crs, var_name=var_name,
-                dim_time=dim_time, dim_x=dim_x, dim_y=dim_y,
-                raster_hydro_units=raster_hydro_units)
-            self.data2D.data_name.append(variable)
+                path, file_pattern=file_pattern, data_crs=data_crs,
+                var_name=var_names, dim_time=dim_time, dim_x=dim_x, dim_y=dim_y,
+                raster_hydro_units=raster_hydro_units, method=regrid_method,
+                weights_cache=weights_cache, cache_dir=cache_dir,
+                start_date=start_date, end_date=end_date, memmap_dir=memmap_dir,
+                executor=executor, n_workers=n_workers)
+            self.data2D.data_name.extend(variables)
         else:
             raise ValueError(f'Unknown method: {method}')
 
     def _apply_pet_computation(self, method, use, **kwargs):
+        use_variables = self._remove_lat_elevation_options(use)
+        self._check_variables_available(use_variables)
+
+        # Computation for all hydro units at once if available
+        options = self._get_pet_options(kwargs)
+        vectorized = pet_methods.get_vectorized_method(method, options)
+        inputs = [self.PYET_VARIABLE_NAMES.get(self.get_variable_enum(v))
+                  for v in use_variables]
+        if vectorized is not None and 'elevation' not in use \
+                and ('lat' in use or 'latitude' in use) \
+                and sorted(inputs) == sorted(
+                    pet_methods.PET_METHODS[vectorized]['inputs']):
+            pet = self._compute_pet_vectorized(vectorized, use_variables, options,
+                                               **kwargs)
+        else:
+            pet = self._compute_pet_per_unit(method, use, **kwargs)
+
+        # Store outputs
+        if self.Variable.PET not in self.data2D.data_name:
+            self.data2D.data.append(pet)
+            self.data2D.data_name.append(self.Variable.PET)
+        else:
+            idx = self.data2D.data_name.index(self.Variable.PET)
+            self.data2D.data[idx] = pet
+
+    def _compute_pet_vectorized(self, name, use_variables, options, **kwargs):
+        if 'latitude' in kwargs:
+            lat = np.deg2rad(kwargs['latitude'])
+        elif 'lat' in kwargs:
+            lat = np.deg2rad(kwargs['lat'])
+        else:
+            lat = np.deg2rad(self.hydro_units['latitude'].to_numpy(
+                dtype=float).ravel())
+
+        inputs = {}
+        for v in use_variables:
+            v = self.get_variable_enum(v)
+            idx = self.data2D.data_name.index(v)
+            inputs[self.PYET_VARIABLE_NAMES.get(v)] = self._get_spatialized_data(idx)
+
+        return pet_methods.compute(name, self.data2D.time, lat, **inputs, **options)
+
+    def _compute_pet_per_unit(self, method, use, **kwargs):
         if not hb.has_pyet:
             raise ImportError("pyet is required to do this.")
 
@@ -592,26 +1060,38 @@ class Forcing:
                 use_unit_latitude = True
 
         use = self._remove_lat_elevation_options(use)
-        self._check_variables_available(use)
+        pyet_args.update(self._get_pet_options(kwargs))
+
+        # Extract the data of all hydro units once
+        inputs = {}
+        for v in use:
+            v = self.get_variable_enum(v)
+            idx = self.data2D.data_name.index(v)
+            inputs[self.PYET_VARIABLE_NAMES.get(v)] = self._get_spatialized_data(idx)
+        time_index = pd.DatetimeIndex(self.data2D.time)
 
         # Loop over the hydro units to compute the PET (pyet xarray implementation is
         # not working as expected in multiplicative operations)
         pet = np.zeros((len(self.data2D.time), len(self.hydro_units)))
-        for i_unit, unit in self.hydro_units.iterrows():
+        elevations = self._get_unit_elevations()
+        if use_unit_latitude:
+            latitudes = self.hydro_units['latitude'].to_numpy(dtype=float).ravel()
+        for i_unit in range(len(self.hydro_units)):
             if use_unit_elevation:
-                pyet_args['elevation'] = unit['elevation'].values
+                pyet_args['elevation'] = elevations[i_unit]
             if use_unit_latitude:
-                pyet_args['lat'] = hb.pyet.deg_to_rad(unit['latitude'].values)
-            pyet_args = self._set_pyet_variables_data(pyet_args, use, i_unit)
+                pyet_args['lat'] = hb.pyet.deg_to_rad(latitudes[i_unit])
+            for name, data in inputs.items():
+                pyet_args[name] = pd.Series(data[:, i_unit], index=time_index)
             pet[:, i_unit] = self._compute_pet(method, pyet_args)
 
-        # Store outputs
-        if self.Variable.PET not in self.data2D.data_name:
-            self.data2D.data.append(pet)
-            self.data2D.data_name.append(self.Variable.PET)
-        else:
-            idx = self.data2D.data_name.index(self.Variable.PET)
-            self.data2D.data[idx] = pet
+        return pet
+
+    @staticmethod
+    def _get_pet_options(kwargs):
+        # Options to pass to the PET function
+        return {key: value for key, value in kwargs.items()
+                if key not in ['method', 'use', 'lat', 'latitude', 'type']}
 
     @staticmethod
     def _compute_pet(method, pyet_args):
@@ -658,29 +1138,6 @@ class Forcing:
         else:
             raise ValueError(f'Unknown PET method: {method}')
 
-    def _set_pyet_variables_data(self, pyet_args, use, i_unit):
-        for v in use:
-            v = self.get_variable_enum(v)
-            idx = self.data2D.data_name.index(v)
-            pyet_var_name = {
-                self.Variable.T: 'tmean',
-                self.Variable.T_MIN: 'tmin',
-                self.Variable.T_MAX: 'tmax',
-                self.Variable.T_DEW_POINT: 'tdew',
-                self.Variable.RH: 'rh',
-                self.Variable.RH_MIN: 'rhmin',
-                self.Variable.RH_MAX: 'rhmax',
-                self.Variable.R_NET: 'rn',
-                self.Variable.R_SOLAR: 'rs',
-                self.Variable.WIND: 'wind',
-                self.Variable.PRESSURE: 'pressure',
-            }
-
-            pyet_args[pyet_var_name.get(v)] = pd.Series(
-                self.data2D.data[idx][:, i_unit], index=self.data2D.time)
-
-        return pyet_args
-
     def _check_variables_available(self, use):
         # Check if all variables are available
         use = [self.get_variable_enum(v) for v in use]
@@ -1,8 +1,10 @@
+import copy
 import importlib
 import os
 from abc import ABC, abstractmethod
 
 import HydroErr
+import numpy as np
 
 import _hydrobricks as _hb
 from _hydrobricks import ModelHydro, SettingsModel
@@ -10,7 +12,14 @@ from hydrobricks import utils
 
 
 class Model(ABC):
-    """Base class for the models"""
+    """
+    Base class for the models.
+
+    Separate model instances can be run concurrently from different threads (e.g.,
+    using a ThreadPoolExecutor) as each instance owns its complete state and the GIL
+    is released during the computations of the core. A single instance must however
+    not be used from multiple threads at the same time.
+    """
 
     @abstractmethod
     def __init__(self, name=None, **kwargs):
@@ -18,12 +27,19 @@ class Model(ABC):
         self.settings = SettingsModel()
         self.model = ModelHydro()
         self.spatial_structure = None
-        self.allowed_kwargs = {'solver', 'record_all', 'land_cover_types',
-                               'land_cover_names'}
+        self.allowed_kwargs = {'solver', 'solver_abs_tolerance',
+                               'solver_rel_tolerance', 'analytical_linear_storages',
+                               'vectorized_processes', 'threads_nb', 'record_all',
+                               'land_cover_types', 'land_cover_names'}
         self._is_initialized = False
 
         # Default options
         self.solver = 'heun_explicit'
+        self.solver_abs_tolerance = 0.1  # Only used by the adaptive solvers
+        self.solver_rel_tolerance = 0.01  # Only used by the adaptive solvers
+        self.analytical_linear_storages = False
+        self.vectorized_processes = False
+        self.threads_nb = 1
         self.record_all = False
         self.land_cover_types = ['ground']
         self.land_cover_names = ['ground']
@@ -32,7 +48,11 @@ class Model(ABC):
 
         # Setting base settings
         self.settings.log_all(self.record_all)
-        self.settings.set_solver(self.solver)
+        self.settings.set_solver(self.solver, self.solver_abs_tolerance,
+                                 self.solver_rel_tolerance)
+        self.settings.set_analytical_linear_storages(self.analytical_linear_storages)
+        self.settings.set_vectorized_processes(self.vectorized_processes)
+        self.settings.set_threads(self.threads_nb)
 
     @property
     def name(self):
@@ -91,14 +111,15 @@ class Model(ABC):
         except Exception:
             print("An exception occurred.")
 
-    def run(self, parameters, forcing=None):
+    def run(self, parameters=None, forcing=None):
         """
         Setup and run the model.
 
         Parameters
         ----------
-        parameters : ParameterSet
-            The parameters for the given model.
+        parameters : ParameterSet, optional
+            The parameters for the given model. If not provided, the current
+            parameter values are kept (e.g., values set with set_parameter_values()).
         forcing : Forcing
             The forcing data.
 
@@ -109,6 +130,10 @@ class Model(ABC):
         if not self._is_initialized:
             raise RuntimeError('The model has not been initialized. '
                                'Please run setup() first.')
+        if parameters is None and forcing is not None \
+                and not forcing.is_initialized():
+            raise ValueError('The parameters must be provided to apply the '
+                             'operations of the forcing.')
 
         try:
             self.model.reset()
@@ -116,7 +141,8 @@ class Model(ABC):
             if forcing is not None and not forcing.is_initialized():
                 forcing.apply_operations(parameters)
 
-            self._set_parameters(parameters)
+            if parameters is not None:
+                self._set_parameters(parameters)
             self._set_forcing(forcing)
 
             if not self.model.is_ok():
@@ -137,6 +163,149 @@ class Model(ABC):
         except Exception:
             print("An exception occurred.")
 
+    def run_batch(self, parameters, parameter_values, parameter_names, forcing=None,
+                  metric=None, observations=None):
+        """
+        Run the model for multiple parameter sets in a single call. The loop over the
+        parameter sets (parameters assignment, reset, run, and extraction of the
+        outlet discharge) is performed by the core.
+
+        Parameters
+        ----------
+        parameters : ParameterSet
+            The parameters for the given model. The parameters that are not listed in
+            parameter_names keep the values defined here.
+        parameter_values : np.ndarray
+            The parameter values as a 2D array (N x P): one row per parameter set
+            and one column per parameter.
+        parameter_names : list
+            The names (with the related component or one of its aliases) of the P
+            parameters.
+        forcing : Forcing
+            The forcing data.
+        metric : str, optional
+            The abbreviation of a goodness of fit metric (as defined in HydroErr).
+            Supported: 'nse', 'kge_2012', 'rmse'. If provided, only the metric value
+            is returned for each parameter set instead of the discharge time series.
+        observations : np.ndarray, optional
+            The time series of the observations (required when a metric is
+            provided).
+
+        Returns
+        -------
+        The outlet discharge as a 2D array (N x T) or, if a metric is provided, the
+        metric values as a 1D array (N).
+
+        Notes
+        -----
+        The parameter values of the model are restored at the end of the batch, so
+        that a following run without parameters uses the values defined in
+        'parameters' and not those of the last parameter set.
+        """
+        if not self._is_initialized:
+            raise RuntimeError('The model has not been initialized. '
+                               'Please run setup() first.')
+
+        parameter_values = np.atleast_2d(np.asarray(parameter_values, dtype=float))
+        if parameter_values.shape[1] != len(parameter_names):
+            raise ValueError(f'The number of columns of the parameter values '
+                             f'({parameter_values.shape[1]}) does not match the number '
+                             f'of parameter names ({len(parameter_names)}).')
+        if metric is not None and observations is None:
+            raise ValueError('The observations must be provided to compute a metric.')
+
+        full_names = [parameters.get_model_parameter_full_name(name)
+                      for name in parameter_names]
+
+        self.model.reset()
+
+        if forcing is not None and not forcing.is_initialized():
+            forcing.apply_operations(parameters)
+
+        self._set_parameters(parameters)
+        self._set_forcing(forcing)
+
+        if not self.model.is_ok():
+            raise RuntimeError('Model is not OK.')
+
+        if metric is None:
+            return self.model.run_batch(self.settings, parameter_values, full_names)
+
+        observations = np.asarray(observations, dtype=float)
+        return self.model.run_batch_evaluation(self.settings, parameter_values,
+                                               full_names, observations, metric)
+
+    def compile_parameters(self, parameters, parameter_names):
+        """
+        Resolve the given parameters once to the storage of their values in the
+        model. Their values can then be changed with set_parameter_values() at a
+        cost that only depends on the number of parameters (and not on the size of
+        the catchment), which is well suited for calibration.
+
+        Parameters
+        ----------
+        parameters : ParameterSet
+            The parameters for the given model. The parameters that are not listed in
+            parameter_names keep the values defined here.
+        parameter_names : list
+            The names (with the related component or one of its aliases) of the
+            parameters to compile.
+        """
+        if not self._is_initialized:
+            raise RuntimeError('The model has not been initialized. '
+                               'Please run setup() first.')
+
+        full_names = [parameters.get_model_parameter_full_name(name)
+                      for name in parameter_names]
+
+        self._set_parameters(parameters)
+        self.model.compile_parameters(self.settings, full_names)
+
+    def set_parameter_values(self, values):
+        """
+        Set the values of the parameters defined with compile_parameters(). The
+        model can then be run with run() without providing the parameters.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The parameter values (in the order of the compiled parameter names).
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        parameters_nb = self.model.get_compiled_parameters_nb()
+        if values.size != parameters_nb:
+            raise ValueError(f'The number of parameter values ({values.size}) does '
+                             f'not match the number of compiled parameters '
+                             f'({parameters_nb}).')
+
+        self.model.set_parameter_values(values)
+
+    def clone(self):
+        """
+        Create an independent copy of the initialized model.
+
+        The settings and the elements of the model structure are duplicated,
+        which is cheaper than building the structure again with setup(). The
+        forcing data and behaviours already attached to the model are copied as
+        well. The copy can then be run with other parameters (e.g., in another
+        thread) without affecting this model.
+
+        Return
+        ------
+        The copy of the model.
+        """
+        if not self._is_initialized:
+            raise RuntimeError('The model has not been initialized. '
+                               'Please run setup() first.')
+
+        model_clone = copy.copy(self)
+        model_clone.settings = self.settings.clone()
+        model_clone.model = self.model.clone(self.settings, model_clone.settings)
+        if model_clone.model is None:
+            raise RuntimeError('Cloning the model failed.')
+
+        return model_clone
+
     @staticmethod
     def cleanup():
         _hb.close_log()
@@ -159,6 +328,14 @@ class Model(ABC):
         """
         Set the forcing data.
 
+        The spatialized arrays (time x hydro units) are shared with the core without
+        any copy when they are C-contiguous float64 arrays (other arrays are
+        converted once). They are kept alive by the model and its clones, which
+        all see any change made in place afterwards (see the in_place option of
+        Forcing.apply_operations()). The variables having the same values for all
+        hydro units (e.g., spatialized with the 'constant' method) are stored once
+        and shared by all hydro units.
+
         Parameters
         ----------
         forcing : Forcing
@@ -168,15 +345,71 @@ class Model(ABC):
         time = utils.date_as_mjd(forcing.data2D.time.to_numpy())
         ids = self.spatial_structure.get_ids().to_numpy()
         for data_name, data in zip(forcing.data2D.data_name, forcing.data2D.data):
+            native = forcing.get_native_spatialization(data_name)
+            if native is not None:
+                if not self.model.create_spatialized_time_series(
+                        data_name, time, ids, native['data']):
+                    raise RuntimeError('Failed adding time series.')
+                self._set_elevation_gradients(data_name, native)
+                continue
             if data is None:
                 raise RuntimeError(f'The forcing {data_name} has not '
                                    f'been spatialized.')
-            if not self.model.create_time_series(data_name, time, ids, data):
+            uniform_data = forcing.get_uniform_data(data_name)
+            if uniform_data is not None:
+                if not self.model.create_uniform_time_series(data_name, time,
+                                                             uniform_data):
+                    raise RuntimeError('Failed adding time series.')
+            elif not self.model.create_time_series(data_name, time, ids, data):
                 raise RuntimeError('Failed adding time series.')
 
         if not self.model.attach_time_series_to_hydro_units():
             raise RuntimeError('Attaching time series failed.')
 
+    def update_forcing(self, forcing, variables=None):
+        """
+        Update the values of the forcing data already set in the model, without
+        rebuilding the time series (e.g., after a change of a forcing parameter during
+        the calibration). Falls back to set_forcing() if no forcing was set before.
+
+        Parameters
+        ----------
+        forcing : Forcing
+            The forcing data (covering the same period and hydro units).
+        variables : list, optional
+            The variables to update. All variables are updated if not provided.
+        """
+        if not self.model.forcing_loaded():
+            self.set_forcing(forcing)
+            return
+
+        if variables is None:
+            variables = forcing.data2D.data_name
+        else:
+            variables = [forcing.get_variable_enum(v) for v in variables]
+
+        for variable in variables:
+            native = forcing.get_native_spatialization(variable)
+            if native is not None:
+                if not self.model.update_uniform_time_series_values(
+                        variable, native['data']):
+                    raise RuntimeError(f'Failed updating the {variable} time series.')
+                self._set_elevation_gradients(variable, native)
+                continue
+            idx = forcing.data2D.data_name.index(variable)
+            data = forcing.data2D.data[idx]
+            if data is None:
+                raise RuntimeError(f'The forcing {variable} has not '
+                                   f'been spatialized.')
+            uniform_data = forcing.get_uniform_data(variable)
+            if uniform_data is not None:
+                updated = self.model.update_uniform_time_series_values(
+                    variable, uniform_data)
+            else:
+                updated = self.model.update_time_series_values(variable, data)
+            if not updated:
+                raise RuntimeError(f'Failed updating the {variable} time series.')
+
     def add_behaviour(self, behaviour) -> bool:
         """
         Add a behaviour to the model.
@@ -299,6 +532,16 @@ class Model(ABC):
     def _set_options(self, kwargs):
         if 'solver' in kwargs:
             self.solver = kwargs['solver']
+        if 'solver_abs_tolerance' in kwargs:
+            self.solver_abs_tolerance = kwargs['solver_abs_tolerance']
+        if 'solver_rel_tolerance' in kwargs:
+            self.solver_rel_tolerance = kwargs['solver_rel_tolerance']
+        if 'analytical_linear_storages' in kwargs:
+            self.analytical_linear_storages = kwargs['analytical_linear_storages']
+        if 'vectorized_processes' in kwargs:
+            self.vectorized_processes = kwargs['vectorized_processes']
+        if 'threads_nb' in kwargs:
+            self.threads_nb = kwargs['threads_nb']
         if 'record_all' in kwargs:
             self.record_all = kwargs['record_all']
         if 'land_cover_types' in kwargs:
@@ -330,3 +573,11 @@ class Model(ABC):
             self.set_forcing(forcing)
         elif not self.model.forcing_loaded():
             raise RuntimeError('Please provide the forcing data at least once.')
+
+    def _set_elevation_gradients(self, variable, native):
+        if not self.model.set_time_series_elevation_gradients(
+                variable, native['method'], native['elevations'],
+                native['ref_elevation'], native['gradients'], native['gradients_2'],
+                native['elevation_threshold']):
+            raise RuntimeError(f'Failed setting the gradients of the {variable} '
+                               f'time series.')
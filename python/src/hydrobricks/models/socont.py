@@ -12,15 +12,16 @@ class Socont(Model):
         # Default options
         self.soil_storage_nb = 1
         self.surface_runoff = 'socont_runoff'
+        self.pet_method = 'forcing'
 
-        self._add_allowed_kwargs(['soil_storage_nb', 'surface_runoff'])
+        self._add_allowed_kwargs(['soil_storage_nb', 'surface_runoff', 'pet_method'])
         self._validate_kwargs(kwargs)
         self._set_options(kwargs)
 
         try:
             if not self.settings.generate_socont_structure(
                     self.land_cover_types, self.land_cover_names,
-                    self.soil_storage_nb, self.surface_runoff):
+                    self.soil_storage_nb, self.surface_runoff, self.pet_method):
                 raise RuntimeError('Socont model initialization failed.')
 
         except RuntimeError as err:
@@ -108,6 +109,21 @@ class Socont(Model):
             aliases=['k_slow', 'k_slow_1', 'k_slow1'], min_value=0.001, max_value=1,
             mandatory=True)
 
+        if self.pet_method == 'oudin':
+            ps.define_parameter(
+                component='slow_reservoir', name='pet_k1', unit='°C',
+                aliases=['k1_pet'], min_value=50, max_value=200, default_value=100,
+                mandatory=False)
+            ps.define_parameter(
+                component='slow_reservoir', name='pet_k2', unit='°C',
+                aliases=['k2_pet'], min_value=0, max_value=10, default_value=5,
+                mandatory=False)
+        elif self.pet_method == 'hargreaves':
+            ps.define_parameter(
+                component='slow_reservoir', name='pet_k', unit='-',
+                aliases=['k_pet'], min_value=0.01, max_value=0.02,
+                default_value=0.0135, mandatory=False)
+
         if self.soil_storage_nb == 2:
             ps.define_parameter(
                 component='slow_reservoir', name='percolation_rate', unit='mm/d',
@@ -133,9 +149,15 @@ class Socont(Model):
                 raise ValueError('The option "soil_storage_nb" can only be 1 or 2')
         if 'surface_runoff' in kwargs:
             self.surface_runoff = kwargs['surface_runoff']
+        if 'pet_method' in kwargs:
+            self.pet_method = kwargs['pet_method']
+            if self.pet_method not in ['forcing', 'oudin', 'hargreaves']:
+                raise ValueError('The option "pet_method" can only be "forcing", '
+                                 '"oudin" or "hargreaves"')
 
     def _get_specific_options(self):
         return {
             'soil_storage_nb': self.soil_storage_nb,
-            'surface_runoff': self.surface_runoff
+            'surface_runoff': self.surface_runoff,
+            'pet_method': self.pet_method
         }
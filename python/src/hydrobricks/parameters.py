@@ -278,6 +278,27 @@ class ParameterSet:
         index = self._get_parameter_index(name)
         return self.parameters.loc[index, 'value']
 
+    def get_model_parameter_full_name(self, name):
+        """
+        Get the full name ('component:name') of a model parameter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the parameter (with the related component or one of its
+            aliases).
+
+        Returns
+        ------
+        The parameter name as 'component:name'.
+        """
+        index = self._get_parameter_index(name)
+        component = self.parameters.loc[index, 'component']
+        if component == 'data':
+            raise ValueError(f'The parameter "{name}" is related to the data and not '
+                             f'to the model.')
+        return component + ':' + self.parameters.loc[index, 'name']
+
     def get_model_parameters(self):
         """
         Get the model-only parameters (excluding data-related parameters).
@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+
+# Options of the PET methods available for all hydro units at once (same names and
+# default values as in pyet). The 'method' option of pyet (variant of the equation)
+# cannot be provided as it conflicts with the name of the PET method.
+PET_METHODS = {
+    'oudin': {'inputs': ['tmean'], 'options': {'k1': 100, 'k2': 5}},
+    'hargreaves': {'inputs': ['tmean', 'tmax', 'tmin'], 'options': {'k': 0.0135}},
+    'hamon': {'inputs': ['tmean'], 'options': {'k': 1}},
+}
+
+PET_METHOD_NAMES = {
+    'Oudin': 'oudin',
+    'oudin': 'oudin',
+    'Hargreaves': 'hargreaves',
+    'hargreaves': 'hargreaves',
+    'Hamon': 'hamon',
+    'hamon': 'hamon',
+}
+
+
+def get_vectorized_method(method, options):
+    """
+    Get the name of the vectorized PET function matching a method and its options.
+
+    Parameters
+    ----------
+    method : str
+        Name of the PET method (pyet method name or function name).
+    options : dict
+        Options of the method (other than the latitude).
+
+    Returns
+    -------
+    The name of the vectorized function, or None if the method (or one of the
+    options) is not supported.
+    """
+    name = PET_METHOD_NAMES.get(method, None)
+    if name is None:
+        return None
+    supported = list(PET_METHODS[name]['options'].keys()) + ['clip_zero']
+    if any(key not in supported for key in options):
+        return None
+    return name
+
+
+def compute(name, dates, lat, clip_zero=True, **kwargs):
+    """
+    Compute the PET for all hydro units at once.
+
+    Parameters
+    ----------
+    name : str
+        Name of the vectorized function ('oudin', 'hargreaves' or 'hamon').
+    dates : array-like
+        Dates of the time steps.
+    lat : float|np.ndarray
+        Latitude [rad], either a single value or one value per hydro unit.
+    clip_zero : bool
+        If True, replace all negative values with 0.
+    kwargs
+        The input variables as 2D arrays (time x hydro units) and the options of
+        the method.
+
+    Returns
+    -------
+    The PET [mm d-1] as a 2D array (time x hydro units).
+    """
+    day_of_year = pd.DatetimeIndex(dates).dayofyear.to_numpy()
+    lat = np.atleast_1d(np.asarray(lat, dtype=float))[np.newaxis, :]
+
+    if name == 'oudin':
+        pet = oudin(day_of_year, lat, **kwargs)
+    elif name == 'hargreaves':
+        pet = hargreaves(day_of_year, lat, **kwargs)
+    elif name == 'hamon':
+        pet = hamon(day_of_year, lat, **kwargs)
+    else:
+        raise ValueError(f'Unknown vectorized PET method: {name}')
+
+    if clip_zero:
+        pet = np.maximum(pet, 0)
+
+    return pet
+
+
+def oudin(day_of_year, lat, tmean, k1=100, k2=5):
+    """
+    PET according to Oudin et al. (2005), following the pyet implementation.
+
+    Parameters
+    ----------
+    day_of_year : np.ndarray
+        Day of the year of the time steps.
+    lat : np.ndarray
+        Latitude [rad] of the hydro units (1 x hydro units).
+    tmean : np.ndarray
+        Average day temperature [°C] (time x hydro units).
+    k1 : float
+        Calibration coefficient [-].
+    k2 : float
+        Calibration coefficient [-].
+
+    Returns
+    -------
+    The PET [mm d-1] (time x hydro units).
+    """
+    ra = extraterrestrial_radiation(day_of_year, lat)
+    pet = ra * (tmean + k2) / _latent_heat(tmean) / k1
+    return np.where((tmean + k2) > 0, pet, 0)
+
+
+def hargreaves(day_of_year, lat, tmean, tmax, tmin, k=0.0135, method=0):
+    """
+    PET according to Hargreaves and Samani (1982), following the pyet
+    implementation.
+
+    Parameters
+    ----------
+    day_of_year : np.ndarray
+        Day of the year of the time steps.
+    lat : np.ndarray
+        Latitude [rad] of the hydro units (1 x hydro units).
+    tmean : np.ndarray
+        Average day temperature [°C] (time x hydro units).
+    tmax : np.ndarray
+        Maximum day temperature [°C] (time x hydro units).
+    tmin : np.ndarray
+        Minimum day temperature [°C] (time x hydro units).
+    k : float
+        Calibration coefficient [-].
+    method : int
+        0: after Jensen and Allen (2016), 1: after McMahon et al. (2013).
+
+    Returns
+    -------
+    The PET [mm d-1] (time x hydro units).
+    """
+    ra = extraterrestrial_radiation(day_of_year, lat)
+    t_range = tmax - tmin
+    if method == 0:
+        return k / 0.0135 * 0.0023 * (tmean + 17.8) * np.sqrt(
+            t_range) * ra / _latent_heat(tmean)
+    elif method == 1:
+        chs = 0.00185 * t_range ** 2 - 0.0433 * t_range + 0.4023
+        return k * chs * np.sqrt(t_range) * ra / _latent_heat(tmean) * (
+            tmean + 17.8)
+
+    raise ValueError('The method can be either 0 or 1.')
+
+
+def hamon(day_of_year, lat, tmean, k=1, c=13.97, cc=218.527, method=0):
+    """
+    PET according to Hamon (1963), following the pyet implementation.
+
+    Parameters
+    ----------
+    day_of_year : np.ndarray
+        Day of the year of the time steps.
+    lat : np.ndarray
+        Latitude [rad] of the hydro units (1 x hydro units).
+    tmean : np.ndarray
+        Average day temperature [°C] (time x hydro units).
+    k : float
+        Calibration coefficient (method 0) [-].
+    c : float
+        Calibration coefficient (method 1) [-].
+    cc : float
+        Calibration coefficient (method 2) [-].
+    method : int
+        Variant of the method (0, 1 or 2, see the pyet documentation).
+
+    Returns
+    -------
+    The PET [mm d-1] (time x hydro units).
+    """
+    dl = daylight_hours(day_of_year, lat)
+    if method == 0:
+        return k * (dl / 12) ** 2 * np.exp(tmean / 16)
+    elif method == 1:
+        pt = 4.95 * np.exp(0.062 * tmean) / 100
+        return c * (dl / 12) ** 2 * pt
+    elif method == 2:
+        return cc * (dl / 12) * 1 / (tmean + 273.3) * np.exp(
+            (17.26939 * tmean) / (tmean + 273.3))
+
+    raise ValueError('The method can be either 0, 1 or 2.')
+
+
+def extraterrestrial_radiation(day_of_year, lat):
+    """
+    Extraterrestrial radiation [MJ m-2 d-1] (equation 21 in Allen et al., 1998).
+
+    Parameters
+    ----------
+    day_of_year : np.ndarray
+        Day of the year of the time steps.
+    lat : np.ndarray
+        Latitude [rad] of the hydro units (1 x hydro units).
+
+    Returns
+    -------
+    The radiation (time x hydro units).
+    """
+    day_of_year = np.asarray(day_of_year, dtype=float)[:, np.newaxis]
+    dr = 1 + 0.033 * np.cos(2. * np.pi / 365. * day_of_year)
+    sol_dec = _solar_declination(day_of_year)
+    omega = _sunset_angle(sol_dec, lat)
+    return 118.08 / np.pi * dr * (
+            omega * np.sin(sol_dec) * np.sin(lat) +
+            np.cos(sol_dec) * np.cos(lat) * np.sin(omega))
+
+
+def daylight_hours(day_of_year, lat):
+    """
+    Daylight hours (equation 34 in Allen et al., 1998).
+
+    Parameters
+    ----------
+    day_of_year : np.ndarray
+        Day of the year of the time steps.
+    lat : np.ndarray
+        Latitude [rad] of the hydro units (1 x hydro units).
+
+    Returns
+    -------
+    The daylight hours (time x hydro units).
+    """
+    day_of_year = np.asarray(day_of_year, dtype=float)[:, np.newaxis]
+    sol_dec = _solar_declination(day_of_year)
+    return 24 / np.pi * _sunset_angle(sol_dec, lat)
+
+
+def _solar_declination(day_of_year):
+    return 0.409 * np.sin(2. * np.pi / 365. * day_of_year - 1.39)
+
+
+def _sunset_angle(sol_dec, lat):
+    # Clipped to handle the polar day and night
+    return np.arccos(np.clip(-np.tan(sol_dec) * np.tan(lat), -1, 1))
+
+
+def _latent_heat(tmean):
+    return 2.501 - 0.002361 * tmean
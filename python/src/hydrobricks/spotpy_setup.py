@@ -60,9 +60,8 @@ class SpotpySetup:
         forcing = self.forcing
         if self.random_forcing:
             forcing.apply_operations(params, apply_to_all=False)
-            model.run(parameters=params, forcing=forcing)
-        else:
-            model.run(parameters=params)
+            model.update_forcing(forcing, forcing.get_updated_variables())
+        model.run(parameters=params)
         sim = model.get_outlet_discharge()
 
         if self.dump_outputs or self.dump_forcing:
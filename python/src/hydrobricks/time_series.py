@@ -1,8 +1,12 @@
+import collections
 import concurrent.futures
+import hashlib
 import os
+import threading
 import time
 import warnings
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
 
 import numpy as np
@@ -70,7 +74,9 @@ class TimeSeries2D(TimeSeries):
     def regrid_from_netcdf(self, path, file_pattern=None, data_crs=None, var_name=None,
                            dim_time='time', dim_x='x', dim_y='y',
                            raster_hydro_units=None, method='weights',
-                           weights_block_size=100):
+                           weights_block_size=100, weights_cache=False,
+                           cache_dir=None, start_date=None, end_date=None,
+                           memmap_dir=None, executor='thread', n_workers=None):
         """
         Regrid time series data from netcdf files. The spatialization is done using a
         raster of hydro unit ids. The meteorological data is resampled to the DEM
@@ -86,8 +92,11 @@ class TimeSeries2D(TimeSeries):
             a single file.
         data_crs : int, optional
             CRS (as EPSG id) of the netcdf file. If None, the CRS is read from the file.
-        var_name : str
-            Name of the variable to read.
+        var_name : str|list
+            Name of the variable to read, or list of the names of the variables to
+            read. Multiple variables must share the same grid. They are then
+            regridded in a single pass (the files are opened and the weights are
+            computed only once) and one array per variable is added to the data.
         dim_time : str
             Name of the time dimension.
         dim_x : str
@@ -100,9 +109,45 @@ class TimeSeries2D(TimeSeries):
         method : str
             Method to use for the spatialization. Can be 'reproject' or 'weights'.
             It does not change the result but the 'weights' method is faster.
+            The 'weights' method stores the weights of the data cells contributing
+            to each hydro unit in a sparse matrix (units x data cells) and
+            reduces each block of time steps with a single matrix product.
+            With both methods, the files are read one after the other and by
+            blocks of time steps, so that the memory used does not depend on the
+            length of the archive.
         weights_block_size : int
             Size of the block of time steps to use for the 'weights' method.
             Default: 100.
+        weights_cache : bool
+            Save the weights of the 'weights' method to disk and reuse them when
+            regridding the same grid onto the same hydro units raster. The cache
+            file is identified by a hash of the data grid coordinates and CRS and of
+            the hydro units raster, so that it is not used anymore when one of them
+            changes. Default: False (enabled by default in
+            Forcing.spatialize_from_gridded_data()).
+        cache_dir : str|Path, optional
+            Directory of the weights cache. Default: the hydrobricks cache directory
+            (see utils.get_cache_dir()).
+        start_date : str|datetime, optional
+            Start of the period to extract. The time axis of the files is subset
+            before reading the data, so that only the time steps of the period are
+            read. Default: the first time step of the files.
+        end_date : str|datetime, optional
+            End of the period to extract (included). Default: the last time step of
+            the files.
+        memmap_dir : str|Path, optional
+            Directory in which the regridded series are written as memory-mapped
+            .npy files (one per variable, named after the variable in the files)
+            instead of being kept in memory. Default: None (kept in memory).
+        executor : str
+            Execution backend: 'thread' (pool of threads) or 'process' (pool of
+            processes, 'reproject' method only). With the 'process' backend, each
+            worker opens the files itself and regrids a slab of time steps. The
+            unit values are written directly into the memory-mapped outputs (see
+            memmap_dir), or returned slab by slab through shared memory. It avoids
+            the contention on the GIL of the reprojection. Default: 'thread'.
+        n_workers : int, optional
+            Number of threads or processes. Default: the number of CPUs.
         """
         if not hb.has_rasterio:
             raise ImportError("rasterio is required for 'regrid_from_netcdf'.")
@@ -110,26 +155,65 @@ class TimeSeries2D(TimeSeries):
             raise ImportError("rioxarray is required for 'regrid_from_netcdf'.")
         if not hb.has_netcdf:
             raise ImportError("netCDF4 is required for 'regrid_from_netcdf'.")
+        if method == 'weights' and not hb.has_scipy:
+            raise ImportError("scipy is required for the 'weights' method.")
+        if method not in ['reproject', 'weights']:
+            raise ValueError(f"Unknown method '{method}'.")
+        if executor not in ['thread', 'process']:
+            raise ValueError(f"Unknown executor '{executor}'.")
+        if executor == 'process' and method != 'reproject':
+            raise ValueError("The 'process' executor is only available for the "
+                             "'reproject' method.")
 
         if raster_hydro_units is None:
             raise ValueError("You must provide a raster of the hydro units.")
 
+        var_names = [var_name] if isinstance(var_name, str) else list(var_name)
+
         # Get unit ids
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
             unit_ids = hb.rxr.open_rasterio(raster_hydro_units)
             unit_ids = unit_ids.squeeze().drop_vars("band")
 
-        # Get netCDF dataset
-        print(f"Reading netcdf file(s) from {path}...")
+        # List the netCDF files and the time steps of the period in each of them
         if file_pattern is None:
-            nc_data = hb.xr.open_dataset(path)
+            files = [Path(path)]
         else:
             files = sorted(Path(path).glob(file_pattern))
-            nc_data = hb.xr.open_mfdataset(files)
+            if not files:
+                raise FileNotFoundError(f"No file matching '{file_pattern}' found "
+                                        f"in {path}.")
+        print(f"Reading {len(files)} netcdf file(s) from {path}...")
+        segments = self._get_time_segments(files, dim_time, start_date, end_date)
 
-        # Get CRS of the netcdf file
-        data_crs = self._parse_crs(nc_data, data_crs)
+        # Get list of time steps
+        time_nc = np.concatenate([segment['time'] for segment in segments])
+        if len(self.time) == 0:
+            self.time = pd.Series(time_nc)
+        else:
+            # Check if the time steps are the same
+            if len(self.time) != len(time_nc):
+                raise ValueError(f"The length of the netcdf time series "
+                                 f"({len(time_nc)}) does not match the one from the "
+                                 f"hydro units data ({len(self.time)}).")
+            if self.time[0] != time_nc[0]:
+                raise ValueError(f"The first time step of the netcdf time series "
+                                 f"({time_nc[0]}) does not match the one from the "
+                                 f"hydro units data ({self.time[0]}).")
+            if self.time[len(self.time) - 1] != time_nc[-1]:
+                raise ValueError(f"The last time step of the netcdf time series "
+                                 f"({time_nc[-1]}) does not match the one from the "
+                                 f"hydro units data "
+                                 f"({self.time[len(self.time) - 1]}).")
+
+        # Get the grid of the data from the first file
+        with hb.xr.open_dataset(segments[0]['file']) as nc_data:
+            # Get CRS of the netcdf file
+            data_crs = self._parse_crs(nc_data, data_crs)
+            data_vars = self._get_data_variables(
+                nc_data, var_names, data_crs, dim_time, dim_x, dim_y)
+            grid = data_vars[0][0].load()
 
         # Get CRS of the unit ids raster
         unit_ids_crs = self._parse_crs(unit_ids, None)
@@ -146,157 +230,374 @@ class TimeSeries2D(TimeSeries):
         unit_ids_list = unit_ids_list[unit_ids_list != 0]
         unit_ids_nb = len(unit_ids_list)
 
-        # Get list of time steps
-        time_nc = nc_data.variables[dim_time][:]
-        if len(self.time) == 0:
-            self.time = pd.Series(time_nc)
-        else:
-            # Check if the time steps are the same
-            if len(self.time) != len(time_nc):
-                raise ValueError(f"The length of the netcdf time series "
-                                 f"({len(time_nc)}) does not match the one from the "
-                                 f"hydro units data ({len(self.time)}).")
-            if self.time[0] != time_nc[0]:
-                raise ValueError(f"The first time step of the netcdf time series "
-                                 f"({time_nc[0].data}) does not match the one from the "
-                                 f"hydro units data ({self.time[0]}).")
-            if self.time[len(self.time) - 1] != time_nc[len(time_nc) - 1]:
-                raise ValueError(f"The last time step of the netcdf time series "
-                                 f"({time_nc[len(time_nc) - 1].data}) does not match "
-                                 f"the one from the hydro units data "
-                                 f"({self.time[len(self.time) - 1]}).")
+        # Initialize data arrays
+        outputs = [self._create_output((len(self.time), unit_ids_nb), memmap_dir, name)
+                   for name in var_names]
+        self.data.extend(outputs)
 
-        # Extract the unit id masks
-        unit_id_masks = []
-        for unit_id in unit_ids_list:
-            unit_id_mask = hb.xr.where(unit_ids == unit_id, 1, 0)
-            unit_id_masks.append(unit_id_mask)
+        unit_labels = None
+        unit_weights = None
+        if method == 'reproject':
+            # Index of the hydro unit of each pixel of the hydro units raster
+            unit_labels = self._get_unit_labels(unit_ids, unit_ids_list)
+
+        elif method == 'weights':
+            # Sparse matrix (units x data cells) of the weights to apply to the
+            # gridded data contributing to each unit
+            cache_file = None
+            if weights_cache:
+                if cache_dir is None:
+                    cache_dir = utils.get_cache_dir()
+                key = self._get_weights_cache_key(grid, data_crs, unit_ids)
+                cache_file = Path(cache_dir) / 'weights' / f'{key}.npz'
+                unit_weights = self._load_unit_weights(
+                    cache_file, (unit_ids_nb, grid.size))
+
+            if unit_weights is None:
+                unit_weights = self._compute_weights_from_grids(
+                    grid, unit_ids, unit_ids_list)
+                if cache_file is not None:
+                    self._save_unit_weights(cache_file, unit_weights)
+
+        if n_workers is None:
+            n_workers = os.cpu_count()
+        progress = _RegridProgress(len(self.time), len(var_names))
+
+        if executor == 'process':
+            self._regrid_reproject_in_processes(
+                segments, outputs, var_names, data_crs, dim_time, dim_x, dim_y,
+                unit_ids, unit_labels, n_workers, progress)
+            progress.finish(f'{n_workers} processes')
+            return
+
+        # Read the files one after the other, and only the time steps of the period
+        offset = 0
+        for segment in segments:
+            with hb.xr.open_dataset(segment['file']) as nc_data:
+                nc_data = nc_data.isel(
+                    {dim_time: slice(segment['start'], segment['end'])})
+                data_vars = self._get_data_variables(
+                    nc_data, var_names, data_crs, dim_time, dim_x, dim_y)
+                if data_vars[0].shape[1:] != grid.shape:
+                    raise ValueError(f"The grid of {segment['file']} does not match "
+                                     f"the grid of {segments[0]['file']}.")
+                steps_nb = data_vars[0].shape[0]
+
+                with warnings.catch_warnings():
+                    warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
+                    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                        # Submit the tasks for each time step (or block of time
+                        # steps) to the executor
+                        if method == 'reproject':
+                            futures = [pool.submit(
+                                self._extract_time_step_data_reproject, data_vars,
+                                outputs, offset, unit_labels, unit_ids, t, progress)
+                                for t in range(steps_nb)]
+                        else:
+                            futures = [pool.submit(
+                                self._extract_time_step_data_weights, data_vars,
+                                outputs, offset, unit_weights, i_start,
+                                min(i_start + weights_block_size, steps_nb),
+                                progress)
+                                for i_start in range(0, steps_nb, weights_block_size)]
+
+                        # Wait for all tasks to complete (and raise their errors)
+                        for future in concurrent.futures.as_completed(futures):
+                            future.result()
+
+            offset += steps_nb
+
+        for output in outputs:
+            if isinstance(output, np.memmap):
+                output.flush()
+
+        progress.finish(f'{n_workers} threads')
 
-        # Initialize data array
-        data = np.zeros((len(self.time), unit_ids_nb))
-        self.data.append(data)
+    @staticmethod
+    def average_by_unit(values, unit_labels, unit_ids_nb):
+        """
+        Average the values of the pixels of each hydro unit, ignoring the missing
+        values. All hydro units are processed at once.
 
+        Parameters
+        ----------
+        values : np.ndarray
+            Values of the pixels of the hydro units raster.
+        unit_labels : np.ndarray
+            Index of the hydro unit of each pixel (same shape as the values), or -1
+            for the pixels outside of the hydro units.
+        unit_ids_nb : int
+            Number of hydro units.
+
+        Returns
+        -------
+        The average value of each hydro unit (NaN if it has no valid pixel).
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        unit_labels = np.asarray(unit_labels).ravel()
+        valid = (unit_labels >= 0) & np.isfinite(values)
+        sums = np.bincount(unit_labels[valid], weights=values[valid],
+                           minlength=unit_ids_nb)
+        counts = np.bincount(unit_labels[valid], minlength=unit_ids_nb)
+        means = np.full(unit_ids_nb, np.nan)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return means
+
+    @staticmethod
+    def _extract_time_step_data_reproject(data_vars, outputs, offset, unit_labels,
+                                          unit_ids, t, progress):
+        for data_var, output in zip(data_vars, outputs):
+            # Reproject and average the meteorological data in each unit
+            data_var_t = data_var[t].rio.reproject_match(
+                unit_ids, Resampling=hb.rasterio.enums.Resampling.average)
+            output[offset + t, :] = TimeSeries2D.average_by_unit(
+                data_var_t.to_numpy(), unit_labels, output.shape[1])
+
+        progress.update(1)
+
+    @staticmethod
+    def _regrid_reproject_in_processes(segments, outputs, var_names, data_crs,
+                                       dim_time, dim_x, dim_y, unit_ids,
+                                       unit_labels, n_workers, progress):
+        # Slabs of time steps are regridded by the workers. When the outputs are
+        # memory-mapped files, the workers write the unit values directly into
+        # them. Otherwise, each slab is returned through its own shared memory
+        # block (variables x slab time steps x units), copied into the outputs as
+        # soon as the slab is done. At most one slab per worker is in memory.
+        tasks = collections.deque()
+        offset = 0
+        for segment in segments:
+            segment_steps_nb = len(segment['time'])
+            slab_size = int(np.ceil(segment_steps_nb / n_workers))
+            for i_start in range(0, segment_steps_nb, slab_size):
+                i_end = min(i_start + slab_size, segment_steps_nb)
+                tasks.append((segment['file'], segment['start'] + i_start,
+                              segment['start'] + i_end, offset + i_start))
+            offset += segment_steps_nb
+
+        units_nb = outputs[0].shape[1]
+        out_paths = None
+        if all(isinstance(output, np.memmap) for output in outputs):
+            for output in outputs:
+                output.flush()
+            out_paths = [output.filename for output in outputs]
+
+        running = {}
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                while tasks or running:
+                    while tasks and len(running) < n_workers:
+                        file, i_start, i_end, slab_offset = tasks.popleft()
+                        shm = None
+                        if out_paths is None:
+                            size = len(outputs) * (i_end - i_start) * units_nb
+                            shm = shared_memory.SharedMemory(
+                                create=True,
+                                size=size * np.dtype(np.float64).itemsize)
+                        future = pool.submit(
+                            _regrid_reproject_slab, file, i_start, i_end,
+                            var_names, data_crs, dim_time, dim_x, dim_y, unit_ids,
+                            unit_labels, units_nb, out_paths, slab_offset,
+                            None if shm is None else shm.name)
+                        running[future] = (slab_offset, shm)
+
+                    # Collect the finished slabs (and raise their errors)
+                    done, _ = concurrent.futures.wait(
+                        running, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        slab_offset, shm = running.pop(future)
+                        try:
+                            steps_nb = future.result()
+                            if shm is not None:
+                                TimeSeries2D._copy_slab_to_outputs(
+                                    shm, outputs, slab_offset, steps_nb)
+                        finally:
+                            if shm is not None:
+                                shm.close()
+                                shm.unlink()
+                        progress.update(steps_nb)
+        finally:
+            for _, shm in running.values():
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
+        for output in outputs:
+            if isinstance(output, np.memmap):
+                output.flush()
+
+    @staticmethod
+    def _copy_slab_to_outputs(shm, outputs, slab_offset, steps_nb):
+        slab = np.ndarray((len(outputs), steps_nb, outputs[0].shape[1]),
+                          dtype=np.float64, buffer=shm.buf)
+        for output, values in zip(outputs, slab):
+            output[slab_offset:slab_offset + steps_nb, :] = values
+        del slab
+
+    @staticmethod
+    def _extract_time_step_data_weights(data_vars, outputs, offset, unit_weights,
+                                        i_start, i_end, progress):
+        # Read the block once (time x data cells) and reduce it for all units at
+        # once. Missing values are ignored (as with a nansum).
+        for data_var, output in zip(data_vars, outputs):
+            block = data_var[i_start:i_end].to_numpy().reshape(i_end - i_start, -1)
+            block = np.nan_to_num(block, nan=0)
+            output[offset + i_start:offset + i_end, :] = (unit_weights @ block.T).T
+
+        progress.update(i_end - i_start)
+
+    @staticmethod
+    def _get_time_segments(files, dim_time, start_date, end_date):
+        # Time steps of the period in each file (only the time axis is read)
+        segments = []
+        for file in files:
+            with hb.xr.open_dataset(file) as nc_data:
+                time_file = nc_data[dim_time].to_numpy()
+            mask = np.ones(len(time_file), dtype=bool)
+            if start_date is not None:
+                mask &= time_file >= pd.Timestamp(start_date).to_datetime64()
+            if end_date is not None:
+                mask &= time_file <= pd.Timestamp(end_date).to_datetime64()
+            idx = np.flatnonzero(mask)
+            if len(idx) == 0:
+                continue
+            segments.append({
+                'file': file,
+                'start': idx[0],
+                'end': idx[-1] + 1,
+                'time': time_file[idx[0]:idx[-1] + 1]
+            })
+
+        if not segments:
+            raise ValueError("No time step of the netcdf file(s) is within the "
+                             "requested period.")
+
+        segments.sort(key=lambda segment: segment['time'][0])
+
+        return segments
+
+    @staticmethod
+    def _get_data_variables(nc_data, var_names, data_crs, dim_time, dim_x, dim_y):
         # Drop other variables
         other_coords = [v for v in nc_data.coords if v not in [dim_time, dim_x, dim_y]]
         nc_data = nc_data.drop_vars(other_coords)
 
-        # Extract variable
-        data_var = nc_data[var_name]
+        # Extract variables
+        data_vars = []
+        for name in var_names:
+            data_var = nc_data[name]
 
-        # Specify the CRS if not specified
-        if data_var.rio.crs is None:
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
-                data_var.rio.write_crs(f'epsg:{data_crs}', inplace=True)
+            # Specify the CRS if not specified
+            if data_var.rio.crs is None:
+                with warnings.catch_warnings():
+                    warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
+                    data_var.rio.write_crs(f'epsg:{data_crs}', inplace=True)
 
-        # Rename spatial dimensions
-        if dim_x != 'x':
-            data_var = data_var.rename({dim_x: 'x'})
-        if dim_y != 'y':
-            data_var = data_var.rename({dim_y: 'y'})
+            # Rename spatial dimensions
+            if dim_x != 'x':
+                data_var = data_var.rename({dim_x: 'x'})
+            if dim_y != 'y':
+                data_var = data_var.rename({dim_y: 'y'})
 
-        # Time the computation
-        start_time = time.time()
+            if data_vars and data_var.shape != data_vars[0].shape:
+                raise ValueError(f"The variable '{name}' does not have the same "
+                                 f"shape as '{var_names[0]}'.")
+            data_vars.append(data_var)
 
-        num_threads = os.cpu_count()
+        return data_vars
 
-        if method == 'reproject':
-            # Create a ThreadPoolExecutor with a specified number of threads
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
-                with ThreadPoolExecutor(max_workers=num_threads) as executor:
-                    # Submit the tasks for each time step to the executor
-                    futures = [executor.submit(self._extract_time_step_data_reproject,
-                                               data_var, unit_id_masks, unit_ids,
-                                               unit_ids_nb, t)
-                               for t in range(len(self.time))]
+    @staticmethod
+    def _get_unit_labels(unit_ids, unit_ids_list):
+        unit_ids = unit_ids.to_numpy()
+        unit_labels = np.full(unit_ids.shape, -1, dtype=np.intp)
+        in_units = np.isin(unit_ids, unit_ids_list)
+        unit_labels[in_units] = np.searchsorted(unit_ids_list, unit_ids[in_units])
+        return unit_labels
 
-                    # Wait for all tasks to complete
-                    concurrent.futures.wait(futures)
+    @staticmethod
+    def _create_output(shape, memmap_dir, name):
+        if memmap_dir is None:
+            return np.zeros(shape)
 
-        elif method == 'weights':
-            # Create a xarray variable containing the data cell indices
-            data_idx = data_var[0].copy()
-            data_idx.values = np.arange(data_idx.size).reshape(data_idx.shape)
-            data_idx = data_idx.astype(float)
+        memmap_dir = Path(memmap_dir)
+        memmap_dir.mkdir(parents=True, exist_ok=True)
+        return np.lib.format.open_memmap(
+            memmap_dir / f'{name}.npy', mode='w+', dtype=np.float64, shape=shape)
 
-            # Reproject the data cell indices to the hydro unit raster
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
-                data_idx_reproj = data_idx.rio.reproject_match(
-                    unit_ids, Resampling=hb.rasterio.enums.Resampling.nearest)
-
-            # Create the masks (with the original data shape) for each unit with the
-            # weights to apply to the gridded data contributing to the unit
-            unit_weights = []
-            for u in range(unit_ids_nb):
-                # Get the data indices contributing to the unit
-                mask_unit_id = hb.xr.where(unit_id_masks[u], data_idx_reproj, -1)
-                mask_unit_id = mask_unit_id.to_numpy().astype(int)
-                # Get unique values and their counts
-                data_idx_values, counts = np.unique(mask_unit_id[mask_unit_id >= 0],
-                                                    return_counts=True)
-                # Create a mask of the weights
-                weights_mask = np.zeros(data_idx.shape)
-                data_idx_values = np.unravel_index(data_idx_values, data_idx.shape)
-                weights_mask[data_idx_values] = counts / np.sum(counts)
-
-                assert np.isclose(np.sum(weights_mask), 1)
-
-                # Add the mask to the list
-                unit_weights.append(weights_mask)
-
-            n_steps = 1 + np.ceil(len(self.time) / weights_block_size).astype(int)
-
-            with ThreadPoolExecutor(max_workers=num_threads) as executor:
-                # Submit the tasks for each time step to the executor
-                futures = [executor.submit(self._extract_time_step_data_weights,
-                                           data_var, unit_weights, t_block,
-                                           weights_block_size)
-                           for t_block in range(n_steps)]
-
-                # Wait for all tasks to complete
-                concurrent.futures.wait(futures)
+    @staticmethod
+    def _compute_weights_from_grids(grid, unit_ids, unit_ids_list):
+        # Create a xarray variable containing the data cell indices
+        data_idx = grid.copy()
+        data_idx.values = np.arange(data_idx.size).reshape(data_idx.shape)
+        data_idx = data_idx.astype(float)
 
-        else:
-            raise ValueError(f"Unknown method '{method}'.")
+        # Reproject the data cell indices to the hydro unit raster
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
+            data_idx_reproj = data_idx.rio.reproject_match(
+                unit_ids, Resampling=hb.rasterio.enums.Resampling.nearest)
 
-        # Print elapsed time
-        elapsed_time = time.time() - start_time
-        print(f"Elapsed time: {elapsed_time:.2f} seconds (using {num_threads} threads)")
-
-    def _extract_time_step_data_reproject(self, data_var, unit_id_masks, unit_ids,
-                                          unit_ids_nb, t):
-        # Print message very 20 time steps
-        if t % 20 == 0:
-            print(f"Extracting {self.time[t]}")
-
-        # Reproject
-        data_var_t = data_var[t].rio.reproject_match(
-            unit_ids, Resampling=hb.rasterio.enums.Resampling.average)
-
-        # Extract data for each unit
-        for u in range(unit_ids_nb):
-            # Mask the meteorological data with the hydro unit.
-            val = hb.xr.where(unit_id_masks[u], data_var_t, np.nan).to_numpy()
-            # Average the meteorological data in the unit.
-            self.data[-1][t, u] = np.nanmean(val)
-
-    def _extract_time_step_data_weights(self, data_var, unit_weights, i_block,
-                                        block_size):
-        i_start = i_block * block_size
-        i_end = min((i_block + 1) * block_size, len(self.time))
-        if i_start >= len(self.time):
-            return
+        return TimeSeries2D._compute_unit_weights(
+            unit_ids.to_numpy(), data_idx_reproj.to_numpy(), unit_ids_list,
+            data_idx.size)
 
-        print(f"Extracting {self.time[i_start]}")
+    @staticmethod
+    def _get_weights_cache_key(grid, data_crs, unit_ids):
+        # Hash of everything the weights depend on: the data grid (coordinates,
+        # shape and CRS) and the hydro units raster (ids, coordinates and CRS).
+        sha = hashlib.sha256()
+        sha.update(b'weights-v1')
+        for coords in [grid['x'], grid['y'], unit_ids['x'], unit_ids['y']]:
+            sha.update(np.ascontiguousarray(coords.to_numpy(), dtype=float).tobytes())
+        sha.update(str(grid.shape).encode())
+        sha.update(str(data_crs).encode())
+        sha.update(np.ascontiguousarray(unit_ids.to_numpy()).tobytes())
+        sha.update(str(unit_ids.rio.crs).encode())
+        return sha.hexdigest()
+
+    @staticmethod
+    def _load_unit_weights(cache_file, shape):
+        if not cache_file.exists():
+            return None
+        try:
+            unit_weights = hb.sparse.load_npz(cache_file)
+        except (OSError, ValueError):
+            return None
+        if unit_weights.shape != shape:
+            return None
+        return unit_weights.tocsr()
+
+    @staticmethod
+    def _save_unit_weights(cache_file, unit_weights):
+        # Written to a temporary file first so that a concurrent reader never sees
+        # a partial file
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f'{cache_file.stem}.{os.getpid()}.tmp.npz')
+        hb.sparse.save_npz(tmp_file, unit_weights)
+        os.replace(tmp_file, cache_file)
 
-        # Extract data for each unit
-        for u, unit_weight in enumerate(unit_weights):
-            # Mask the meteorological data with the unit weights.
-            self.data[-1][i_start:i_end, u] = np.nansum(
-                data_var[i_start:i_end].to_numpy() * unit_weight,
-                axis=(1, 2))
+    @staticmethod
+    def _compute_unit_weights(unit_ids, data_idx_reproj, unit_ids_list, data_size):
+        # Data cell index and unit id of each pixel of the hydro units raster
+        unit_ids = unit_ids.ravel()
+        data_idx_reproj = data_idx_reproj.ravel()
+        valid = np.isin(unit_ids, unit_ids_list) & np.isfinite(data_idx_reproj) \
+            & (data_idx_reproj >= 0)
+        rows = np.searchsorted(unit_ids_list, unit_ids[valid])
+        cols = data_idx_reproj[valid].astype(int)
+
+        # Count the pixels of each unit falling in each data cell (duplicates are
+        # summed) and normalize by the number of pixels of the unit
+        counts = hb.sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(unit_ids_list), data_size))
+        pixels_nb = np.asarray(counts.sum(axis=1)).ravel()
+        if np.any(pixels_nb == 0):
+            raise ValueError("Some hydro units are not covered by the gridded data.")
+        weights = hb.sparse.diags(1 / pixels_nb) @ counts
+
+        assert np.allclose(weights.sum(axis=1), 1)
+
+        return weights.tocsr()
 
     @staticmethod
     def _parse_crs(data, file_crs):
@@ -311,3 +612,76 @@ class TimeSeries2D(TimeSeries):
                 raise ValueError("No CRS found in the netcdf file."
                                  "Please provide a CRS (option 'file_crs').")
         return file_crs
+
+
+def _regrid_reproject_slab(file, i_start, i_end, var_names, data_crs, dim_time,
+                           dim_x, dim_y, unit_ids, unit_labels, units_nb,
+                           out_paths=None, out_offset=0, shm_name=None):
+    # Worker of the 'process' backend: opens the file itself and regrids the time
+    # steps [i_start, i_end[. The unit values are written either directly into the
+    # memory-mapped outputs (out_paths, from the time step out_offset) or into the
+    # shared memory block of the slab (shm_name).
+    steps_nb = i_end - i_start
+    shm = None
+    if out_paths is not None:
+        memmaps = [np.load(path, mmap_mode='r+') for path in out_paths]
+        results = [memmap[out_offset:out_offset + steps_nb] for memmap in memmaps]
+    else:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        results = np.ndarray((len(var_names), steps_nb, units_nb),
+                             dtype=np.float64, buffer=shm.buf)
+    try:
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
+            with hb.xr.open_dataset(file) as nc_data:
+                nc_data = nc_data.isel({dim_time: slice(i_start, i_end)})
+                data_vars = TimeSeries2D._get_data_variables(
+                    nc_data, var_names, data_crs, dim_time, dim_x, dim_y)
+                for data_var, result in zip(data_vars, results):
+                    for t in range(steps_nb):
+                        data_var_t = data_var[t].rio.reproject_match(
+                            unit_ids, Resampling=hb.rasterio.enums.Resampling.average)
+                        result[t, :] = TimeSeries2D.average_by_unit(
+                            data_var_t.to_numpy(), unit_labels, units_nb)
+        if out_paths is not None:
+            for memmap in memmaps:
+                memmap.flush()
+    finally:
+        del results
+        if shm is not None:
+            shm.close()
+
+    return steps_nb
+
+
+class _RegridProgress:
+    """Report of the progress and throughput of the regridding."""
+
+    def __init__(self, steps_nb, variables_nb, interval=10):
+        self.steps_nb = steps_nb
+        self.variables_nb = variables_nb
+        self.interval = interval
+        self.steps_done = 0
+        self._start_time = time.time()
+        self._last_report = self._start_time
+        self._lock = threading.Lock()
+
+    def update(self, steps_nb):
+        with self._lock:
+            self.steps_done += steps_nb
+            now = time.time()
+            if now - self._last_report < self.interval:
+                return
+            self._last_report = now
+            print(f"Regridded {self.steps_done}/{self.steps_nb} time steps "
+                  f"({100 * self.steps_done / self.steps_nb:.0f}%, "
+                  f"{self._get_throughput(now):.1f} steps/s)")
+
+    def finish(self, workers):
+        now = time.time()
+        print(f"Regridded {self.steps_done} time steps of {self.variables_nb} "
+              f"variable(s) in {now - self._start_time:.2f} seconds "
+              f"({self._get_throughput(now):.1f} steps/s, using {workers})")
+
+    def _get_throughput(self, now):
+        return self.steps_done / max(now - self._start_time, 1e-9)
@@ -1,5 +1,6 @@
 import datetime
 import json
+import os
 import time
 from pathlib import Path
 
@@ -148,3 +149,16 @@ class Timer:
             self.logger(text)
 
         return self.last
+
+
+def get_cache_dir():
+    """
+    Get the directory where hydrobricks caches data (e.g., regridding weights). It
+    can be defined with the HYDROBRICKS_CACHE_DIR environment variable and defaults
+    to the user cache directory (XDG_CACHE_HOME or ~/.cache).
+    """
+    if 'HYDROBRICKS_CACHE_DIR' in os.environ:
+        return Path(os.environ['HYDROBRICKS_CACHE_DIR'])
+    if 'XDG_CACHE_HOME' in os.environ:
+        return Path(os.environ['XDG_CACHE_HOME']) / 'hydrobricks'
+    return Path.home() / '.cache' / 'hydrobricks'
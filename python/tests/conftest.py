@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    # Keep the files cached by the tests (e.g., regridding weights) out of the
+    # user cache directory
+    monkeypatch.setenv('HYDROBRICKS_CACHE_DIR', str(tmp_path / 'cache'))
@@ -1,7 +1,10 @@
 import os
 import tempfile
+import warnings
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 
 import hydrobricks as hb
@@ -13,7 +16,8 @@ CATCHMENT_DIR = Path(
 
 
 def has_gridded_data_packages() -> bool:
-    return hb.has_rasterio and hb.has_netcdf and hb.has_rioxarray and hb.has_xarray
+    return hb.has_rasterio and hb.has_netcdf and hb.has_rioxarray and hb.has_xarray \
+        and hb.has_scipy
 
 
 @pytest.fixture
@@ -176,6 +180,186 @@ def test_apply_spatialization_from_station_data_precipitation(forcing, parameter
                                             len(forcing.hydro_units))
 
 
+def test_apply_spatialization_from_station_data_constant(forcing, parameters):
+    forcing.spatialize_from_station_data(variable='pet')
+    forcing.spatialize_from_station_data(
+        variable='temperature', ref_elevation=1250, gradient=-0.6)
+    forcing.apply_operations(parameters)
+    idx = forcing.data2D.data_name.index(forcing.Variable.PET)
+    assert forcing.data2D.data[idx].shape == (len(forcing.data1D.time),
+                                              len(forcing.hydro_units))
+    pet = forcing.get_uniform_data('pet')
+    assert pet.shape == (len(forcing.data1D.time),)
+    assert np.array_equal(forcing.data2D.data[idx][:, -1], pet)
+    assert forcing.get_uniform_data('temperature') is None
+
+
+def test_apply_spatialization_monthly_and_threshold_gradients(forcing, parameters):
+    gradients = [0.01 * (m + 1) for m in range(12)]
+    forcing.spatialize_from_station_data(
+        variable='temperature', ref_elevation=1250, gradient=gradients)
+    forcing.spatialize_from_station_data(
+        variable='precipitation', method='multiplicative_elevation_threshold_gradients',
+        ref_elevation=1250, gradient=0.05, gradient_2=0.01,
+        elevation_threshold=2000)
+    forcing.apply_operations(parameters)
+
+    elevations = forcing.hydro_units['elevation'].to_numpy().ravel()
+    months = forcing.data1D.time.dt.month.to_numpy()
+    temp = forcing.data1D.data[forcing.data1D.data_name.index(forcing.Variable.T)]
+    precip = forcing.data1D.data[forcing.data1D.data_name.index(forcing.Variable.P)]
+    for i_unit, elevation in enumerate(elevations):
+        expected = temp + np.array(gradients)[months - 1] * (elevation - 1250) / 100
+        assert np.allclose(forcing.data2D.data[0][:, i_unit], expected)
+        if elevation < 2000:
+            factor = 1 + 0.05 * (elevation - 1250) / 100
+        else:
+            factor = (1 + 0.05 * 7.5) * (1 + 0.01 * (elevation - 2000) / 100)
+        assert np.allclose(forcing.data2D.data[1][:, i_unit], precip * factor)
+
+
+def test_reapplied_spatialization_reuses_output(forcing, parameters):
+    parameters.add_data_parameter('precip_gradient', 0.05)
+    forcing.spatialize_from_station_data(
+        variable='precipitation', ref_elevation=1250,
+        gradient='param:precip_gradient')
+    forcing.apply_operations(parameters)
+    data = forcing.data2D.data[0]
+
+    parameters.set_values({'precip_gradient': 0.1})
+    parameters.allow_changing = ['precip_gradient']
+    forcing.apply_operations(parameters, apply_to_all=False, in_place=True)
+    assert forcing.data2D.data[0] is data
+    values = data.copy()
+
+    # Same values as a full computation
+    forcing.apply_operations(parameters)
+    assert forcing.data2D.data[0] is not data
+    assert np.allclose(forcing.data2D.data[0], values)
+
+
+def test_reapplied_spatialization_allocates_output_by_default(forcing, parameters):
+    parameters.add_data_parameter('precip_gradient', 0.05)
+    forcing.spatialize_from_station_data(
+        variable='precipitation', ref_elevation=1250,
+        gradient='param:precip_gradient')
+    forcing.apply_operations(parameters)
+    data = forcing.data2D.data[0]
+    values = data.copy()
+
+    parameters.set_values({'precip_gradient': 0.1})
+    parameters.allow_changing = ['precip_gradient']
+    forcing.apply_operations(parameters, apply_to_all=False)
+    assert forcing.data2D.data[0] is not data
+    assert np.array_equal(data, values)
+
+
+def test_cache_reuses_results_of_same_parameter_values(forcing, parameters):
+    parameters.add_data_parameter('temp_gradients', -0.6)
+    parameters.add_data_parameter('precip_gradient', 0.05)
+    forcing.set_cache_size(100 * 1024 * 1024)
+    forcing.spatialize_from_station_data(
+        variable='temperature', ref_elevation=1250,
+        gradient='param:temp_gradients')
+    forcing.spatialize_from_station_data(
+        variable='precipitation', ref_elevation=1250,
+        gradient='param:precip_gradient')
+    forcing.apply_operations(parameters)
+    assert forcing.get_cache_info()['misses'] == 2
+    assert forcing.get_cache_info()['entries'] == 2
+    precip_ref = forcing.data2D.data[1]
+
+    # New precipitation gradient: computed and cached
+    parameters.allow_changing = ['precip_gradient']
+    parameters.set_values({'precip_gradient': 0.1})
+    forcing.apply_operations(parameters, apply_to_all=False)
+    assert forcing.get_cache_info()['misses'] == 3
+    assert forcing.get_updated_variables() == [forcing.Variable.P]
+    assert not np.allclose(forcing.data2D.data[1], precip_ref)
+
+    # Back to the first value: taken from the cache
+    parameters.set_values({'precip_gradient': 0.05})
+    forcing.apply_operations(parameters, apply_to_all=False)
+    assert forcing.get_cache_info()['hits'] == 1
+    assert forcing.data2D.data[1] is precip_ref
+    assert forcing.get_updated_variables() == [forcing.Variable.P]
+
+    # Same values again: nothing to update in the model
+    forcing.apply_operations(parameters, apply_to_all=False)
+    assert forcing.get_cache_info()['hits'] == 2
+    assert forcing.get_updated_variables() == []
+
+
+def test_cache_size_is_limited(forcing, parameters):
+    parameters.add_data_parameter('precip_gradient', 0.05)
+    forcing.spatialize_from_station_data(
+        variable='precipitation', ref_elevation=1250,
+        gradient='param:precip_gradient')
+    forcing.set_cache_size(1)
+    forcing.apply_operations(parameters)
+    assert forcing.get_cache_info()['entries'] == 0
+
+    size = forcing.data2D.data[0].nbytes
+    forcing.set_cache_size(2 * size)
+    for gradient in [0.05, 0.1, 0.15]:
+        parameters.set_values({'precip_gradient': gradient})
+        forcing.apply_operations(parameters)
+    assert forcing.get_cache_info()['entries'] == 2
+    assert forcing.get_cache_info()['size'] == 2 * size
+
+    # The least recently used result was discarded
+    parameters.set_values({'precip_gradient': 0.05})
+    forcing.apply_operations(parameters)
+    assert forcing.get_cache_info()['hits'] == 0
+    forcing.clear_cache()
+    assert forcing.get_cache_info()['size'] == 0
+
+
+def test_native_spatialization_keeps_station_data_only(forcing, parameters):
+    forcing.spatialize_from_station_data(
+        variable='temperature', ref_elevation=1250, gradient=-0.6, native=True)
+    forcing.apply_operations(parameters)
+    assert forcing.data2D.data == [None]
+    native = forcing.get_native_spatialization('temperature')
+    assert native['method'] == 'additive_elevation_gradient'
+    assert native['data'].shape == (len(forcing.data1D.time),)
+    assert native['gradients'].tolist() == [-0.6]
+
+    # The values are the same as the ones computed in Python
+    values = forcing._get_spatialized_data(0)
+    forcing.spatialize_from_station_data(
+        variable='temperature', ref_elevation=1250, gradient=-0.6)
+    forcing.apply_operations(parameters)
+    assert forcing.get_native_spatialization('temperature') is None
+    assert np.allclose(values, forcing.data2D.data[0])
+    assert np.allclose(forcing._get_spatialized_data(0, 2), values[:, 2])
+
+
+def test_native_spatialization_requires_ref_elevation(forcing, parameters):
+    forcing.spatialize_from_station_data(variable='temperature', native=True,
+                                         gradient=-0.6)
+    with pytest.raises(ValueError):
+        forcing.apply_operations(parameters)
+
+
+def test_updated_variables_restricted_to_changing_parameters(forcing, parameters):
+    parameters.add_data_parameter('temp_gradients', -0.6)
+    parameters.add_data_parameter('precip_gradient', 0.05)
+    forcing.spatialize_from_station_data(
+        variable='temperature', ref_elevation=1250,
+        gradient='param:temp_gradients')
+    forcing.spatialize_from_station_data(
+        variable='precipitation', ref_elevation=1250,
+        gradient='param:precip_gradient')
+    forcing.apply_operations(parameters)
+    assert forcing.get_updated_variables() == [forcing.Variable.T,
+                                               forcing.Variable.P]
+
+    parameters.allow_changing = ['precip_gradient']
+    forcing.apply_operations(parameters, apply_to_all=False)
+    assert forcing.get_updated_variables() == [forcing.Variable.P]
+
+
 def test_apply_pet_computation_wrong_variable_name(forcing):
     if not hb.has_pyet:
         return
@@ -208,6 +392,32 @@ def test_apply_pet_computation_hamon(forcing):
     assert 'pet' in forcing.data2D.data_name
 
 
+@pytest.mark.parametrize('method, use, options', [
+    ('Oudin', ['t', 'lat'], {}),
+    ('Hamon', ['t', 'lat'], {}),
+    ('Hamon', ['t', 'lat'], {'k': 1.2}),
+    ('Hargreaves', ['t', 'tmin', 'tmax', 'lat'], {'k': 0.015}),
+])
+def test_vectorized_pet_computation_matches_pyet(forcing, method, use, options):
+    if not hb.has_pyet:
+        return
+    # Faking tmin and tmax
+    forcing.data1D.data_name.append(forcing.Variable.T_MIN)
+    forcing.data1D.data.append(forcing.data1D.data[1] - 5)
+    forcing.data1D.data_name.append(forcing.Variable.T_MAX)
+    forcing.data1D.data.append(forcing.data1D.data[1] + 5)
+    for variable in ['temperature', 'tmin', 'tmax']:
+        forcing.spatialize_from_station_data(
+            variable=variable, method='additive_elevation_gradient',
+            ref_elevation=1250, gradient=-0.6)
+    forcing.compute_pet(method=method, use=use, lat=47.3, **options)
+    forcing.apply_operations()
+    pet = forcing.data2D.data[forcing.data2D.data_name.index('pet')]
+    pet_pyet = forcing._compute_pet_per_unit(method, use, lat=47.3, **options)
+    assert pet.shape == pet_pyet.shape
+    assert np.allclose(pet, pet_pyet)
+
+
 def test_apply_pet_computation_linacre(forcing):
     if not hb.has_pyet:
         return
@@ -296,3 +506,215 @@ def test_regrid_from_netcdf_multiple_files(hydro_units):
     assert len(forcing.data2D.data) == 1
     assert forcing.data2D.data[0].shape[0] == 3
     assert forcing.data2D.data[0].shape[1] == 36
+
+
+def test_regrid_from_netcdf_weights_match_reproject(hydro_units):
+    if not has_gridded_data_packages():
+        return
+
+    results = []
+    for method in ['weights', 'reproject']:
+        time_series = hb.time_series.TimeSeries2D()
+        time_series.regrid_from_netcdf(
+            CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056, var_name='RhiresD',
+            dim_x='E', dim_y='N', raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+            method=method)
+        results.append(time_series.data[-1])
+
+    assert results[0].shape == (3, 36)
+    assert np.allclose(results[0], results[1])
+
+
+def test_regrid_from_netcdf_weights_cache():
+    if not has_gridded_data_packages():
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = []
+        for _ in range(2):
+            time_series = hb.time_series.TimeSeries2D()
+            time_series.regrid_from_netcdf(
+                CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056,
+                var_name='RhiresD', dim_x='E', dim_y='N',
+                raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+                weights_cache=True, cache_dir=tmp_dir)
+            results.append(time_series.data[-1])
+
+            cache_files = list((Path(tmp_dir) / 'weights').glob('*.npz'))
+            assert len(cache_files) == 1
+
+        assert np.allclose(results[0], results[1])
+
+        # Another hydro units raster gets its own cache file
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=UserWarning)  # pyproj
+            with hb.rxr.open_rasterio(CATCHMENT_DIR / 'unit_ids.tif') as unit_ids:
+                unit_ids = unit_ids.where(unit_ids != 1, 2).astype(unit_ids.dtype)
+                unit_ids.rio.to_raster(Path(tmp_dir) / 'unit_ids.tif')
+        time_series = hb.time_series.TimeSeries2D()
+        time_series.regrid_from_netcdf(
+            CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056, var_name='RhiresD',
+            dim_x='E', dim_y='N', raster_hydro_units=Path(tmp_dir) / 'unit_ids.tif',
+            weights_cache=True, cache_dir=tmp_dir)
+        assert len(list((Path(tmp_dir) / 'weights').glob('*.npz'))) == 2
+        assert time_series.data[-1].shape == (3, 35)
+
+
+def test_regrid_from_netcdf_multiple_variables(hydro_units):
+    if not has_gridded_data_packages():
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Add a second variable on the same grid
+        with hb.xr.open_dataset(CATCHMENT_DIR / 'gridded_precip.nc') as nc_data:
+            nc_data['TabsD'] = 0.5 * nc_data['RhiresD'] - 3
+            nc_data.to_netcdf(Path(tmp_dir) / 'gridded_meteo.nc')
+
+        forcing = hb.Forcing(hydro_units)
+        forcing.spatialize_from_gridded_data(
+            variable=['precipitation', 'temperature'],
+            path=Path(tmp_dir) / 'gridded_meteo.nc', data_crs=2056,
+            var_name=['RhiresD', 'TabsD'], dim_x='E', dim_y='N',
+            raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif', cache_dir=tmp_dir)
+        forcing.apply_operations()
+
+        forcing_ref = hb.Forcing(hydro_units)
+        for variable, var_name in zip(['precipitation', 'temperature'],
+                                      ['RhiresD', 'TabsD']):
+            forcing_ref.spatialize_from_gridded_data(
+                variable=variable, path=Path(tmp_dir) / 'gridded_meteo.nc',
+                data_crs=2056, var_name=var_name, dim_x='E', dim_y='N',
+                raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+                weights_cache=False)
+        forcing_ref.apply_operations()
+
+    variables = [hb.Forcing.Variable.P, hb.Forcing.Variable.T]
+    assert forcing.data2D.data_name == variables
+    assert forcing.get_updated_variables() == variables
+    for data, data_ref in zip(forcing.data2D.data, forcing_ref.data2D.data):
+        assert data.shape == (3, 36)
+        assert np.allclose(data, data_ref)
+    assert not np.allclose(forcing.data2D.data[0], forcing.data2D.data[1])
+
+
+def test_regrid_from_netcdf_multiple_variables_names_mismatch(hydro_units):
+    forcing = hb.Forcing(hydro_units)
+    forcing.spatialize_from_gridded_data(
+        variable=['precipitation', 'temperature'],
+        path=CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056,
+        var_name='RhiresD', raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif')
+    with pytest.raises(ValueError):
+        forcing.apply_operations()
+
+
+def test_regrid_from_netcdf_streaming_over_files_and_period():
+    if not has_gridded_data_packages():
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        time_series = hb.time_series.TimeSeries2D()
+        time_series.regrid_from_netcdf(
+            CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056, var_name='RhiresD',
+            dim_x='E', dim_y='N', raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+            cache_dir=tmp_dir)
+        reference = time_series.data[-1]
+
+        # Split the data in one file per time step
+        with hb.xr.open_dataset(CATCHMENT_DIR / 'gridded_precip.nc') as nc_data:
+            for i in range(3):
+                nc_data.isel(time=slice(i, i + 1)).to_netcdf(
+                    Path(tmp_dir) / f'part_{i}_precip.nc')
+
+        time_series = hb.time_series.TimeSeries2D()
+        time_series.regrid_from_netcdf(
+            tmp_dir, file_pattern='part_*_precip.nc', data_crs=2056,
+            var_name='RhiresD', dim_x='E', dim_y='N',
+            raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif', cache_dir=tmp_dir,
+            start_date='1962-01-02', end_date='1962-01-03',
+            memmap_dir=Path(tmp_dir) / 'memmap')
+        data = time_series.data[-1]
+
+        assert len(time_series.time) == 2
+        assert time_series.time[0] == pd.Timestamp('1962-01-02')
+        assert isinstance(data, np.memmap)
+        assert (Path(tmp_dir) / 'memmap' / 'RhiresD.npy').exists()
+        assert np.allclose(data, reference[1:])
+        del data, time_series
+
+
+def test_regrid_from_netcdf_period_without_data():
+    if not has_gridded_data_packages():
+        return
+
+    time_series = hb.time_series.TimeSeries2D()
+    with pytest.raises(ValueError):
+        time_series.regrid_from_netcdf(
+            CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056, var_name='RhiresD',
+            dim_x='E', dim_y='N', raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+            start_date='1970-01-01')
+
+
+def test_regrid_from_netcdf_reproject_in_processes(hydro_units):
+    if not has_gridded_data_packages():
+        return
+
+    results = []
+    for executor in ['thread', 'process']:
+        forcing = hb.Forcing(hydro_units)
+        forcing.spatialize_from_gridded_data(
+            variable='precipitation', path=CATCHMENT_DIR / 'gridded_precip.nc',
+            data_crs=2056, var_name='RhiresD', dim_x='E', dim_y='N',
+            raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+            regrid_method='reproject', executor=executor, n_workers=2)
+        forcing.apply_operations()
+        results.append(forcing.data2D.data[0])
+
+    assert results[1].shape == (3, 36)
+    assert np.allclose(results[0], results[1])
+
+
+def test_regrid_from_netcdf_reproject_in_processes_to_memmap():
+    if not has_gridded_data_packages():
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = []
+        for executor, memmap_dir in [('thread', None),
+                                     ('process', Path(tmp_dir) / 'memmap')]:
+            time_series = hb.time_series.TimeSeries2D()
+            time_series.regrid_from_netcdf(
+                CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056,
+                var_name='RhiresD', dim_x='E', dim_y='N',
+                raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+                method='reproject', memmap_dir=memmap_dir, executor=executor,
+                n_workers=2)
+            results.append(time_series.data[-1])
+
+        # The workers wrote the values directly into the memory-mapped file
+        assert isinstance(results[1], np.memmap)
+        assert np.allclose(results[0], results[1])
+        assert np.allclose(np.load(Path(tmp_dir) / 'memmap' / 'RhiresD.npy'),
+                           results[0])
+        del results, time_series
+
+
+def test_regrid_from_netcdf_process_executor_needs_reproject():
+    if not has_gridded_data_packages():
+        return
+
+    time_series = hb.time_series.TimeSeries2D()
+    with pytest.raises(ValueError):
+        time_series.regrid_from_netcdf(
+            CATCHMENT_DIR / 'gridded_precip.nc', data_crs=2056, var_name='RhiresD',
+            dim_x='E', dim_y='N', raster_hydro_units=CATCHMENT_DIR / 'unit_ids.tif',
+            method='weights', executor='process')
+
+
+def test_average_by_unit():
+    values = np.array([[1.0, 2.0, np.nan], [4.0, 5.0, 6.0]])
+    unit_labels = np.array([[0, 0, 1], [-1, 2, 2]])
+    means = hb.time_series.TimeSeries2D.average_by_unit(values, unit_labels, 4)
+
+    assert np.allclose(means[[0, 2]], [1.5, 5.5])
+    assert np.isnan(means[1])
+    assert np.isnan(means[3])
@@ -1,7 +1,10 @@
+import copy
 import os.path
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 import hydrobricks as hb
@@ -29,6 +32,20 @@ def test_socont_creation_with_solver():
     models.Socont(solver='runge_kutta')
 
 
+def test_socont_creation_with_analytical_linear_storages():
+    models.Socont(soil_storage_nb=2, surface_runoff='linear_storage',
+                  analytical_linear_storages=True)
+
+
+def test_socont_creation_with_vectorized_processes():
+    models.Socont(soil_storage_nb=2, vectorized_processes=True)
+
+
+def test_socont_creation_with_adaptive_solver():
+    models.Socont(solver='heun_euler', solver_abs_tolerance=0.05,
+                  solver_rel_tolerance=0.001)
+
+
 def test_socont_creation_with_surface_runoff():
     models.Socont(surface_runoff='linear_storage')
 
@@ -148,3 +165,382 @@ def test_socont_closes_water_balance():
         tmp_dir.cleanup()
     except Exception:
         print('Could not remove temporary directory.')
+
+
+def setup_socont_model(tmp_dir, start_date='1981-01-01', end_date='1985-12-31',
+                       **model_options):
+    socont = models.Socont(soil_storage_nb=2, surface_runoff="linear_storage",
+                           **model_options)
+
+    parameters = socont.generate_parameters()
+    parameters.set_values({'a_snow': 3, 'k_quick': 0.05, 'A': 200, 'k_slow_1': 0.001,
+                           'percol': 0.5, 'k_slow_2': 0.005})
+
+    hydro_units = hb.HydroUnits()
+    hydro_units.load_from_csv(
+        CATCHMENT_BANDS, column_elevation='elevation', column_area='area')
+
+    forcing = hb.Forcing(hydro_units)
+    forcing.load_station_data_from_csv(
+        CATCHMENT_METEO, column_time='Date', time_format='%d/%m/%Y',
+        content={'precipitation': 'precip(mm/day)', 'temperature': 'temp(C)',
+                 'pet': 'pet_sim(mm/day)'})
+    forcing.spatialize_from_station_data(
+        variable='temperature', ref_elevation=1250, gradient=-0.6)
+    forcing.spatialize_from_station_data(variable='pet')
+    forcing.spatialize_from_station_data(
+        variable='precipitation', ref_elevation=1250, gradient=0.05)
+
+    socont.setup(spatial_structure=hydro_units, output_path=tmp_dir,
+                 start_date=start_date, end_date=end_date)
+
+    return socont, parameters, forcing
+
+
+def test_run_batch_matches_individual_runs():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+
+        values = np.array([[0.05, 200], [0.1, 150], [0.2, 300]])
+        discharge = socont.run_batch(parameters, values, ['k_quick', 'A'],
+                                     forcing=forcing)
+
+        assert discharge.shape == (3, len(socont.get_outlet_discharge()))
+
+        for i in range(values.shape[0]):
+            parameters.set_values({'k_quick': values[i, 0], 'A': values[i, 1]})
+            socont.run(parameters=parameters)
+            assert discharge[i] == pytest.approx(socont.get_outlet_discharge())
+
+        socont.cleanup()
+
+
+def test_run_batch_returns_metric():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+
+        socont.run(parameters=parameters, forcing=forcing)
+        observations = socont.get_outlet_discharge()
+
+        values = np.array([[0.05], [0.2]])
+        nse = socont.run_batch(parameters, values, ['k_quick'], metric='nse',
+                               observations=observations)
+
+        assert nse.shape == (2,)
+        assert nse[0] == pytest.approx(1)
+        assert nse[1] < 1
+
+        socont.cleanup()
+
+
+def test_run_batch_restores_the_parameter_values():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+
+        socont.run(parameters=parameters, forcing=forcing)
+        expected = socont.get_outlet_discharge()
+
+        values = np.array([[0.05, 200], [0.2, 300]])
+        socont.run_batch(parameters, values, ['k_quick', 'A'])
+
+        socont.run()
+        assert socont.get_outlet_discharge() == pytest.approx(expected)
+
+        socont.cleanup()
+
+
+def test_set_parameter_values_matches_run_with_parameters():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+        socont.compile_parameters(parameters, ['k_quick', 'A'])
+
+        values = np.array([[0.05, 200], [0.2, 300]])
+        results = []
+        for i in range(values.shape[0]):
+            socont.set_parameter_values(values[i])
+            socont.run()
+            results.append(socont.get_outlet_discharge())
+
+        for i in range(values.shape[0]):
+            parameters.set_values({'k_quick': values[i, 0], 'A': values[i, 1]})
+            socont.run(parameters=parameters)
+            assert results[i] == pytest.approx(socont.get_outlet_discharge())
+
+        with pytest.raises(ValueError):
+            socont.set_parameter_values([0.1])
+
+        socont.cleanup()
+
+
+def test_forcing_in_any_memory_layout_gives_same_results():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+        expected = socont.get_outlet_discharge()
+
+        # Non C-contiguous arrays are converted once before being passed to the core
+        forcing.data2D.data = [np.asfortranarray(data) for data in forcing.data2D.data]
+        socont.set_forcing(forcing)
+        socont.run(parameters=parameters)
+
+        assert socont.get_outlet_discharge() == pytest.approx(expected)
+        socont.cleanup()
+
+
+def test_update_forcing_matches_set_forcing():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+
+        idx = forcing.data2D.data_name.index(forcing.Variable.P)
+        forcing.data2D.data[idx] = forcing.data2D.data[idx] * 1.2
+
+        socont.update_forcing(forcing, variables=['precipitation'])
+        socont.run(parameters=parameters)
+        updated = socont.get_outlet_discharge()
+
+        socont.set_forcing(forcing)
+        socont.run(parameters=parameters)
+        assert updated == pytest.approx(socont.get_outlet_discharge())
+
+        with pytest.raises(RuntimeError):
+            forcing.data2D.data[idx] = forcing.data2D.data[idx][:-1, :]
+            socont.update_forcing(forcing, variables=['precipitation'])
+
+        socont.cleanup()
+
+
+def test_uniform_forcing_matches_distributed_forcing():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+        uniform = socont.get_outlet_discharge()
+
+        # Same PET values, stored for every hydro unit
+        idx = forcing.data2D.data_name.index(forcing.Variable.PET)
+        assert forcing.get_uniform_data('pet') is not None
+        forcing.data2D.data[idx] = np.array(forcing.data2D.data[idx])
+        assert forcing.get_uniform_data('pet') is None
+
+        socont.set_forcing(forcing)
+        socont.run(parameters=parameters)
+        assert uniform == pytest.approx(socont.get_outlet_discharge())
+
+        socont.cleanup()
+
+
+def test_native_spatialization_matches_python_spatialization():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, _ = setup_socont_model(tmp_dir)
+        gradients = [-0.4, -0.45, -0.5, -0.55, -0.6, -0.65, -0.65, -0.6, -0.55,
+                     -0.5, -0.45, -0.4]
+        parameters.add_data_parameter('precip_gradient', 0.05)
+
+        results = []
+        for native in [False, True]:
+            forcing = hb.Forcing(socont.spatial_structure)
+            forcing.load_station_data_from_csv(
+                CATCHMENT_METEO, column_time='Date', time_format='%d/%m/%Y',
+                content={'precipitation': 'precip(mm/day)', 'temperature': 'temp(C)',
+                         'pet': 'pet_sim(mm/day)'})
+            forcing.spatialize_from_station_data(
+                variable='temperature', ref_elevation=1250, gradient=gradients,
+                native=native)
+            forcing.spatialize_from_station_data(variable='pet')
+            forcing.spatialize_from_station_data(
+                variable='precipitation', ref_elevation=1250,
+                gradient='param:precip_gradient', native=native)
+            socont.run(parameters=parameters, forcing=forcing)
+            results.append(socont.get_outlet_discharge())
+
+        assert forcing.get_native_spatialization('temperature') is not None
+        assert results[1] == pytest.approx(results[0])
+
+        # Change of the gradient: only the gradients are sent to the model
+        parameters.set_values({'precip_gradient': 0.1})
+        forcing.apply_operations(parameters)
+        socont.update_forcing(forcing, variables=['precipitation'])
+        socont.run(parameters=parameters)
+        updated = socont.get_outlet_discharge()
+
+        socont.set_forcing(forcing)
+        socont.run(parameters=parameters)
+        assert updated == pytest.approx(socont.get_outlet_discharge())
+        assert not np.allclose(updated, results[1])
+
+        socont.cleanup()
+
+
+def test_pet_computed_in_engine_matches_pet_forcing():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        units_nb = len(np.loadtxt(CATCHMENT_BANDS, delimiter=',', skiprows=2))
+        results = []
+        for pet_method in ['forcing', 'oudin']:
+            socont = models.Socont(soil_storage_nb=2, surface_runoff='linear_storage',
+                                   pet_method=pet_method)
+            parameters = socont.generate_parameters()
+            parameters.set_values({'a_snow': 3, 'k_quick': 0.05, 'A': 200,
+                                   'k_slow_1': 0.001, 'percol': 0.5,
+                                   'k_slow_2': 0.005})
+
+            hydro_units = hb.HydroUnits()
+            hydro_units.add_property(('latitude', 'deg'), np.full(units_nb, 47.3))
+            hydro_units.load_from_csv(
+                CATCHMENT_BANDS, column_elevation='elevation', column_area='area')
+
+            forcing = hb.Forcing(hydro_units)
+            forcing.load_station_data_from_csv(
+                CATCHMENT_METEO, column_time='Date', time_format='%d/%m/%Y',
+                content={'precipitation': 'precip(mm/day)', 'temperature': 'temp(C)'})
+            forcing.spatialize_from_station_data(
+                variable='temperature', ref_elevation=1250, gradient=-0.6)
+            forcing.spatialize_from_station_data(
+                variable='precipitation', ref_elevation=1250, gradient=0.05)
+            if pet_method == 'forcing':
+                forcing.compute_pet(method='Oudin', use=['t', 'lat'])
+
+            socont.setup(spatial_structure=hydro_units, output_path=tmp_dir,
+                         start_date='1981-01-01', end_date='1985-12-31')
+            socont.run(parameters=parameters, forcing=forcing)
+            results.append(socont.get_outlet_discharge())
+            socont.cleanup()
+
+        assert 'pet' not in forcing.data2D.data_name
+        assert results[1] == pytest.approx(results[0])
+
+
+def test_socont_creation_with_wrong_pet_method():
+    with pytest.raises(ValueError):
+        models.Socont(pet_method='penman')
+
+
+def test_models_run_concurrently_in_threads():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        k_quick_values = [0.05, 0.1, 0.2, 0.4]
+        setups = [setup_socont_model(tmp_dir) for _ in k_quick_values]
+        for (_, parameters, _), k_quick in zip(setups, k_quick_values):
+            parameters.set_values({'k_quick': k_quick})
+
+        # Sequential runs as reference
+        expected = []
+        for socont, parameters, forcing in setups:
+            socont.run(parameters=parameters, forcing=forcing)
+            expected.append(socont.get_outlet_discharge())
+
+        # Concurrent runs
+        def run_model(setup):
+            socont, parameters, _ = setup
+            socont.run(parameters=parameters)
+            return socont.get_outlet_discharge()
+
+        with ThreadPoolExecutor(max_workers=len(setups)) as executor:
+            results = list(executor.map(run_model, setups))
+
+        for result, reference in zip(results, expected):
+            assert result == pytest.approx(reference)
+
+        setups[0][0].cleanup()
+
+
+def test_multithreaded_run_matches_single_thread():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+        expected = socont.get_outlet_discharge()
+
+        socont_threads, parameters, forcing = setup_socont_model(tmp_dir,
+                                                                 threads_nb=3)
+        socont_threads.run(parameters=parameters, forcing=forcing)
+
+        assert socont_threads.get_outlet_discharge() == pytest.approx(expected)
+        socont.cleanup()
+
+
+def test_vectorized_processes_match_object_evaluation():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+        expected = socont.get_outlet_discharge()
+
+        socont_vectorized, parameters, forcing = setup_socont_model(
+            tmp_dir, vectorized_processes=True)
+        socont_vectorized.run(parameters=parameters, forcing=forcing)
+
+        assert np.array_equal(socont_vectorized.get_outlet_discharge(), expected)
+        socont.cleanup()
+
+
+def test_cloned_model_runs_like_original():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+        expected = socont.get_outlet_discharge()
+
+        socont_clone = socont.clone()
+        assert socont_clone.model is not socont.model
+        socont_clone.run(parameters=parameters)
+
+        assert socont_clone.get_outlet_discharge() == pytest.approx(expected)
+        socont.cleanup()
+
+
+def test_reapplied_operations_do_not_change_the_cloned_models():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        parameters.add_data_parameter('precip_gradient', 0.05)
+        forcing.spatialize_from_station_data(
+            variable='precipitation', ref_elevation=1250,
+            gradient='param:precip_gradient')
+        socont.run(parameters=parameters, forcing=forcing)
+        expected = socont.get_outlet_discharge()
+        socont_clone = socont.clone()
+
+        # The clone shares the forcing arrays of the original model
+        parameters.set_values({'precip_gradient': 0.1})
+        parameters.allow_changing = ['precip_gradient']
+        forcing.apply_operations(parameters, apply_to_all=False)
+        socont_clone.run(parameters=parameters)
+        assert socont_clone.get_outlet_discharge() == pytest.approx(expected)
+
+        # Only the models updated explicitly see the new values
+        socont.update_forcing(forcing, forcing.get_updated_variables())
+        socont.run(parameters=parameters)
+        assert socont.get_outlet_discharge() != pytest.approx(expected)
+        socont_clone.run(parameters=parameters)
+        assert socont_clone.get_outlet_discharge() == pytest.approx(expected)
+        socont.cleanup()
+
+
+def test_cloned_models_run_concurrently():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socont, parameters, forcing = setup_socont_model(tmp_dir)
+        socont.run(parameters=parameters, forcing=forcing)
+
+        k_quick_values = [0.05, 0.1, 0.2, 0.4]
+        clones = [socont.clone() for _ in k_quick_values]
+        parameter_sets = []
+        for k_quick in k_quick_values:
+            parameters_clone = copy.deepcopy(parameters)
+            parameters_clone.set_values({'k_quick': k_quick})
+            parameter_sets.append(parameters_clone)
+
+        # Sequential runs of the original model as reference
+        expected = []
+        for parameters_clone in parameter_sets:
+            socont.run(parameters=parameters_clone)
+            expected.append(socont.get_outlet_discharge())
+
+        # Concurrent runs of the clones
+        def run_clone(args):
+            model, params = args
+            model.run(parameters=params)
+            return model.get_outlet_discharge()
+
+        with ThreadPoolExecutor(max_workers=len(clones)) as executor:
+            results = list(executor.map(run_clone, zip(clones, parameter_sets)))
+
+        for result, reference in zip(results, expected):
+            assert result == pytest.approx(reference)
+
+        socont.cleanup()